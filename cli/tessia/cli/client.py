@@ -21,14 +21,27 @@ Extend the potion client with custom functionality
 #
 from potion_client import Client as PotionClient
 from potion_client import resource as potion_resource
+from potion_client.converter import PotionJSONDecoder, PotionJSONSchemaDecoder
+from potion_client.utils import upper_camel_case
 from requests.auth import AuthBase
 from tessia.cli.config import CONF
+from tessia.cli.secutils import makedirs_private, open_private_file
 from tessia.cli.utils import build_expect_header
+from urllib.parse import urljoin
+
+import hashlib
+import json
+import logging
+import os
 
 #
 # CONSTANTS AND DEFINITIONS
 #
 
+# file where the api schema of a server is cached, named after the server url
+# and api version
+SCHEMA_CACHE_FILE = 'schema-{}.json'
+
 #
 # CODE
 #
@@ -158,6 +171,145 @@ class Client(PotionClient):
         # client wants
         kwargs['headers'] = kwargs.get('headers', {})
         kwargs['headers']['Expect'] = build_expect_header()
+
+        self._logger = logging.getLogger(__name__)
+        # schema documents by uri, used to build the resources without
+        # requesting each schema from the server
+        self._schema_docs = None
         super().__init__(server, *args, **kwargs)
     # __init__()
+
+    def _fetch_schema(self):
+        """
+        Fetch the api schema and create the resources. The schema is cached on
+        disk and revalidated by its etag so that the resource schemas are only
+        downloaded again when the server's api changed.
+        """
+        cache_path = self._schema_cache_path()
+        cache = self._read_schema_cache(cache_path)
+
+        headers = {}
+        if cache:
+            headers['If-None-Match'] = cache['etag']
+        response = self.session.get(self._schema_url, headers=headers)
+
+        # cached copy still valid: resource schemas are read from it
+        if cache and response.status_code == 304:
+            self._schema_docs = cache['schemas']
+            root_doc = cache['root']
+            etag = None
+        else:
+            self._schema_docs = {}
+            root_doc = response.content.decode('utf-8')
+            etag = response.headers.get('ETag')
+            if response.status_code != 200 or (
+                    etag and etag.startswith('W/')):
+                etag = None
+
+        schema = json.loads(root_doc, cls=PotionJSONSchemaDecoder,
+                            referrer=self._schema_url, client=self)
+        # NOTE these should perhaps be definitions in Flask-Potion
+        for name, resource_schema in schema['properties'].items():
+            resource = self.resource_factory(name, resource_schema)
+            setattr(self, upper_camel_case(name), resource)
+
+        # server provided a new version: replace the cached copy
+        if etag:
+            self._write_schema_cache(cache_path, {
+                'etag': etag, 'root': root_doc, 'schemas': self._schema_docs})
+    # _fetch_schema()
+
+    def _read_schema_cache(self, cache_path):
+        """
+        Read the cached api schema
+
+        Args:
+            cache_path (str): path to the cache file
+
+        Returns:
+            dict: cache content or None if not available
+        """
+        try:
+            with open_private_file(cache_path, 'r') as cache_fd:
+                cache = json.load(cache_fd)
+            if not (isinstance(cache, dict) and cache.get('etag') and
+                    isinstance(cache.get('root'), str) and
+                    isinstance(cache.get('schemas'), dict)):
+                raise ValueError('Invalid schema cache content')
+        except FileNotFoundError:
+            return None
+        # corrupt or unreadable cache: schema is downloaded again
+        except (OSError, ValueError):
+            self._logger.debug('Ignoring schema cache %s', cache_path,
+                               exc_info=True)
+            return None
+        return cache
+    # _read_schema_cache()
+
+    def _schema_cache_path(self):
+        """
+        Return the path to the schema cache file of the current server
+
+        Returns:
+            str: filesystem path
+        """
+        key = hashlib.sha256('{}|{}'.format(
+            self._api_root_url, CONF.get_api_version()).encode('utf-8'))
+        return os.path.join(os.path.dirname(CONF.USER_CONF_PATH),
+                            SCHEMA_CACHE_FILE.format(key.hexdigest()[:16]))
+    # _schema_cache_path()
+
+    def _write_schema_cache(self, cache_path, cache):
+        """
+        Store the api schema on disk. Failures are not fatal as the schema is
+        then downloaded again on the next invocation.
+
+        Args:
+            cache_path (str): path to the cache file
+            cache (dict): cache content
+        """
+        temp_path = '{}.{}'.format(cache_path, os.getpid())
+        try:
+            makedirs_private(os.path.dirname(cache_path), exist_ok=True)
+            with open_private_file(temp_path, 'w') as cache_fd:
+                json.dump(cache, cache_fd)
+            # concurrent invocations always leave a complete file
+            os.replace(temp_path, cache_path)
+        except OSError:
+            self._logger.debug('Failed to write schema cache %s', cache_path,
+                               exc_info=True)
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+    # _write_schema_cache()
+
+    def fetch(self, uri, cls=PotionJSONDecoder, **kwargs):
+        """
+        Fetch a document from the server. Schema documents are served from
+        the cache when available and recorded to be stored in it otherwise.
+
+        Args:
+            uri (str): document uri
+            cls (JSONDecoder): decoder class to parse the document
+            kwargs (dict): arguments forwarded to the decoder
+
+        Returns:
+            any: parsed document
+
+        Raises:
+            requests.HTTPError: in case the request fails
+        """
+        if cls is not PotionJSONSchemaDecoder or self._schema_docs is None:
+            return super().fetch(uri, cls=cls, **kwargs)
+
+        doc = self._schema_docs.get(uri)
+        if doc is None:
+            response = self.session.get(urljoin(self._root_url, uri, True))
+            response.raise_for_status()
+            doc = response.content.decode('utf-8')
+            self._schema_docs[uri] = doc
+
+        return json.loads(doc, cls=cls, client=self, referrer=uri, **kwargs)
+    # fetch()
 # Client
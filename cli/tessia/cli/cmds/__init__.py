@@ -19,20 +19,9 @@ Root group to which all commands are attached
 #
 # IMPORTS
 #
-from pkg_resources import get_distribution, DistributionNotFound
-from tessia.cli.client import Client
-from tessia.cli.cmds.os import _os
-from tessia.cli.cmds.autotemplate import autotemplate
-from tessia.cli.cmds.conf import conf
-from tessia.cli.cmds.conf import key_gen
-from tessia.cli.cmds.job import job
-from tessia.cli.cmds.monitoring import monitoring
-from tessia.cli.cmds.net import net
-from tessia.cli.cmds.perm import perm
-from tessia.cli.cmds.repo import repo
-from tessia.cli.cmds.storage import storage
-from tessia.cli.cmds.system import system
+from importlib.metadata import version, PackageNotFoundError
 from tessia.cli.config import CONF
+from tessia.cli.lazy_group import LazyGroup
 from tessia.cli.session import SESSION
 from tessia.cli.utils import build_expect_header, log_exc_info, version_verify
 
@@ -45,18 +34,19 @@ import sys
 #
 # CONSTANTS AND DEFINITIONS
 #
-CMDS = [
-    autotemplate,
-    conf,
-    job,
-    monitoring,
-    net,
-    _os,
-    perm,
-    repo,
-    storage,
-    system,
-]
+# subcommands are imported only when invoked to keep the startup fast
+CMDS = {
+    'autotemplate': 'tessia.cli.cmds.autotemplate:autotemplate',
+    'conf': 'tessia.cli.cmds.conf:conf',
+    'job': 'tessia.cli.cmds.job:job',
+    'monitoring': 'tessia.cli.cmds.monitoring:monitoring',
+    'net': 'tessia.cli.cmds.net:net',
+    'os': 'tessia.cli.cmds.os:_os',
+    'perm': 'tessia.cli.cmds.perm:perm',
+    'repo': 'tessia.cli.cmds.repo:repo',
+    'storage': 'tessia.cli.cmds.storage:storage',
+    'system': 'tessia.cli.cmds.system:system',
+}
 CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help'])
 # messages constants
 MSG_NO_KEY = (
@@ -91,8 +81,8 @@ MSG_URL_INVALID_ANSWER = (
 )
 
 try:
-    __version__ = get_distribution('tessia-cli').version
-except DistributionNotFound:
+    __version__ = version('tessia-cli')
+except PackageNotFoundError:
     __version__ = '(local)'
 
 #
@@ -158,7 +148,8 @@ def _config_server():
     CONF.update_config(conf_dict)
 # _config_server()
 
-@click.group(context_settings=CONTEXT_SETTINGS)
+@click.group(cls=LazyGroup, lazy_commands=CMDS,
+             context_settings=CONTEXT_SETTINGS)
 @click.version_option(
     prog_name='tessia command line client', version=__version__)
 @click.pass_context
@@ -218,9 +209,7 @@ def root(ctx=None):
         click.echo(MSG_NO_KEY)
         login = click.prompt('Login')
         pwd = click.prompt('Password', hide_input=True)
+        key_gen = ctx.command.get_command(ctx, 'conf').get_command(
+            ctx, 'key-gen')
         ctx.invoke(key_gen, login=login, password=pwd)
 # root()
-
-# add all the subcommands
-for cmd in CMDS:
-    root.add_command(cmd)
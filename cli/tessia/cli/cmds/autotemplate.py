@@ -139,6 +139,9 @@ def template_list(**kwargs):
     # parse parameters to filters
     parsed_filter = dict_to_filter(kwargs)
     parsed_filter['sort'] = {'name': False}
+    # the table shows only some fields: skip fetching the others
+    if not long_info:
+        parsed_filter['fields'] = MODEL_FIELDS_TABLE
     entries = client.AutoTemplates.instances(**parsed_filter)
 
     # present results
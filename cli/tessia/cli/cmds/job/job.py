@@ -22,6 +22,7 @@ Module for the job (scheduler jobs) command
 from tessia.cli.client import Client
 from tessia.cli.config import CONF
 from tessia.cli.filters import dict_to_filter
+from tessia.cli.output import PrintMode
 from tessia.cli.output import print_items
 from tessia.cli.output import print_ver_table
 from tessia.cli.types import ACTION_TYPE, DATE_TIME, JOB_PRIO, JOB_TYPE, \
@@ -51,7 +52,8 @@ JOB_FIELDS_GENERIC = (
 )
 JOB_FIELDS_DETAILED = (
     'job_id', 'job_type', 'submit_date', 'start_date', 'end_date', 'requester',
-    'state', 'description', 'resources', 'time_slot', 'timeout', 'result'
+    'state', 'description', 'resources', 'time_slot', 'timeout', 'result',
+    'metrics'
 )
 DATE_FORMAT = click.DateTime(formats=['%Y-%m-%d'])
 
@@ -59,6 +61,57 @@ DATE_FORMAT = click.DateTime(formats=['%Y-%m-%d'])
 #
 # CODE
 #
+def _bytes_to_str(size):
+    """
+    Format a size in bytes with the biggest binary unit that keeps the value
+    above 1
+    """
+    for unit in ('B', 'KiB', 'MiB', 'GiB'):
+        if size < 1024:
+            break
+        size /= 1024
+    else:
+        unit = 'TiB'
+    if unit == 'B':
+        return '{}B'.format(size)
+    return '{:.1f}{}'.format(size, unit)
+# _bytes_to_str()
+
+
+def format_metrics(metrics):
+    """
+    Format the resource usage of a job, one line for the usage of the
+    process, one for the time in each stage of the state machine and one for
+    the cgroup statistics of containerized jobs
+    """
+    if not metrics:
+        return ''
+    lines = ['cpu {}s, max rss {}, read {}, written {}, output {}'.format(
+        metrics.get('cpu_seconds', 0),
+        _bytes_to_str(metrics.get('max_rss_bytes', 0)),
+        _bytes_to_str(metrics.get('read_bytes', 0)),
+        _bytes_to_str(metrics.get('write_bytes', 0)),
+        _bytes_to_str(metrics.get('output_bytes', 0)))]
+    if metrics.get('stages'):
+        lines.append('stages: {}'.format(', '.join(
+            '{} {}s'.format(stage['name'], stage['seconds'])
+            for stage in metrics['stages'])))
+    cgroup = metrics.get('cgroup')
+    if cgroup:
+        values = []
+        if 'cpu_seconds' in cgroup:
+            values.append('cpu {}s'.format(cgroup['cpu_seconds']))
+        for key, label in (('max_memory_bytes', 'max memory'),
+                           ('read_bytes', 'read'),
+                           ('write_bytes', 'written')):
+            if key in cgroup:
+                values.append(
+                    '{} {}'.format(label, _bytes_to_str(cgroup[key])))
+        lines.append('cgroup: {}'.format(', '.join(values)))
+    return '\n'.join(lines)
+# format_metrics()
+
+
 def date_interval_to_potion_filter(date_start, date_end) -> dict:
     """
     Convert start and end dates to a half-open [start, end) date comparison
@@ -107,6 +160,8 @@ def req_list(request_id, **kwargs):
     parsed_filter = dict_to_filter(kwargs)
     # sort the result
     parsed_filter['sort'] = {'request_id': True}
+    # only the table fields are shown
+    parsed_filter['fields'] = REQUEST_FIELDS_GENERIC
     # the result is paginated so we can iterate on it later
     entries = client.JobRequests.instances(**parsed_filter)
 
@@ -241,6 +296,9 @@ def submit(ctx, job_type, parmfile, **kwargs):
     name='list',
     short_help='show the queue of jobs or details of a job')
 @click.option('job_id', '--id', type=int, help="show details of a job id")
+@click.option('--long', 'long_info', help="show extended information, "
+              "including the resource usage of finished jobs",
+              is_flag=True, default=False)
 @click.option('--my', help="show only my own jobs", is_flag=True,
               default=False)
 @click.option('--params', is_flag=True, help="show the job parameters")
@@ -252,7 +310,7 @@ def submit(ctx, job_type, parmfile, **kwargs):
               help='list jobs that started on or after given day (YYYY-MM-DD)')
 @click.option('--start-before', type=DATE_FORMAT,
               help='list jobs that started before given day (YYYY-MM-DD)')
-def list_(job_id, params, **kwargs):
+def list_(job_id, params, long_info, **kwargs):
     """
     show the queue of jobs or details of a job
     """
@@ -283,17 +341,25 @@ def list_(job_id, params, **kwargs):
             click.echo(item.parameters)
         else:
             print_items(
-                JOB_FIELDS_DETAILED, client.Jobs, None, [item])
+                JOB_FIELDS_DETAILED, client.Jobs,
+                {'metrics': format_metrics}, [item])
         return
 
     # parse parameters to filters
     parsed_filter = dict_to_filter(kwargs)
     # sort the result
     parsed_filter['sort'] = {'job_id': True}
+    # the table shows only some fields: skip fetching the others
+    if not long_info:
+        parsed_filter['fields'] = JOB_FIELDS_GENERIC
     # the result is paginated so we can iterate on it later
     entries = client.Jobs.instances(**parsed_filter)
 
-    print_ver_table(JOB_FIELDS_GENERIC, entries, JOB_FIELDS_GENERIC)
+    if long_info:
+        print_items(JOB_FIELDS_DETAILED, client.Jobs,
+                    {'metrics': format_metrics}, entries, PrintMode.LONG)
+    else:
+        print_ver_table(JOB_FIELDS_GENERIC, entries, JOB_FIELDS_GENERIC)
 # list_()
 
 
@@ -1,4 +1,4 @@
-# Copyright 2021 IBM Corp.
+# Copyright 2021, 2026 IBM Corp.
 #
 # Licensed under the Apache License, Version 2.0 (the "License");
 # you may not use this file except in compliance with the License.
@@ -20,10 +20,10 @@ Module for the HMC monitoring commands
 # IMPORTS
 #
 from tessia.cli.client import Client
-from tessia.cli.filters import dict_to_filter
 from tessia.cli.output import print_items
 from tessia.cli.output import PrintMode
 from tessia.cli.types import HOSTNAME
+from types import SimpleNamespace
 
 import click
 
@@ -32,6 +32,8 @@ import click
 #
 TYPE_FIELDS_HMC = ('name', 'status', 'cpc_status', 'last_update')
 TYPE_FIELDS_CPC = ('cpc_status', 'name', 'last_update')
+# time in seconds the server holds a watch request waiting for changes
+WATCH_TIMEOUT = 50
 
 
 #
@@ -39,36 +41,30 @@ TYPE_FIELDS_CPC = ('cpc_status', 'name', 'last_update')
 #
 
 
-@click.command(name='status')
-@click.option('--name', '--hmc', type=HOSTNAME,
-              help="filter by HMC host name")
-@click.option('--cpc', type=HOSTNAME,
-              help="filter by CPC host name")
-def status(**kwargs):
+def _print_status(client, entries, check_hmc, check_cpc):
     """
-    List hmc status.
-    """
-    # fetch data from server
-    client = Client()
+    Filter and print the status entries
 
-    check_cpc = kwargs.pop('cpc')
-
-    # parse parameters to filters
-    parsed_filter = dict_to_filter(kwargs)
-    parsed_filter['sort'] = {'name': False}
-    entries = client.HmcCanary.instances(**parsed_filter)
+    Args:
+        client (Client): api client
+        entries (list): dicts with the status of each HMC
+        check_hmc (str): HMC name to filter by
+        check_cpc (str): CPC name to filter by
+    """
+    entries = [SimpleNamespace(**entry) for entry in entries
+               if check_hmc is None or entry['name'] == check_hmc]
 
     # find CPC by name, if specified
     entries_by_cpc = []
     is_found = False
     if check_cpc is not None:
         for hmc_entry in entries:
-            fields = [field for field in getattr(hmc_entry, 'cpc_status')
+            fields = [field for field in (hmc_entry.cpc_status or [])
                       if field['name'] == check_cpc]
             if fields:
                 is_found = True
                 entries_by_cpc.append(hmc_entry)
-            setattr(hmc_entry, 'cpc_status', fields)
+            hmc_entry.cpc_status = fields
 
     if is_found is False and check_cpc is not None:
         click.echo("No results were found.")
@@ -77,7 +73,7 @@ def status(**kwargs):
     def parse_cpc(cpcs):
         """Helper function to format output."""
         parsed_cpcs = []
-        for cpc in cpcs:
+        for cpc in cpcs or []:
             parsed_cpcs.append('[{}: {}]'.format(cpc['name'], cpc['status']))
         return ", ".join(parsed_cpcs)
     # parse_cpc()
@@ -92,6 +88,35 @@ def status(**kwargs):
     else:
         print_items(TYPE_FIELDS_CPC, client.HmcCanary, parser_map,
                     entries_by_cpc, PrintMode.LONG)
+# _print_status()
+
+
+@click.command(name='status')
+@click.option('--name', '--hmc', type=HOSTNAME,
+              help="filter by HMC host name")
+@click.option('--cpc', type=HOSTNAME,
+              help="filter by CPC host name")
+@click.option('--watch', is_flag=True,
+              help="keep running and print the status again when it changes")
+def status(**kwargs):
+    """
+    List hmc status.
+    """
+    # fetch data from server
+    client = Client()
+
+    snapshot = client.HmcCanary.status()
+    _print_status(client, snapshot['hmcs'], kwargs['name'], kwargs['cpc'])
+
+    # server answers as soon as the status changes or when the timeout
+    # expires, in which case the same revision is returned
+    while kwargs['watch']:
+        revision = snapshot['revision']
+        snapshot = client.HmcCanary.status(
+            revision=revision, timeout=WATCH_TIMEOUT)
+        if snapshot['revision'] != revision:
+            _print_status(
+                client, snapshot['hmcs'], kwargs['name'], kwargs['cpc'])
 # status()
 
 CMDS = [status]
@@ -186,6 +186,9 @@ def ip_list(**kwargs):
     # parse parameters to filters
     parsed_filter = dict_to_filter(kwargs)
     parsed_filter['sort'] = {'address': False}
+    # the table shows only some fields: skip fetching the others
+    if not long_info:
+        parsed_filter['fields'] = FIELDS_TABLE
     entries = client.IpAddresses.instances(**parsed_filter)
 
     # present results
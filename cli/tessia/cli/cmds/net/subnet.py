@@ -167,6 +167,9 @@ def subnet_list(**kwargs):
         kwargs.update({'owner': CONF.get_login()})
     # parse parameters to filters
     parsed_filter = dict_to_filter(kwargs)
+    # the table shows only some fields: skip fetching the others
+    if not long_info:
+        parsed_filter['fields'] = FIELDS_TABLE
     entries = client.Subnets.instances(**parsed_filter)
 
     # present results
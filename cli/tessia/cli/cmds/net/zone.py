@@ -125,6 +125,9 @@ def zone_list(**kwargs):
     # parse parameters to filters
     parsed_filter = dict_to_filter(kwargs)
     parsed_filter['sort'] = {'name': False}
+    # the table shows only some fields: skip fetching the others
+    if not long_info:
+        parsed_filter['fields'] = FIELDS_TABLE
     entries = client.NetZones.instances(**parsed_filter)
 
     # present results
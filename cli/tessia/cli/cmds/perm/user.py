@@ -120,6 +120,9 @@ def user_list(**kwargs):
     # parse parameters to filters
     parsed_filter = dict_to_filter(kwargs)
     parsed_filter['sort'] = {'login': False}
+    # the table shows only some fields: skip fetching the others
+    if not long_info:
+        parsed_filter['fields'] = FIELDS_TABLE
     entries = client.Users.instances(**parsed_filter)
 
     # present results
@@ -154,6 +154,9 @@ def list_(**kwargs):
     # parse parameters to filters
     parsed_filter = dict_to_filter(kwargs)
     parsed_filter['sort'] = {'name': False}
+    # the table shows only some fields: skip fetching the others
+    if not long_info:
+        parsed_filter['fields'] = MODEL_FIELDS_TABLE
     # fetch data from server
     entries = client.Repositories.instances(**parsed_filter)
     # present results
@@ -648,6 +648,9 @@ def vol_list(**kwargs):
     # parse parameters to filters
     parsed_filter = dict_to_filter(kwargs)
     parsed_filter['sort'] = {'volume_id': False}
+    # the table shows only some fields: skip fetching the others
+    if not long_info:
+        parsed_filter['fields'] = FIELDS_TABLE
     entries = client.StorageVolumes.instances(**parsed_filter)
     parser_map = {'size': size_to_str,
                   'system_profiles':
@@ -24,20 +24,23 @@ from tessia.cli.cmds.system.model import CMDS as model_cmds
 from tessia.cli.cmds.system.prof import CMDS as prof_cmds
 from tessia.cli.cmds.system.system import CMDS as system_cmds
 from tessia.cli.cmds.system.vol import CMDS as vol_cmds
-from tessia.cli.cmds.system.wizard import CMDS as wizard_cmds
+from tessia.cli.lazy_group import LazyGroup
 
 import click
 
 #
 # CONSTANTS AND DEFINITIONS
 #
-CMDS = (iface_cmds + model_cmds + prof_cmds + system_cmds + vol_cmds +
-        wizard_cmds)
+CMDS = iface_cmds + model_cmds + prof_cmds + system_cmds + vol_cmds
+# the wizard is a large module, only imported when invoked
+LAZY_CMDS = {
+    'wizard': 'tessia.cli.cmds.system.wizard:wizard',
+}
 
 #
 # CODE
 #
-@click.group()
+@click.group(cls=LazyGroup, lazy_commands=LAZY_CMDS)
 def system():
     """
     manage systems and related resources
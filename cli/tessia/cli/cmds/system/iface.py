@@ -502,6 +502,9 @@ def iface_list(**kwargs):
     parsed_filter = dict_to_filter(kwargs)
     parsed_filter['sort'] = {'name': False}
 
+    # the table shows only some fields: skip fetching the others
+    if not long_info:
+        parsed_filter['fields'] = IFACE_FIELDS_TABLE
     entries = client.SystemIfaces.instances(**parsed_filter)
     parser_map = {'profiles': lambda prof_list: ', '.join(
         ['[{}]'.format(prof.name) for prof in prof_list])
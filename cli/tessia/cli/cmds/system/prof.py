@@ -345,6 +345,10 @@ def prof_list(**kwargs):
     # parse parameters to filters
     parsed_filter = dict_to_filter(kwargs)
     parsed_filter['sort'] = {'name': False}
+    # the table shows only some fields: skip fetching the others
+    # (default is used to mark the default profile)
+    if not long_info:
+        parsed_filter['fields'] = PROFILE_FIELDS_TABLE + ('default',)
     entries = client.SystemProfiles.instances(**parsed_filter)
 
     def parse_ifaces(ifaces):
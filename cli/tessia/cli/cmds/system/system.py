@@ -277,6 +277,9 @@ def list_(**kwargs):
     # parse parameters to filters
     parsed_filter = dict_to_filter(kwargs)
     parsed_filter['sort'] = {'name': False}
+    # the table shows only some fields: skip fetching the others
+    if not long_info:
+        parsed_filter['fields'] = SYSTEM_FIELDS_TABLE
     entries = client.Systems.instances(**parsed_filter)
 
     # present results
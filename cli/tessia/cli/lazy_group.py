@@ -0,0 +1,86 @@
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Click group which loads its subcommands on demand
+"""
+
+#
+# IMPORTS
+#
+import click
+import importlib
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+
+#
+# CODE
+#
+
+
+class LazyGroup(click.Group):
+    """
+    Group whose subcommands are imported only when they are used, so that
+    running one command does not pay for importing all the others
+    """
+
+    def __init__(self, *args, lazy_commands=None, **kwargs):
+        """
+        Constructor, store the location of the lazy subcommands
+
+        Args:
+            args (list): packed arguments forwarded to click.Group
+            lazy_commands (dict): command names and the location of each
+                                  command object in the format
+                                  'module.path:attribute'
+            kwargs (dict): packed keyword arguments forwarded to click.Group
+        """
+        super().__init__(*args, **kwargs)
+        self._lazy_commands = dict(lazy_commands or {})
+    # __init__()
+
+    def get_command(self, ctx, cmd_name):
+        """
+        Return the subcommand, importing its module if not done yet
+
+        Args:
+            ctx (click.Context): current context
+            cmd_name (str): subcommand name
+
+        Returns:
+            click.Command: subcommand or None if it does not exist
+        """
+        location = self._lazy_commands.get(cmd_name)
+        if location and cmd_name not in self.commands:
+            module_name, attr_name = location.split(':')
+            cmd = getattr(importlib.import_module(module_name), attr_name)
+            self.add_command(cmd, cmd_name)
+        return super().get_command(ctx, cmd_name)
+    # get_command()
+
+    def list_commands(self, ctx):
+        """
+        Return the names of all subcommands, loaded or not
+
+        Args:
+            ctx (click.Context): current context
+
+        Returns:
+            list: sorted command names
+        """
+        return sorted(set(self.commands).union(self._lazy_commands))
+    # list_commands()
+# LazyGroup
@@ -30,6 +30,13 @@ import time
 # CONSTANTS AND DEFINITIONS
 #
 REQUEST_WAIT_TIMEOUT = 60
+# time in seconds the server holds each wait request, the progress bar moves
+# between them
+WAIT_STEP_TIMEOUT = 5
+# time in seconds the server holds a wait request for a job to start
+JOB_WAIT_TIMEOUT = 50
+# time in seconds between polls on servers without the wait route
+POLL_INTERVAL = 2
 REQUEST_TIMEOUT_MSG = (
     "Warning: the scheduler did not process our request in a reasonable time. "
     "This might or might not indicate a problem, depending on the scheduler "
@@ -353,6 +360,36 @@ def submit_csv_job(client, ctx, commit, file_content, verbosity, force,
         ctx.invoke(ctx.obj['CANCEL'], job_id=job_id)
 # submit_csv_job()
 
+def wait_item(resource, id_field, item_id, until, timeout, error_msg):
+    """
+    Wait until an item reaches one of the given states or the timeout
+    expires. Servers which do not provide the wait route are polled.
+
+    Args:
+        resource (Resource): potion resource
+        id_field (str): name of the id field used to search the item
+        item_id (int): id of the item to wait for
+        until (list): states to wait for
+        timeout (int): maximum time in seconds to wait
+        error_msg (str): message to show if item is not found
+
+    Returns:
+        Resource: item with its current state
+    """
+    if hasattr(resource, 'wait'):
+        # server answers as soon as the item reaches one of the states or
+        # when the timeout expires
+        return resource.wait(id=item_id, until=until, timeout=timeout)
+
+    # older server: poll the item
+    deadline = time.time() + timeout
+    while True:
+        item = fetch_item(resource, {id_field: item_id}, error_msg)
+        if item.state in until or time.time() >= deadline:
+            return item
+        time.sleep(POLL_INTERVAL)
+# wait_item()
+
 def wait_job_exec(client, job_id):
     """
     Wait until job starts to execute.
@@ -362,14 +399,12 @@ def wait_job_exec(client, job_id):
         job_id (int): job id to wait for
     """
     click.echo('Waiting for job #{} to start...'.format(job_id))
+    until = ['RUNNING', 'CLEANINGUP', 'COMPLETED', 'FAILED', 'CANCELED']
     while True:
-        item = fetch_item(
-            client.Jobs,
-            {'job_id': job_id},
-            'job not found.')
+        item = wait_item(client.Jobs, 'job_id', job_id, until,
+                         JOB_WAIT_TIMEOUT, 'job not found.')
         if item.state != 'WAITING':
             break
-        time.sleep(0.5)
 # wait_job_exec()
 
 def wait_scheduler(client, arg_dict):
@@ -397,10 +432,9 @@ def wait_scheduler(client, arg_dict):
                            label='processing job') as widget_bar:
         cur_length = 0
         while True:
-            time.sleep(2)
-            item = fetch_item(
-                client.JobRequests,
-                {'request_id': req_id},
+            item = wait_item(
+                client.JobRequests, 'request_id', req_id,
+                ['COMPLETED', 'FAILED'], WAIT_STEP_TIMEOUT,
                 'unexpected error, the request was not found.')
             if item.state == 'COMPLETED' or item.state == 'FAILED':
                 widget_bar.update(100)
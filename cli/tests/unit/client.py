@@ -0,0 +1,242 @@
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit test for the client module
+"""
+
+#
+# IMPORTS
+#
+from tempfile import TemporaryDirectory
+from tessia.cli import client
+from unittest import TestCase
+from unittest.mock import MagicMock, Mock, patch
+
+import json
+import os
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+SERVER_URL = 'https://server:5000'
+
+ROOT_SCHEMA = json.dumps({
+    'properties': {'items': {'$ref': '/items/schema#'}}})
+
+ITEMS_SCHEMA = json.dumps({
+    'links': [{'rel': 'instances', 'href': '/items', 'method': 'GET'}],
+    'properties': {'name': {'type': 'string'}}})
+
+ETAG = '"0123456789abcdef"'
+
+#
+# CODE
+#
+
+
+class TestClient(TestCase):
+    """
+    Unit test for the schema cache of the Client class
+    """
+
+    def setUp(self):
+        """
+        Point the configuration to a temporary directory and mock the http
+        session.
+        """
+        temp_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(temp_dir.cleanup)
+        self._conf_dir = os.path.join(temp_dir.name, '.tessia-cli')
+
+        patcher = patch.object(client, 'CONF', autospec=True)
+        mock_conf = patcher.start()
+        self.addCleanup(patcher.stop)
+        mock_conf.USER_CONF_PATH = os.path.join(self._conf_dir, 'config.yaml')
+        mock_conf.get_config.return_value = {'server_url': SERVER_URL}
+        mock_conf.get_key.return_value = ('key_id', 'key_secret')
+        mock_conf.get_cacert_path.return_value = None
+        mock_conf.get_api_version.return_value = 20160916
+
+        patcher = patch.object(client, 'build_expect_header', autospec=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # etag sent by the server for the root schema
+        self._etag = ETAG
+        patcher = patch('potion_client.requests.Session', autospec=True)
+        mock_session_cls = patcher.start()
+        self.addCleanup(patcher.stop)
+        self._mock_session = MagicMock()
+        self._mock_session.get.side_effect = self._get
+        mock_session_cls.return_value = self._mock_session
+    # setUp()
+
+    def _get(self, url, headers=None):
+        """
+        Answer the schema requests like the server does
+
+        Args:
+            url (str): requested url
+            headers (dict): request headers
+
+        Returns:
+            Mock: response
+        """
+        if url == SERVER_URL + '/schema':
+            if headers and headers.get('If-None-Match') == self._etag:
+                return Mock(status_code=304, content=b'',
+                            headers={'ETag': self._etag})
+            return Mock(status_code=200,
+                        content=ROOT_SCHEMA.encode('utf-8'),
+                        headers={'ETag': self._etag} if self._etag else {})
+        if url == SERVER_URL + '/items/schema':
+            return Mock(status_code=200,
+                        content=ITEMS_SCHEMA.encode('utf-8'), headers={})
+        raise AssertionError('Unexpected request to {}'.format(url))
+    # _get()
+
+    def _cache_files(self):
+        """
+        Return the files in the configuration directory
+
+        Returns:
+            list: file names
+        """
+        try:
+            return os.listdir(self._conf_dir)
+        except FileNotFoundError:
+            return []
+    # _cache_files()
+
+    def _new_client(self):
+        """
+        Create a client, which fetches the api schema
+
+        Returns:
+            client.Client: client instance
+        """
+        self._mock_session.get.reset_mock()
+        new_client = client.Client()
+        # resources are built from the schema
+        self.assertEqual(
+            new_client.Items._schema['properties']['name']['type'], 'string')
+        return new_client
+    # _new_client()
+
+    def _requested_urls(self):
+        """
+        Return the urls requested since the last client was created
+
+        Returns:
+            list: (url, If-None-Match header) tuples
+        """
+        urls = []
+        for call in self._mock_session.get.call_args_list:
+            headers = call[1].get('headers') or {}
+            urls.append((call[0][0], headers.get('If-None-Match')))
+        return urls
+    # _requested_urls()
+
+    def test_schema_not_modified(self):
+        """
+        Test that the schema is stored in the cache and that the resource
+        schemas are read from it when the server answers not modified.
+        """
+        new_client = self._new_client()
+        self.assertEqual(self._requested_urls(), [
+            (SERVER_URL + '/schema', None),
+            (SERVER_URL + '/items/schema', None)])
+        cache_path = new_client._schema_cache_path()
+        with open(cache_path, 'r') as cache_fd:
+            cache = json.load(cache_fd)
+        self.assertEqual(cache, {'etag': ETAG, 'root': ROOT_SCHEMA,
+                                 'schemas': {'/items/schema#': ITEMS_SCHEMA}})
+
+        self._new_client()
+        self.assertEqual(self._requested_urls(), [
+            (SERVER_URL + '/schema', ETAG)])
+
+        # schema changed on the server: cache is replaced
+        self._etag = '"fedcba9876543210"'
+        self._new_client()
+        self.assertEqual(self._requested_urls(), [
+            (SERVER_URL + '/schema', ETAG),
+            (SERVER_URL + '/items/schema', None)])
+        with open(cache_path, 'r') as cache_fd:
+            self.assertEqual(json.load(cache_fd)['etag'], self._etag)
+    # test_schema_not_modified()
+
+    def test_schema_corrupt_cache(self):
+        """
+        Test that a corrupt cache is ignored and replaced.
+        """
+        cache_path = self._new_client()._schema_cache_path()
+
+        for content in ('{"etag": "', json.dumps({'etag': ETAG}),
+                        json.dumps(['not', 'a', 'dict'])):
+            with open(cache_path, 'w') as cache_fd:
+                cache_fd.write(content)
+
+            self._new_client()
+            self.assertEqual(self._requested_urls(), [
+                (SERVER_URL + '/schema', None),
+                (SERVER_URL + '/items/schema', None)])
+            with open(cache_path, 'r') as cache_fd:
+                self.assertEqual(json.load(cache_fd)['etag'], ETAG)
+    # test_schema_corrupt_cache()
+
+    def test_schema_weak_etag(self):
+        """
+        Test that the schema is not cached when the server does not send a
+        strong etag.
+        """
+        for etag in ('W/"0123456789abcdef"', None):
+            self._etag = etag
+            self._new_client()
+            self._new_client()
+            self.assertEqual(self._requested_urls(), [
+                (SERVER_URL + '/schema', None),
+                (SERVER_URL + '/items/schema', None)])
+            self.assertEqual(self._cache_files(), [])
+    # test_schema_weak_etag()
+
+    def test_schema_cache_replace(self):
+        """
+        Test that the cache is written to a temporary file and atomically
+        moved in place, and that a failed write keeps the previous cache.
+        """
+        with patch.object(client.os, 'replace', autospec=True,
+                          side_effect=os.replace) as mock_replace:
+            cache_path = self._new_client()._schema_cache_path()
+        mock_replace.assert_called_once_with(
+            '{}.{}'.format(cache_path, os.getpid()), cache_path)
+        self.assertEqual(self._cache_files(), [os.path.basename(cache_path)])
+        with open(cache_path, 'r') as cache_fd:
+            orig_content = cache_fd.read()
+
+        # failed writes: previous cache is kept and no temporary file is left
+        self._etag = '"fedcba9876543210"'
+        for target, error in (('dump', OSError('No space left on device')),
+                              ('replace', PermissionError('Not allowed'))):
+            module = client.json if target == 'dump' else client.os
+            with patch.object(module, target, autospec=True,
+                              side_effect=error):
+                self._new_client()
+            self.assertEqual(self._cache_files(),
+                             [os.path.basename(cache_path)])
+            with open(cache_path, 'r') as cache_fd:
+                self.assertEqual(cache_fd.read(), orig_content)
+    # test_schema_cache_replace()
+# TestClient
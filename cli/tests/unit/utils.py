@@ -0,0 +1,90 @@
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit test for the utils module
+"""
+
+#
+# IMPORTS
+#
+from tessia.cli import utils
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+
+#
+# CODE
+#
+
+
+class TestWaitItem(TestCase):
+    """
+    Unit test for the wait_item function
+    """
+
+    def setUp(self):
+        """
+        Do not sleep between polls
+        """
+        patcher = patch.object(utils.time, 'sleep', autospec=True)
+        self._mock_sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+    # setUp()
+
+    def test_wait_route(self):
+        """
+        Test that the wait route is used when the server provides it
+        """
+        resource = Mock(spec=['wait', 'one'])
+        resource.wait.return_value = Mock(state='COMPLETED')
+
+        item = utils.wait_item(resource, 'request_id', 5,
+                               ['COMPLETED', 'FAILED'], 10, 'not found')
+        self.assertIs(item, resource.wait.return_value)
+        resource.wait.assert_called_once_with(
+            id=5, until=['COMPLETED', 'FAILED'], timeout=10)
+        resource.one.assert_not_called()
+    # test_wait_route()
+
+    def test_poll(self):
+        """
+        Test that the item is polled when the server has no wait route
+        """
+        # server without the wait route
+        resource = Mock(spec=['one'])
+        resource.one.side_effect = [
+            Mock(state='WAITING'), Mock(state='WAITING'),
+            Mock(state='COMPLETED')]
+
+        item = utils.wait_item(resource, 'request_id', 5,
+                               ['COMPLETED', 'FAILED'], 10, 'not found')
+        self.assertEqual(item.state, 'COMPLETED')
+        resource.one.assert_called_with(where={'request_id': 5})
+        self.assertEqual(resource.one.call_count, 3)
+        self.assertEqual(self._mock_sleep.call_count, 2)
+
+        # timeout reached: item is returned in its current state
+        resource.one.side_effect = None
+        resource.one.return_value = Mock(state='WAITING')
+        with patch.object(utils.time, 'time', autospec=True,
+                          side_effect=[0, 5, 11]):
+            item = utils.wait_item(resource, 'request_id', 5,
+                                   ['COMPLETED', 'FAILED'], 10, 'not found')
+        self.assertEqual(item.state, 'WAITING')
+    # test_poll()
+# TestWaitItem
@@ -27,6 +27,8 @@ from tessia.server.api import exceptions as api_exceptions
 from tessia.server.api.db import API_DB
 from tessia.server.api.manager import ApiManager
 from tessia.server.api.resources import RESOURCES
+from tessia.server.api.views import metrics
+from tessia.server.api.views import schema
 from tessia.server.api.views import version
 from tessia.server.api.views.auth import authorize
 from tessia.server.db.connection import MANAGER
@@ -110,10 +112,16 @@ class _AppManager:
         Raises:
             RuntimeError: in case a resource is missing mandatory attribute
         """
+        # performance metrics, registered first so that the time of the other
+        # hooks is also measured
+        if metrics.is_enabled():
+            metrics.init_app(app)
         # version verification routine when defined by the client in headers
         app.before_request(version.check_version)
         # add the api version header on each response
         app.after_request(version.report_version)
+        # let clients revalidate their cached copy of the api schema
+        app.after_request(schema.add_schema_etag)
 
         # patch the potion error handler for the following reasons:
         # - to log some exceptions to get traceback data
@@ -0,0 +1,149 @@
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Listing schema with support to field projection
+"""
+
+#
+# IMPORTS
+#
+from collections import OrderedDict
+from flask import json, request
+from flask_potion.exceptions import InvalidJSON
+from flask_potion.instances import Instances
+from tessia.server.api.exceptions import BaseHttpError
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+
+# field always returned so that clients can identify the items
+URI_FIELD = '$uri'
+
+#
+# CODE
+#
+
+
+class ProjectedInstances(Instances):
+    """
+    Extend potion's Instances with the query parameter 'fields', a list of
+    field names which restricts the content returned for each item, i.e.
+    fields=["name","type"]. The attribute names of the requested fields are
+    passed to the manager so that it can skip loading the other columns.
+    """
+    query_params = ('where', 'sort', 'fields')
+
+    def _requested_fields(self):
+        """
+        Parse the fields requested by the client
+
+        Returns:
+            OrderedDict: requested fields by name, None if no projection
+                         was requested
+
+        Raises:
+            InvalidJSON: if parameter is not valid json
+            BaseHttpError: if parameter has wrong format or an unknown field
+        """
+        value = request.args.get('fields')
+        if value is None:
+            return None
+
+        try:
+            names = json.loads(value)
+        except ValueError:
+            raise InvalidJSON()
+        if not isinstance(names, list) or not all(
+                isinstance(name, str) for name in names):
+            raise BaseHttpError(
+                400, msg="Parameter 'fields' must be a list of field names")
+
+        readable = self.resource.schema.readable_fields
+        unknown = sorted(set(names).difference(readable))
+        if unknown:
+            raise BaseHttpError(
+                400, msg='Unknown field(s): {}'.format(', '.join(unknown)))
+
+        # keep the order of the schema so that output is stable
+        fields = self.resource.schema.fields
+        return OrderedDict(
+            (name, field) for name, field in fields.items()
+            if name in readable and (name in names or name == URI_FIELD))
+    # _requested_fields()
+
+    def format(self, items):
+        """
+        Format the items returning only the requested fields
+
+        Args:
+            items (list): model instances
+
+        Returns:
+            list: formatted items
+        """
+        fields = self._requested_fields()
+        if fields is None:
+            return super().format(items)
+
+        return [OrderedDict((name, field.output(name, item))
+                            for name, field in fields.items())
+                for item in items]
+    # format()
+
+    def parse_request(self, request):  # pylint: disable=redefined-outer-name
+        """
+        Parse the request parameters adding the attributes of the requested
+        fields.
+
+        Args:
+            request (flask.Request): request object
+
+        Returns:
+            dict: parsed parameters, the key 'fields' contains a tuple of
+                  model attribute names or None
+        """
+        result = super().parse_request(request)
+
+        fields = self._requested_fields()
+        result['fields'] = None
+        if fields is not None:
+            result['fields'] = tuple(
+                field.attribute or name for name, field in fields.items()
+                if name != URI_FIELD)
+        return result
+    # parse_request()
+
+    def schema(self):
+        """
+        Add the fields parameter to the request schema
+
+        Returns:
+            tuple: (response schema, request schema)
+        """
+        response_schema, request_schema = super().schema()
+        request_schema['properties']['fields'] = {
+            "type": "array",
+            "items": {
+                "type": "string",
+                "enum": sorted(
+                    name for name in self.resource.schema.readable_fields
+                    if name != URI_FIELD)
+            },
+            "uniqueItems": True,
+        }
+        return response_schema, request_schema
+    # schema()
+# ProjectedInstances
@@ -21,8 +21,10 @@ Custom potion db manager
 #
 from flask_potion import exceptions as potion_exceptions
 from flask_potion.contrib.alchemy.manager import SQLAlchemyManager
+from flask_potion.instances import Pagination
 from sqlalchemy import exc as sa_exceptions
-from sqlalchemy.orm import aliased
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import aliased, defer
 from werkzeug.exceptions import BadRequest
 
 import logging
@@ -91,6 +93,38 @@ class ApiManager(SQLAlchemyManager):
         # as_dict()
     # DataError
 
+    def _projection_options(self, attributes):
+        """
+        Build the query options to skip loading the columns not needed to
+        serialize the given attributes. Primary and foreign keys are always
+        loaded as hybrid attributes use them to reach the related tables.
+
+        Args:
+            attributes (tuple): names of the model attributes to be returned
+
+        Returns:
+            list: query options, empty when every column is needed
+        """
+        mapper = sa_inspect(self.model)
+        needed = set()
+        for attr_name in attributes:
+            if attr_name in mapper.columns:
+                needed.add(attr_name)
+            # hybrid attribute reading a fk relationship, see the naming
+            # convention described in instances()
+            elif attr_name + '_rel' in mapper.relationships:
+                continue
+            # any other computed attribute might read any column
+            else:
+                return []
+
+        return [
+            defer(getattr(self.model, col_name))
+            for col_name, column in mapper.columns.items()
+            if col_name not in needed and not column.primary_key and
+            not column.foreign_keys]
+    # _projection_options()
+
     def instances(self, where=None, sort=None):
         """
         Add the functionality to join tables when queries use hybrid
@@ -194,6 +228,30 @@ class ApiManager(SQLAlchemyManager):
         return query
     # instances()
 
+    def paginated_instances(self, page, per_page, where=None, sort=None,
+                            fields=None):
+        """
+        Add the possibility to restrict the columns loaded from the database
+
+        Args:
+            page (int): page number
+            per_page (int): items per page
+            where (list): list of SQLAlchemyBaseFilter instances
+            sort (list): list containing sorting conditions
+            fields (tuple): model attributes to be returned, None means all
+
+        Returns:
+            Pagination: items of the page
+        """
+        instances = self.instances(where=where, sort=sort)
+        if isinstance(instances, list):
+            return Pagination.from_list(instances, page, per_page)
+
+        if fields is not None:
+            instances = instances.options(*self._projection_options(fields))
+        return self._query_get_paginated_items(instances, page, per_page)
+    # paginated_instances()
+
     def create(self, properties, commit=True):
         """
         Fix the create method which is not catching sa's exception for error in
@@ -1,4 +1,4 @@
-# Copyright 2021 IBM Corp.
+# Copyright 2021, 2026 IBM Corp.
 #
 # Licensed under the Apache License, Version 2.0 (the "License");
 # you may not use this file except in compliance with the License.
@@ -19,9 +19,19 @@ Resource definition
 #
 # IMPORTS
 #
+from datetime import timezone
 from flask_potion import fields
+from flask_potion.routes import Route
+from flask_potion.schema import FieldSet
 from tessia.server.api.resources.secure_resource import SecureResource
 from tessia.server.db.models import HmcCanary
+from tessia.server.lib.canary.canary import MEDIATOR_REVISION_KEY
+from tessia.server.lib.canary.canary import MEDIATOR_STATUS_KEY
+from tessia.server.lib.mediator import MEDIATOR
+
+import json
+import logging
+import time
 
 #
 # CONSTANTS AND DEFINITIONS
@@ -35,6 +45,13 @@ DESC = {
 
 NAME_PATTERN = r'^\w+[\w\s\.\-\@]+$'
 
+# maximum time in seconds a status request waits for a change
+MAX_WAIT_TIMEOUT = 60
+
+# time in seconds a status request waits when the mediator is not available,
+# so that watching clients do not poll the database continuously
+FALLBACK_WAIT_TIME = 5
+
 #
 # CODE
 #
@@ -76,4 +93,80 @@ class HMCCanaryResource(SecureResource):
                                       description=DESC['last_update'],
                                       nullable=False)
 
+    @staticmethod
+    def _status_from_db():
+        """
+        Build the status snapshot from the database, used when the canary
+        service has not published it to the mediator.
+
+        Returns:
+            dict: snapshot in the same format as published by the service
+        """
+        hmcs = []
+        for entry in HmcCanary.query.order_by(HmcCanary.name).all():
+            hmcs.append({
+                'name': entry.name,
+                'status': entry.status,
+                'cpc_status': entry.cpc_status,
+                'last_update': {'$date': int(entry.last_update.replace(
+                    tzinfo=timezone.utc).timestamp() * 1000)},
+            })
+        return {'revision': 0, 'hmcs': hmcs}
+    # _status_from_db()
+
+    @Route.GET('/status', rel="status")
+    def status(self, **kwargs):
+        """
+        Handler to retrieve the status of all HMCs via GET method.
+
+        The status is served from the mediator, where it is kept by the
+        canary service. If a revision is specified and matches the current
+        one, the request waits until the status changes or the timeout is
+        reached (long-poll). The status is read from the database when the
+        service has not published it or the mediator is not available.
+
+        Returns:
+            dict: revision and list of HMC entries
+        """
+        revision = kwargs.get('revision')
+        timeout = kwargs.get('timeout')
+        try:
+            if revision is not None and timeout:
+                # revision 0 comes from the database fallback, where no
+                # revision is published: wait for the service to publish one
+                MEDIATOR.wait_change(
+                    MEDIATOR_REVISION_KEY, str(revision) if revision else None,
+                    timeout)
+            snapshot = MEDIATOR.get(MEDIATOR_STATUS_KEY)
+        except Exception:  # pylint: disable=broad-except
+            logging.getLogger(__name__).warning(
+                'Mediator not available, reading HMC status from database',
+                exc_info=True)
+            if revision is not None and timeout:
+                time.sleep(min(FALLBACK_WAIT_TIME, timeout))
+            snapshot = None
+
+        if snapshot is None:
+            return self._status_from_db()
+        return json.loads(snapshot)
+    # status()
+    # it's important to use FieldSet or Schema otherwise Potion will not parse
+    # the parameters from the request query string to the view's arguments
+    status.request_schema = FieldSet({
+        'revision': fields.Raw(
+            {
+                "type": ["integer", "null"],
+                "minimum": 0,
+            },
+            default=None),
+        'timeout': fields.Raw(
+            {
+                "type": "integer",
+                "minimum": 0,
+                "maximum": MAX_WAIT_TIMEOUT,
+            },
+            default=0),
+    })
+    status.response_schema = fields.Any()
+
 # HMCCanaryResource
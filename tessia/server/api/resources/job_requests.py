@@ -26,10 +26,13 @@ from flask_potion import exceptions as potion_exceptions
 from flask_potion.fields import Inline
 from flask_potion.resource import ModelResource
 from flask_potion.routes import Route
+from flask_potion.schema import FieldSet
 from tessia.server.api import exceptions as api_exceptions
+from tessia.server.api.db import API_DB
 from tessia.server.db import exceptions as db_exceptions
 from tessia.server.db.models import SchedulerRequest
 from tessia.server.lib.mediator import MEDIATOR
+from tessia.server.scheduler.notify import wait_state
 from tessia.server.state_machines import MACHINES
 from tessia.server.state_machines.base import BaseMachine
 
@@ -54,6 +57,9 @@ DESC = {
     'result': 'Request result',
 }
 
+# maximum time in seconds a wait request is held by the server
+MAX_WAIT_TIMEOUT = 60
+
 #
 # CODE
 #
@@ -236,4 +242,44 @@ class JobRequestResource(ModelResource):
     create.request_schema = Inline('self')
     create.response_schema = None
 
+    @Route.GET('/<int:id>/wait', rel="wait")
+    def wait(self, id, **kwargs):  # pylint: disable=redefined-builtin,invalid-name
+        """
+        Handler to wait for a request to change state via GET method
+        (long-poll).
+
+        The request is answered as soon as the job request reaches one of the
+        states specified or when the timeout is reached.
+
+        Args:
+            id (int): request id
+            kwargs (dict): 'until' (states) and 'timeout' (seconds)
+
+        Returns:
+            json: the request item
+        """
+        item = self.manager.read(id)
+        return wait_state(API_DB.db.session, item, kwargs['until'],
+                          kwargs['timeout'])
+    # wait()
+    # it's important to use FieldSet or Schema otherwise Potion will not parse
+    # the parameters from the request query string to the view's arguments
+    wait.request_schema = FieldSet({
+        'until': fields.Raw(
+            {
+                "type": "array",
+                "items": {
+                    "type": "string", "enum": list(SchedulerRequest.STATES)},
+                "minItems": 1,
+            }),
+        'timeout': fields.Raw(
+            {
+                "type": "integer",
+                "minimum": 0,
+                "maximum": MAX_WAIT_TIMEOUT,
+            },
+            default=0),
+    })
+    wait.response_schema = Inline('self')
+
 # JobRequestResource
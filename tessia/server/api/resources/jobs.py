@@ -1,4 +1,4 @@
-# Copyright 2016, 2017, 2022 IBM Corp.
+# Copyright 2016, 2017, 2022, 2026 IBM Corp.
 #
 # Licensed under the Apache License, Version 2.0 (the "License");
 # you may not use this file except in compliance with the License.
@@ -19,10 +19,9 @@ Resource definition
 #
 # IMPORTS
 #
-from flask import send_file
+from flask import request, send_file, Response
 from flask_potion import fields
 from flask_potion.fields import Inline
-from flask_potion.instances import Instances
 from flask_potion.resource import ModelResource
 from flask_potion.routes import Route
 from flask_potion.schema import FieldSet, SchemaImpl
@@ -32,12 +31,17 @@ from itertools import islice
 from pathlib import Path
 
 import json
+import os
 import tarfile
 
 from tessia.server.api.exceptions import BaseHttpError
+from tessia.server.api.db import API_DB
+from tessia.server.api.instances import ProjectedInstances
 from tessia.server.config import CONF
 from tessia.server.db.models import SchedulerJob
 from tessia.server.lib.compression import GzipStreamWrapper
+from tessia.server.lib.output_cache import OUTPUT_CACHE
+from tessia.server.scheduler.notify import wait_state
 
 #
 # CONSTANTS AND DEFINITIONS
@@ -45,6 +49,7 @@ from tessia.server.lib.compression import GzipStreamWrapper
 DESC = {
     'requester': 'Request owner',
     'job_id': 'Job ID',
+    'request_id': 'Request ID',
     'job_type': 'Machine type',
     'time_slot': 'Time slot',
     'state': 'State',
@@ -57,14 +62,69 @@ DESC = {
     'priority': 'Priority',
     'result': 'Result',
     'timeout': 'Timeout (secs)',
+    'metrics': 'Resource usage',
 }
 
+# maximum time in seconds a wait request is held by the server
+MAX_WAIT_TIMEOUT = 60
+
 #
 # CODE
 #
 
 
-class FileSchema(SchemaImpl):
+class _ConditionalSchema(SchemaImpl):
+    """
+    Base response schema with support for conditional and range requests
+    on immutable content
+    """
+
+    @staticmethod
+    def _not_modified(etag):
+        """
+        Verify whether the client already has the content identified by etag
+
+        Args:
+            etag (str): strong etag of the content
+
+        Returns:
+            flask.Response: 304 response or None if content must be sent
+        """
+        if not request.if_none_match.contains(etag):
+            return None
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+    # _not_modified()
+
+    @staticmethod
+    def _send_immutable(file_obj, size, etag, **kwargs):
+        """
+        Send immutable content honoring If-None-Match and Range headers
+
+        Args:
+            file_obj (file): readable binary file object with the content
+            size (int): content size in bytes, None if the content is
+                        streamed without knowing its size
+            etag (str): strong etag of the content
+            kwargs (dict): arguments passed to flask's send_file
+
+        Returns:
+            flask.Response: full, partial or not modified response
+        """
+        response = send_file(file_obj, conditional=False, **kwargs)
+        response.set_etag(etag)
+        # streamed content: ranges cannot be served, send all of it
+        if size is None:
+            return response
+        return response.make_conditional(
+            request, accept_ranges=True, complete_length=size)
+    # _send_immutable()
+
+# _ConditionalSchema
+
+
+class FileSchema(_ConditionalSchema):
     """
     Response Schema that returns an octet stream instead of JSON
     """
@@ -91,36 +151,74 @@ class FileSchema(SchemaImpl):
         # 'files': list of files (or a str with single file for output)
         # 'encoding': response encoding (raw, gzip)
         # 'id': job id
+        # 'etag': etag of the files content, only present for finished jobs
+        etag = data.get('etag')
+        if etag:
+            not_modified = self._not_modified(etag)
+            if not_modified:
+                return not_modified
         try:
             if isinstance(data['files'], str):
                 # return the only file
                 filename = f'output-{data["id"]}'
-                # pylint: disable=consider-using-with
-                response = send_file(
-                    _enc_stream(open(data['files'], 'rb'), filename),
-                    mimetype='text/plain;charset=UTF-8', as_attachment=True,
-                    attachment_filename=filename)
+                # job is over: serve compressed content from cache
+                if etag and encoding == 'gzip':
+                    # pylint: disable=consider-using-with
+                    file_obj, size = OUTPUT_CACHE.open(
+                        f'{etag}.gz', lambda: _enc_stream(
+                            open(data['files'], 'rb'), filename))
+                    response = self._send_immutable(
+                        file_obj, size, etag,
+                        mimetype='text/plain;charset=UTF-8',
+                        as_attachment=True, attachment_filename=filename)
+                # job is over: serve the file itself
+                elif etag:
+                    # pylint: disable=consider-using-with
+                    file_obj = open(data['files'], 'rb')
+                    response = self._send_immutable(
+                        file_obj, os.fstat(file_obj.fileno()).st_size, etag,
+                        mimetype='text/plain;charset=UTF-8',
+                        as_attachment=True, attachment_filename=filename)
+                else:
+                    # pylint: disable=consider-using-with
+                    response = send_file(
+                        _enc_stream(open(data['files'], 'rb'), filename),
+                        mimetype='text/plain;charset=UTF-8',
+                        as_attachment=True, attachment_filename=filename)
 
                 if encoding == 'gzip':
                     response.headers['Content-Encoding'] = 'gzip'
                 return response
 
-            # Create a tarball with all listed files
-            # Tarball is stored in memory and not streamed,
-            # so in order to conserve memory it will be always gzipped,
-            # regardless of requested encoding
-            tarbuf = BytesIO()
-            with tarfile.open(fileobj=tarbuf, mode='w:gz',
-                              compresslevel=1) as tar:
-                for file in data['files']:
-                    tar.add(file, arcname=Path(file).name)
-                tar.close()
-            tarbuf.seek(0)
+            def _make_tarball():
+                """
+                Create a tarball with all listed files
+                Tarball is stored in memory and not streamed,
+                so in order to conserve memory it will be always gzipped,
+                regardless of requested encoding
+                """
+                tarbuf = BytesIO()
+                with tarfile.open(fileobj=tarbuf, mode='w:gz',
+                                  compresslevel=1) as tar:
+                    for file in data['files']:
+                        tar.add(file, arcname=Path(file).name)
+                    tar.close()
+                tarbuf.seek(0)
+                return tarbuf
+
+            tar_filename = f'job-{data["id"]}.tar.gz'
+            # job is over: tarball can be reused
+            if etag:
+                file_obj, size = OUTPUT_CACHE.open(
+                    f'{etag}.tar.gz', _make_tarball)
+                return self._send_immutable(
+                    file_obj, size, etag,
+                    mimetype='application/octet-stream', as_attachment=True,
+                    attachment_filename=tar_filename)
 
             return send_file(
-                tarbuf, mimetype='application/octet-stream',
-                as_attachment=True,
-                attachment_filename=f'job-{data["id"]}.tar.gz')
+                _make_tarball(), mimetype='application/octet-stream',
+                as_attachment=True, attachment_filename=tar_filename)
 
         # perhaps the file was not created yet, so retrieve job to determine
         # if this is the case or if job id was wrong
@@ -138,7 +236,7 @@ class FileSchema(SchemaImpl):
 # FileSchema
 
 
-class CompressedJsonSchema(SchemaImpl):
+class CompressedJsonSchema(_ConditionalSchema):
     """
     Response Schema that returns a compressed JSON
     """
@@ -149,17 +247,32 @@ class CompressedJsonSchema(SchemaImpl):
         """
         data, code, headers = unpack(response)
 
-        # Expect data to be a string to send
-        if code == 200:
+        if code != 200:
+            return self.format(data), code, headers
+
+        # Expect data to be either a string to send or, for content that
+        # does not change anymore, a dictionary with:
+        # 'etag': etag of the content
+        # 'content': callable returning the string to send
+        if isinstance(data, dict):
+            etag = data['etag']
+            not_modified = self._not_modified(etag)
+            if not_modified:
+                return not_modified
+            file_obj, size = OUTPUT_CACHE.open(
+                f'{etag}.json.gz', lambda: GzipStreamWrapper(
+                    BytesIO(json.dumps(data['content']()).encode('utf-8'))))
+            response = self._send_immutable(
+                file_obj, size, etag, mimetype='application/json',
+                as_attachment=False)
+        else:
             response = send_file(
                 GzipStreamWrapper(
                     BytesIO(json.dumps(data).encode('utf-8'))),
                 mimetype='application/json',
                 as_attachment=False)
-            response.headers['Content-Encoding'] = 'gzip'
-            return response
-
-        return self.format(data), code, headers
+        response.headers['Content-Encoding'] = 'gzip'
+        return response
     # format_response()
 
 # CompressedJsonSchema
@@ -195,6 +308,9 @@ class JobResource(ModelResource):
         job_id = fields.Integer(
             title=DESC['job_id'], description=DESC['job_id'],
             attribute='id', io='r')
+        request_id = fields.Integer(
+            title=DESC['request_id'], description=DESC['request_id'],
+            nullable=True, io='r')
         requester = fields.String(
             title=DESC['requester'], description=DESC['requester'], io='r')
         priority = fields.Integer(
@@ -222,22 +338,46 @@ class JobResource(ModelResource):
             title=DESC['result'], description=DESC['result'], io='r')
         timeout = fields.Integer(
             title=DESC['timeout'], description=DESC['timeout'], io='r')
+        metrics = fields.Any(
+            title=DESC['metrics'], description=DESC['metrics'], io='r')
     # Schema
 
+    @staticmethod
+    def _read_output(path, offset, qty):
+        """
+        Read lines from a job output file
+
+        Args:
+            path (str): path to the output file
+            offset (int): number of lines to skip
+            qty (int): number of lines to read, -1 means all
+
+        Returns:
+            str: lines read
+        """
+        with open(path, 'r', encoding='utf-8') as file:
+            # -1 means retrieve the complete content starting at the offset
+            if qty == -1:
+                return ''.join(islice(file, offset, None))
+            return ''.join(islice(file, offset, offset+qty))
+    # _read_output()
+
     @Route.GET('', rel="instances")
     def instances(self, **kwargs):
         """
         Handler for the list items operation via GET method.
 
         Args:
-            kwargs (dict): contains keys like 'where' (filtering) and
-                           'per_page' (pagination), see potion doc for details
+            kwargs (dict): contains keys like 'where' (filtering),
+                           'per_page' (pagination) and 'fields' (projection),
+                           see potion doc and ProjectedInstances for details
         Returns:
             json: json response as defined by response_schema property
         """
         instances = self.manager.paginated_instances(**kwargs)
         return instances
-    instances.request_schema = instances.response_schema = Instances()
+    instances.request_schema = instances.response_schema = (
+        ProjectedInstances())
 
     @Route.GET('/<int:id>', rel="self", attribute="instance")
     def read(self, id):  # pylint: disable=redefined-builtin,invalid-name
@@ -256,6 +396,44 @@ class JobResource(ModelResource):
     read.request_schema = None
     read.response_schema = Inline('self')
 
+    @Route.GET('/<int:id>/wait', rel="wait")
+    def wait(self, id, **kwargs):  # pylint: disable=redefined-builtin,invalid-name
+        """
+        Handler to wait for a job to change state via GET method (long-poll).
+
+        The request is answered as soon as the job reaches one of the states
+        specified or when the timeout is reached.
+
+        Args:
+            id (int): job id
+            kwargs (dict): 'until' (states) and 'timeout' (seconds)
+
+        Returns:
+            json: the job item
+        """
+        item = self.manager.read(id)
+        return wait_state(API_DB.db.session, item, kwargs['until'],
+                          kwargs['timeout'])
+    # wait()
+    # it's important to use FieldSet or Schema otherwise Potion will not parse
+    # the parameters from the request query string to the view's arguments
+    wait.request_schema = FieldSet({
+        'until': fields.Raw(
+            {
+                "type": "array",
+                "items": {"type": "string", "enum": list(SchedulerJob.STATES)},
+                "minItems": 1,
+            }),
+        'timeout': fields.Raw(
+            {
+                "type": "integer",
+                "minimum": 0,
+                "maximum": MAX_WAIT_TIMEOUT,
+            },
+            default=0),
+    })
+    wait.response_schema = Inline('self')
+
     @Route.GET('/<int:id>/output', rel="output")
     def output(self, id, **kwargs):  # pylint: disable=redefined-builtin,invalid-name
         """
@@ -268,15 +446,21 @@ class JobResource(ModelResource):
             raise BaseHttpError(500, msg=msg)
         offset = kwargs.get('offset')
         qty = kwargs.get('qty')
+        output_path = f'{jobs_dir}/{id}/output'
 
-        # read the content of the file
         try:
-            with open(f'{jobs_dir}/{id}/output', 'r',
-                      encoding='utf-8') as file:
-                # -1 means retrieve the complete content starting at the offset
-                if qty == -1:
-                    return ''.join(islice(file, offset, None))
-                return ''.join(islice(file, offset, offset+qty))
+            # job is over: output does not change anymore and can be cached.
+            # The result file is written by the job process when it finishes,
+            # checking it avoids a database query on each poll of the output.
+            if os.path.exists(f'{jobs_dir}/{id}/.{id}'):
+                return {
+                    'etag': OUTPUT_CACHE.compute_etag(
+                        [output_path], offset, qty),
+                    'content': lambda: self._read_output(
+                        output_path, offset, qty)
+                }
+            # read the content of the file
+            return self._read_output(output_path, offset, qty)
 
         # perhaps the file was not created yet, so retrieve job to determine
         # if this is the case or if job id was wrong
@@ -326,17 +510,31 @@ class JobResource(ModelResource):
 
         # pull paths to requested content
         if content == 'output':
-            return {
+            result = {
                 'files': f'{jobs_dir}/{id}/output',
                 'encoding': encoding,
                 'id': id,
                 'timestamp': item.submit_date.timestamp() or None,
             }
-        return {
-            'files': Path(f'{jobs_dir}/{id}').glob('*'),
-            'encoding': encoding,
-            'id': id,
-        }
+            etag_paths = [result['files']]
+        else:
+            result = {
+                'files': sorted(
+                    str(path) for path in Path(f'{jobs_dir}/{id}').glob('*')),
+                'encoding': encoding,
+                'id': id,
+            }
+            etag_paths = result['files']
+
+        # job is over: content does not change anymore and can be cached
+        if item.end_date is not None:
+            try:
+                result['etag'] = OUTPUT_CACHE.compute_etag(
+                    etag_paths, content, encoding, result.get('timestamp'))
+            # let the response schema report the missing file
+            except FileNotFoundError:
+                pass
+        return result
 
     # it's important to use FieldSet or Schema otherwise Potion will not parse
     # the parameters from the request query string to the view's arguments
@@ -23,9 +23,9 @@ from flask import g as flask_global
 from flask_potion import ModelResource
 from flask_potion import exceptions as potion_exceptions
 from flask_potion.fields import Inline
-from flask_potion.instances import Instances
 from flask_potion.routes import Route
 from tessia.server.api import exceptions as api_exceptions
+from tessia.server.api.instances import ProjectedInstances
 from tessia.server.lib.perm_manager import PermManager
 from tessia.server.db import exceptions as db_exceptions
 from werkzeug.exceptions import Forbidden
@@ -74,13 +74,15 @@ class SecureResource(ModelResource):
         specialized do_list method.
 
         Args:
-            kwargs (dict): contains keys like 'where' (filtering) and
-                           'per_page' (pagination), see potion doc for details
+            kwargs (dict): contains keys like 'where' (filtering),
+                           'per_page' (pagination) and 'fields' (projection),
+                           see potion doc and ProjectedInstances for details
         Returns:
             json: json response as defined by response_schema property
         """
         return self.do_list(**kwargs)
-    instances.request_schema = instances.response_schema = Instances()
+    instances.request_schema = instances.response_schema = (
+        ProjectedInstances())
 
     @Route.GET(lambda r: '/<{}:id>'.format(r.meta.id_converter),
                rel="self", attribute="instance")
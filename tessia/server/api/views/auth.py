@@ -33,10 +33,16 @@ from tessia.server.db.models import UserKey
 # it and convert to a valid json response
 from werkzeug.exceptions import BadRequest
 
+import time
+
 
 #
 # CONSTANTS AND DEFINITIONS
 #
+# schemes accounted in the metrics, others share a single label so that
+# clients cannot create new series
+METRIC_SCHEMES = ('basic', 'x-key')
+METRIC_SCHEME_UNSUPPORTED = 'unsupported'
 
 #
 # CODE
@@ -212,13 +218,21 @@ def authorize(decorated_view):
 
         auth_scheme = auth_scheme.lower()
 
-        if auth_scheme == 'basic':
-            user_entry = _LoginManager.authenticate_basic(auth_value)
-        elif auth_scheme == 'x-key':
-            user_entry = _LoginManager.authenticate_key(auth_value)
-        else:
-            # scheme not supported
-            raise UnauthorizedError()
+        start = time.perf_counter()
+        try:
+            if auth_scheme == 'basic':
+                user_entry = _LoginManager.authenticate_basic(auth_value)
+            elif auth_scheme == 'x-key':
+                user_entry = _LoginManager.authenticate_key(auth_value)
+            else:
+                # scheme not supported
+                raise UnauthorizedError()
+        finally:
+            # used by the performance metrics, when enabled
+            metric_scheme = (auth_scheme if auth_scheme in METRIC_SCHEMES
+                             else METRIC_SCHEME_UNSUPPORTED)
+            flask_global.auth_duration = (  # pylint: disable=assigning-non-slot
+                metric_scheme, time.perf_counter() - start)
 
         # set model as session variable
         flask_global.auth_user = user_entry # pylint: disable=assigning-non-slot
@@ -0,0 +1,254 @@
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Performance metrics of the api, exported in the prometheus text format
+"""
+
+#
+# IMPORTS
+#
+from flask import g as flask_global
+from flask import has_request_context, Response
+from flask import request as flask_request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from tessia.server.config import CONF
+from tessia.server.lib.mediator import MEDIATOR
+from tessia.server.lib.metrics import COUNT_BUCKETS, SIZE_BUCKETS, Registry
+
+import json
+import logging
+import os
+import socket
+import time
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+# mediator hash where each worker process stores its snapshot
+MEDIATOR_KEY = 'api:metrics'
+
+# seconds a snapshot stays in the mediator without being updated
+MEDIATOR_EXPIRE = 86400
+
+# minimum interval in seconds between snapshots stored by a worker
+FLUSH_INTERVAL = 10
+
+# route label for requests which did not match any route
+UNMATCHED_ROUTE = '<unmatched>'
+
+METRICS = Registry()
+METRICS.counter(
+    'tessia_api_requests_total', 'Requests answered')
+METRICS.histogram(
+    'tessia_api_request_duration_seconds', 'Time to answer a request')
+METRICS.histogram(
+    'tessia_api_response_size_bytes', 'Size of response bodies',
+    SIZE_BUCKETS)
+METRICS.histogram(
+    'tessia_api_auth_duration_seconds', 'Time to authenticate a request')
+METRICS.histogram(
+    'tessia_api_db_statements', 'SQL statements executed by a request',
+    COUNT_BUCKETS)
+METRICS.histogram(
+    'tessia_api_db_duration_seconds',
+    'Time spent executing SQL statements by a request')
+
+#
+# CODE
+#
+
+
+class _Exporter:
+    """
+    Share the metrics of this process with the other workers through the
+    mediator, so that any of them can export the values of all.
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self._last_flush = 0
+        self._worker = '{}:{}'.format(socket.gethostname(), os.getpid())
+    # __init__()
+
+    def flush(self, force=False):
+        """
+        Store the snapshot of this process in the mediator
+
+        Args:
+            force (bool): store even if the last one is recent
+        """
+        now = time.monotonic()
+        if not force and now - self._last_flush < FLUSH_INTERVAL:
+            return
+        self._last_flush = now
+        MEDIATOR.set_fields(
+            MEDIATOR_KEY, {self._worker: json.dumps(METRICS.snapshot())},
+            expire=MEDIATOR_EXPIRE)
+    # flush()
+
+    def collect(self):
+        """
+        Retrieve the metrics of all worker processes
+
+        Returns:
+            dict: merged snapshot, only this process' values if the mediator
+                  is not available
+        """
+        try:
+            self.flush(force=True)
+            stored = MEDIATOR.get(MEDIATOR_KEY) or {}
+        except Exception:  # pylint: disable=broad-except
+            logging.getLogger(__name__).warning(
+                'Failed to retrieve metrics from mediator, exporting only the '
+                'current process', exc_info=True)
+            return METRICS.snapshot()
+        return Registry.merge(
+            [json.loads(snapshot) for snapshot in stored.values()])
+    # collect()
+# _Exporter
+
+
+EXPORTER = _Exporter()
+
+
+def _before_cursor_execute(_conn, _cursor, _statement, _parameters, context,
+                           _executemany):
+    """
+    Take the start time of a statement executed during a request
+    """
+    if (context is not None and has_request_context() and
+            flask_global.get('metrics') is not None):
+        context.metrics_start = time.perf_counter()
+# _before_cursor_execute()
+
+
+def _after_cursor_execute(_conn, _cursor, _statement, _parameters, context,
+                          _executemany):
+    """
+    Account the duration of a statement executed during a request
+    """
+    start = getattr(context, 'metrics_start', None)
+    if start is None or not has_request_context():
+        return
+    data = flask_global.get('metrics')
+    if data is None:
+        return
+    data['db_statements'] += 1
+    data['db_duration'] += time.perf_counter() - start
+# _after_cursor_execute()
+
+
+def is_enabled():
+    """
+    Whether metrics collection is enabled in the configuration
+
+    Returns:
+        bool: True if enabled
+    """
+    return bool((CONF.get_config().get('metrics') or {}).get('enabled', False))
+# is_enabled()
+
+
+def start_request():
+    """
+    Prepare the accounting of the current request
+    """
+    flask_global.metrics = {  # pylint: disable=assigning-non-slot
+        'start': time.perf_counter(),
+        'db_statements': 0,
+        'db_duration': 0.0,
+    }
+# start_request()
+
+
+def finish_request(response):
+    """
+    Record the metrics of the current request
+
+    Args:
+        response (flask.Response): response object
+
+    Returns:
+        flask.Response: the same response object
+    """
+    data = flask_global.get('metrics')
+    if data is None:
+        return response
+    flask_global.metrics = None  # pylint: disable=assigning-non-slot
+
+    route = UNMATCHED_ROUTE
+    if flask_request.url_rule is not None:
+        route = flask_request.url_rule.rule
+    labels = {'method': flask_request.method, 'route': route}
+
+    METRICS.inc('tessia_api_requests_total',
+                dict(labels, status=response.status_code))
+    METRICS.observe('tessia_api_request_duration_seconds',
+                    time.perf_counter() - data['start'], labels)
+    # streamed content has no known length
+    if response.content_length is not None:
+        METRICS.observe('tessia_api_response_size_bytes',
+                        response.content_length, labels)
+    METRICS.observe('tessia_api_db_statements', data['db_statements'],
+                    labels)
+    METRICS.observe('tessia_api_db_duration_seconds', data['db_duration'],
+                    labels)
+    auth_duration = flask_global.get('auth_duration')
+    if auth_duration is not None:
+        METRICS.observe('tessia_api_auth_duration_seconds',
+                        auth_duration[1], {'scheme': auth_duration[0]})
+
+    try:
+        EXPORTER.flush()
+    except Exception:  # pylint: disable=broad-except
+        logging.getLogger(__name__).warning(
+            'Failed to store metrics in mediator', exc_info=True)
+    return response
+# finish_request()
+
+
+def export():
+    """
+    View returning the metrics of all api workers
+
+    Returns:
+        flask.Response: metrics in the prometheus text format
+    """
+    return Response(Registry.render(EXPORTER.collect()),
+                    mimetype='text/plain; version=0.0.4')
+# export()
+
+
+def init_app(app):
+    """
+    Enable metrics collection in the app and add the /metrics endpoint
+
+    Args:
+        app (Flask): flask object
+    """
+    app.before_request(start_request)
+    app.after_request(finish_request)
+    app.add_url_rule('/metrics', 'metrics', export)
+
+    # all engines, as the api uses both the flask-sqlalchemy engine and the
+    # one from the db manager
+    if not event.contains(Engine, 'before_cursor_execute',
+                          _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+# init_app()
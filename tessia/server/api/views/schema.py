@@ -0,0 +1,96 @@
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Conditional responses for the api schema endpoints
+"""
+
+#
+# IMPORTS
+#
+from flask import current_app
+from flask import request as flask_request
+
+import hashlib
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+
+# endpoint name of the root schema
+ROOT_ENDPOINT = 'schema'
+
+# suffix of the endpoint names of the resource schemas
+RESOURCE_SUFFIX = '_describedBy'
+
+# key in the app extensions where the etag of the root schema is stored
+EXTENSION_KEY = 'tessia_schema_etag'
+
+#
+# CODE
+#
+
+
+def _root_etag():
+    """
+    Compute the etag of the root schema. Clients rebuild the whole api from
+    it so the etag covers the schema of each resource as well. Schemas do not
+    change while the application is running, so the value is computed once.
+
+    Returns:
+        str: strong etag
+    """
+    etag = current_app.extensions.get(EXTENSION_KEY)
+    if etag is not None:
+        return etag
+
+    digest = hashlib.sha256()
+    for endpoint in sorted(current_app.view_functions):
+        if endpoint != ROOT_ENDPOINT and not endpoint.endswith(
+                RESOURCE_SUFFIX):
+            continue
+        digest.update(endpoint.encode('utf-8'))
+        digest.update(current_app.view_functions[endpoint]().get_data())
+    etag = digest.hexdigest()
+    current_app.extensions[EXTENSION_KEY] = etag
+    return etag
+# _root_etag()
+
+
+def add_schema_etag(response):
+    """
+    Add an etag to successful responses of the schema endpoints and answer
+    304 - "Not modified" when the client already has the same content.
+
+    Args:
+        response (flask.Response): response generated by the view
+
+    Returns:
+        flask.Response: the response, conditional for schema endpoints
+    """
+    if (flask_request.method != 'GET' or response.status_code != 200 or
+            flask_request.url_rule is None):
+        return response
+
+    endpoint = flask_request.url_rule.endpoint
+    if endpoint == ROOT_ENDPOINT:
+        etag = _root_etag()
+    elif endpoint.endswith(RESOURCE_SUFFIX):
+        etag = hashlib.sha256(response.get_data()).hexdigest()
+    else:
+        return response
+
+    response.set_etag(etag)
+    return response.make_conditional(flask_request)
+# add_schema_etag()
@@ -0,0 +1,41 @@
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""0.0.19 (add metrics to jobs)
+
+Revision ID: 3d7b9e51c2a8
+Revises: 6a1f0c2d9e4b
+Create Date: 2026-10-18 23:41:07.215604
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '3d7b9e51c2a8'
+down_revision = '6a1f0c2d9e4b'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+def upgrade():
+    op.add_column('scheduler_jobs',
+                  sa.Column('metrics', postgresql.JSONB(astext_type=sa.Text()),
+                            nullable=True))
+
+
+def downgrade():
+    op.drop_column('scheduler_jobs', 'metrics')
@@ -0,0 +1,45 @@
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""0.0.18 (add request id to jobs)
+
+Revision ID: 6a1f0c2d9e4b
+Revises: e8dd12daa34b
+Create Date: 2026-10-18 10:12:41.382913
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '6a1f0c2d9e4b'
+down_revision = 'e8dd12daa34b'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.add_column('scheduler_jobs',
+                  sa.Column('request_id', sa.Integer(), nullable=True))
+    # fill the column for existing jobs from their submit requests
+    op.execute(
+        "UPDATE scheduler_jobs SET request_id = scheduler_requests.id "
+        "FROM scheduler_requests "
+        "WHERE scheduler_requests.job_id = scheduler_jobs.id "
+        "AND scheduler_requests.action_type = 'SUBMIT'")
+
+
+def downgrade():
+    op.drop_column('scheduler_jobs', 'request_id')
@@ -2212,6 +2212,12 @@ class SchedulerJob(CommonMixin, BASE):
     state = Column(String, nullable=False)
     pid = Column(Integer)
 
+    # submit request which created the job, used by the scheduler to
+    # retrieve the request's extra variables without querying the requests
+    # table. It is not a foreign key since the requests table already
+    # references the jobs table.
+    request_id = Column(Integer)
+
     # opted for a json field instead of a denormalized table 'job_resources'
     # because of the following reasons:
     # - faster access to information in the same row instead of having to
@@ -2242,6 +2248,16 @@ class SchedulerJob(CommonMixin, BASE):
 
     timeout = Column(Integer, default=0, nullable=False)
 
+    # resource usage reported by the job's process when it finishes, in the
+    # format:
+    # {'cpu_seconds': 1.5, 'max_rss_bytes': 1024, 'read_bytes': 0,
+    # 'write_bytes': 0, 'output_bytes': 512,
+    # 'stages': [{'name': 'stage1', 'seconds': 10}],
+    # 'cgroup': {'cpu_seconds': 1.5, 'max_memory_bytes': 2048,
+    # 'read_bytes': 0, 'write_bytes': 0}}
+    # where cgroup is only present for containerized jobs
+    metrics = Column(postgresql.JSONB)
+
     def __repr__(self):
         """Object representation"""
         return "<Job (id='{}')>".format(self.id)
@@ -1,4 +1,4 @@
-# Copyright 2021 IBM Corp.
+# Copyright 2021, 2026 IBM Corp.
 #
 # Licensed under the Apache License, Version 2.0 (the "License");
 # you may not use this file except in compliance with the License.
@@ -19,13 +19,18 @@ Module that periodically checks the HMC availability and CPC status
 #
 # IMPORTS
 #
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from sqlalchemy.dialects.postgresql import insert
 from tessia.server.config import CONF
 from tessia.server.db.connection import MANAGER
 from tessia.server.db.models import HmcCanary
 from tessia.server.db.models import System
 from tessia.server.db.models import SystemType
 from tessia.server.db.models import SystemProfile
+from tessia.server.lib.mediator import MEDIATOR
 
+import json
 import logging
 import requests
 import time
@@ -37,6 +42,14 @@ import urllib3
 
 HMC_API_PORT = "6794"
 MIN_LOOP_TIMEOUT = 60
+# how many HMCs are checked at the same time
+DEFAULT_MAX_WORKERS = 8
+# timeout (in seconds) of each request sent to an HMC
+DEFAULT_REQUEST_TIMEOUT = 10
+# mediator key with the status of all HMCs, read by the API
+MEDIATOR_STATUS_KEY = 'canary:hmc_status'
+# mediator key changed whenever the status of an HMC or CPC changes
+MEDIATOR_REVISION_KEY = 'canary:revision'
 
 #
 # CODE
@@ -56,6 +69,11 @@ class Canary:
         self.hmc_to_check = []
         self.check_on = True
         self.waiting_time = MIN_LOOP_TIMEOUT
+        self.max_workers = DEFAULT_MAX_WORKERS
+        self.request_timeout = DEFAULT_REQUEST_TIMEOUT
+        # statuses of the previous check, used to detect transitions
+        self._last_statuses = None
+        self._revision = 0
 
     @property
     def waiting_time(self):
@@ -125,11 +143,43 @@ class Canary:
                 break
             self.get_hmc_list()
             self.check()
-            self.clear_hmc_db()
-            self.update_db()
+            last_update = datetime.utcnow()
+            self.update_db(last_update)
+            self.publish_status(last_update)
             time.sleep(self._waiting_time)
     # loop()
 
+    @staticmethod
+    def _positive_int_option(canary_config, name, default):
+        """
+        Read a positive integer option from the Canary-service configuration.
+
+        Args:
+            canary_config (dict): Canary-service configuration
+            name (str): option name
+            default (int): value used when the option is not defined
+
+        Returns:
+            int: option value
+
+        Raises:
+            RuntimeError: in case the value is not a positive integer
+        """
+        value = canary_config.get(name, default)
+        # booleans are int subclasses but not meaningful here
+        if isinstance(value, bool):
+            raise RuntimeError("Canary option '{}' must be int".format(name))
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            raise RuntimeError(
+                "Canary option '{}' must be int".format(name)) from None
+        if value < 1:
+            raise RuntimeError(
+                "Canary option '{}' must be greater than 0".format(name))
+        return value
+    # _positive_int_option()
+
     def configuration(self):
         """
         Reading Canary-service configuration file.
@@ -157,6 +207,14 @@ class Canary:
         self._logger.info("The parameter 'waiting_time' is "
                           "set to  to %s", self.waiting_time)
 
+        self.max_workers = self._positive_int_option(
+            canary_config, 'max_workers', DEFAULT_MAX_WORKERS)
+        self.request_timeout = self._positive_int_option(
+            canary_config, 'request_timeout', DEFAULT_REQUEST_TIMEOUT)
+        self._logger.info("Checking up to %s HMCs at a time with a request "
+                          "timeout of %s seconds", self.max_workers,
+                          self.request_timeout)
+
         if not canary_config.get('insecure_warnings', False):
             urllib3.disable_warnings(
                         urllib3.exceptions.InsecureRequestWarning)
@@ -165,107 +223,190 @@ class Canary:
     def get_hmc_list(self):
         """
         Getting an up-to-date and complete HMC list.
+
+        CPCs and their default profiles are retrieved with a single query.
         """
         self.hmc_to_check = []
-        type_for_cpc = SystemType.query.filter_by(name='CPC').one()
-        cpc_obj_list = System.query.filter_by(type_id=type_for_cpc.id).all()
-        if not cpc_obj_list:
+        cpc_list = MANAGER.session.query(
+            System.hostname, SystemProfile.credentials
+        ).join(
+            SystemType, System.type_id == SystemType.id
+        ).join(
+            SystemProfile, SystemProfile.system_id == System.id
+        ).filter(
+            SystemType.name == 'CPC'
+        ).filter(
+            SystemProfile.default == bool(True)
+        ).all()
+        if not cpc_list:
             self._logger.info("There are no HMC to check.")
-        else:
-            for cpc_obj in cpc_obj_list:
-                if cpc_obj.hostname not in \
-                        [hmc['hostname'] for hmc in self.hmc_to_check]:
-                    prof = SystemProfile.query.join(
-                        'system_rel'
-                    ).filter(
-                        SystemProfile.default == bool(True)
-                    ).filter(
-                        SystemProfile.system == cpc_obj.name
-                    ).one_or_none()
-                    if prof and prof.credentials['admin-user'] and \
-                        prof.credentials['admin-password']:
-                        self.hmc_to_check.append(
-                            {'hostname': cpc_obj.hostname,
-                             'user': prof.credentials['admin-user'],
-                             'password': prof.credentials['admin-password']})
+            return
+
+        known_hostnames = set()
+        for hostname, credentials in cpc_list:
+            # several CPCs can be managed by the same HMC
+            if hostname in known_hostnames:
+                continue
+            if credentials and credentials.get('admin-user') and \
+                    credentials.get('admin-password'):
+                known_hostnames.add(hostname)
+                self.hmc_to_check.append(
+                    {'hostname': hostname,
+                     'user': credentials['admin-user'],
+                     'password': credentials['admin-password']})
     # get_hmc_list()
 
+    def _check_hmc(self, hmc):
+        """
+        Check the availability of a single HMC and the status of its CPCs.
+
+        Args:
+            hmc (dict): HMC entry, updated with the results
+        """
+        hmc['cpc'] = []
+        hmc['status'] = "NOT AVAILABLE"
+        base_url = "".join(["https://", hmc['hostname'], ":", HMC_API_PORT])
+
+        # the session keeps the connection open for all requests to the HMC
+        with requests.Session() as ses:
+            try:
+                resp = ses.post(
+                    base_url + "/api/sessions",
+                    verify=False,
+                    timeout=self.request_timeout,
+                    json={
+                        'password': hmc['password'],
+                        'userid': hmc['user']})
+            except requests.exceptions.RequestException as exc:
+                self._logger.debug(
+                    "HMC %s is not reachable: %s", hmc['hostname'], exc)
+                return
+
+            if resp.status_code != 200:
+                return
+            hmc['status'] = "AVAILABLE"
+
+            headers = {'x-api-session': resp.json()['api-session']}
+            try:
+                resp = ses.get(base_url + "/api/cpcs", headers=headers,
+                               verify=False, timeout=self.request_timeout)
+                hmc['cpc'] = [
+                    {'name': cpc['name'], 'status': cpc['status']}
+                    for cpc in resp.json()['cpcs']]
+
+                resp = ses.delete(
+                    base_url + "/api/session/this-session",
+                    headers=headers, verify=False,
+                    timeout=self.request_timeout)
+            except (requests.exceptions.RequestException, ValueError,
+                    KeyError) as exc:
+                self._logger.info(
+                    "Failed to retrieve CPCs status from HMC %s: %s",
+                    hmc['hostname'], exc)
+                return
+            if resp.status_code != 204:
+                self._logger.info(
+                    "When closing the session, "
+                    "an unexpected %s code was "
+                    "received.", resp.status_code)
+    # _check_hmc()
 
     def check(self):
         """
         Performs a direct HMC availability check.
+
+        HMCs are checked concurrently by a bounded pool of workers, so that
+        an unreachable HMC does not delay the check of the others.
         """
-        for hmc in self.hmc_to_check:
-            cpcs_status = []
-            hmc['cpc'] = cpcs_status
-            hmc['status'] = "NOT AVAILABLE"
-
-            with requests.Session() as ses:
-                url = "".join(["https://", hmc['hostname'], ":", HMC_API_PORT,
-                               "/api/sessions"])
+        if not self.hmc_to_check:
+            return
+        with ThreadPoolExecutor(
+                max_workers=min(self.max_workers,
+                                len(self.hmc_to_check))) as executor:
+            futures = [executor.submit(self._check_hmc, hmc)
+                       for hmc in self.hmc_to_check]
+            for hmc, future in zip(self.hmc_to_check, futures):
                 try:
-                    resp = ses.post(
-                        url,
-                        verify=False,
-                        json={
-                            'password': hmc['password'],
-                            'userid': hmc['user']})
-                except requests.exceptions.ConnectionError:
-                    continue
-
-                if resp.status_code == 200:
-                    hmc['status'] = "AVAILABLE"
-                else:
-                    continue
-
-                session_data = resp.json()
-                headers = {'x-api-session': session_data['api-session']}
-                url = "".join(["https://", hmc['hostname'], ":", HMC_API_PORT,
-                               "/api/cpcs"])
-
-                resp = ses.get(url, headers=headers, verify=False)
-                session_data = resp.json()
-                for cpc in session_data['cpcs']:
-                    cpcs_status.append({
-                        'name': cpc['name'],
-                        'status': cpc['status']})
-                hmc['cpc'] = cpcs_status
-
-                url = "".join(["https://", hmc['hostname'], ":", HMC_API_PORT,
-                               "/api/session/this-session"])
-
-                resp = ses.delete(url, headers=headers, verify=False)
-                if resp.status_code != 204:
-                    self._logger.info(
-                        "When closing the session, "
-                        "an unexpected %s code was "
-                        "received.", resp.status_code)
-   # check()
-
-    def update_db(self):
+                    future.result()
+                # any unexpected error only affects the HMC being checked
+                except Exception:  # pylint: disable=broad-except
+                    self._logger.warning(
+                        "Check of HMC %s failed", hmc['hostname'],
+                        exc_info=True)
+    # check()
+
+    def publish_status(self, last_update):
         """
-        Filling the database with new data.
-        The table was cleared in one of the previous steps.
-        """
-        entries = []
-        for hmc in self.hmc_to_check:
-            entry = HmcCanary()
-            entry.name = hmc['hostname']
-            entry.status = hmc['status']
-            entry.cpc_status = hmc['cpc']
-            entries.append(entry)
-        MANAGER.session.add_all(entries)
-        MANAGER.session.commit()
-    # update_db()
+        Store the results of the last check in the mediator, where they are
+        read by the API without accessing the database.
 
-    @staticmethod
-    def clear_hmc_db():
+        The revision is only changed when the status of an HMC or of one of
+        its CPCs changes, which allows clients to wait for transitions.
+
+        Args:
+            last_update (datetime): date of the check
+        """
+        statuses = {hmc['hostname']: (hmc['status'], hmc['cpc'])
+                    for hmc in self.hmc_to_check}
+        if statuses != self._last_statuses:
+            self._revision = int(time.time() * 1000)
+            self._last_statuses = statuses
+
+        # use the same date format as the API responses
+        date_ms = int(last_update.replace(
+            tzinfo=timezone.utc).timestamp() * 1000)
+        snapshot = {
+            'revision': self._revision,
+            'hmcs': [
+                {'name': hmc['hostname'],
+                 'status': hmc['status'],
+                 'cpc_status': hmc['cpc'],
+                 'last_update': {'$date': date_ms}}
+                for hmc in sorted(self.hmc_to_check,
+                                  key=lambda entry: entry['hostname'])]
+        }
+        # entries expire if the service stops, so that readers fall back to
+        # the database
+        try:
+            MEDIATOR.set_many({
+                MEDIATOR_STATUS_KEY: json.dumps(snapshot),
+                MEDIATOR_REVISION_KEY: str(self._revision),
+            }, expire=self._waiting_time * 3)
+        except Exception:  # pylint: disable=broad-except
+            self._logger.warning(
+                "Failed to publish HMC status to mediator", exc_info=True)
+    # publish_status()
+
+    def update_db(self, last_update):
         """
-        Clearing the database of data from the previous check.
+        Store the results of the last check in a single transaction.
 
-        We use deletion instead of updating, because this avoids
-        additional checks for the relevance of the HMC list.
+        Entries are updated in place (upsert) so that readers never see an
+        empty table; HMCs which are not checked anymore are removed.
+
+        Args:
+            last_update (datetime): date of the check
         """
-        MANAGER.session.query(HmcCanary).delete()
-        MANAGER.session.commit()
-    # clear_hmc_db()
+        session = MANAGER.session
+        hostnames = [hmc['hostname'] for hmc in self.hmc_to_check]
+        if self.hmc_to_check:
+            stmt = insert(HmcCanary.__table__).values([
+                {'name': hmc['hostname'],
+                 'status': hmc['status'],
+                 'cpc_status': hmc['cpc'],
+                 'last_update': last_update}
+                for hmc in self.hmc_to_check])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[HmcCanary.name],
+                set_={'status': stmt.excluded.status,
+                      'cpc_status': stmt.excluded.cpc_status,
+                      'last_update': stmt.excluded.last_update})
+            session.execute(stmt)
+
+        # remove HMCs which are gone from the list
+        query = session.query(HmcCanary)
+        if hostnames:
+            query = query.filter(~HmcCanary.name.in_(hostnames))
+        query.delete(synchronize_session=False)
+        session.commit()
+    # update_db()
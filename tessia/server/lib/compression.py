@@ -95,6 +95,8 @@ class GzipStreamWrapper:
 
     def __init__(self, input_file, mtime=None, filename: str = None):
         """Initialize the stream"""
+        # kept to be closed, _input is reset once the end is reached
+        self._input_file = input_file
         self._input = input_file
         self._spill = BufferedStream()
         self._zlib = zlib.compressobj(
@@ -132,4 +134,10 @@ class GzipStreamWrapper:
         return self._spill.read(size)
     # read()
 
+    def close(self):
+        """Close the input stream"""
+        self._input = None
+        self._input_file.close()
+    # close()
+
 # GzipStreamWrapper
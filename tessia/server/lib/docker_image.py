@@ -0,0 +1,217 @@
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Build of the docker images used by the ansible and tela jobs
+"""
+
+#
+# IMPORTS
+#
+from tessia.server.config import CONF
+
+import docker
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import pathlib
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+# label identifying the images built by a tessia instance, the value is the
+# jobs directory of the instance
+INSTANCE_LABEL = 'com.tessia.jobs_dir'
+
+#
+# CODE
+#
+
+
+def context_hash(context_dir):
+    """
+    Compute the hash of the files in a build context
+
+    Args:
+        context_dir (str): path to the build context
+
+    Returns:
+        str: hash used as image tag
+    """
+    digest = hashlib.sha256()
+    for dir_path, dir_names, file_names in os.walk(context_dir):
+        # walk in a stable order and skip python bytecode
+        dir_names[:] = sorted(
+            name for name in dir_names if name != '__pycache__')
+        for file_name in sorted(file_names):
+            file_path = pathlib.Path(dir_path, file_name)
+            digest.update('{}:{:o}\0'.format(
+                file_path.relative_to(context_dir),
+                file_path.stat().st_mode).encode('utf-8'))
+            digest.update(file_path.read_bytes())
+    return digest.hexdigest()[:16]
+# context_hash()
+
+
+class DockerImage:
+    """
+    Docker image tagged with the hash of its build context, so that a
+    changed context results in a new image instead of reusing the old one.
+
+    Builds are serialized by a lock file in the scheduler jobs directory,
+    which is shared by the processes of all jobs of the tessia instance,
+    and the images are labeled with that directory so that each instance
+    only removes the outdated images it built itself.
+    """
+
+    def __init__(self, client, name, context_dir):
+        """
+        Constructor
+
+        Args:
+            client (docker.DockerClient): connection to the docker daemon
+            name (str): image name (repository)
+            context_dir (str): path to the build context
+        """
+        self._logger = logging.getLogger(__name__)
+        self._client = client
+        self._name = name
+        self._context_dir = context_dir
+        self.tag = '{}:{}'.format(name, context_hash(context_dir))
+    # __init__()
+
+    @staticmethod
+    def _get_jobs_dir():
+        """
+        Return the jobs directory of the instance
+
+        Returns:
+            str: path to the directory
+
+        Raises:
+            RuntimeError: if no jobs directory is configured
+        """
+        try:
+            return CONF.get_config().get('scheduler')['jobs_dir']
+        except (TypeError, KeyError):
+            raise RuntimeError('No scheduler job directory configured')
+    # _get_jobs_dir()
+
+    def _docker_build(self, jobs_dir):
+        """
+        Build the docker image
+
+        Args:
+            jobs_dir (str): jobs directory used as value of the instance
+                            label
+
+        Raises:
+            RuntimeError: if the build fails
+        """
+        self._logger.info('building docker image %s, this might take a while',
+                          self.tag)
+        lines = self._client.api.build(
+            path=self._context_dir, tag=self.tag,
+            nocache=True,
+            # Removes the intermediate containers after an unsuccessful build.
+            # The intermediate containers are not removed when the build
+            # process is killed by any signal.
+            # In this case the cleanup method deletes the dangling images.
+            forcerm=True,
+            labels={INSTANCE_LABEL: jobs_dir}
+        )
+
+        output = ""
+        for line in lines:
+            line_json = json.loads(line.decode('utf-8', errors='replace'))
+            # WARNING: be careful when parsing the json output as it
+            # can also contain a key named 'aux'.
+            if 'stream' in line_json:
+                self._logger.debug(line_json['stream'])
+                output += line_json['stream']
+            if 'errorDetail' in line_json:
+                raise RuntimeError('Image build failed: {}'.format(
+                    line_json['errorDetail']['message'])) from None
+
+        # Detect if the build process was killed by a signal e.g. an external
+        # entity calls docker kill.
+        # Check if the output contains the final two success messages,
+        # otherwise raise an exception.
+        if not ("Successfully built" in output and
+                "Successfully tagged" in output):
+            raise RuntimeError('Image build failed: The build process is '
+                               'incomplete')
+    # _docker_build()
+
+    def _exists(self):
+        """
+        Check whether the image is available in the docker daemon
+
+        Returns:
+            bool: True if image exists
+        """
+        try:
+            self._client.images.get(self.tag)
+        except docker.errors.ImageNotFound:
+            return False
+        return True
+    # _exists()
+
+    def _remove_outdated(self, jobs_dir):
+        """
+        Remove the images built by this instance from previous versions of
+        the build context
+
+        Args:
+            jobs_dir (str): jobs directory used as value of the instance
+                            label
+        """
+        images = self._client.images.list(
+            name=self._name,
+            filters={'label': '{}={}'.format(INSTANCE_LABEL, jobs_dir)})
+        for image in images:
+            if self.tag in image.tags:
+                continue
+            try:
+                self._client.images.remove(image.id)
+                self._logger.debug(
+                    "the outdated image %s was removed", image.id)
+            except docker.errors.APIError:
+                # image still used by the container of a running job
+                pass
+    # _remove_outdated()
+
+    def build(self):
+        """
+        Build the image unless it already exists
+        """
+        if self._exists():
+            return
+
+        # jobs starting at the same time wait for a single build
+        jobs_dir = self._get_jobs_dir()
+        lock_fd = os.open(
+            os.path.join(jobs_dir, '.{}.lock'.format(self._name)),
+            os.O_CREAT | os.O_RDWR, 0o666)
+        try:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX)
+            if not self._exists():
+                self._docker_build(jobs_dir)
+                self._remove_outdated(jobs_dir)
+        finally:
+            os.close(lock_fd)
+    # build()
+# DockerImage
@@ -1,4 +1,4 @@
-# Copyright 2020 IBM Corp.
+# Copyright 2020, 2026 IBM Corp.
 #
 # Licensed under the Apache License, Version 2.0 (the "License");
 # you may not use this file except in compliance with the License.
@@ -20,14 +20,39 @@ Module that helps mediating transient data between components
 # IMPORTS
 #
 from tessia.server.config import CONF
-from redis import exceptions as RedisExceptions
 
 import logging
 import redis
+import time
 
 #
 # CONSTANTS AND DEFINITIONS
 #
+# seconds of inactivity after which a pooled connection is checked before use
+HEALTH_CHECK_INTERVAL = 30
+
+# interval in seconds between checks when waiting for a value to change
+WAIT_POLL_INTERVAL = 0.5
+
+# retrieve type and value of several keys in a single round trip;
+# result is a flat list of (type, value) pairs, with hashes as flat lists
+SCRIPT_GET_MANY = """
+local result = {}
+for _, key in ipairs(KEYS) do
+    local value_type = redis.call('TYPE', key)['ok']
+    local value = false
+    if value_type == 'string' then
+        value = redis.call('GET', key)
+    elseif value_type == 'hash' then
+        value = redis.call('HGETALL', key)
+    elseif value_type == 'list' then
+        value = redis.call('LRANGE', key, 0, -1)
+    end
+    table.insert(result, value_type)
+    table.insert(result, value)
+end
+return result
+"""
 
 #
 # CODE
@@ -42,43 +67,14 @@ class _Mediator:
 
     def __init__(self):
         """
-        Constructor, defines the variable that stores the engine and session
-        instances as empty. The connection to the db is triggered on the first
-        time one of the variables engine or session is referenced.
+        Constructor, defines the variable that stores the redis client as
+        empty. The connection pool is created on the first time the client
+        is referenced.
         """
         self._conn = None
+        self._get_many_script = None
     # __init__()
 
-    def _verify_connection(self):
-        """
-        Ping redis server to see if connection is still alive,
-        and recreate it if not
-
-        Raises:
-            RuntimeError: on missing connection configuration
-        """
-        if self._conn:
-            try:
-                self._conn.ping()
-            except RedisExceptions.ConnectionError:
-                self._conn = None
-            except RedisExceptions.TimeoutError:
-                self._conn = None
-
-        if not self._conn:
-            if not self._mediator_uri:
-                try:
-                    redis_url = CONF.get_config().get('mediator')['url']
-                except (TypeError, KeyError) as exc:
-                    raise RuntimeError(
-                        'No mediator configuration found') from exc
-            else:
-                redis_url = self._mediator_uri
-            logging.debug("Connecting to redis at %s", redis_url)
-
-            self._conn = redis.from_url(redis_url)
-    # _verify_connection()
-
     def _decode(self, binary):
         """
         Decode an object that may have bytes value.
@@ -104,6 +100,36 @@ class _Mediator:
         return binary
     # _decode()
 
+    def _decode_typed(self, key, value_type, value):
+        """
+        Convert a value retrieved with its redis type to a python object
+
+        Args:
+            key (str): key the value belongs to
+            value_type (bytes): redis type of the value
+            value (Union[bytes,list,None]): raw value
+
+        Returns:
+            Union[str,dict,list,None]: decoded value
+
+        Raises:
+            ValueError: when stored value type is not supported
+        """
+        value_type = self._decode(value_type)
+        if value_type == 'string':
+            return self._decode(value)
+        if value_type == 'hash':
+            # hashes come as a flat list of alternating fields and values
+            return self._decode(dict(zip(value[::2], value[1::2])))
+        if value_type == 'list':
+            return self._decode(value)
+        if value_type == 'none':
+            return None
+
+        raise ValueError("Key " + repr(key) + " has unsupported value type " +
+                         value_type)
+    # _decode_typed()
+
     def _flushdb(self):
         """
         Clear the database
@@ -112,6 +138,62 @@ class _Mediator:
         self._conn.flushdb()
     # _flushdb()
 
+    @staticmethod
+    def _queue_set(pipe, key, value, expire):
+        """
+        Queue the commands needed to store a value in a pipeline
+
+        Args:
+            pipe (redis.client.Pipeline): pipeline to add commands to
+            key (str): identifier
+            value (Union[str,list,dict]): value to store
+            expire (int): time in seconds for data expiration
+        """
+        if isinstance(value, dict):
+            pipe.delete(key)
+            pipe.hset(key, mapping=value)
+            if expire:
+                pipe.expire(key, expire)
+        elif isinstance(value, list):
+            pipe.delete(key)
+            pipe.rpush(key, *value)
+            if expire:
+                pipe.expire(key, expire)
+        elif value is None:
+            pipe.delete(key)
+        else:
+            pipe.set(key, value, ex=expire)
+    # _queue_set()
+
+    def _verify_connection(self):
+        """
+        Create the redis client on first usage.
+
+        Connections are kept in a pool and checked by the client itself when
+        they were idle for longer than the health check interval, so there is
+        no need to ping the server before each operation.
+
+        Raises:
+            RuntimeError: on missing connection configuration
+        """
+        if self._conn:
+            return
+
+        if not self._mediator_uri:
+            try:
+                redis_url = CONF.get_config().get('mediator')['url']
+            except (TypeError, KeyError) as exc:
+                raise RuntimeError(
+                    'No mediator configuration found') from exc
+        else:
+            redis_url = self._mediator_uri
+        logging.debug("Connecting to redis at %s", redis_url)
+
+        self._conn = redis.from_url(
+            redis_url, health_check_interval=HEALTH_CHECK_INTERVAL)
+        self._get_many_script = self._conn.register_script(SCRIPT_GET_MANY)
+    # _verify_connection()
+
     def get(self, key):
         """
         Retrieve a value by key
@@ -125,21 +207,33 @@ class _Mediator:
         Raises:
             ValueError: when stored value type is none of the above
         """
-        self._verify_connection()
-        value_type = self._conn.type(key).decode('utf-8')
-        if value_type == 'string':
-            return self._decode(self._conn.get(key))
-        if value_type == 'hash':
-            return self._decode(self._conn.hgetall(key))
-        if value_type == 'list':
-            return self._decode(self._conn.lrange(key, 0, -1))
-        if value_type == 'none':
-            return None
-
-        raise ValueError("Key " + repr(key) + " has unsupported value type " +
-                         value_type)
+        return self.get_many([key])[0]
     # get()
 
+    def get_many(self, keys):
+        """
+        Retrieve values of several keys in a single round trip
+
+        Args:
+            keys (list): string identifiers
+
+        Returns:
+            list: retrieved values in the same order as keys, see get()
+
+        Raises:
+            ValueError: when a stored value type is not supported
+        """
+        if not keys:
+            return []
+        self._verify_connection()
+        result = self._get_many_script(keys=list(keys))
+        return [
+            self._decode_typed(key, value_type, value)
+            for key, value_type, value in zip(
+                keys, result[::2], result[1::2])
+        ]
+    # get_many()
+
     def set(self, key, value, expire=None):
         """
         Set a value by key with a possible expiration timeout
@@ -149,23 +243,74 @@ class _Mediator:
             value (Union[str,list,dict]): value to store
             expire (int): time in seconds for data expiration
         """
+        self.set_many({key: value}, expire=expire)
+    # set()
+
+    def set_many(self, values, expire=None):
+        """
+        Set several values atomically in a single round trip
+
+        Args:
+            values (dict): values to store, indexed by identifier
+            expire (int): time in seconds for data expiration
+        """
+        if not values:
+            return
         self._verify_connection()
 
-        if isinstance(value, dict):
-            self._conn.delete(key)
-            self._conn.hset(key, mapping=value)
-            if expire:
-                self._conn.expire(key, expire)
-        elif isinstance(value, list):
-            self._conn.delete(key)
-            self._conn.rpush(key, *value)
+        # queue all commands in a MULTI/EXEC block
+        with self._conn.pipeline(transaction=True) as pipe:
+            for key, value in values.items():
+                self._queue_set(pipe, key, value, expire)
+            pipe.execute()
+    # set_many()
+
+    def set_fields(self, key, values, expire=None):
+        """
+        Set fields of a hash keeping the other fields, so that several
+        writers can share the same key
+
+        Args:
+            key (str): identifier
+            values (dict): field values to store
+            expire (int): time in seconds for expiration of the whole hash
+        """
+        if not values:
+            return
+        self._verify_connection()
+
+        with self._conn.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping=values)
             if expire:
-                self._conn.expire(key, expire)
-        elif value is None:
-            self._conn.delete(key)
-        else:
-            self._conn.set(key, value, ex=expire)
-    # set()
+                pipe.expire(key, expire)
+            pipe.execute()
+    # set_fields()
+
+    def wait_change(self, key, value, timeout, interval=WAIT_POLL_INTERVAL):
+        """
+        Wait until the value stored for a key differs from the given one.
+
+        Used by long-poll requests, which this way only access the mediator
+        while waiting.
+
+        Args:
+            key (str): identifier
+            value (Union[str,list,dict,None]): value known by the caller
+            timeout (float): maximum time in seconds to wait
+            interval (float): time in seconds between checks
+
+        Returns:
+            Union[str,dict,list,None]: current value, which is equal to the
+                                       given one if timeout was reached
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            current = self.get(key)
+            remaining = deadline - time.monotonic()
+            if current != value or remaining <= 0:
+                return current
+            time.sleep(min(interval, remaining))
+    # wait_change()
 
 # _Mediator()
 
@@ -0,0 +1,440 @@
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+In-memory counters, gauges, histograms and summaries exported in the
+prometheus text format
+"""
+
+#
+# IMPORTS
+#
+from contextlib import contextmanager
+from threading import Lock
+
+import math
+import time
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+# upper bounds of the buckets for durations in seconds
+TIME_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+                30, 60)
+
+# upper bounds of the buckets for sizes in bytes
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304,
+                16777216)
+
+# upper bounds of the buckets for small quantities (i.e. statements)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# quantiles reported by summaries
+QUANTILES = (0.5, 0.9, 0.99)
+
+# number of most recent observations from which summary quantiles are
+# calculated
+SUMMARY_WINDOW = 1000
+
+COUNTER = 'counter'
+GAUGE = 'gauge'
+HISTOGRAM = 'histogram'
+SUMMARY = 'summary'
+
+#
+# CODE
+#
+
+
+def _format_labels(labels, extra=None):
+    """
+    Format labels in the exposition format
+
+    Args:
+        labels (list): label name and value pairs
+        extra (tuple): additional pair appended to the labels
+
+    Returns:
+        str: labels enclosed in braces or empty string if there are none
+    """
+    pairs = list(labels)
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(
+        '{}="{}"'.format(name, str(value).replace('\\', r'\\').replace(
+            '"', r'\"').replace('\n', r'\n'))
+        for name, value in pairs) + '}'
+# _format_labels()
+
+
+def _format_value(value):
+    """
+    Format a sample value, integers are printed without decimals
+
+    Args:
+        value (float): sample value
+
+    Returns:
+        str: formatted value
+    """
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+# _format_value()
+
+
+def _quantile(samples, quantile):
+    """
+    Calculate a quantile by the nearest rank method
+
+    Args:
+        samples (list): sorted observations
+        quantile (float): between 0 and 1
+
+    Returns:
+        float: observation at the quantile position
+    """
+    position = max(0, math.ceil(quantile * len(samples)) - 1)
+    return samples[position]
+# _quantile()
+
+
+def _copy_value(value):
+    """
+    Copy a metric value so that snapshots do not share lists with the
+    registry
+
+    Args:
+        value (Union[float,list]): value as stored in the registry
+
+    Returns:
+        Union[float,list]: copied value
+    """
+    if not isinstance(value, list):
+        return value
+    return [_copy_value(item) for item in value]
+# _copy_value()
+
+
+class Registry:
+    """
+    Thread safe set of metrics. Values can be exchanged between processes as
+    snapshots (json serializable dicts) which are merged before rendering.
+    """
+
+    def __init__(self):
+        """
+        Constructor, starts without metrics
+        """
+        # metric definitions by name, each one a dict with keys 'type',
+        # 'help', 'buckets' and 'values'. Values are keyed by a tuple of
+        # label pairs; histogram values are lists with the count of each
+        # bucket followed by the count of the +Inf bucket and the sum;
+        # summary values are lists with the count, the sum and the most
+        # recent observations.
+        self._metrics = {}
+        self._lock = Lock()
+    # __init__()
+
+    def _define(self, name, metric_type, help_text, buckets=None):
+        """
+        Add a metric definition
+
+        Args:
+            name (str): metric name
+            metric_type (str): COUNTER or HISTOGRAM
+            help_text (str): description of the metric
+            buckets (tuple): bucket upper bounds for histograms
+
+        Raises:
+            ValueError: if a metric with the same name exists
+        """
+        if name in self._metrics:
+            raise ValueError('Metric {} already defined'.format(name))
+        self._metrics[name] = {
+            'type': metric_type,
+            'help': help_text,
+            'buckets': list(buckets or ()),
+            'values': {},
+        }
+    # _define()
+
+    def counter(self, name, help_text):
+        """
+        Define a counter
+
+        Args:
+            name (str): metric name
+            help_text (str): description of the metric
+        """
+        self._define(name, COUNTER, help_text)
+    # counter()
+
+    def gauge(self, name, help_text):
+        """
+        Define a gauge
+
+        Args:
+            name (str): metric name
+            help_text (str): description of the metric
+        """
+        self._define(name, GAUGE, help_text)
+    # gauge()
+
+    def histogram(self, name, help_text, buckets=TIME_BUCKETS):
+        """
+        Define a histogram
+
+        Args:
+            name (str): metric name
+            help_text (str): description of the metric
+            buckets (tuple): sorted bucket upper bounds
+        """
+        self._define(name, HISTOGRAM, help_text, buckets)
+    # histogram()
+
+    def summary(self, name, help_text):
+        """
+        Define a summary, which reports quantiles of the recent observations
+
+        Args:
+            name (str): metric name
+            help_text (str): description of the metric
+        """
+        self._define(name, SUMMARY, help_text)
+    # summary()
+
+    def clear(self, name):
+        """
+        Remove all values of a metric, i.e. of a gauge whose label values
+        are not current anymore
+
+        Args:
+            name (str): metric name
+        """
+        with self._lock:
+            self._metrics[name]['values'].clear()
+    # clear()
+
+    def inc(self, name, labels=None, value=1):
+        """
+        Increment a counter
+
+        Args:
+            name (str): metric name
+            labels (dict): label values
+            value (float): amount to add
+        """
+        key = tuple(sorted((labels or {}).items()))
+        values = self._metrics[name]['values']
+        with self._lock:
+            values[key] = values.get(key, 0) + value
+    # inc()
+
+    def set(self, name, value, labels=None):
+        """
+        Set the value of a gauge
+
+        Args:
+            name (str): metric name
+            value (float): current value
+            labels (dict): label values
+        """
+        key = tuple(sorted((labels or {}).items()))
+        values = self._metrics[name]['values']
+        with self._lock:
+            values[key] = value
+    # set()
+
+    def observe(self, name, value, labels=None):
+        """
+        Add an observation to a histogram or summary
+
+        Args:
+            name (str): metric name
+            value (float): observed value
+            labels (dict): label values
+        """
+        key = tuple(sorted((labels or {}).items()))
+        metric = self._metrics[name]
+        if metric['type'] == SUMMARY:
+            with self._lock:
+                count, total, samples = metric['values'].get(
+                    key, (0, 0, []))
+                samples.append(value)
+                metric['values'][key] = [
+                    count + 1, total + value, samples[-SUMMARY_WINDOW:]]
+            return
+
+        buckets = metric['buckets']
+        # first bucket which fits the value, the last position is +Inf
+        index = len(buckets)
+        for pos, bound in enumerate(buckets):
+            if value <= bound:
+                index = pos
+                break
+        with self._lock:
+            counts = metric['values'].get(key)
+            if counts is None:
+                counts = metric['values'][key] = [0] * (len(buckets) + 2)
+            counts[index] += 1
+            counts[-1] += value
+    # observe()
+
+    @contextmanager
+    def time(self, name, labels=None):
+        """
+        Observe the duration in seconds of the enclosed block, including
+        when it raises an exception
+
+        Args:
+            name (str): metric name
+            labels (dict): label values
+
+        Yields:
+            None
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, labels)
+    # time()
+
+    def snapshot(self):
+        """
+        Copy the current values in a json serializable format
+
+        Returns:
+            dict: metrics keyed by name, values as lists of label pairs and
+                  value
+        """
+        with self._lock:
+            return {
+                name: {
+                    'type': metric['type'],
+                    'help': metric['help'],
+                    'buckets': metric['buckets'],
+                    'values': [
+                        [[list(pair) for pair in key], _copy_value(value)]
+                        for key, value in metric['values'].items()],
+                }
+                for name, metric in self._metrics.items()
+            }
+    # snapshot()
+
+    @staticmethod
+    def merge(snapshots):
+        """
+        Sum the values of several snapshots, i.e. from different processes
+
+        Args:
+            snapshots (list): snapshots as returned by snapshot()
+
+        Returns:
+            dict: merged snapshot
+        """
+        merged = {}
+        for snapshot in snapshots:
+            for name, metric in snapshot.items():
+                target = merged.setdefault(name, {
+                    'type': metric['type'],
+                    'help': metric['help'],
+                    'buckets': metric['buckets'],
+                    'values': {},
+                })
+                # definition changed between versions: keep the first one
+                if target['buckets'] != metric['buckets']:
+                    continue
+                for labels, value in metric['values']:
+                    key = tuple(tuple(pair) for pair in labels)
+                    current = target['values'].get(key)
+                    if current is None:
+                        target['values'][key] = _copy_value(value)
+                    elif metric['type'] == SUMMARY:
+                        target['values'][key] = [
+                            current[0] + value[0], current[1] + value[1],
+                            (current[2] + value[2])[-SUMMARY_WINDOW:]]
+                    elif metric['type'] == GAUGE:
+                        # gauges of several processes are added, i.e. the
+                        # jobs waiting in each one
+                        target['values'][key] = current + value
+                    elif isinstance(value, list):
+                        target['values'][key] = [
+                            first + second
+                            for first, second in zip(current, value)]
+                    else:
+                        target['values'][key] = current + value
+
+        for metric in merged.values():
+            metric['values'] = [
+                [[list(pair) for pair in key], value]
+                for key, value in metric['values'].items()]
+        return merged
+    # merge()
+
+    @staticmethod
+    def render(snapshot):
+        """
+        Render a snapshot in the prometheus text exposition format
+
+        Args:
+            snapshot (dict): snapshot as returned by snapshot() or merge()
+
+        Returns:
+            str: metrics in text format
+        """
+        lines = []
+        for name in sorted(snapshot):
+            metric = snapshot[name]
+            lines.append('# HELP {} {}'.format(name, metric['help']))
+            lines.append('# TYPE {} {}'.format(name, metric['type']))
+            for labels, value in sorted(metric['values']):
+                labels = [tuple(pair) for pair in labels]
+                if metric['type'] in (COUNTER, GAUGE):
+                    lines.append('{}{} {}'.format(
+                        name, _format_labels(labels), _format_value(value)))
+                    continue
+                if metric['type'] == SUMMARY:
+                    count, total, samples = value
+                    samples = sorted(samples)
+                    for quantile in QUANTILES if samples else ():
+                        lines.append('{}{} {}'.format(
+                            name,
+                            _format_labels(labels, ('quantile', quantile)),
+                            _format_value(_quantile(samples, quantile))))
+                    lines.append('{}_sum{} {}'.format(
+                        name, _format_labels(labels), _format_value(total)))
+                    lines.append('{}_count{} {}'.format(
+                        name, _format_labels(labels), count))
+                    continue
+
+                cumulative = 0
+                bounds = metric['buckets'] + ['+Inf']
+                for bound, count in zip(bounds, value[:-1]):
+                    cumulative += count
+                    if bound != '+Inf':
+                        bound = _format_value(bound)
+                    lines.append('{}_bucket{} {}'.format(
+                        name, _format_labels(labels, ('le', bound)),
+                        cumulative))
+                lines.append('{}_sum{} {}'.format(
+                    name, _format_labels(labels), _format_value(value[-1])))
+                lines.append('{}_count{} {}'.format(
+                    name, _format_labels(labels), cumulative))
+        return '\n'.join(lines) + '\n'
+    # render()
+# Registry
@@ -0,0 +1,210 @@
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Disk cache for artifacts derived from the output of finished jobs
+"""
+
+#
+# IMPORTS
+#
+from tempfile import NamedTemporaryFile
+from tessia.server.config import CONF
+
+import hashlib
+import logging
+import os
+import shutil
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+# default cache size cap in MiB
+DEFAULT_MAX_SIZE = 512
+
+#
+# CODE
+#
+
+
+class _OutputCache:
+    """
+    Least recently used cache of compressed job artifacts stored on disk.
+
+    The output files of a finished job do not change anymore, so artifacts
+    produced from them (gzipped output, tarballs, json payloads) can be
+    stored once and served many times. Entries are identified by keys derived
+    from a strong etag of the source files, which means a stale entry is
+    never served: if a source file changes its etag changes too. The access
+    time of an entry is tracked by its mtime, which allows several API
+    processes to share the same cache directory.
+    """
+
+    def __init__(self):
+        """
+        Constructor, configuration is only read on first usage
+        """
+        self._cache_dir = None
+        self._max_size = None
+        self._logger = logging.getLogger(__name__)
+    # __init__()
+
+    def _evict(self):
+        """
+        Remove least recently used entries until the cache fits in its size
+        cap
+        """
+        entries = []
+        total_size = 0
+        with os.scandir(self._cache_dir) as dir_it:
+            for entry in dir_it:
+                # files being written by other processes are not entries yet
+                if entry.name.startswith('.tmp-'):
+                    continue
+                try:
+                    entry_stat = entry.stat()
+                # entry removed by another process in the meantime
+                except FileNotFoundError:
+                    continue
+                entries.append(
+                    (entry_stat.st_mtime, entry_stat.st_size, entry.path))
+                total_size += entry_stat.st_size
+
+        # oldest entries go first
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= self._max_size:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_size -= size
+    # _evict()
+
+    def _load_config(self):
+        """
+        Read the cache configuration from the server configuration file
+
+        Returns:
+            bool: True if cache is enabled, False otherwise
+        """
+        if self._cache_dir is not None:
+            return bool(self._cache_dir)
+
+        try:
+            cache_conf = CONF.get_config().get(
+                'scheduler')['output_cache']
+        except (TypeError, KeyError):
+            cache_conf = None
+        # no configuration present: cache is disabled
+        if not cache_conf or not cache_conf.get('dir'):
+            self._cache_dir = ''
+            return False
+
+        self._cache_dir = cache_conf['dir']
+        self._max_size = int(cache_conf.get(
+            'max_size', DEFAULT_MAX_SIZE)) * 1024 * 1024
+        os.makedirs(self._cache_dir, exist_ok=True)
+        return True
+    # _load_config()
+
+    @staticmethod
+    def compute_etag(paths, *extra):
+        """
+        Compute a strong etag for the content of the given files based on
+        their size and modification time.
+
+        Args:
+            paths (list): paths to the source files
+            extra (any): additional values that affect the derived content
+                         (i.e. encoding or slicing parameters)
+
+        Returns:
+            str: etag value
+
+        Raises:
+            FileNotFoundError: if one of the files does not exist
+        """
+        digest = hashlib.sha256()
+        for path in sorted(str(path) for path in paths):
+            file_stat = os.stat(path)
+            digest.update('{}:{}:{};'.format(
+                path, file_stat.st_size,
+                file_stat.st_mtime_ns).encode('utf-8'))
+        digest.update(repr(extra).encode('utf-8'))
+        return digest.hexdigest()[:32]
+    # compute_etag()
+
+    def open(self, key, producer):
+        """
+        Open the artifact identified by key, creating it on a cache miss.
+
+        Args:
+            key (str): artifact identifier, usually etag plus a suffix
+            producer (callable): returns a readable binary stream with the
+                                 artifact content
+
+        Returns:
+            tuple: (readable binary file object, content size), the size is
+                   None when the cache is disabled
+        """
+        # cache disabled: stream the content from the producer, its size is
+        # not known in advance
+        if not self._load_config():
+            return producer(), None
+
+        path = os.path.join(self._cache_dir, key)
+        try:
+            file_obj = open(path, 'rb')  # pylint: disable=consider-using-with
+        except FileNotFoundError:
+            file_obj = None
+        # cache hit: refresh access time used for eviction
+        if file_obj:
+            try:
+                os.utime(path)
+            # entry evicted in the meantime, descriptor is still valid
+            except FileNotFoundError:
+                pass
+            return file_obj, os.fstat(file_obj.fileno()).st_size
+
+        # write to a temporary file first so that concurrent readers never
+        # see a partial entry
+        # pylint: disable=consider-using-with
+        temp_file = NamedTemporaryFile(
+            dir=self._cache_dir, prefix='.tmp-', delete=False)
+        try:
+            stream = producer()
+            try:
+                shutil.copyfileobj(stream, temp_file)
+            finally:
+                stream.close()
+            temp_file.flush()
+        except Exception:
+            temp_file.close()
+            os.remove(temp_file.name)
+            raise
+        os.replace(temp_file.name, path)
+        self._logger.debug('Stored artifact %s in output cache', key)
+        self._evict()
+
+        # the open descriptor stays valid even if the entry gets evicted
+        temp_file.seek(0)
+        return temp_file, os.fstat(temp_file.fileno()).st_size
+    # open()
+
+# _OutputCache
+
+
+OUTPUT_CACHE = _OutputCache()
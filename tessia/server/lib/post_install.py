@@ -13,24 +13,27 @@
 # limitations under the License.
 
 """
-Post installation verification using ansible tool
+Post installation verification using ansible and ssh
 """
 
 #
 # IMPORTS
 #
+from base64 import b64encode
 from collections import OrderedDict
 from copy import deepcopy
 from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 from pprint import pformat
 from tempfile import NamedTemporaryFile
+from tessia.baselib.common.ssh.client import SshClient
 
 import ipaddress
 import json
 import logging
 import os
 import re
+import shlex
 import subprocess
 
 #
@@ -45,6 +48,27 @@ UNIT_TABLE = {
     't': lambda size: int(size * 1024 * 1024),
 }
 
+# commands executed on the target system to collect the facts not provided
+# by ansible, in addition to the per disk commands
+FACT_COMMANDS = (
+    ('lszfcp', 'lszfcp -D'),
+    ('os_release', 'cat /etc/os-release'),
+    ('lscpu', 'lscpu'),
+    ('lsmem_bytes', 'lsmem -b'),
+    ('lsmem', 'lsmem'),
+    ('resolv_path', 'realpath /etc/resolv.conf'),
+    ('resolv_conf', 'cat /run/systemd/resolve/resolv.conf'),
+    ('lsdasd', 'lsdasd'),
+    ('cmdline', 'cat /proc/cmdline'),
+)
+# delimits the output of each command executed by the facts script
+SCRIPT_MARKER = '@@tessia-facts@@'
+# max time in seconds to wait for the facts script to finish
+SCRIPT_TIMEOUT = 300
+# max length of each piece of the encoded facts script sent to the shell,
+# well below the line limit of the terminal (4 KiB)
+SCRIPT_CHUNK_SIZE = 1024
+
 #
 # CODE
 #
@@ -128,6 +152,7 @@ class PostInstallChecker:
 
         # fetched at verification time
         self._facts = None
+        self._cmd_outputs = None
 
         # collected mismatches
         self._mismatches = []
@@ -202,6 +227,83 @@ class PostInstallChecker:
         return cmd_output
     # _exec_ansible()
 
+    def _exec_script(self, commands):
+        """
+        Run several commands on the target system over a single ssh session
+        and collect the output of each of them.
+
+        The commands are bundled in one shell script which prints a marker
+        line before and after the output of each command, the closing marker
+        carrying the command's exit code.
+
+        Args:
+            commands (list): tuples (name, command) to execute
+
+        Returns:
+            dict: name of each command as key, tuple (exit code, output) as
+                  value
+
+        Raises:
+            ConnectionError: if ssh connection can't be established
+            SystemError: if script can't be transferred or its output
+                         can't be parsed
+        """
+        script_lines = [
+            'export LC_ALL=C',
+            '_section() {',
+            '    echo "{} begin $1"'.format(SCRIPT_MARKER),
+            '    eval "$2" 2>&1',
+            "    printf '\\n%s end %s\\n' '{}' \"$?\"".format(SCRIPT_MARKER),
+            '}',
+        ]
+        for name, cmd in commands:
+            script_lines.append('_section {} {}'.format(
+                shlex.quote(name), shlex.quote(cmd)))
+        # transfer script encoded so that the interactive shell does not
+        # interpret any of its content, in pieces appended to a temporary
+        # file as a single line would exceed the line limit of the terminal
+        # when there are many volumes
+        encoded_script = b64encode(
+            '\n'.join(script_lines).encode('utf-8')).decode('ascii')
+        transfer_cmds = ['_facts=$(mktemp)']
+        for start in range(0, len(encoded_script), SCRIPT_CHUNK_SIZE):
+            transfer_cmds.append('printf %s {} >> "$_facts"'.format(
+                encoded_script[start:start + SCRIPT_CHUNK_SIZE]))
+
+        ssh_client = SshClient()
+        try:
+            ssh_client.login(
+                self._hostname, user=self._user, passwd=self._passwd)
+            shell = ssh_client.open_shell()
+        except (ConnectionError, PermissionError) as exc:
+            raise ConnectionError(
+                'Connection failed: {}'.format(str(exc))) from exc
+        try:
+            for cmd in transfer_cmds:
+                ret, output = shell.run(cmd)
+                if ret != 0:
+                    raise SystemError(
+                        'Could not transfer script: {}'.format(output))
+            ret, output = shell.run(
+                'base64 -d "$_facts" | sh; _ret=$?; rm -f "$_facts"; '
+                '(exit $_ret)', timeout=SCRIPT_TIMEOUT)
+        finally:
+            ssh_client.logoff()
+
+        output = output.replace('\r\n', '\n')
+        results = {}
+        for match in re.finditer(
+                r'^{0} begin (\S+)\n(.*?)\n{0} end (\d+)$'.format(
+                    re.escape(SCRIPT_MARKER)),
+                output, re.MULTILINE | re.DOTALL):
+            results[match.group(1)] = (int(match.group(3)), match.group(2))
+        if ret != 0 or len(results) != len(commands):
+            raise SystemError(
+                'Could not parse command output: {}'.format(output))
+
+        return results
+    # _exec_script()
+
     def _fetch_alias(self):
         """
         Get DASD alias information from a target instance.
@@ -210,8 +312,7 @@ class PostInstallChecker:
             list: a list with all aliases
         """
         try:
-            alias_entries = self._exec_ansible(
-                'command', 'lsdasd').splitlines()
+            alias_entries = self._get_output('lsdasd').splitlines()
         except RuntimeError:
             return {}
 
@@ -226,6 +327,10 @@ class PostInstallChecker:
         """
         Get and store 'ansible facts' from a target instance.
 
+        The general facts come from ansible's setup module while the
+        additional information not provided by it is collected by a single
+        script executed over one ssh session.
+
         Raises:
             ConnectionError: if connection to the system cannot be established
             SystemError: in case ansible output can't be parsed
@@ -245,18 +350,36 @@ class PostInstallChecker:
         # in the DASD case the entries are by kernel device name which cannot
         # be matched with our channel based device name. Therefore we create
         # additional entries with the necessary information.
+        commands = []
         for svol in self._expected_params['storage']:
             devpath = svol['devpath']
-
             # dasd alias: collected later with lsdasd
             if svol['type'] == 'HPAV':
                 continue
-
+            quoted_path = shlex.quote(devpath)
             # no partition table defined: just verify disk presence
+            if not svol['part_table']:
+                commands.append(
+                    ('exists:' + devpath, '[ -e {} ]'.format(quoted_path)))
+                continue
+            commands.append((
+                'parted:' + devpath,
+                'parted -s -m {} unit B print'.format(quoted_path)))
+            commands.append((
+                'lsblk:' + devpath,
+                'lsblk --raw --noheadings --output FSTYPE,MOUNTPOINT {}'
+                .format(quoted_path)))
+        commands.extend(FACT_COMMANDS)
+        self._cmd_outputs = self._exec_script(commands)
+
+        for svol in self._expected_params['storage']:
+            devpath = svol['devpath']
+            if svol['type'] == 'HPAV':
+                continue
+
             if not svol['part_table']:
                 try:
-                    self._exec_ansible(
-                        'command', '[ -e {} ]'.format(devpath))
+                    self._get_output('exists:' + devpath)
                 except RuntimeError:
                     self._logger.debug('Failed to check presence of disk %s:',
                                        devpath, exc_info=True)
@@ -265,29 +388,21 @@ class PostInstallChecker:
                 continue
 
             try:
-                parted_output = self._exec_ansible(
-                    'community.general.parted',
-                    'device={} unit=B state=info'.format(devpath)
-                    )
+                parted_output = self._get_output('parted:' + devpath)
             except RuntimeError:
                 self._logger.debug('Failed to fetch info for disk %s:',
                                    devpath, exc_info=True)
                 continue
-
-            try:
-                parted_json = json.loads(parted_output)
-            # should not happen as ansible output is stable
-            except Exception as exc:
-                raise SystemError(
-                    'Could not parse parted output of disk {}: {}'.format(
-                        devpath, str(exc)))
+            parted_json = self._parse_parted(devpath, parted_output)
 
             # fetch mount point information
-            lsblk_lines = self._exec_ansible(
-                'command',
-                'lsblk --raw --noheadings --output FSTYPE,MOUNTPOINT {}'
-                .format(devpath)
-            ).strip().splitlines()
+            try:
+                lsblk_lines = self._get_output(
+                    'lsblk:' + devpath).strip().splitlines()
+            except RuntimeError:
+                self._logger.debug('Failed to fetch mount points of disk %s:',
+                                   devpath, exc_info=True)
+                lsblk_lines = []
             for i in range(0, len(parted_json['partitions'])):
                 try:
                     line_fields = lsblk_lines[i].strip().split()
@@ -350,8 +465,7 @@ class PostInstallChecker:
             list: a list with all FCP entries or None if no FCP configured
         """
         try:
-            fcp_entries = self._exec_ansible(
-                'command', 'lszfcp -D').splitlines()
+            fcp_entries = self._get_output('lszfcp').splitlines()
         # no fcp available/configured on the system
         except RuntimeError:
             return None
@@ -377,11 +491,11 @@ class PostInstallChecker:
 
         # try first the newer lsmem version which can provide size in bytes
         try:
-            output = self._exec_ansible('command', 'lsmem -b')
+            output = self._get_output('lsmem_bytes')
             regex = r'Total online memory\s*:\s*(\d+)'
         except RuntimeError:
             try:
-                output = self._exec_ansible('command', 'lsmem')
+                output = self._get_output('lsmem')
                 regex = r'Total online memory\s*:\s*(\d+)\s*(B|K|M|G|T)'
             except RuntimeError as exc:
                 self._logger.warning(
@@ -407,7 +521,7 @@ class PostInstallChecker:
         """
         Extract the kernel cmdline string
         """
-        file_content = self._exec_ansible('command', 'cat /proc/cmdline')
+        file_content = self._get_output('cmdline')
         return file_content.strip()
     # _fetch_kernel_cmdline()
 
@@ -415,7 +529,7 @@ class PostInstallChecker:
         """
         Extract pretty name from standard os-release file
         """
-        file_content = self._exec_ansible('command', 'cat /etc/os-release')
+        file_content = self._get_output('os_release')
         for line in file_content.splitlines():
             match = re.search('^PRETTY_NAME=(.*)', line)
             if match:
@@ -429,7 +543,7 @@ class PostInstallChecker:
         Extract the number of threads per core (smt enabled/disabled)
         """
         try:
-            lscpu_lines = self._exec_ansible('command', "lscpu")
+            lscpu_lines = self._get_output('lscpu')
         except RuntimeError:
             return 1
         for line in lscpu_lines.splitlines():
@@ -444,8 +558,7 @@ class PostInstallChecker:
         Extract the DNS servers configured in systemd-resolve
         """
         try:
-            resolv_path = self._exec_ansible(
-                'command', "realpath /etc/resolv.conf").strip()
+            resolv_path = self._get_output('resolv_path').strip()
         except RuntimeError:
             self._logger.debug("could not resolve symlink of resolv.conf:",
                                exc_info=True)
@@ -457,8 +570,7 @@ class PostInstallChecker:
 
         # collect nameservers from resolv.conf generated by systemd
         try:
-            file_content = self._exec_ansible(
-                'command', 'cat /run/systemd/resolve/resolv.conf')
+            file_content = self._get_output('resolv_conf')
         except RuntimeError:
             self._logger.debug(
                 "could not read /run/systemd/resolve/resolv.conf:",
@@ -477,6 +589,27 @@ class PostInstallChecker:
         return servers
     # _fetch_systemd_dns()
 
+    def _get_output(self, name):
+        """
+        Return the output of a command executed by the facts script
+
+        Args:
+            name (str): command name
+
+        Returns:
+            str: command output
+
+        Raises:
+            RuntimeError: if command failed
+        """
+        ret, output = self._cmd_outputs[name]
+        if ret != 0:
+            raise RuntimeError(
+                'Command {} failed with exit code {}, output: {}'.format(
+                    name, ret, output))
+        return output
+    # _get_output()
+
     def _pass_or_report(self, param_name, expected_value, actual_value):
         """
         Helper method, compare required parameter with actual one and raise
@@ -881,6 +1014,63 @@ class PostInstallChecker:
         return svol
     # _parse_obj_svol()
 
+    @staticmethod
+    def _parse_parted(devpath, output):
+        """
+        Parse the machine readable output of parted into the same format
+        provided by ansible's parted module.
+
+        Args:
+            devpath (str): disk device path
+            output (str): output of 'parted -s -m <devpath> unit B print'
+
+        Returns:
+            dict: disk and partitions information
+
+        Raises:
+            SystemError: if output can't be parsed
+        """
+        lines = [line.strip().rstrip(';') for line in output.splitlines()]
+        try:
+            # skip any warnings printed before the unit line
+            start = lines.index('BYT')
+            disk_fields = lines[start + 1].split(':')
+            parted_json = {
+                'disk': {
+                    'dev': disk_fields[0],
+                    'size': float(disk_fields[1].rstrip('B')),
+                    'logical_block': int(disk_fields[3]),
+                    'physical_block': int(disk_fields[4]),
+                    'table': disk_fields[5],
+                    'model': disk_fields[6],
+                    'unit': 'b',
+                },
+                'partitions': [],
+            }
+            for line in lines[start + 2:]:
+                if not line:
+                    continue
+                part_fields = line.split(':')
+                parted_json['partitions'].append({
+                    'num': int(part_fields[0]),
+                    'begin': float(part_fields[1].rstrip('B')),
+                    'end': float(part_fields[2].rstrip('B')),
+                    'size': float(part_fields[3].rstrip('B')),
+                    'fstype': part_fields[4],
+                    'name': part_fields[5],
+                    'flags': [flag.strip()
+                              for flag in part_fields[6].split(',')
+                              if flag.strip()],
+                    'unit': 'b',
+                })
+        except (IndexError, ValueError) as exc:
+            raise SystemError(
+                'Could not parse parted output of disk {}: {}'.format(
+                    devpath, str(exc)))
+
+        return parted_json
+    # _parse_parted()
+
     def _report(self, *args, **kwargs):
         """
         Log a misconfiguration warning if permissive is false, raise
@@ -0,0 +1,540 @@
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Disk cache for the source repositories used by the ansible and tela jobs
+"""
+
+#
+# IMPORTS
+#
+from tempfile import NamedTemporaryFile
+from tessia.server.config import CONF
+from urllib.parse import urlsplit, urlunsplit
+
+import fcntl
+import hashlib
+import logging
+import os
+import re
+import requests
+import shutil
+import subprocess
+import tarfile
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+# default cache size cap in MiB
+DEFAULT_MAX_SIZE = 2048
+# max allowed size for web source files
+MAX_WEB_MB_SIZE = 100
+# timeout in seconds for git network operations
+GIT_TIMEOUT = 600
+# user id of the unprivileged user in the executor images
+OWNER_UID = 1000
+# full commit ids can be looked up without contacting the remote
+COMMIT_ID_REGEX = re.compile('^[0-9a-f]{40}$')
+
+#
+# CODE
+#
+
+
+class _RepoCache:
+    """
+    Least recently used cache of repository contents stored on disk.
+
+    Git repositories are kept as bare mirrors which are updated
+    incrementally, and the content of each commit used by a job is stored as
+    a tar archive keyed by the repository url and the resolved commit id.
+    Web tarballs are stored keyed by the url and the ETag returned by the
+    server. Archives are ready to be uploaded to the executor containers,
+    with the files owned by the unprivileged user of the image, so that jobs
+    running the same revision do not download it again.
+    """
+
+    def __init__(self):
+        """
+        Constructor, configuration is only read on first usage
+        """
+        self._cache_dir = None
+        self._max_size = None
+        self._logger = logging.getLogger(__name__)
+    # __init__()
+
+    @staticmethod
+    def _dir_size(path):
+        """
+        Return the size of the files in a directory tree
+
+        Args:
+            path (str): directory path
+
+        Returns:
+            int: size in bytes
+        """
+        total_size = 0
+        for dir_path, _, file_names in os.walk(path):
+            for file_name in file_names:
+                try:
+                    total_size += os.lstat(
+                        os.path.join(dir_path, file_name)).st_size
+                except FileNotFoundError:
+                    pass
+        return total_size
+    # _dir_size()
+
+    def _evict(self, keep):
+        """
+        Remove least recently used entries until the cache fits in its size
+        cap
+
+        Args:
+            keep (str): path of the entry about to be used
+        """
+        entries = []
+        total_size = 0
+        with os.scandir(self._cache_dir) as dir_it:
+            for entry in dir_it:
+                # files being written by other processes are not entries yet
+                if (entry.name.startswith('.tmp-') or
+                        entry.name.endswith('.lock')):
+                    continue
+                try:
+                    entry_stat = entry.stat()
+                    if entry.is_dir():
+                        size = self._dir_size(entry.path)
+                    else:
+                        size = entry_stat.st_size
+                # entry removed by another process in the meantime
+                except FileNotFoundError:
+                    continue
+                entries.append((entry_stat.st_mtime, size, entry.path))
+                total_size += size
+
+        # oldest entries go first
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= self._max_size:
+                break
+            if path == keep:
+                continue
+            if os.path.isdir(path):
+                # mirror being fetched by another job: leave it
+                with open(path + '.lock', 'a') as lock_fd:
+                    try:
+                        fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except BlockingIOError:
+                        continue
+                    shutil.rmtree(path, ignore_errors=True)
+            else:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            total_size -= size
+    # _evict()
+
+    @staticmethod
+    def _key(*parts):
+        """
+        Return an entry name for the given values
+
+        Args:
+            parts (str): values identifying the entry
+
+        Returns:
+            str: entry name
+        """
+        return hashlib.sha256(
+            '\0'.join(parts).encode('utf-8')).hexdigest()[:32]
+    # _key()
+
+    def _load_config(self):
+        """
+        Read the cache configuration from the server configuration file
+
+        Returns:
+            bool: True if cache is enabled, False otherwise
+        """
+        if self._cache_dir is not None:
+            return bool(self._cache_dir)
+
+        try:
+            cache_conf = CONF.get_config().get(
+                'scheduler')['repo_cache']
+        except (TypeError, KeyError):
+            cache_conf = None
+        # no configuration present: cache is disabled
+        if not cache_conf or not cache_conf.get('dir'):
+            self._cache_dir = ''
+            return False
+
+        self._cache_dir = cache_conf['dir']
+        self._max_size = int(cache_conf.get(
+            'max_size', DEFAULT_MAX_SIZE)) * 1024 * 1024
+        os.makedirs(self._cache_dir, exist_ok=True)
+        return True
+    # _load_config()
+
+    @staticmethod
+    def _parse_url(repo_url):
+        """
+        Parse a repository url in the format accepted by the downloader
+        of the executor images.
+
+        Args:
+            repo_url (str): repository network url
+
+        Returns:
+            dict: url, obfuscated url, type, git branch and git commit
+
+        Raises:
+            ValueError: if url is not supported
+        """
+        parsed_url = urlsplit(repo_url)
+        if not parsed_url.netloc:
+            raise ValueError('Invalid URL')
+
+        try:
+            _, host_name = parsed_url.netloc.rsplit('@', 1)
+        except ValueError:
+            url_obs = parsed_url.geturl()
+        else:
+            repo_parts = [*parsed_url]
+            repo_parts[1] = '{}@{}'.format('****', host_name)
+            url_obs = urlunsplit(repo_parts)
+
+        repo = {
+            'url': repo_url,
+            'url_obs': url_obs,
+            'git_branch': None,
+            'git_commit': 'HEAD',
+        }
+        http_protocols = ('http', 'https')
+        if parsed_url.scheme == 'git' or (
+                parsed_url.scheme in http_protocols and
+                (parsed_url.path.endswith('.git') or
+                 '.git@' in parsed_url.path)):
+            repo['type'] = 'git'
+            try:
+                _, git_rev = parsed_url.path.rsplit('@', 1)
+            except ValueError:
+                return repo
+            repo['url'] = parsed_url.geturl().replace('@' + git_rev, '')
+            repo['git_branch'] = git_rev
+            try:
+                repo['git_branch'], repo['git_commit'] = git_rev.rsplit(
+                    ':', 1)
+            except ValueError:
+                pass
+        elif parsed_url.scheme in http_protocols:
+            repo['type'] = 'web'
+        else:
+            raise ValueError('Unsupported source url')
+
+        return repo
+    # _parse_url()
+
+    def _run_git(self, repo, args):
+        """
+        Run a git command
+
+        Args:
+            repo (dict): parsed repository url
+            args (list): git arguments
+
+        Returns:
+            str: command output
+
+        Raises:
+            RuntimeError: if command fails
+        """
+        process_env = os.environ.copy()
+        process_env['GIT_SSL_NO_VERIFY'] = 'true'
+        process_env['GIT_TERMINAL_PROMPT'] = '0'
+        try:
+            result = subprocess.run(
+                ['git'] + args,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                env=process_env,
+                check=True,
+                timeout=GIT_TIMEOUT,
+                universal_newlines=True
+            )
+        except subprocess.CalledProcessError as exc:
+            # re-raise and suppress context, which has unscreened repo url
+            raise RuntimeError('git failed: {}'.format(
+                exc.stderr.replace(repo['url'], repo['url_obs']))) from None
+        except (subprocess.TimeoutExpired, OSError) as exc:
+            raise RuntimeError('git failed: {}'.format(
+                str(exc).replace(repo['url'], repo['url_obs']))) from None
+        return result.stdout
+    # _run_git()
+
+    def _resolve_branch(self, repo, default_branches):
+        """
+        Find the commit id at the tip of the branch to be used
+
+        Args:
+            repo (dict): parsed repository url
+            default_branches (tuple): branches to look for when none was
+                                      specified, None to use the default
+                                      branch of the remote
+
+        Returns:
+            str: commit id, None if the branch cannot be determined
+        """
+        # full ref names as ls-remote matches patterns by their ending
+        if repo['git_branch']:
+            args = ['ls-remote', repo['url'],
+                    'refs/heads/{}'.format(repo['git_branch'])]
+        elif default_branches:
+            args = ['ls-remote', repo['url']] + [
+                'refs/heads/{}'.format(branch) for branch in default_branches]
+        else:
+            args = ['ls-remote', repo['url'], 'HEAD']
+        reflist = self._run_git(repo, args).splitlines()
+        # ambiguous result is reported by the downloader
+        if len(reflist) != 1:
+            return None
+        return reflist[0].split('\t')[0]
+    # _resolve_branch()
+
+    def _store(self, path, stream, owner):
+        """
+        Store the content of a tar stream as an entry, with the files owned
+        by the given user.
+
+        Args:
+            path (str): entry path
+            stream (file): readable binary stream with a tar archive
+            owner (str): user name in the executor image
+
+        Raises:
+            ValueError: if archive contains paths outside of its root
+        """
+        # pylint: disable=consider-using-with
+        temp_file = NamedTemporaryFile(
+            dir=self._cache_dir, prefix='.tmp-', delete=False)
+        try:
+            with tarfile.open(fileobj=stream, mode='r|*') as src_tar, \
+                    tarfile.open(fileobj=temp_file, mode='w') as dst_tar:
+                for member in src_tar:
+                    name = os.path.normpath(member.name)
+                    if os.path.isabs(name) or name.split(os.sep)[0] == '..':
+                        raise ValueError(
+                            'Invalid path in archive: {}'.format(name))
+                    member.uid = member.gid = OWNER_UID
+                    member.uname = member.gname = owner
+                    dst_tar.addfile(
+                        member,
+                        src_tar.extractfile(member) if member.isreg()
+                        else None)
+            temp_file.close()
+        except Exception:
+            temp_file.close()
+            os.remove(temp_file.name)
+            raise
+        os.replace(temp_file.name, path)
+    # _store()
+
+    def _update_mirror(self, repo):
+        """
+        Create or update the bare mirror of a git repository
+
+        Args:
+            repo (dict): parsed repository url
+
+        Returns:
+            str: path to the mirror
+        """
+        mirror_path = os.path.join(
+            self._cache_dir, '{}.git'.format(self._key(repo['url'])))
+        # serialize jobs fetching the same repository
+        with open(mirror_path + '.lock', 'a') as lock_fd:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX)
+            if not os.path.isdir(mirror_path):
+                self._run_git(repo, ['init', '-q', '--bare', mirror_path])
+            # url is passed on each fetch so that credentials are not stored
+            self._run_git(repo, [
+                '--git-dir', mirror_path, 'fetch', '-q', '--prune',
+                '--force', repo['url'], '+refs/heads/*:refs/heads/*',
+                '+refs/tags/*:refs/tags/*'])
+            os.utime(mirror_path)
+        return mirror_path
+    # _update_mirror()
+
+    def _get_git(self, repo, owner, default_branches):
+        """
+        Return the archive of the commit requested for a git repository
+
+        Args:
+            repo (dict): parsed repository url
+            owner (str): user name in the executor image
+            default_branches (tuple): see _resolve_branch
+
+        Returns:
+            str: path to the archive, None if it cannot be determined
+        """
+        commit_id = None
+        if repo['git_commit'] == 'HEAD':
+            commit_id = self._resolve_branch(repo, default_branches)
+            if not commit_id:
+                return None
+        elif COMMIT_ID_REGEX.match(repo['git_commit']):
+            commit_id = repo['git_commit']
+
+        mirror_path = None
+        if not commit_id:
+            # tags and abbreviated ids are resolved in the mirror
+            mirror_path = self._update_mirror(repo)
+            try:
+                commit_id = self._run_git(repo, [
+                    '--git-dir', mirror_path, 'rev-parse', '--verify', '-q',
+                    '{}^{{commit}}'.format(repo['git_commit'])]).strip()
+            except RuntimeError:
+                return None
+
+        archive_path = os.path.join(self._cache_dir, '{}.tar'.format(
+            self._key(repo['url'], commit_id, owner)))
+        if self._touch(archive_path):
+            return archive_path
+
+        if not mirror_path:
+            mirror_path = self._update_mirror(repo)
+        self._logger.info('storing commit %s of %s in repository cache',
+                          commit_id, repo['url_obs'])
+        # pylint: disable=consider-using-with
+        proc = subprocess.Popen(
+            ['git', '--git-dir', mirror_path, 'archive', '--format=tar',
+             commit_id],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        try:
+            self._store(archive_path, proc.stdout, owner)
+        finally:
+            proc.stdout.close()
+            ret_code = proc.wait()
+        if ret_code != 0:
+            os.remove(archive_path)
+            raise RuntimeError('git archive failed for commit {}'.format(
+                commit_id))
+        return archive_path
+    # _get_git()
+
+    def _get_web(self, repo, owner):
+        """
+        Return the archive of a web tarball
+
+        Args:
+            repo (dict): parsed repository url
+            owner (str): user name in the executor image
+
+        Returns:
+            str: path to the archive, None if server provides no ETag
+        """
+        try:
+            resp = requests.head(
+                repo['url'], verify=False, timeout=5, allow_redirects=True)
+            resp.raise_for_status()
+        except requests.exceptions.RequestException:
+            # error is reported by the downloader
+            return None
+        etag = resp.headers.get('etag')
+        # only strong validators identify the content
+        if not etag or etag.startswith('W/'):
+            return None
+
+        archive_path = os.path.join(self._cache_dir, '{}.tar'.format(
+            self._key(repo['url'], etag, owner)))
+        if self._touch(archive_path):
+            return archive_path
+
+        self._logger.info('storing %s in repository cache', repo['url_obs'])
+        resp = requests.get(
+            repo['url'], stream=True, verify=False, timeout=5)
+        try:
+            resp.raise_for_status()
+            if (int(resp.headers.get('content-length', 0)) >
+                    MAX_WEB_MB_SIZE * 1024 * 1024):
+                return None
+            # content served with a different etag: do not store it under
+            # the key of another version
+            if resp.headers.get('etag') != etag:
+                return None
+            resp.raw.decode_content = True
+            self._store(archive_path, resp.raw, owner)
+        finally:
+            resp.close()
+        return archive_path
+    # _get_web()
+
+    @staticmethod
+    def _touch(path):
+        """
+        Refresh the access time of an entry used for eviction
+
+        Args:
+            path (str): entry path
+
+        Returns:
+            bool: True if entry exists, False otherwise
+        """
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return False
+        return True
+    # _touch()
+
+    def get_archive(self, repo_url, owner, default_branches=None):
+        """
+        Return a tar archive with the content of a repository, downloading
+        it on a cache miss. Any failure is logged and reported as a miss so
+        that the job falls back to the download in the container.
+
+        Args:
+            repo_url (str): repository url as accepted by the downloader
+            owner (str): user name in the executor image
+            default_branches (tuple): branches to look for when the url
+                                      specifies none, by default the
+                                      default branch of the remote is used
+
+        Returns:
+            str: path to the archive, None if not available
+        """
+        try:
+            if not self._load_config():
+                return None
+            repo = self._parse_url(repo_url)
+            if repo['type'] == 'git':
+                archive_path = self._get_git(repo, owner, default_branches)
+            else:
+                archive_path = self._get_web(repo, owner)
+            if archive_path:
+                self._evict(archive_path)
+        # cache is an optimization, the job can download the repository
+        except Exception as exc:
+            self._logger.warning('Repository cache not available: %s',
+                                 str(exc).replace(repo_url, '****'))
+            return None
+        return archive_path
+    # get_archive()
+
+# _RepoCache
+
+
+REPO_CACHE = _RepoCache()
@@ -0,0 +1,114 @@
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+In-memory cache of results which expire after a time to live
+"""
+
+#
+# IMPORTS
+#
+from threading import Lock
+
+import time
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+
+#
+# CODE
+#
+
+
+class TtlCache:
+    """
+    Thread safe cache of the results of expensive calls (i.e. validation of
+    remote sources). Errors are cached as well so that a failing remote is
+    not contacted again on every call, usually with a shorter time to live.
+    """
+
+    def __init__(self, ttl, error_ttl=None):
+        """
+        Constructor
+
+        Args:
+            ttl (int): seconds a result is kept
+            error_ttl (int): seconds an error is kept, defaults to ttl
+        """
+        self._ttl = ttl
+        self._error_ttl = ttl if error_ttl is None else error_ttl
+        # entries as tuples (expiration time, result, exception) keyed by the
+        # caller's key
+        self._entries = {}
+        self._lock = Lock()
+    # __init__()
+
+    def _purge(self, now):
+        """
+        Remove expired entries, must be called with the lock held
+
+        Args:
+            now (float): current monotonic time
+        """
+        for key in [key for key, entry in self._entries.items()
+                    if entry[0] <= now]:
+            del self._entries[key]
+    # _purge()
+
+    def clear(self):
+        """
+        Remove all entries
+        """
+        with self._lock:
+            self._entries.clear()
+    # clear()
+
+    def get(self, key, producer):
+        """
+        Return the cached result for key, calling producer on a miss
+
+        Args:
+            key (hashable): entry identifier
+            producer (callable): returns the result or raises an exception
+
+        Returns:
+            any: result of the producer
+
+        Raises:
+            Exception: whatever the producer raised, also for cached errors
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._purge(now)
+            entry = self._entries.get(key)
+        if entry is not None:
+            if entry[2] is not None:
+                raise entry[2].with_traceback(None)
+            return entry[1]
+
+        # producer is called without the lock so that a slow call does not
+        # delay other keys
+        try:
+            result = producer()
+        except Exception as exc:
+            with self._lock:
+                self._entries[key] = (now + self._error_ttl, None, exc)
+            raise
+        with self._lock:
+            self._entries[key] = (now + self._ttl, result, None)
+        return result
+    # get()
+
+# TtlCache
@@ -109,7 +109,9 @@ def main():
               file=sys.stderr)
         usage()
 
-    # start the machine
+    # start the machine, the container is dedicated to the job so its cgroup
+    # accounts only for the job's processes
+    job_arguments['cgroup_stats'] = True
     SpawnerBase.exec_machine(**job_arguments)
 
 # main()
@@ -1,4 +1,4 @@
-# Copyright 2016, 2017 IBM Corp.
+# Copyright 2016, 2017, 2026 IBM Corp.
 #
 # Licensed under the Apache License, Version 2.0 (the "License");
 # you may not use this file except in compliance with the License.
@@ -19,6 +19,7 @@ The main module containing the daemon processing the job requests
 #
 # IMPORTS
 #
+from concurrent import futures
 from datetime import datetime
 from jsonschema import validate
 from tessia.server.config import CONF
@@ -26,19 +27,29 @@ from tessia.server.db.connection import MANAGER
 from tessia.server.db.models import SchedulerJob, SchedulerRequest, System
 from tessia.server.lib.mediator import MEDIATOR
 from tessia.server.lib.perm_manager import PermManager
+from tessia.server.scheduler import notify
 from tessia.server.scheduler import resources_manager
 from tessia.server.scheduler import spawner
+from tessia.server.scheduler import stats
 from tessia.server.scheduler import wrapper
 from tessia.server.state_machines import MACHINES
 
+import json
 import logging
 import multiprocessing
 import signal
+import threading
 import time
 
 #
 # CONSTANTS AND DEFINITIONS
 #
+# maximum number of requests being parsed at the same time
+PARSE_WORKERS = 4
+
+# maximum time in seconds to wait for parsers in each loop iteration, parsers
+# taking longer are collected in later iterations
+PARSE_WAIT_TIME = 0.5
 
 #
 # CODE
@@ -91,6 +102,13 @@ class Looper:
         self._spawner = None
         # mapping of allowed request actions and their methods
         self._request_methods = None
+        # pool of threads running the machine parsers, as parsers might
+        # access the network (i.e. to verify repositories)
+        self._parse_pool = None
+        # futures of the parsers running, keyed by request id
+        self._parsing = {}
+        # writes the metrics file and profiles the loop on demand
+        self._stats_writer = None
 
         # signal handler will set flag to False to make looper gracefully stop
         self._should_run = False
@@ -220,6 +238,46 @@ class Looper:
 
     # _cancel_job()
 
+    def _fetch_extra_vars(self, request_ids):
+        """
+        Retrieve the extra variables of several requests from the mediator in
+        a single round trip
+
+        Args:
+            request_ids (list): ids of the requests
+
+        Returns:
+            dict: extra variables (or None) keyed by request id
+        """
+        tokens = ['job_requests:{}:vars'.format(request_id)
+                  for request_id in request_ids]
+        try:
+            with stats.STATS.time(
+                    'tessia_scheduler_mediator_duration_seconds',
+                    {'operation': 'get_many'}):
+                return dict(zip(request_ids, MEDIATOR.get_many(tokens)))
+        except ValueError as exc:
+            self._logger.warning(
+                'Wrong value in mediator, retrieving keys one by one: %s',
+                str(exc))
+
+        # some value is invalid: isolate it so that other requests are not
+        # affected
+        extra_vars = {}
+        for request_id, token in zip(request_ids, tokens):
+            try:
+                with stats.STATS.time(
+                        'tessia_scheduler_mediator_duration_seconds',
+                        {'operation': 'get'}):
+                    extra_vars[request_id] = MEDIATOR.get(token)
+            except ValueError as exc:
+                self._logger.warning(
+                    'Wrong value in mediator: key %s, exception %s',
+                    token, str(exc))
+                extra_vars[request_id] = None
+        return extra_vars
+    # _fetch_extra_vars()
+
     @staticmethod
     def _has_resources(job):
         """
@@ -250,12 +308,34 @@ class Looper:
         self._should_run = False
     # _signal_handler()
 
-    def _submit_job(self, request):
+    @staticmethod
+    def _parse_params(parser, parameters):
         """
-        Process a request and register a new job for execution
+        Run a machine parser, called in a worker thread
+
+        Args:
+            parser (callable): machine parser
+            parameters (str): complete request parameters
+
+        Returns:
+            dict: parser result
+        """
+        try:
+            return parser(parameters)
+        finally:
+            # each worker thread has its own db session, release it so that
+            # entries are not kept between parses
+            MANAGER.session.remove()
+    # _parse_params()
+
+    def _submit_job(self, request, extra_vars=None):
+        """
+        Process a request and start parsing its parameters, the job is
+        registered in _create_job once the parser finishes.
 
         Args:
             request (SchedulerRequest): request's model instance
+            extra_vars (any): request's extra variables from the mediator
         """
         # get the appropriate machine parser based on specified job type
         try:
@@ -278,15 +358,6 @@ class Looper:
         # recover complete parameters
         # A complete parmfile is checked by the state machine parser
         # before a job is created. so errors can be caught at an earlier stage
-        token = 'job_requests:{}:vars'.format(request.id)
-        extra_vars = None
-        try:
-            extra_vars = MEDIATOR.get(token)
-        except ValueError as exc:
-            self._logger.warning(
-                'Wrong value in mediator: key %s, exception %s',
-                token, str(exc))
-
         try:
             complete_parameters = state_machine.recombine(
                 request.parameters, extra_vars)
@@ -300,8 +371,20 @@ class Looper:
         # call the parser to define:
         # 1- resources to be used by this state machine
         # 2- job description
+        self._parsing[request.id] = self._parse_pool.submit(
+            self._parse_params, parser, complete_parameters)
+    # _submit_job()
+
+    def _create_job(self, request, parse_future):
+        """
+        Register a new job for execution based on the parser result
+
+        Args:
+            request (SchedulerRequest): request's model instance
+            parse_future (concurrent.futures.Future): finished parser
+        """
         try:
-            parsed_content = parser(complete_parameters)
+            parsed_content = parse_future.result()
             resources = parsed_content['resources']
             # validate against schema
             validate(resources, resources_manager.RESOURCES_SCHEMA)
@@ -352,6 +435,7 @@ class Looper:
 
         # create job object
         new_job = SchedulerJob(
+            request_id=request.id,
             requester_id=request.requester_id,
             priority=request.priority,
             time_slot=request.time_slot,
@@ -398,7 +482,7 @@ class Looper:
         self._resources_man.enqueue(
             self._refresh_and_expunge(new_job))
 
-    # _submit_job()
+    # _create_job()
 
     def _init_manager(self):
         """
@@ -442,6 +526,27 @@ class Looper:
 
     # _init_manager()
 
+    def _prepare_machines(self):
+        """
+        Let the state machines prepare their shared resources (i.e. build
+        container images) in a background thread, so that the first jobs do
+        not have to wait for them.
+        """
+        def _prepare():
+            """Call prepare of each machine, failures are not fatal"""
+            for name, machine in sorted(self._machines.items()):
+                try:
+                    machine.prepare()
+                except Exception as exc:
+                    self._logger.warning(
+                        'Preparation of machine %s failed: %s', name,
+                        str(exc))
+        # _prepare()
+
+        threading.Thread(
+            target=_prepare, name='prepare', daemon=True).start()
+    # _prepare_machines()
+
     def _finish_jobs(self):
         """
         Update state of active jobs that have finished
@@ -451,6 +556,8 @@ class Looper:
             SchedulerJob.state.in_(
                 [SchedulerJob.STATE_CLEANINGUP, SchedulerJob.STATE_RUNNING])
         ).all()
+        stats.STATS.set('tessia_scheduler_jobs', len(active_jobs),
+                        {'state': 'running'})
 
         for job in active_jobs:
             # validate pid to determine if job is still executing
@@ -466,6 +573,28 @@ class Looper:
 
     # _finish_jobs()
 
+    def _read_metrics(self, job_dir, job):
+        """
+        Read the resource usage reported by the job's process
+
+        Args:
+            job_dir (str): job directory
+            job (SchedulerJob): job's model instance
+
+        Returns:
+            dict: job metrics, None if not available
+        """
+        metrics_file_name = '{}/{}'.format(job_dir, wrapper.METRICS_FILE)
+        try:
+            with open(metrics_file_name, 'r') as metrics_file:
+                return json.loads(metrics_file.read())
+        except Exception as exc:
+            self._logger.debug(
+                'Reading of metrics file for job %s: %s failed',
+                job.id, str(exc))
+            return None
+    # _read_metrics()
+
     def _post_process_job(self, job):
         """
         Update job state according to the result of its process
@@ -475,6 +604,7 @@ class Looper:
         """
         job_dir = '{}/{}'.format(self._jobs_dir, job.id)
         results_file_name = '{}/.{}'.format(job_dir, job.id)
+        job.metrics = self._read_metrics(job_dir, job)
 
         try:
             with open(results_file_name, 'r') as results_file:
@@ -547,29 +677,47 @@ class Looper:
         pending_jobs = SchedulerJob.query.filter(
             SchedulerJob.state == SchedulerJob.STATE_WAITING
         ).all()
+        stats.STATS.set('tessia_scheduler_jobs', len(pending_jobs),
+                        {'state': 'waiting'})
+
+        # collect all jobs that can start before accessing the mediator so
+        # that their parameters are retrieved at once
+        startable_jobs = [job for job in pending_jobs
+                          if self._resources_man.can_start(job)]
+        if not startable_jobs:
+            return
 
-        for job in pending_jobs:
+        # jobs created before the request id was stored in the job table:
+        # resolve them with a single query
+        missing_ids = [job.id for job in startable_jobs
+                       if job.request_id is None]
+        if missing_ids:
+            request_ids = dict(
+                self._session.query(
+                    SchedulerRequest.job_id, SchedulerRequest.id
+                ).filter(
+                    SchedulerRequest.job_id.in_(missing_ids),
+                    SchedulerRequest.action_type ==
+                    SchedulerRequest.ACTION_SUBMIT
+                ).all())
+            for job in startable_jobs:
+                if job.request_id is None:
+                    job.request_id = request_ids.get(job.id)
+        extra_vars = self._fetch_extra_vars(
+            [job.request_id for job in startable_jobs])
+
+        for job in startable_jobs:
+            # resources might have been taken by a job started in this
+            # iteration
             if not self._resources_man.can_start(job):
                 continue
 
             self._logger.info('Starting job %s', job.id)
 
             # recover complete parmfile
-            request = SchedulerRequest.query.filter(
-                SchedulerRequest.job_id == job.id
-            ).first()
-            token = 'job_requests:{}:vars'.format(request.id)
-            extra_vars = None
-            try:
-                extra_vars = MEDIATOR.get(token)
-            except ValueError as exc:
-                self._logger.warning(
-                    'Unexpected value in mediator: key %s, exception %s',
-                    token, str(exc))
-
             try:
                 complete_parameters = self._machines[job.job_type].recombine(
-                    job.parameters, extra_vars)
+                    job.parameters, extra_vars.get(job.request_id))
             except Exception as exc:
                 job.state = SchedulerJob.STATE_FAILED
                 job.result = (
@@ -613,6 +761,10 @@ class Looper:
             job.result = 'Job is running'
             job.start_date = datetime.utcnow()
             self._session.commit()
+            stats.STATS.observe(
+                'tessia_scheduler_job_wait_seconds',
+                (job.start_date - job.submit_date).total_seconds(),
+                {'job_type': job.job_type})
 
             self._refresh_and_expunge(job)
             self._resources_man.wait_pop(job)
@@ -620,6 +772,28 @@ class Looper:
 
     # _start_jobs()
 
+    def _stop_parsers(self):
+        """
+        Shut down the parser threads, the parsers not started yet are
+        canceled and the ones running are not waited for since the requests
+        stay pending and are parsed again by the next loop.
+        """
+        for parse_future in self._parsing.values():
+            parse_future.cancel()
+        self._parsing.clear()
+        self._parse_pool.shutdown(wait=False)
+    # _stop_parsers()
+
+    def _update_queue_stats(self):
+        """
+        Report the current length of the resource queues
+        """
+        stats.STATS.clear('tessia_scheduler_queue_depth')
+        for resource, depth in self._resources_man.queue_depths().items():
+            stats.STATS.set('tessia_scheduler_queue_depth', depth,
+                            {'resource': resource})
+    # _update_queue_stats()
+
     def _validate_pid(self, job):
         """
         Verify the state of the job's process (whether it still belongs to a
@@ -648,7 +822,24 @@ class Looper:
                 SchedulerRequest.submit_date.asc()
             )).all()
 
+        # forget parsers of requests which are not pending anymore
+        pending_ids = set(request.id for request in pending_requests)
+        for request_id in set(self._parsing) - pending_ids:
+            self._parsing.pop(request_id).cancel()
+
+        # retrieve extra variables of all submit requests at once
+        extra_vars = {}
+        submit_ids = [
+            request.id for request in pending_requests
+            if request.action_type == SchedulerRequest.ACTION_SUBMIT and
+            request.id not in self._parsing]
+        if submit_ids:
+            extra_vars = self._fetch_extra_vars(submit_ids)
+
         for request in pending_requests:
+            # parser already started: request is completed below
+            if request.id in self._parsing:
+                continue
             try:
                 method = self._request_methods[request.action_type]
             # request is invalid: mark it as failed
@@ -658,10 +849,33 @@ class Looper:
                 request.state = SchedulerRequest.STATE_FAILED
                 request.result = 'Invalid operation specified'
                 self._session.commit()
-            # valid request: execute the specified action
+                continue
+
+            # submit request: pass the variables retrieved beforehand
+            if request.action_type == SchedulerRequest.ACTION_SUBMIT:
+                method(request, extra_vars.get(request.id))
+            # other valid request: execute the specified action
             else:
                 method(request)
 
+        if not self._parsing:
+            self._session.commit()
+            return
+
+        # give the parsers a moment to finish so that usually requests are
+        # completed in the same iteration, slow ones are left for later
+        futures.wait(self._parsing.values(), timeout=PARSE_WAIT_TIME)
+        # jobs are created in submit order, a slow parser holds back the
+        # requests submitted after it so that they are not enqueued first
+        for request in pending_requests:
+            parse_future = self._parsing.get(request.id)
+            if parse_future is None:
+                continue
+            if not parse_future.done():
+                break
+            del self._parsing[request.id]
+            self._create_job(request, parse_future)
+
         self._session.commit()
     # _process_pending_requests()
 
@@ -684,14 +898,22 @@ class Looper:
         self._machines = MACHINES.classes
         # db session
         self._session = MANAGER.session
+        # let clients waiting for requests and jobs know about our changes
+        notify.publish_changes(self._session)
         # spawn strategy
         self._spawner = spawner.ContainerSpawner()
+        self._parsing = {}
         # mapping of allowed request actions and their methods
         self._request_methods = {
             SchedulerRequest.ACTION_CANCEL: self._cancel_job,
             SchedulerRequest.ACTION_SUBMIT: self._submit_job,
         }
 
+        self._stats_writer = stats.StatsWriter(self._jobs_dir)
+
+        # start and stop profiling of the loop
+        signal.signal(signal.SIGUSR1,
+                      self._stats_writer.request_profile_toggle)
         # handle the signals for graceful termination
         signal.signal(signal.SIGHUP, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
@@ -701,6 +923,13 @@ class Looper:
 
         # init resources manager with information from jobs
         self._init_manager()
+
+        try:
+            prepare = CONF.get_config().get('scheduler')['prepare_machines']
+        except (TypeError, KeyError):
+            prepare = False
+        if prepare:
+            self._prepare_machines()
     # initialize()
 
     def loop(self, sleep_time=0.5):
@@ -710,16 +939,28 @@ class Looper:
         Args:
             sleep_time (int): interval to wait between each loop
         """
+        tick_metric = 'tessia_scheduler_tick_duration_seconds'
+        # pool of parser threads, shut down when the loop stops
+        self._parse_pool = futures.ThreadPoolExecutor(
+            max_workers=PARSE_WORKERS)
         try:
             while self._should_run:
-                # finish any active jobs
-                self._finish_jobs()
+                self._stats_writer.toggle_profile()
+
+                with stats.STATS.time(tick_metric, {'phase': 'total'}):
+                    # finish any active jobs
+                    with stats.STATS.time(tick_metric, {'phase': 'finish'}):
+                        self._finish_jobs()
 
-                self._process_pending_requests()
+                    with stats.STATS.time(tick_metric, {'phase': 'process'}):
+                        self._process_pending_requests()
 
-                # try to schedule jobs in pending state
-                self._start_jobs()
+                    # try to schedule jobs in pending state
+                    with stats.STATS.time(tick_metric, {'phase': 'start'}):
+                        self._start_jobs()
 
+                self._update_queue_stats()
+                self._stats_writer.write()
                 self._logger.debug(self._resources_man)
                 # TODO: scheduler is running too fast
                 time.sleep(sleep_time)
@@ -729,6 +970,8 @@ class Looper:
             self._logger.error(
                 "Caught exception in scheduler, exiting...", exc_info=True)
             raise
+        finally:
+            self._stop_parsers()
 
     # loop()
 # Looper
@@ -0,0 +1,155 @@
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Notification of the changes made by the scheduler to requests and jobs
+"""
+
+#
+# IMPORTS
+#
+from sqlalchemy import event
+from tessia.server.lib.mediator import MEDIATOR
+from tessia.server.scheduler.stats import STATS
+
+import logging
+import time
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+# mediator key with the revision of the scheduler data, it changes every time
+# the scheduler commits changes to requests or jobs
+MEDIATOR_REVISION_KEY = 'scheduler:revision'
+
+# key in the session info dict to mark that changes were flushed
+SESSION_CHANGED_KEY = 'scheduler_changed'
+
+# interval in seconds between checks when the mediator is not available
+FALLBACK_POLL_INTERVAL = 2
+
+#
+# CODE
+#
+
+
+def _flushed(session, _flush_context):
+    """
+    Mark the session as having changes to be published
+
+    Args:
+        session (Session): session which flushed changes
+        _flush_context (UOWTransaction): unused
+    """
+    session.info[SESSION_CHANGED_KEY] = True
+# _flushed()
+
+
+def _rolled_back(session, _previous_transaction):
+    """
+    Discard the changes marked as the transaction did not happen
+
+    Args:
+        session (Session): session rolled back
+        _previous_transaction (SessionTransaction): unused
+    """
+    session.info.pop(SESSION_CHANGED_KEY, None)
+# _rolled_back()
+
+
+def _committed(session):
+    """
+    Publish a new revision if the committed transaction had changes
+
+    Args:
+        session (Session): session committed
+    """
+    if not session.info.pop(SESSION_CHANGED_KEY, False):
+        return
+    try:
+        with STATS.time('tessia_scheduler_mediator_duration_seconds',
+                        {'operation': 'publish'}):
+            MEDIATOR.set(MEDIATOR_REVISION_KEY, str(time.time_ns()))
+    # waiters notice the change later on their own timeout, no need to stop
+    # the scheduler
+    except Exception:  # pylint: disable=broad-except
+        logging.getLogger(__name__).warning(
+            'Failed to publish scheduler revision to mediator', exc_info=True)
+# _committed()
+
+
+def publish_changes(session):
+    """
+    Publish a new revision to the mediator every time the session commits
+    changes, so that waiting clients are notified.
+
+    Args:
+        session (Session): db session used by the scheduler
+    """
+    event.listen(session, 'after_flush', _flushed)
+    event.listen(session, 'after_soft_rollback', _rolled_back)
+    event.listen(session, 'after_commit', _committed)
+# publish_changes()
+
+
+def wait_state(session, item, until, timeout):
+    """
+    Wait until an item reaches one of the given states.
+
+    The state is only read from the database again when the scheduler
+    publishes a new revision. The transaction is ended before each wait so
+    that the db connection returns to the pool meanwhile.
+
+    Args:
+        session (Session): db session the item belongs to
+        item (SchedulerRequest or SchedulerJob): item to watch
+        until (list): states to wait for
+        timeout (float): maximum time in seconds to wait
+
+    Returns:
+        SchedulerRequest or SchedulerJob: item with the current state, which
+            is not one of the given states if timeout was reached
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        # read the revision before the state, otherwise a change in between
+        # would be missed
+        try:
+            revision = MEDIATOR.get(MEDIATOR_REVISION_KEY)
+            has_mediator = True
+        except Exception:  # pylint: disable=broad-except
+            logging.getLogger(__name__).warning(
+                'Mediator not available, polling the database instead',
+                exc_info=True)
+            has_mediator = False
+        session.refresh(item)
+
+        remaining = deadline - time.monotonic()
+        if item.state in until or remaining <= 0:
+            return item
+
+        # nothing was changed, ending the transaction only releases the
+        # connection
+        session.rollback()
+        if has_mediator:
+            try:
+                MEDIATOR.wait_change(
+                    MEDIATOR_REVISION_KEY, revision, remaining)
+                continue
+            except Exception:  # pylint: disable=broad-except
+                logging.getLogger(__name__).warning(
+                    'Mediator failed while waiting, polling the database '
+                    'instead', exc_info=True)
+        time.sleep(min(FALLBACK_POLL_INTERVAL, remaining))
+# wait_state()
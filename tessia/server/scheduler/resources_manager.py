@@ -499,6 +499,17 @@ class ResourcesManager:
             self._enqueue_job(wait_queue, job, mode)
     # enqueue()
 
+    def queue_depths(self):
+        """
+        Number of jobs waiting for each resource
+
+        Returns:
+            dict: queue length keyed by resource name
+        """
+        return {resource: len(queue)
+                for resource, queue in self._wait_queues.items()}
+    # queue_depths()
+
     def reset(self):
         """
         Reset all queues to empty state
@@ -0,0 +1,655 @@
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Offline simulation of the scheduler, replays a trace of job submissions
+against the resources manager with a simulated clock and spawner
+"""
+
+#
+# IMPORTS
+#
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from jsonschema import ValidationError, validate
+from tessia.server.db.connection import MANAGER
+from tessia.server.db.models import SchedulerJob, SchedulerRequest
+from tessia.server.scheduler import resources_manager
+from tessia.server.scheduler import spawner
+
+import json
+import logging
+import math
+import random
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+# simulated time starts at this date, so that results do not depend on when
+# the simulation runs
+EPOCH = datetime(2000, 1, 1)
+
+# interval between loop iterations, same as the looper's default sleep time
+LOOP_INTERVAL = 0.5
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+# reasons for which requests are not turned into jobs
+REJECT_CONFLICT = 'conflict'
+REJECT_INVALID = 'invalid_resources'
+REJECT_NO_TIMEOUT = 'no_timeout'
+
+# times are offsets in seconds from the beginning of the trace
+TRACE_ENTRY_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'submit': {'type': 'number', 'minimum': 0},
+        'start': {'type': ['number', 'null'], 'minimum': 0},
+        'duration': {'type': 'number', 'minimum': 0},
+        'timeout': {'type': 'integer', 'minimum': 0},
+        'priority': {'type': 'integer'},
+        'job_type': {'type': 'string'},
+        'time_slot': {'type': 'string', 'enum': list(SchedulerJob.SLOTS)},
+        'resources': resources_manager.RESOURCES_SCHEMA,
+    },
+    'required': ['submit', 'duration', 'resources'],
+}
+
+#
+# CODE
+#
+
+
+def _percentiles(samples):
+    """
+    Summarize a list of observations
+
+    Args:
+        samples (list): observations
+
+    Returns:
+        dict: count, mean, max and quantiles by the nearest rank method
+    """
+    if not samples:
+        return {'count': 0}
+    samples = sorted(samples)
+    summary = {
+        'count': len(samples),
+        'mean': sum(samples) / len(samples),
+        'max': samples[-1],
+    }
+    for quantile in QUANTILES:
+        position = max(0, math.ceil(quantile * len(samples)) - 1)
+        summary['p{}'.format(round(quantile * 100))] = samples[position]
+    return summary
+# _percentiles()
+
+
+def _busy_time(intervals):
+    """
+    Total time covered by a list of intervals, which may overlap
+
+    Args:
+        intervals (list): tuples (start, end)
+
+    Returns:
+        float: length of the union of the intervals
+    """
+    busy = 0
+    cur_start = cur_end = None
+    for start, end in sorted(intervals):
+        if cur_end is None or start > cur_end:
+            if cur_end is not None:
+                busy += cur_end - cur_start
+            cur_start, cur_end = start, end
+        else:
+            cur_end = max(cur_end, end)
+    if cur_end is not None:
+        busy += cur_end - cur_start
+    return busy
+# _busy_time()
+
+
+def load_trace(file_obj):
+    """
+    Read a trace in json lines format, one request per line
+
+    Args:
+        file_obj (file): trace file
+
+    Returns:
+        list: trace entries
+
+    Raises:
+        ValueError: if an entry is not valid
+    """
+    trace = []
+    for line_number, line in enumerate(file_obj, 1):
+        if not line.strip():
+            continue
+        try:
+            entry = json.loads(line)
+            validate(entry, TRACE_ENTRY_SCHEMA)
+        except (ValueError, ValidationError) as exc:
+            raise ValueError('Invalid trace entry at line {}: {}'.format(
+                line_number, str(exc)))
+        trace.append(entry)
+    return trace
+# load_trace()
+
+
+def record_trace(since, until=None):
+    """
+    Create a trace from the jobs submitted in the database. Requests that
+    did not create a job (i.e. failed) are not included as their resources
+    are unknown, as well as jobs canceled before they started.
+
+    Args:
+        since (datetime.datetime): submission date of the first request
+        until (datetime.datetime): submission date limit, defaults to now
+
+    Returns:
+        list: trace entries
+    """
+    if until is None:
+        until = datetime.utcnow()
+    rows = MANAGER.session.query(SchedulerRequest, SchedulerJob).filter(
+        SchedulerRequest.job_id == SchedulerJob.id,
+        SchedulerRequest.action_type == SchedulerRequest.ACTION_SUBMIT,
+        SchedulerRequest.submit_date >= since,
+        SchedulerRequest.submit_date < until,
+    ).order_by(SchedulerRequest.submit_date.asc()).all()
+
+    trace = []
+    for request, job in rows:
+        if job.start_date is None or not job.resources:
+            continue
+        # job still running: it lasts at least until now
+        end_date = job.end_date or until
+        entry = {
+            'submit': (request.submit_date - since).total_seconds(),
+            'start': None,
+            'duration': max(0, (end_date - job.start_date).total_seconds()),
+            'timeout': job.timeout,
+            'priority': job.priority,
+            'job_type': job.job_type,
+            'time_slot': job.time_slot,
+            'resources': job.resources,
+        }
+        if request.start_date is not None:
+            entry['start'] = max(
+                0, (request.start_date - since).total_seconds())
+        trace.append(entry)
+    MANAGER.session.rollback()
+    return trace
+# record_trace()
+
+
+def synthetic_trace(jobs, resources, seed=0, interval=60):
+    """
+    Create a random trace, the same seed always produces the same trace
+
+    Args:
+        jobs (int): number of requests
+        resources (int): number of systems used exclusively, one hypervisor
+                         shared by jobs is created for every 10 of them
+        seed (int): seed of the random generator
+        interval (int): mean time in seconds between submissions
+
+    Returns:
+        list: trace entries
+    """
+    rand = random.Random(seed)
+    guests = ['system.guest{}'.format(index) for index in range(resources)]
+    hypervisors = ['system.lpar{}'.format(index)
+                   for index in range(max(1, resources // 10))]
+    trace = []
+    submit = 0
+    for _ in range(jobs):
+        submit += rand.expovariate(1 / interval)
+        duration = rand.choice((60, 300, 900, 3600)) * rand.uniform(0.5, 1.5)
+        start = None
+        timeout = 7200
+        # some jobs are scheduled for later
+        if rand.random() < 0.1:
+            start = submit + rand.randint(600, 7200)
+        # and some run without timeout
+        elif rand.random() < 0.2:
+            timeout = 0
+        trace.append({
+            'submit': submit,
+            'start': start,
+            'duration': duration,
+            'timeout': timeout,
+            'priority': rand.randint(0, 9),
+            'job_type': rand.choice(
+                ('ansible', 'autoinstall', 'powermanager')),
+            'resources': {
+                resources_manager.MODE_EXCLUSIVE: rand.sample(
+                    guests, rand.randint(1, min(3, len(guests)))),
+                resources_manager.MODE_SHARED: rand.sample(
+                    hypervisors, rand.randint(0, min(1, len(hypervisors)))),
+            },
+        })
+    return trace
+# synthetic_trace()
+
+
+class SimJob:
+    """
+    Stand-in for the SchedulerJob model with the attributes used by the
+    resources manager. Plain attributes are much faster to access than the
+    instrumented ones of the model, which matters for long traces.
+    """
+    __slots__ = ('id', 'priority', 'time_slot', 'submit_date', 'start_date',
+                 'end_date', 'state', 'pid', 'job_type', 'resources',
+                 'parameters', 'timeout')
+
+    def __init__(self, **kwargs):
+        """
+        Constructor
+
+        Args:
+            kwargs (dict): values of the attributes, missing ones are None
+        """
+        for name in self.__slots__:
+            setattr(self, name, kwargs.get(name))
+    # __init__()
+# SimJob
+
+
+class SimClock:
+    """
+    Simulated time, only moves when advanced
+    """
+
+    def __init__(self):
+        """
+        Constructor, starts at the epoch
+        """
+        self.offset = 0
+        self.now = EPOCH
+    # __init__()
+
+    def advance(self, offset):
+        """
+        Move the clock forward
+
+        Args:
+            offset (float): new time in seconds since the epoch
+        """
+        self.offset = offset
+        self.now = EPOCH + timedelta(seconds=offset)
+    # advance()
+
+    @staticmethod
+    def date(offset):
+        """
+        Convert an offset of the trace to a date
+
+        Args:
+            offset (float): seconds since the epoch
+
+        Returns:
+            datetime.datetime: date in simulated time
+        """
+        return EPOCH + timedelta(seconds=offset)
+    # date()
+# SimClock
+
+
+class SimSpawner(spawner.SpawnerBase):
+    """
+    Spawner that starts no processes, a job ends when the clock reaches the
+    duration defined in its parameters or its timeout
+    """
+
+    def __init__(self, clock):
+        """
+        Constructor
+
+        Args:
+            clock (SimClock): simulated time
+        """
+        super().__init__()
+        self._clock = clock
+        self._end_dates = {}
+        self._last_pid = 0
+    # __init__()
+
+    def end_date(self, job):
+        """
+        Return when a job started by the spawner ends
+
+        Args:
+            job (SchedulerJob): job instance
+
+        Returns:
+            datetime.datetime: end date in simulated time
+        """
+        return self._end_dates[job.pid]
+    # end_date()
+
+    def spawn(self, job_args, environment=None):
+        """
+        Register a new job execution
+
+        Args:
+            job_args (dict): job arguments, the job parameters contain the
+                             duration in seconds
+            environment (dict): not used
+
+        Returns:
+            int: pid of the simulated process
+        """
+        duration = json.loads(job_args['job_parameters'])['duration']
+        if job_args['timeout'] > 0:
+            duration = min(duration, job_args['timeout'])
+        self._last_pid += 1
+        self._end_dates[self._last_pid] = (
+            self._clock.now + timedelta(seconds=duration))
+        return self._last_pid
+    # spawn()
+
+    def terminate(self, job, force=False):
+        """
+        End a job immediately
+
+        Args:
+            job (SchedulerJob): job instance
+            force (bool): not used
+        """
+        self._end_dates[job.pid] = self._clock.now
+    # terminate()
+
+    def validate(self, job):
+        """
+        Verify if a job has reached its end
+
+        Args:
+            job (SchedulerJob): job instance
+
+        Returns:
+            int: PROCESS_DEAD or PROCESS_RUNNING
+        """
+        if self._clock.now >= self._end_dates[job.pid]:
+            return spawner.PROCESS_DEAD
+        return spawner.PROCESS_RUNNING
+    # validate()
+# SimSpawner
+
+
+class Simulator:
+    """
+    Replays a trace following the same steps of each iteration of the
+    looper: finish the ended jobs, create jobs from the new requests and
+    start the waiting jobs. Time jumps directly to the next iteration in
+    which something happens, so a month of load takes seconds.
+    """
+
+    def __init__(self, trace, grace_seconds=None, priorities=None,
+                 loop_interval=LOOP_INTERVAL, manager=None):
+        """
+        Constructor
+
+        Args:
+            trace (list): trace entries
+            grace_seconds (int): value of resources_manager.GRACE_SECONDS
+                                 during the simulation, unchanged if None
+            priorities (dict): priority by job type, replaces the one in
+                               the trace
+            loop_interval (float): seconds between iterations of the loop
+            manager (ResourcesManager): instance to be evaluated, allows to
+                                        try alternative implementations
+        """
+        self._logger = logging.getLogger(__name__)
+        # requests are processed in order of submission
+        self._trace = sorted(trace, key=lambda entry: entry['submit'])
+        self._grace_seconds = grace_seconds
+        self._priorities = priorities or {}
+        self._loop_interval = loop_interval
+        self._resources_man = manager or resources_manager.ResourcesManager()
+        self._clock = SimClock()
+        self._spawner = SimSpawner(self._clock)
+
+        self._next_request = 0
+        self._waiting_jobs = []
+        self._active_jobs = []
+        self._iterations = 0
+        self._rejected = {
+            REJECT_CONFLICT: 0, REJECT_INVALID: 0, REJECT_NO_TIMEOUT: 0}
+        self._timed_out = 0
+        self._waits = []
+        self._waits_by_priority = {}
+        self._busy = {}
+        self._last_end = 0
+    # __init__()
+
+    @contextmanager
+    def _patch_manager(self):
+        """
+        Make the resources manager use the simulated clock and the grace time
+        of the simulation
+        """
+        clock = self._clock
+
+        class _SimDatetime(datetime):
+            """Datetime whose current time is the simulated one"""
+            @classmethod
+            def utcnow(cls):
+                """Simulated time"""
+                return clock.now
+
+        orig_datetime = resources_manager.datetime
+        orig_grace = resources_manager.GRACE_SECONDS
+        resources_manager.datetime = _SimDatetime
+        if self._grace_seconds is not None:
+            resources_manager.GRACE_SECONDS = self._grace_seconds
+        try:
+            yield
+        finally:
+            resources_manager.datetime = orig_datetime
+            resources_manager.GRACE_SECONDS = orig_grace
+    # _patch_manager()
+
+    def _finish_jobs(self):
+        """
+        Remove the ended jobs from the active ones
+        """
+        still_active = []
+        for job in self._active_jobs:
+            if self._spawner.validate(job) != spawner.PROCESS_DEAD:
+                still_active.append(job)
+                continue
+
+            job.end_date = self._clock.now
+            job.state = SchedulerJob.STATE_COMPLETED
+            duration = json.loads(job.parameters)['duration']
+            if 0 < job.timeout < duration:
+                job.state = SchedulerJob.STATE_FAILED
+                self._timed_out += 1
+            self._resources_man.active_pop(job)
+
+            start = (job.start_date - EPOCH).total_seconds()
+            for mode in resources_manager.MODES:
+                for resource in job.resources.get(mode, []):
+                    self._busy.setdefault(resource, []).append(
+                        (start, self._clock.offset))
+            self._last_end = self._clock.offset
+        self._active_jobs = still_active
+    # _finish_jobs()
+
+    def _process_pending_requests(self):
+        """
+        Create jobs for the requests submitted until now
+        """
+        while (self._next_request < len(self._trace) and
+               self._trace[self._next_request]['submit'] <=
+               self._clock.offset):
+            entry = self._trace[self._next_request]
+            self._next_request += 1
+
+            resources = entry['resources']
+            if not self._resources_man.validate_resources(resources):
+                self._rejected[REJECT_INVALID] += 1
+                continue
+
+            job_type = entry.get('job_type', 'echo')
+            start = entry.get('start')
+            new_job = SimJob(
+                id=self._next_request,
+                priority=self._priorities.get(
+                    job_type, entry.get('priority', 0)),
+                time_slot=entry.get('time_slot', SchedulerJob.SLOT_DEFAULT),
+                submit_date=self._clock.date(entry['submit']),
+                start_date=(None if start is None
+                            else self._clock.date(start)),
+                state=SchedulerJob.STATE_WAITING,
+                job_type=job_type,
+                resources=resources,
+                parameters=json.dumps({'duration': entry['duration']}),
+                timeout=entry.get('timeout', 0),
+            )
+            if new_job.start_date and new_job.timeout == 0:
+                self._rejected[REJECT_NO_TIMEOUT] += 1
+                continue
+            if not self._resources_man.can_enqueue(new_job):
+                self._rejected[REJECT_CONFLICT] += 1
+                continue
+
+            self._resources_man.enqueue(new_job)
+            self._waiting_jobs.append(new_job)
+    # _process_pending_requests()
+
+    def _start_jobs(self):
+        """
+        Start the waiting jobs which have their resources available
+        """
+        startable_jobs = [job for job in self._waiting_jobs
+                          if self._resources_man.can_start(job)]
+        if not startable_jobs:
+            return
+
+        for job in startable_jobs:
+            # resources might have been taken by a job started in this
+            # iteration
+            if not self._resources_man.can_start(job):
+                continue
+
+            job.pid = self._spawner.spawn(job_args={
+                'job_dir': str(job.id),
+                'job_type': job.job_type,
+                'job_parameters': job.parameters,
+                'timeout': job.timeout,
+            })
+            job.state = SchedulerJob.STATE_RUNNING
+            job.start_date = self._clock.now
+            wait = (job.start_date - job.submit_date).total_seconds()
+            self._waits.append(wait)
+            self._waits_by_priority.setdefault(job.priority, []).append(wait)
+
+            self._resources_man.wait_pop(job)
+            self._resources_man.set_active(job)
+            self._active_jobs.append(job)
+
+        self._waiting_jobs = [
+            job for job in self._waiting_jobs
+            if job.state == SchedulerJob.STATE_WAITING]
+    # _start_jobs()
+
+    def _next_iteration(self):
+        """
+        Find the time of the next loop iteration in which something happens
+
+        Returns:
+            float: offset in seconds, None if the simulation is over
+        """
+        events = []
+        if self._next_request < len(self._trace):
+            events.append(self._trace[self._next_request]['submit'])
+        for job in self._active_jobs:
+            events.append(
+                (self._spawner.end_date(job) - EPOCH).total_seconds())
+        for job in self._waiting_jobs:
+            if job.start_date is not None and job.start_date > self._clock.now:
+                events.append((job.start_date - EPOCH).total_seconds())
+        if not events:
+            return None
+
+        # iterations happen at fixed intervals, so events are only noticed
+        # in the first iteration after them
+        steps = max(1, math.ceil(
+            (min(events) - self._clock.offset) / self._loop_interval))
+        return self._clock.offset + steps * self._loop_interval
+    # _next_iteration()
+
+    def run(self):
+        """
+        Execute the simulation until all jobs are done
+
+        Returns:
+            dict: report with wait times, utilization per resource and
+                  rejection rates
+        """
+        with self._patch_manager():
+            offset = self._trace[0]['submit'] if self._trace else None
+            while offset is not None:
+                self._clock.advance(offset)
+                self._iterations += 1
+                self._finish_jobs()
+                self._process_pending_requests()
+                self._start_jobs()
+                offset = self._next_iteration()
+
+        if self._waiting_jobs:
+            self._logger.warning(
+                '%s jobs could never start', len(self._waiting_jobs))
+        return self.report()
+    # run()
+
+    def report(self):
+        """
+        Summarize the results of the simulation
+
+        Returns:
+            dict: simulation results
+        """
+        requests = len(self._trace)
+        span = self._last_end
+        if self._trace:
+            span -= self._trace[0]['submit']
+        utilization = {}
+        for resource, intervals in sorted(self._busy.items()):
+            utilization[resource] = (
+                _busy_time(intervals) / span if span > 0 else 0)
+
+        return {
+            'requests': requests,
+            'started': len(self._waits),
+            'never_started': len(self._waiting_jobs),
+            'timed_out': self._timed_out,
+            'rejected': dict(self._rejected),
+            'conflict_rejection_rate': (
+                self._rejected[REJECT_CONFLICT] / requests
+                if requests else 0),
+            'iterations': self._iterations,
+            'span_seconds': span,
+            'wait_seconds': _percentiles(self._waits),
+            'wait_seconds_by_priority': {
+                priority: _percentiles(waits) for priority, waits in
+                sorted(self._waits_by_priority.items())},
+            'utilization': utilization,
+        }
+    # report()
+# Simulator
@@ -22,6 +22,7 @@ Spawner used to start the workers (jobs' processes)
 from abc import abstractmethod
 from tessia.server.config import CONF
 from tessia.server.scheduler import wrapper
+from tessia.server.scheduler.stats import STATS
 
 import docker
 import json
@@ -59,7 +60,8 @@ class SpawnerBase():
     # __init__()
 
     @staticmethod
-    def exec_machine(job_dir, job_type, job_parameters, timeout):
+    def exec_machine(job_dir, job_type, job_parameters, timeout,
+                     cgroup_stats=False):
         """
         Start a state machine in a MachineWrapper
 
@@ -68,10 +70,12 @@ class SpawnerBase():
             job_type (str): the type of state machine to use
             job_parameters (str): parameters to pass to the state machine
             timeout (int): job timeout in seconds
+            cgroup_stats (bool): whether to record the statistics of the
+                                 process' cgroup in the job metrics
         """
         wrapped_machine = wrapper.MachineWrapper(
             run_dir=job_dir, job_type=job_type, job_params=job_parameters,
-            timeout=timeout
+            timeout=timeout, cgroup_stats=cgroup_stats
         )
         wrapped_machine.start()
     # exec_machine()
@@ -355,18 +359,20 @@ class ContainerSpawner(SpawnerBase):
             # TODO: create containers with least access possible,
             # which means rewriting state machines to run without
             # database and config
-            container_obj = self._client.containers.run(
-                image=self._image_name, name=container_name,
-                detach=True,             # immediately return Container object
-                remove=True,             # Removes container when finished
-                stdin_open=True, tty=False,
-                entrypoint=['/usr/bin/python3', '-m',
-                            'tessia.server.scheduler.exec'],
-                network_mode="container:{}_server_1".format(
-                    self._compose_name),
-                ports={},
-                volumes_from=["{}_server_1".format(self._compose_name)],
-            )
+            with STATS.time('tessia_scheduler_spawner_duration_seconds',
+                            {'operation': 'run'}):
+                container_obj = self._client.containers.run(
+                    image=self._image_name, name=container_name,
+                    detach=True,         # immediately return Container object
+                    remove=True,         # Removes container when finished
+                    stdin_open=True, tty=False,
+                    entrypoint=['/usr/bin/python3', '-m',
+                                'tessia.server.scheduler.exec'],
+                    network_mode="container:{}_server_1".format(
+                        self._compose_name),
+                    ports={},
+                    volumes_from=["{}_server_1".format(self._compose_name)],
+                )
         # also catches docker.errors.ImageNotFound (inherits from api error)
         except docker.errors.APIError as exc:
             self._logger.warning('Container start failed: %s', str(exc))
@@ -378,9 +384,11 @@ class ContainerSpawner(SpawnerBase):
         try:
             # pass job arguments as a json-encoded object to stdin
             self._logger.debug('sending job arguments to %s', container_name)
-            with self._client.api.attach_socket(
-                    container_obj.id,
-                    params={'stdin': 1, 'stream': 1}) as stdin_socket:
+            with STATS.time('tessia_scheduler_spawner_duration_seconds',
+                            {'operation': 'attach'}), \
+                    self._client.api.attach_socket(
+                        container_obj.id,
+                        params={'stdin': 1, 'stream': 1}) as stdin_socket:
                 # to make things more weird, socket is a SocketIO socket,
                 # and we access the lower level socket through a private
                 # member.
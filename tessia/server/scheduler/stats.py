@@ -0,0 +1,150 @@
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Performance metrics of the scheduler and on demand profiling of its loop
+"""
+
+#
+# IMPORTS
+#
+from datetime import datetime
+from tessia.server.lib.metrics import Registry
+
+import cProfile
+import logging
+import os
+import time
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+# name of the file in the jobs directory where metrics are written
+STATS_FILE = 'scheduler.prom'
+
+# minimum interval in seconds between writes of the stats file
+STATS_INTERVAL = 10
+
+# name pattern of the profile files written to the jobs directory
+PROFILE_FILE = 'scheduler-{}.prof'
+
+STATS = Registry()
+STATS.histogram(
+    'tessia_scheduler_tick_duration_seconds',
+    'Time spent in each phase of a scheduler iteration')
+STATS.gauge(
+    'tessia_scheduler_queue_depth', 'Jobs waiting for each resource')
+STATS.gauge(
+    'tessia_scheduler_jobs', 'Jobs tracked by the scheduler by state')
+STATS.summary(
+    'tessia_scheduler_job_wait_seconds',
+    'Time between the submission and the start of jobs')
+STATS.histogram(
+    'tessia_scheduler_spawner_duration_seconds',
+    'Time of the operations to start a job container')
+STATS.histogram(
+    'tessia_scheduler_mediator_duration_seconds',
+    'Time of the scheduler operations on the mediator')
+
+#
+# CODE
+#
+
+
+class StatsWriter:
+    """
+    Periodically write the metrics to a file in the jobs directory, in the
+    prometheus text format (suitable for the node exporter's textfile
+    collector), and run the profiler when requested.
+    """
+
+    def __init__(self, jobs_dir):
+        """
+        Constructor
+
+        Args:
+            jobs_dir (str): path to the jobs directory
+        """
+        self._jobs_dir = jobs_dir
+        self._last_write = 0
+        self._logger = logging.getLogger(__name__)
+        # profiler instance while profiling is active
+        self._profiler = None
+        # set by the signal handler, profiling is switched between iterations
+        self._toggle_requested = False
+    # __init__()
+
+    def request_profile_toggle(self, *_args, **_kwargs):
+        """
+        Signal handler to start or stop profiling the scheduler loop
+        """
+        self._toggle_requested = True
+    # request_profile_toggle()
+
+    def toggle_profile(self):
+        """
+        Start or stop the profiler if requested. When stopped, the profile is
+        written to the jobs directory.
+
+        Returns:
+            str: path of the profile file written, None otherwise
+        """
+        if not self._toggle_requested:
+            return None
+        self._toggle_requested = False
+
+        if self._profiler is None:
+            self._logger.info('Starting profiler of scheduler loop')
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+            return None
+
+        self._profiler.disable()
+        path = os.path.join(self._jobs_dir, PROFILE_FILE.format(
+            datetime.utcnow().strftime('%Y%m%d%H%M%S')))
+        try:
+            self._profiler.dump_stats(path)
+        except OSError as exc:
+            self._logger.warning('Failed to write profile: %s', str(exc))
+            path = None
+        else:
+            self._logger.info('Profile of scheduler loop written to %s', path)
+        self._profiler = None
+        return path
+    # toggle_profile()
+
+    def write(self, force=False):
+        """
+        Write the metrics file if the last write is not recent
+
+        Args:
+            force (bool): write even if the last write is recent
+        """
+        now = time.monotonic()
+        if not force and now - self._last_write < STATS_INTERVAL:
+            return
+        self._last_write = now
+
+        path = os.path.join(self._jobs_dir, STATS_FILE)
+        # replace in a single step so that readers never see a partial file
+        temp_path = '{}.tmp'.format(path)
+        try:
+            with open(temp_path, 'w') as file_obj:
+                file_obj.write(Registry.render(STATS.snapshot()))
+            os.replace(temp_path, path)
+        except OSError as exc:
+            self._logger.warning(
+                'Failed to write scheduler stats: %s', str(exc))
+    # write()
+# StatsWriter
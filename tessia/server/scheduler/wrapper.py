@@ -24,9 +24,11 @@ from tessia.server.state_machines import MACHINES
 from tessia.server.scheduler import exceptions
 
 import builtins
+import json
 import logging
 import os
 import pickle
+import resource
 import signal
 import sys
 
@@ -61,6 +63,20 @@ WORKER_COMM = 'tessia-job'
 # in interrupted workers
 WRAPPER_PARAMETERS_FILE = 'wrapper_init_parameters'
 
+# Name of the file in the job directory where the resource usage of the job
+# is stored in json format
+METRICS_FILE = '.job_metrics'
+
+# Messages logged by the state machines when they enter a new phase, used to
+# measure the time spent in each one
+STAGE_MARKERS = (b'| new state: ', b'| new stage: ')
+
+# Format of the dates in the state machines' log messages
+LOG_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Mount point of the cgroup filesystem
+CGROUP_DIR = '/sys/fs/cgroup'
+
 #
 # CODE
 #
@@ -77,9 +93,19 @@ class MachineWrapper:
       place to store its files if needed
     """
 
-    def __init__(self, run_dir, job_type, job_params, timeout):
+    def __init__(self, run_dir, job_type, job_params, timeout,
+                 cgroup_stats=False):
         """
         Constructor, only initializes internal variables
+
+        Args:
+            run_dir (str): filesystem path to the directory used for the job
+            job_type (str): the type of state machine to use
+            job_params (str): parameters to pass to the state machine
+            timeout (int): job timeout in seconds
+            cgroup_stats (bool): whether the process runs in a cgroup of its
+                                 own (i.e. a container) whose statistics
+                                 should be recorded with the job metrics
         """
         self._logger = logging.getLogger(__name__)
         # instance of state machine
@@ -97,6 +123,8 @@ class MachineWrapper:
 
         self._timeout = timeout
 
+        self._cgroup_stats = cgroup_stats
+
         self._mask_timeouts = False
 
     # __init__()
@@ -115,7 +143,7 @@ class MachineWrapper:
         with open(WRAPPER_PARAMETERS_FILE, 'wb') as params_file:
             pickle.dump(
                 (ret_code, self._run_dir, self._job_type,
-                 self._job_params, self._timeout),
+                 self._job_params, self._timeout, self._cgroup_stats),
                 params_file)
     # _pickle_cleanup_parameters()
 
@@ -197,10 +225,29 @@ class MachineWrapper:
         raise exceptions.WrapperTimeout
     # _handle_cleanup_timeout()
 
+    def _write_metrics(self):
+        """
+        Write the resource usage of the job to the metrics file. Failures
+        are only logged as the metrics must not affect the job result.
+
+        Args:
+        Returns:
+        Raises:
+        """
+        try:
+            metrics = collect_metrics(self._run_dir, self._cgroup_stats)
+            with open('{}/{}'.format(self._run_dir, METRICS_FILE),
+                      'w') as metrics_file:
+                metrics_file.write(json.dumps(metrics))
+        except Exception as exc:
+            self._logger.warning('Failed to write job metrics: %s', str(exc))
+    # _write_metrics()
+
     def _write_result(self, ret_code, cleanup_code=None):
         """
         Write the result file with exit code, cleanup code and end time,
-        one in each of three lines.
+        one in each of three lines. The metrics file is written before so
+        that it is available once the scheduler reads the result.
 
         Args:
             ret_code (int): status code for the start method of the machine
@@ -209,6 +256,8 @@ class MachineWrapper:
         Returns:
         Raises:
         """
+        self._write_metrics()
+
         status = [str(ret_code)]
 
         if cleanup_code is not None:
@@ -216,6 +265,9 @@ class MachineWrapper:
 
         status.append(datetime.utcnow().strftime(DATE_FORMAT))
 
+        # the output is complete once the result file exists
+        sys.stdout.flush()
+        sys.stderr.flush()
         with open(self._result_file, 'w') as result_file:
             result_file.write('{}\n'.format('\n'.join(status)))
 
@@ -396,6 +448,156 @@ class MachineWrapper:
 # MachineWrapper
 
 
+def _read_stages(output_path, end_time):
+    """
+    Compute the time spent in each state machine stage from the markers
+    logged in the job output. A stage lasts until the next marker or the end
+    of the job.
+
+    Args:
+        output_path (str): path to the job output file
+        end_time (datetime): end of the last stage, in local time like the
+                             log messages
+
+    Returns:
+        list: dicts with the stage name and its duration in seconds
+    """
+    markers = []
+    with open(output_path, 'rb') as output_file:
+        for line in output_file:
+            for marker in STAGE_MARKERS:
+                index = line.find(marker)
+                if index == -1:
+                    continue
+                try:
+                    start = datetime.strptime(
+                        line.split(b' | ', 1)[0].decode('ascii'),
+                        LOG_DATE_FORMAT)
+                except ValueError:
+                    break
+                name = line[index + len(marker):].decode(
+                    'utf-8', 'replace').strip()
+                markers.append((name, start))
+                break
+
+    stages = []
+    for index, (name, start) in enumerate(markers):
+        if index + 1 < len(markers):
+            end = markers[index + 1][1]
+        else:
+            end = end_time
+        stages.append({
+            'name': name,
+            'seconds': max(int((end - start).total_seconds()), 0)
+        })
+    return stages
+# _read_stages()
+
+
+def _read_cgroup_file(path):
+    """
+    Read a cgroup statistics file
+
+    Args:
+        path (str): path relative to the cgroup mount point
+
+    Returns:
+        list: lines of the file split in fields, empty if not available
+    """
+    try:
+        with open('{}/{}'.format(CGROUP_DIR, path), 'r') as stat_file:
+            return [line.split() for line in stat_file]
+    except OSError:
+        return []
+# _read_cgroup_file()
+
+
+def _read_cgroup_stats():
+    """
+    Read the cpu, memory and block io accounting of the process' cgroup,
+    from cgroup v2 or v1 controllers, whichever is mounted.
+
+    Returns:
+        dict: available statistics
+    """
+    stats = {}
+    # cgroup v2: a single hierarchy with the controllers' files
+    if os.path.exists('{}/cgroup.controllers'.format(CGROUP_DIR)):
+        for fields in _read_cgroup_file('cpu.stat'):
+            if fields[0] == 'usage_usec':
+                stats['cpu_seconds'] = int(fields[1]) / 1000000
+        for fields in _read_cgroup_file('memory.peak'):
+            stats['max_memory_bytes'] = int(fields[0])
+        io_lines = _read_cgroup_file('io.stat')
+        if io_lines:
+            stats['read_bytes'] = stats['write_bytes'] = 0
+        for fields in io_lines:
+            for field in fields[1:]:
+                key, _, value = field.partition('=')
+                if key == 'rbytes':
+                    stats['read_bytes'] += int(value)
+                elif key == 'wbytes':
+                    stats['write_bytes'] += int(value)
+        return stats
+
+    # cgroup v1: one hierarchy per controller
+    for fields in _read_cgroup_file('cpuacct/cpuacct.usage'):
+        stats['cpu_seconds'] = int(fields[0]) / 1000000000
+    for fields in _read_cgroup_file('memory/memory.max_usage_in_bytes'):
+        stats['max_memory_bytes'] = int(fields[0])
+    io_lines = _read_cgroup_file('blkio/blkio.throttle.io_service_bytes')
+    if io_lines:
+        stats['read_bytes'] = stats['write_bytes'] = 0
+    for fields in io_lines:
+        # the last line has the total of all devices
+        if len(fields) != 3:
+            continue
+        if fields[1] == 'Read':
+            stats['read_bytes'] += int(fields[2])
+        elif fields[1] == 'Write':
+            stats['write_bytes'] += int(fields[2])
+    return stats
+# _read_cgroup_stats()
+
+
+def collect_metrics(run_dir, cgroup_stats=False):
+    """
+    Collect the resource usage of the current process and its children,
+    which is preserved across the exec of the interruption cleanup.
+
+    Args:
+        run_dir (str): job directory, where the output file is
+        cgroup_stats (bool): whether to add the statistics of the cgroup
+
+    Returns:
+        dict: job metrics
+    """
+    usages = (resource.getrusage(resource.RUSAGE_SELF),
+              resource.getrusage(resource.RUSAGE_CHILDREN))
+    # block counts are in units of 512 bytes, max rss in kilobytes
+    metrics = {
+        'cpu_seconds': round(
+            sum(usage.ru_utime + usage.ru_stime for usage in usages), 3),
+        'max_rss_bytes': max(usage.ru_maxrss for usage in usages) * 1024,
+        'read_bytes': sum(usage.ru_inblock for usage in usages) * 512,
+        'write_bytes': sum(usage.ru_oublock for usage in usages) * 512,
+    }
+
+    output_path = '{}/output'.format(run_dir)
+    try:
+        metrics['output_bytes'] = os.path.getsize(output_path)
+        metrics['stages'] = _read_stages(output_path, datetime.now())
+    except OSError:
+        metrics['output_bytes'] = 0
+        metrics['stages'] = []
+
+    if cgroup_stats:
+        metrics['cgroup'] = _read_cgroup_stats()
+
+    return metrics
+# collect_metrics()
+
+
 def do_interruption_cleanup():
     """
     Read pre-pickled parameters for a machine wrapper and run the cleanup
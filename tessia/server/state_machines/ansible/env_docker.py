@@ -20,10 +20,11 @@ Docker based run environment
 # IMPORTS
 #
 from io import BytesIO
+from tessia.server.lib.docker_image import DockerImage
+from tessia.server.lib.repo_cache import REPO_CACHE
 from tessia.server.state_machines.ansible.env_base import EnvBase
 
 import docker
-import json
 import logging
 import os
 import tarfile
@@ -61,49 +62,11 @@ class EnvDocker(EnvBase):
         # docker client
         self._client = docker.from_env()
 
-        self._image_name = '{}:latest'.format(IMAGE_NAME)
-    # __init__()
-
-    def _docker_build(self):
-        """
-        Build the docker image
-        """
         context_dir = os.path.abspath('{}/docker_build'.format(
             os.path.dirname(os.path.abspath(__file__))))
-
-        self._logger.info('building docker image %s, this might take a while',
-                          self._image_name)
-        lines = self._client.api.build(
-            path=context_dir, tag=self._image_name,
-            nocache=True,
-            # Removes the intermediate containers after an unsuccessful build.
-            # The intermediate containers are not removed when the build
-            # process is killed by any signal.
-            # In this case the cleanup method deletes the dangling images.
-            forcerm=True
-        )
-
-        output = ""
-        for line in lines:
-            line_json = json.loads(line.decode('utf-8'))
-            # WARNING: be careful when parsing the json output as it
-            # can also contain a key named 'aux'.
-            if 'stream' in line_json:
-                self._logger.debug(line_json['stream'])
-                output += line_json['stream']
-            if 'errorDetail' in line_json:
-                raise RuntimeError('Image build failed: {}'.format(
-                    line_json['errorDetail']['message'])) from None
-
-        # Detect if the build process was killed by a signal e.g. an external
-        # entity calls docker kill.
-        # Check if the output contains the final two success messages,
-        # otherwise raise an exception.
-        if not ("Successfully built" in output and
-                "Successfully tagged" in output):
-            raise RuntimeError('Image build failed: The build process is '
-                               'incomplete')
-    # _docker_build()
+        self._image = DockerImage(self._client, IMAGE_NAME, context_dir)
+        self._image_name = self._image.tag
+    # __init__()
 
     def _upload_configuration(self, container_obj, config_dir):
         """
@@ -132,10 +95,7 @@ class EnvDocker(EnvBase):
         """
         # build is not run in __init__ method because the cleanup process gets
         # stuck when the build fails.
-        try:
-            self._client.images.get(self._image_name)
-        except docker.errors.ImageNotFound:
-            self._docker_build()
+        self._image.build()
     # build()
 
     def run(self, repo_url, repo_dir, playbook_name, galaxy_req=None,
@@ -188,25 +148,34 @@ class EnvDocker(EnvBase):
 
         self._logger.debug('container status is <%s>', container_obj.status)
 
-        # To get the ExitCode of docker exec the low level api of
-        # docker py is used because there is no way at a higher level.
-        exec_id = self._client.api.exec_create(
-            container_obj.name,
-            '/assets/downloader.py',
-            environment={
-                'TESSIA_ANSIBLE_DOCKER_REPO_URL': repo_url,
-                'TESSIA_ANSIBLE_DOCKER_LOG_LEVEL': (
-                    self._logger.getEffectiveLevel())
-            },
-            workdir=PLAYBOOK_DIR)
-        lines = self._client.api.exec_start(exec_id['Id'], stream=True)
-        ret = {'Running': True, 'ExitCode': 0}
-        while ret['Running']:
-            ret = self._client.api.exec_inspect(exec_id['Id'])
-            for line in lines:
-                print(line.decode('utf-8'), end='')
-        if ret['ExitCode'] != 0:
-            raise RuntimeError('Failed to download repository')
+        # repository available in the server cache: copy it instead of
+        # downloading in the container
+        archive_path = REPO_CACHE.get_archive(
+            repo_url, 'ansible', default_branches=('main', 'master'))
+        if archive_path:
+            self._logger.info('copying repository from cache')
+            with open(archive_path, 'rb') as archive_fd:
+                container_obj.put_archive(PLAYBOOK_DIR, archive_fd)
+        else:
+            # To get the ExitCode of docker exec the low level api of
+            # docker py is used because there is no way at a higher level.
+            exec_id = self._client.api.exec_create(
+                container_obj.name,
+                '/assets/downloader.py',
+                environment={
+                    'TESSIA_ANSIBLE_DOCKER_REPO_URL': repo_url,
+                    'TESSIA_ANSIBLE_DOCKER_LOG_LEVEL': (
+                        self._logger.getEffectiveLevel())
+                },
+                workdir=PLAYBOOK_DIR)
+            lines = self._client.api.exec_start(exec_id['Id'], stream=True)
+            ret = {'Running': True, 'ExitCode': 0}
+            while ret['Running']:
+                ret = self._client.api.exec_inspect(exec_id['Id'])
+                for line in lines:
+                    print(line.decode('utf-8'), end='')
+            if ret['ExitCode'] != 0:
+                raise RuntimeError('Failed to download repository')
 
         # Copy inventory and config files to the ansible container.
         self._upload_configuration(container_obj, repo_dir)
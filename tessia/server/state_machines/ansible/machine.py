@@ -24,6 +24,7 @@ from jsonschema import validate
 from tessia.server.db.connection import MANAGER
 from tessia.server.db.models import System
 from tessia.server.db.models import SystemProfile
+from tessia.server.lib.ttl_cache import TtlCache
 from tessia.server.state_machines.base import BaseMachine
 from tessia.server.state_machines.ansible.env_docker import EnvDocker
 from tessia.server.state_machines.autoinstall.machine import AutoInstallMachine
@@ -42,6 +43,12 @@ import yaml
 # CONSTANTS AND DEFINITIONS
 #
 
+# results of source url verifications are kept for some time so that
+# requests for the same repository do not contact it again; failures are
+# kept shorter so that a fixed repository is soon accepted
+SOURCE_CHECKS = TtlCache(ttl=300, error_ttl=30)
+# timeout in seconds for the verification of a git source
+SOURCE_CHECK_TIMEOUT = 60
 # name of inventory file created by tessia
 INVENTORY_FILE_NAME = 'tessia-hosts'
 # description for scheduler
@@ -289,27 +296,40 @@ class AnsibleMachine(BaseMachine):
                 if not repo['git_branch']:
                     repo['git_branch'] = 'master'
 
-            process_env = os.environ.copy()
-            process_env['GIT_SSL_NO_VERIFY'] = 'true'
-            try:
-                subprocess.run(
-                    ['git', 'ls-remote', git_url],
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.PIPE,
-                    env=process_env,
-                    check=True,
-                    universal_newlines=True
-                )
-            except subprocess.CalledProcessError as exc:
-                # re-raise and suppress context, which has unscreened repo url
-                raise ValueError('Source url is not accessible: {} {}'.format(
-                    str(exc).replace(git_url, repo['url_obs']),
-                    exc.stderr.replace(
-                        git_url, repo['url_obs']))) from None
-            except OSError as exc:
-                # re-raise and suppress context, which has unscreened repo url
-                raise RuntimeError('Failed to execute git: {}'.format(
-                    str(exc).replace(git_url, repo['url_obs']))) from None
+            def _verify_git():
+                """Check that the repository is accessible"""
+                process_env = os.environ.copy()
+                process_env['GIT_SSL_NO_VERIFY'] = 'true'
+                try:
+                    subprocess.run(
+                        ['git', 'ls-remote', git_url],
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.PIPE,
+                        env=process_env,
+                        check=True,
+                        universal_newlines=True,
+                        timeout=SOURCE_CHECK_TIMEOUT
+                    )
+                except subprocess.CalledProcessError as exc:
+                    # re-raise and suppress context, which has unscreened
+                    # repo url
+                    raise ValueError(
+                        'Source url is not accessible: {} {}'.format(
+                            str(exc).replace(git_url, repo['url_obs']),
+                            exc.stderr.replace(
+                                git_url, repo['url_obs']))) from None
+                except subprocess.TimeoutExpired:
+                    raise ValueError(
+                        'Source url is not accessible: timed out after '
+                        '{} seconds'.format(SOURCE_CHECK_TIMEOUT)) from None
+                except OSError as exc:
+                    # re-raise and suppress context, which has unscreened
+                    # repo url
+                    raise RuntimeError('Failed to execute git: {}'.format(
+                        str(exc).replace(git_url, repo['url_obs']))) from None
+            # _verify_git()
+
+            SOURCE_CHECKS.get(git_url, _verify_git)
 
         # http source: use the requests lib to verify it
         elif repo['type'] == 'web':
@@ -320,21 +340,25 @@ class AnsibleMachine(BaseMachine):
                 raise ValueError(
                     "Unsupported file format '{}'".format(file_name))
 
-            # verify if url is accessible
-            try:
-                # set a reasonable timeout, let's not wait too long as the
-                # scheduler is possibly waiting
-                resp = requests.get(
-                    source_url, stream=True, verify=False, timeout=5)
-                resp.raise_for_status()
-                resp.close()
-            except requests.exceptions.HTTPError as exc:
-                raise ValueError(
-                    "Source url is not accessible: {} {}".format(
-                        exc.response.status_code, exc.response.reason))
-            except requests.exceptions.RequestException as exc:
-                raise ValueError(
-                    "Source url is not accessible: {}".format(str(exc)))
+            def _verify_web():
+                """Check that the file is accessible"""
+                try:
+                    # set a reasonable timeout, let's not wait too long as
+                    # other requests are possibly waiting
+                    resp = requests.get(
+                        source_url, stream=True, verify=False, timeout=5)
+                    resp.raise_for_status()
+                    resp.close()
+                except requests.exceptions.HTTPError as exc:
+                    raise ValueError(
+                        "Source url is not accessible: {} {}".format(
+                            exc.response.status_code, exc.response.reason))
+                except requests.exceptions.RequestException as exc:
+                    raise ValueError(
+                        "Source url is not accessible: {}".format(str(exc)))
+            # _verify_web()
+
+            SOURCE_CHECKS.get(source_url, _verify_web)
 
         else:
             raise ValueError('Unsupported source url specified')
@@ -716,6 +740,14 @@ class AnsibleMachine(BaseMachine):
         return result
     # parse()
 
+    @classmethod
+    def prepare(cls):
+        """
+        Build the docker image so that the first job does not wait for it.
+        """
+        EnvDocker().build()
+    # prepare()
+
     @classmethod
     def prefilter(cls, params):
         """
@@ -29,6 +29,7 @@ provides writeback interface to database
 # IMPORTS
 #
 from datetime import datetime
+from sqlalchemy.orm import joinedload, selectinload
 from sqlalchemy.orm.attributes import flag_modified
 from tessia.server.db.connection import _DbManager
 from tessia.server.db.models import OperatingSystem, Repository, SystemIface
@@ -44,7 +45,20 @@ import re
 #
 # CONSTANTS AND DEFINITIONS
 #
-
+# relationships walked when building the model are loaded together with the
+# entries, otherwise each lazy-loaded attribute would issue its own query.
+# Two levels of hypervisors cover the deepest chain (i.e. zvm guest, lpar and
+# cpc).
+SYSTEM_LOAD_OPTIONS = (
+    joinedload(System.hypervisor_rel).joinedload(System.hypervisor_rel),
+)
+PROFILE_LOAD_OPTIONS = (
+    selectinload(SystemProfile.storage_volumes_rel),
+    selectinload(SystemProfile.system_ifaces_rel).selectinload(
+        SystemIface.ip_address_rel),
+    joinedload(SystemProfile.hypervisor_profile_rel).selectinload(
+        SystemProfile.storage_volumes_rel),
+)
 
 #
 # CODE
@@ -57,6 +71,10 @@ class DbController:
 
     def __init__(self, manager: _DbManager):
         self._manager = manager
+        # entries already retrieved, keyed by system name and
+        # (system name, profile name)
+        self._systems = {}
+        self._sysprof_entries = {}
     # __init__()
 
     def _get_cpc_boot_method(self, profile):
@@ -130,18 +148,40 @@ class DbController:
         )
         return model_subnet
 
-    def _get_sysprof_entries(self, system_name, profile_name):
+    def _get_system_entry(self, system_name):
         """
-        Retrieve system and profile database entries
+        Retrieve system database entry along with its hypervisor chain
         """
-        system = System.query.filter(
+        try:
+            return self._systems[system_name]
+        except KeyError:
+            pass
+
+        system = System.query.options(*SYSTEM_LOAD_OPTIONS).filter(
             System.name == system_name
         ).one_or_none()
         if system is None:
             raise ValueError('System {} not found'.format(system_name))
+        self._systems[system_name] = system
+        return system
+    # _get_system_entry()
 
+    def _get_sysprof_entries(self, system_name, profile_name):
+        """
+        Retrieve system and profile database entries. Entries are retrieved
+        only once per controller, with the relationships needed to build
+        the model already loaded.
+        """
+        try:
+            return self._sysprof_entries[(system_name, profile_name)]
+        except KeyError:
+            pass
+
+        system = self._get_system_entry(system_name)
         if profile_name is not None:
-            profile = SystemProfile.query.join(
+            profile = SystemProfile.query.options(
+                *PROFILE_LOAD_OPTIONS
+            ).join(
                 'system_rel'
             ).filter(
                 SystemProfile.name == profile_name
@@ -152,7 +192,9 @@ class DbController:
                 raise ValueError('Profile {} for system {} not found'.format(
                     profile_name, system_name))
         else:
-            profile = SystemProfile.query.join(
+            profile = SystemProfile.query.options(
+                *PROFILE_LOAD_OPTIONS
+            ).join(
                 'system_rel'
             ).filter(
                 SystemProfile.default == bool(True)
@@ -164,8 +206,69 @@ class DbController:
                     'Default profile for system {} not available'.format(
                         system_name)
                 )
+        self._sysprof_entries[(system_name, profile_name)] = (system, profile)
         return (system, profile)
 
+    def check_default_profile(self, system_name):
+        """
+        Verify that a system has a default profile, without loading the
+        profile itself
+
+        Args:
+            system_name (str): system name
+
+        Raises:
+            ValueError: system not found or without default profile
+        """
+        system = self._get_system_entry(system_name)
+        profile_id = SystemProfile.query.with_entities(
+            SystemProfile.id
+        ).filter(
+            SystemProfile.system_id == system.id
+        ).filter(
+            SystemProfile.default == bool(True)
+        ).first()
+        if profile_id is None:
+            raise ValueError(
+                'Default profile for system {} not available'.format(
+                    system_name))
+    # check_default_profile()
+
+    def get_profile_entry(self, system_name, profile_name):
+        """
+        Return the profile database entry with the relationships needed to
+        build the model loaded
+
+        Args:
+            system_name (str): system name
+            profile_name (str): profile name, None for the default profile
+
+        Returns:
+            SystemProfile: profile entry
+
+        Raises:
+            ValueError: system or profile not found
+        """
+        _, profile = self._get_sysprof_entries(system_name, profile_name)
+        return profile
+    # get_profile_entry()
+
+    def get_system_entry(self, system_name):
+        """
+        Return the system database entry along with its hypervisor chain
+
+        Args:
+            system_name (str): system name
+
+        Returns:
+            System: system entry
+
+        Raises:
+            ValueError: system not found
+        """
+        return self._get_system_entry(system_name)
+    # get_system_entry()
+
     def get_system(self, system_name, profile_name):
         """
         Return data required for autoinstall machine
@@ -369,8 +472,9 @@ class DbController:
         Raises:
             ValueError: in case specified os does not exist
         """
-        os_entry = OperatingSystem.query.filter_by(
-            name=os_name).one_or_none()
+        os_entry = OperatingSystem.query.options(
+            selectinload(OperatingSystem.repository_rel)
+        ).filter_by(name=os_name).one_or_none()
         if os_entry is None:
             raise ValueError('OS {} not found'.format(os_name))
         operating_system = AutoinstallMachineModel.OperatingSystem(
@@ -382,11 +486,7 @@ class DbController:
             template_name=os_entry.template
         )
 
-        system = System.query.filter(
-            System.name == system_name
-        ).one_or_none()
-        if system is None:
-            raise ValueError('System {} not found'.format(system_name))
+        system = self._get_system_entry(system_name)
 
         arch = system.type_rel.arch_rel.name
         if arch == AARCH64:
@@ -435,6 +535,13 @@ class DbController:
         os_repos = []
         package_repos = []
 
+        # retrieve all registered repositories referenced at once
+        repo_objs = {}
+        if custom_repos:
+            for repo_obj in Repository.query.filter(
+                    Repository.name.in_(custom_repos)):
+                repo_objs[repo_obj.name] = repo_obj
+
         # check the repositories specified by the user
         for repo_entry in custom_repos:
             if (repo_entry.split('://')[0] in ('http', 'https', 'ftp', 'file')
@@ -459,7 +566,7 @@ class DbController:
                 continue
 
             # see if name refers to a registered repository
-            repo_obj = Repository.query.filter_by(name=repo_entry).first()
+            repo_obj = repo_objs.get(repo_entry)
             if not repo_obj:
                 raise ValueError(
                     "Repository <{}> specified by user does not exist"
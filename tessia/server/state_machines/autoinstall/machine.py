@@ -121,7 +121,10 @@ class AutoInstallMachine(BaseMachine):
         self._log_config(self._params.get('verbosity'))
         self._logger = logging.getLogger(__name__)
 
-        self._model = self._model_from_params(self._params)
+        # same controller for all queries, so that entries retrieved to build
+        # the model are reused later
+        self._dbctrl = DbController(MANAGER)
+        self._model = self._model_from_params(self._params, self._dbctrl)
         self._machine = self._create_machine()
     # __init__()
 
@@ -155,33 +158,13 @@ class AutoInstallMachine(BaseMachine):
         installed.
         """
         self._model.validate()
-
-        # model can accept any OS type, but we have only this many implemented
+        sm_class = self._get_machine_class(self._model)
         os_entry = self._model.operating_system
-        if os_entry.type not in SUPPORTED_TYPES:
-            raise ValueError("OS type '{}' is not supported for installation"
-                             .format(os_entry.type))
 
-        if os_entry.type == 'debian' and os_entry.major >= 2004:
-            if os_entry.minor == 0 and self._model.ubuntu20_legacy_installer:
-                self._logger.info("NOTE: tessia_option_installer=legacy"
-                                  " is specified in the profile")
-                self._logger.info("NOTE: please make sure that repo and"
-                                  " template are set accordingly")
-                self._logger.info("NOTE: failure to do so will result in"
-                                  " cryptic error messages")
-                sm_class = SUPPORTED_TYPES[os_entry.type]
-            else:
-                sm_class = SmSubiquityInstaller
-        elif os_entry.type == 'suse' and os_entry.major >= 16:
-            sm_class = SmAgama
-        else:
-            sm_class = SUPPORTED_TYPES[os_entry.type]
-
-        dbctrl = DbController(MANAGER)
         platform = self._create_platform()
-        # PostInstallChecker expects database objects, so we fetch them again
-        _, profile_obj = dbctrl._get_sysprof_entries(
+        # PostInstallChecker expects database objects, these were already
+        # retrieved when the model was created
+        profile_obj = self._dbctrl.get_profile_entry(
             self._model.system_profile.system_name,
             self._model.system_profile.profile_name)
 
@@ -192,7 +175,7 @@ class AutoInstallMachine(BaseMachine):
                            sm_class.__name__, str(os_entry))
         machine = sm_class(self._model, platform,
                            post_install_checker=post_install)
-        machine.persist_init_data(dbctrl)
+        machine.persist_init_data(self._dbctrl)
         return machine
     # _create_machine()
 
@@ -237,13 +220,42 @@ class AutoInstallMachine(BaseMachine):
                                                 template_content)
     # _get_installer_cmdline_template()
 
-    def _model_from_params(self, params):
+    @staticmethod
+    def _get_machine_class(model: AutoinstallMachineModel):
+        """
+        Return the state machine class for the operating system being
+        installed
+        """
+        logger = logging.getLogger(__name__)
+        # model can accept any OS type, but we have only this many implemented
+        os_entry = model.operating_system
+        if os_entry.type not in SUPPORTED_TYPES:
+            raise ValueError("OS type '{}' is not supported for installation"
+                             .format(os_entry.type))
+
+        if os_entry.type == 'debian' and os_entry.major >= 2004:
+            if os_entry.minor == 0 and model.ubuntu20_legacy_installer:
+                logger.info("NOTE: tessia_option_installer=legacy"
+                            " is specified in the profile")
+                logger.info("NOTE: please make sure that repo and"
+                            " template are set accordingly")
+                logger.info("NOTE: failure to do so will result in"
+                            " cryptic error messages")
+                sm_class = SUPPORTED_TYPES[os_entry.type]
+            else:
+                sm_class = SmSubiquityInstaller
+        elif os_entry.type == 'suse' and os_entry.major >= 16:
+            sm_class = SmAgama
+        else:
+            sm_class = SUPPORTED_TYPES[os_entry.type]
+        return sm_class
+    # _get_machine_class()
+
+    @classmethod
+    def _model_from_params(cls, params, dbctrl: DbController):
         """
         Create model from machine params
         """
-        # we can use static class, not an instance,
-        # because instance only makes sure database is connected
-        dbctrl = DbController(MANAGER)
         os_entry, os_repos = dbctrl.get_os(params['system'],
                                            params['os'])
 
@@ -256,7 +268,7 @@ class AutoInstallMachine(BaseMachine):
                              .format(os_entry.name))
 
         # get installer template
-        installer_template = self._get_installer_cmdline_template(os_entry)
+        installer_template = cls._get_installer_cmdline_template(os_entry)
 
         system_model = dbctrl.get_system(params['system'],
                                          params.get("profile"))
@@ -264,7 +276,7 @@ class AutoInstallMachine(BaseMachine):
         # via gateway interface define on the system
         gateway_subnets = [network.subnet for network in
                            system_model.list_gateway_networks()]
-        accessible_os_repos = self._filter_os_repos_by_subnet(
+        accessible_os_repos = cls._filter_os_repos_by_subnet(
             os_repos, gateway_subnets)
         if not accessible_os_repos:
             # fallback if no "better" repo was found
@@ -333,8 +345,11 @@ class AutoInstallMachine(BaseMachine):
 
         # make a few requests to get necessary parameters
         dbctrl = DbController(MANAGER)
-        # check which format the profile parameter is using
-        system, _ = dbctrl._get_sysprof_entries(params['system'], None)
+        # only the system and its hypervisor chain are needed here, the
+        # profile is loaded by the machine when the job starts
+        system = dbctrl.get_system_entry(params['system'])
+        # fail early for a system which cannot be installed
+        dbctrl.check_default_profile(params['system'])
         os_entry, _ = dbctrl.get_os(params['system'],
                                     params['os'])
         result = {
@@ -363,6 +378,34 @@ class AutoInstallMachine(BaseMachine):
         return result
     # parse()
 
+    @classmethod
+    def preflight(cls, params):
+        """
+        Render the templates of an installation request without executing
+        it. Nothing is changed in the database or on the target system, which
+        allows templates to be validated against a system profile.
+
+        Args:
+            params (str): string representation of JSON object
+                          with schema INSTALL_REQ_PARAMS_SCHEMA
+
+        Returns:
+            dict: rendered content keyed by 'autofile' and 'cmdline'
+
+        Raises:
+            SyntaxError: if content is in wrong format.
+            ValueError: if certain properties are not defined.
+        """
+        MANAGER.connect()
+        model = cls._model_from_params(cls.parse(params)['params'],
+                                       DbController(MANAGER))
+        model.validate()
+        sm_class = cls._get_machine_class(model)
+        # target system is not touched so no platform is needed
+        machine = sm_class(model, None)
+        return machine.render_templates()
+    # preflight()
+
     def start(self):
         """
         Proxy the call to the real machine to start execution.
@@ -22,9 +22,11 @@ Interface for epresentation of each platform type
 from tessia.server.state_machines.autoinstall.model import \
     AutoinstallMachineModel
 from tessia.baselib.common.ssh.client import SshClient
+from threading import Thread
 
 import abc
 import logging
+import sys
 
 #
 # CONSTANTS AND DEFINITIONS
@@ -40,6 +42,64 @@ HYP_TYPES_BASELIB = {
 #
 
 
+class HypThread(Thread):
+    """
+    Thread running a hypervisor operation which keeps going while the state
+    machine continues (i.e. a boot providing console output). Exceptions
+    are stored so that the caller can propagate them.
+    """
+
+    def __init__(self, name, target, *args):
+        """
+        Constructor
+
+        Args:
+            name (str): thread name
+            target (Callable): thread main function
+            args (Iterable): arguments to thread main function
+        """
+        super().__init__(name=name, target=target, args=args)
+        self.exc_info = None
+    # __init__()
+
+    def run(self):
+        """
+        Run with exception handling
+        """
+        try:
+            super().run()
+        except Exception:
+            self.exc_info = sys.exc_info()
+    # run()
+
+    def wait_event(self, event, error_msg, interval=5.):
+        """
+        Wait until the operation signals the event or the thread ends
+
+        Args:
+            event (threading.Event): event set by the operation
+            error_msg (str): message of the exception raised if the
+                             operation failed
+            interval (float): seconds between checks of the thread state
+
+        Returns:
+            bool: True if event was set, False if thread ended without it
+
+        Raises:
+            RuntimeError: if the operation failed, chained to its exception
+        """
+        while not event.wait(interval) and self.is_alive():
+            pass
+        if self.exc_info:
+            logging.getLogger(__name__).debug(
+                '%s exception: %s', self.name, str(self.exc_info[1]))
+            raise RuntimeError(error_msg) from self.exc_info[1]
+        return event.is_set()
+    # wait_event()
+
+# HypThread
+
+
 class PlatBase(metaclass=abc.ABCMeta):
     """
     Base class for all platforms
@@ -20,7 +20,6 @@ Module to deal with operations on LPARs
 # IMPORTS
 #
 from collections import defaultdict
-from queue import Queue
 
 from tessia.baselib.hypervisors.hmc import HypervisorHmc
 from tessia.baselib.hypervisors.hmc.volume_descriptor import \
@@ -28,12 +27,12 @@ from tessia.baselib.hypervisors.hmc.volume_descriptor import \
 from tessia.server.state_machines.autoinstall.model import \
     AutoinstallMachineModel
 from tessia.server.config import Config
-from tessia.server.state_machines.autoinstall.plat_base import PlatBase
-from threading import Event, Thread
+from tessia.server.state_machines.autoinstall.plat_base import HypThread, \
+    PlatBase
+from threading import Event
 from urllib.parse import urljoin, urlsplit
 
 import logging
-import sys
 
 #
 # CONSTANTS AND DEFINITIONS
@@ -44,33 +43,6 @@ import sys
 #
 
 
-class HmcThread(Thread):
-    """
-    Thread for handling HMC communications
-    """
-
-    def __init__(self, exc_store, target, *args):
-        """
-        Init with exception storage
-
-        Args:
-            exc_store (Queue): a thread-safe storage for exception information
-            target (Callable): thread main function
-            args (Iterable): arguments to thread main function
-        """
-        Thread.__init__(self, name='hmc-thread', target=target, args=args)
-        self.exc_store = exc_store
-
-    def run(self):
-        """
-        Run with exception handling
-        """
-        try:
-            super().run()
-        except Exception:
-            self.exc_store.put(sys.exc_info())
-
-
 class PlatLpar(PlatBase):
     """
     Handling for HMC's LPARs
@@ -398,22 +370,15 @@ class PlatLpar(PlatBase):
         # If an exception happens in the thread before boot happened,
         # we should re-raise it to stop further processing
         boot_notification = Event()
-        exception_store = Queue()
-        hyp_thread = HmcThread(
-            exception_store, self._hyp_obj.start,
+        hyp_thread = HypThread(
+            'hmc-thread', self._hyp_obj.start,
             guest_name, 0, 0, params, boot_notification)
         hyp_thread.start()
 
         # wait until either we have been notified that we can go on,
         # or baselib thread has exited for some reason
-        while not boot_notification.wait(5.) and hyp_thread.is_alive():
-            pass
-        if not exception_store.empty():
-            exc_info = exception_store.get()
-            self._logger.debug('HMC thread exception: %s', str(exc_info[1]))
-            raise RuntimeError("Failed to start installation") from exc_info[1]
-
-        if boot_notification.is_set():
+        if hyp_thread.wait_event(
+                boot_notification, "Failed to start installation"):
             self._logger.debug("Received initial boot complete notification")
     # start_installer()
 # PlatLpar
@@ -22,6 +22,8 @@ Machine for auto installation of Agama installer based operating systems
 from tessia.server.state_machines.autoinstall.plat_base import PlatBase
 from tessia.server.state_machines.autoinstall.sm_base import SmBase
 from tessia.server.state_machines.autoinstall.sm_base import TEMPLATES_DIR
+from tessia.server.state_machines.autoinstall.template_cache import \
+    TEMPLATE_CACHE
 from tessia.server.state_machines.autoinstall.model import (
     AutoinstallMachineModel,
 )
@@ -31,7 +33,6 @@ import logging
 import os
 from time import sleep, time
 
-import jinja2
 import yaml
 
 #
@@ -81,7 +82,7 @@ class SmAgama(SmBase):
             self._os.type,
         )
 
-        template_obj = jinja2.Template(template_content)
+        template_obj = TEMPLATE_CACHE.get(template_filename, template_content)
         return template_obj.render(config=self._info).strip()
 
     def _fetch_lines_until_end(self, shell, line_offset):
@@ -129,12 +130,7 @@ class SmAgama(SmBase):
         Fill the template and create the autofile in the target location
         """
         self._remove_autofile()
-        template = jinja2.Template(self._template.content)
-        self._logger.info(
-            "autotemplate will be used: '%s'", self._template.name
-        )
-
-        autofile_content = template.render(config=self._info)
+        autofile_content = self._render_autofile()
 
         with open(self._autofile_path, "w", encoding="utf-8") as autofile:
             yaml_dict = yaml.safe_load(autofile_content)
@@ -123,10 +123,9 @@ class SmAnaconda(SmBase):
 
     def wait_install(self):
         """
-        Waits for the installation. This method periodically checks the
+        Waits for the installation. This method follows the
         /tmp/anaconda.log file in the system and looks for a string that
-        indicates that the process has finished. There is a timeout of 10
-        minutes.
+        indicates that the process has finished or failed.
         """
         ssh_client, shell = self._get_ssh_conn()
 
@@ -146,53 +145,33 @@ class SmAnaconda(SmBase):
             raise TimeoutError(
                 'Timed out while waiting for installation logfile')
 
-        cmd_read_line = "tail -n +{} " + logfile_path + " | head -n 100"
-        termination_string = "Thread Done: AnaConfigurationThread"
-        termination_string_fedora_31 = "ui.gui.spokes.installation_progress:" \
-                                       " The installation has finished."
-        termination_string_rhel_10 = "ui.tui.spokes.installation_progress:" \
-                                       " The installation has finished."
+        termination_strings = [
+            "Thread Done: AnaConfigurationThread",
+            "ui.gui.spokes.installation_progress:"
+            " The installation has finished.",
+            "ui.tui.spokes.installation_progress:"
+            " The installation has finished.",
+        ]
         # re to match errors with partitioning scheme
-        part_error_regex = re.compile(
-            r'^.* ERR anaconda: storage configuration failed: *(.*)$',
-            re.MULTILINE
-        )
-
-        # Performs consecutive calls to tail to extract the end of the file
-        # from a previous start point.
-        max_wait_install = self._model.install_timeout
-        timeout_installation = time() + max_wait_install
-        line_offset = 1
-        success = False
-        while time() <= timeout_installation:
-            ret, out = shell.run(cmd_read_line.format(line_offset))
-            out = out.rstrip('\n')
-            if not out:
-                sleep(frequency_check)
-                continue
-
-            line_offset += len(out.split('\n'))
-            self._logger.info(out)
-
-            if out.find(termination_string) != -1 or \
-                    out.find(termination_string_fedora_31) != -1 or \
-                    out.find(termination_string_rhel_10) != -1:
-                success = True
-                break
+        part_error_regex = (
+            r'^.* ERR anaconda: storage configuration failed: *(.*)$')
 
-            match = part_error_regex.search(out)
-            if match is not None:
-                raise RuntimeError(
-                    'Anaconda storage configuration failed: ' + match.group(1))
-
-            sleep(frequency_check)
+        # follow the log until the installation finishes or fails
+        result = self._follow_log(
+            shell, logfile_path,
+            [re.escape(string) for string in termination_strings],
+            [part_error_regex], self._model.install_timeout)
 
         shell.close()
         ssh_client.logoff()
 
-        if not success:
+        if result is None:
             raise TimeoutError('Installation Timeout: The installation'
                                ' process is taking too long')
+        success, match = result
+        if not success:
+            raise RuntimeError(
+                'Anaconda storage configuration failed: ' + match.group(1))
 
         return success
     # wait_install()
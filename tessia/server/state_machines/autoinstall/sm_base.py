@@ -29,15 +29,18 @@ from tessia.server.config import Config
 from tessia.server.state_machines.autoinstall.model import \
     AutoinstallMachineModel
 from tessia.server.state_machines.autoinstall.plat_kvm import PlatKvm
+from tessia.server.state_machines.autoinstall.template_cache import \
+    TEMPLATE_CACHE
 from time import sleep, monotonic
 from urllib.parse import urlsplit
 
 import abc
 import crypt
 import ipaddress
-import jinja2
 import logging
 import os
+import re
+import shlex
 
 #
 # CONSTANTS AND DEFINITIONS
@@ -51,10 +54,46 @@ CONNECTION_RETRY_INTERVAL = 20
 # directory containing the kernel cmdline templates
 TEMPLATES_DIR = os.path.dirname(os.path.abspath(__file__)) + "/templates/"
 
+# interval between reads of a followed log when no new data is available
+LOG_FOLLOW_INTERVAL = 0.5
+
 #
 # CODE
 #
 
+# SshShell.run() only returns once the command prompt is back, so a command
+# that does not end (like tail -F) is followed with the raw channel methods
+# of baselib's shell. These are not part of its public interface and are
+# only accessed by the two functions below.
+
+
+def _shell_read(shell):
+    """
+    Read the output available on a shell channel without waiting for the
+    command prompt.
+
+    Args:
+        shell (SshShell): an open ssh shell
+
+    Returns:
+        str: output received since the last read, empty if none
+    """
+    return shell._read()  # pylint: disable=protected-access
+# _shell_read()
+
+
+def _shell_write(shell, data):
+    """
+    Send data to a shell channel without waiting for the command prompt.
+
+    Args:
+        shell (SshShell): an open ssh shell
+        data (str): content to send, i.e. a command line or a control
+                    character
+    """
+    shell._write(data)  # pylint: disable=protected-access
+# _shell_write()
+
 
 class SmBase(metaclass=abc.ABCMeta):
     """
@@ -100,6 +139,69 @@ class SmBase(metaclass=abc.ABCMeta):
         self._info = None
     # __init__()
 
+    def _follow_log(self, shell, logfile_path, success_patterns,
+                    failure_patterns=(), timeout=None):
+        """
+        Follow a log file on the target system, presenting its lines in the
+        state machine log until one of the given patterns is found.
+
+        A single 'tail -F' runs on the shell channel for the whole duration
+        and its output is consumed as it arrives, so the file is neither
+        re-read from the start on each check nor polled in fixed chunks.
+
+        Args:
+            shell (SshShell): an open ssh shell, it is left running the
+                              follower and should be closed afterwards
+            logfile_path (str): path to the log file
+            success_patterns (list): regular expressions that indicate the
+                                     process has finished
+            failure_patterns (list): regular expressions that indicate the
+                                     process has failed
+            timeout (int): maximum time in seconds to wait for a match, None
+                           to wait indefinitely
+
+        Returns:
+            tuple: (True, re.Match) on a success pattern, (False, re.Match)
+                   on a failure pattern, or None if timeout was reached
+        """
+        matchers = [(True, re.compile(pattern))
+                    for pattern in success_patterns]
+        matchers.extend((False, re.compile(pattern))
+                        for pattern in failure_patterns)
+        deadline = None
+        if timeout is not None:
+            deadline = monotonic() + timeout
+
+        _shell_write(
+            shell, 'tail -n +1 -F {}\n'.format(shlex.quote(logfile_path)))
+        pending = ''
+        try:
+            while deadline is None or monotonic() <= deadline:
+                data = _shell_read(shell)
+                if not data:
+                    sleep(LOG_FOLLOW_INTERVAL)
+                    continue
+
+                # keep an incomplete last line until the rest arrives
+                lines = (pending + data).split('\n')
+                pending = lines.pop()
+                lines = [line.rstrip('\r') for line in lines]
+                if not lines:
+                    continue
+                self._logger.info('\n'.join(lines))
+
+                for line in lines:
+                    for succeeded, regex in matchers:
+                        match = regex.search(line)
+                        if match is not None:
+                            return succeeded, match
+        finally:
+            # interrupt the follower
+            _shell_write(shell, '\x03')
+
+        return None
+    # _follow_log()
+
     def _get_ssh_conn(self, connect_after_install: bool = False):
         """
         Auxiliary method to get a ssh connection and shell to the target system
@@ -337,14 +439,56 @@ class SmBase(metaclass=abc.ABCMeta):
                                    " cleanup.")
     # _remove_autofile()
 
+    def _render_autofile(self):
+        """
+        Returns the autofile content from the template
+        """
+        template = TEMPLATE_CACHE.get(
+            self._template.name, self._template.content)
+        self._logger.info(
+            "autotemplate will be used: '%s'", self._template.name)
+        return template.render(config=self._info)
+    # _render_autofile()
+
     def _render_installer_cmdline(self):
         """
         Returns installer kernel command line from the template
         """
-        template_obj = jinja2.Template(self._model.installer_template.content)
+        template_obj = TEMPLATE_CACHE.get(
+            self._model.installer_template.name,
+            self._model.installer_template.content)
         return template_obj.render(config=self._info).strip()
     # _render_installer_cmdline()
 
+    def _render_installer_kargs(self):
+        """
+        Returns the installer kernel command line merged with the custom
+        parameters from the profile
+        """
+        kargs = self._render_installer_cmdline()
+        if self._model.installer_cmdline:
+            custom_kargs = self._model.installer_cmdline
+            # below we use a dict to remove duplicated parameters, the code
+            # assumes no kernel params have empty spaces as values
+            # (i.e. param="foo bar") so if this is ever to be supported
+            # the implementation below needs to be improved
+            kargs_dict = OrderedDict()
+            for param in kargs.split() + custom_kargs.split():
+                try:
+                    name, value = param.split('=', 1)
+                except ValueError:
+                    name, value = param, None
+                kargs_dict[name] = value
+            custom_kargs = []
+            for name, value in kargs_dict.items():
+                if value is None:
+                    custom_kargs.append(name)
+                else:
+                    custom_kargs.append('{}={}'.format(name, value))
+            kargs = ' '.join(custom_kargs)
+        return kargs
+    # _render_installer_kargs()
+
     def _repeat_with_timeout(self, conn_method):
         """
         Try several times to establish a connection
@@ -402,27 +546,7 @@ class SmBase(metaclass=abc.ABCMeta):
         self._logger.debug("Auto-generated installation password: %s",
                            self._info['credentials']['installation-password'])
 
-        kargs = self._render_installer_cmdline()
-        if self._model.installer_cmdline:
-            custom_kargs = self._model.installer_cmdline
-            # below we use a dict to remove duplicated parameters, the code
-            # assumes no kernel params have empty spaces as values
-            # (i.e. param="foo bar") so if this is ever to be supported
-            # the implementation below needs to be improved
-            kargs_dict = OrderedDict()
-            for param in kargs.split() + custom_kargs.split():
-                try:
-                    name, value = param.split('=', 1)
-                except ValueError:
-                    name, value = param, None
-                kargs_dict[name] = value
-            custom_kargs = []
-            for name, value in kargs_dict.items():
-                if value is None:
-                    custom_kargs.append(name)
-                else:
-                    custom_kargs.append('{}={}'.format(name, value))
-            kargs = ' '.join(custom_kargs)
+        kargs = self._render_installer_kargs()
         self._logger.info('kernel cmdline for installer is: %s', kargs)
 
         self._platform.start_installer(kargs)
@@ -490,11 +614,7 @@ class SmBase(metaclass=abc.ABCMeta):
         """
         self._logger.info("generating autofile")
         self._remove_autofile()
-        template = jinja2.Template(self._template.content)
-        self._logger.info(
-            "autotemplate will be used: '%s'", self._template.name)
-
-        autofile_content = template.render(config=self._info)
+        autofile_content = self._render_autofile()
 
         # Write the autofile for usage during installation
         # by the distro installer.
@@ -629,6 +749,22 @@ class SmBase(metaclass=abc.ABCMeta):
         """
     # post_install()
 
+    def render_templates(self):
+        """
+        Render the autofile and the installer kernel command line without
+        touching the target system. Useful to validate templates against a
+        system profile before submitting an installation.
+
+        Returns:
+            dict: rendered content keyed by 'autofile' and 'cmdline'
+        """
+        self.fill_template_vars()
+        return {
+            'autofile': self._render_autofile(),
+            'cmdline': self._render_installer_kargs(),
+        }
+    # render_templates()
+
     def target_reboot(self):
         """
         Performs a reboot of the target system after installation is done
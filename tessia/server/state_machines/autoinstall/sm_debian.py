@@ -28,10 +28,13 @@ from time import sleep
 from urllib.parse import urlparse
 
 import logging
+import re
 
 #
 # CONSTANTS AND DEFINITIONS
 #
+# maximum time to wait for the installation process
+MAX_WAIT_INSTALL = 3600
 
 #
 # CODE
@@ -73,51 +76,6 @@ class SmDebianInstaller(SmBase):
         )
     # _add_systemd_osname()
 
-    def _read_logfile(self, shell, logfile_path):
-        """
-        Read the Ubuntu installation log file and presents it in the
-        state machine log.
-
-        Args:
-            shell (SshShell): an open ssh shell.
-            logfile_path (str): Path to the log file.
-
-        Returns:
-            bool: True if the termination string can be found in the log file
-                  , False otherwise.
-        """
-        cmd_read_line = "tail -n +{} " + logfile_path + " | head -n 100"
-        termination_string = (
-            "Running /usr/lib/finish-install.d/20final-message")
-
-        # Maximum time to wait for the installation process.
-        max_wait_install = 3600
-        timeout_installation = time() + max_wait_install
-        line_offset = 1
-        success = False
-        frequency_check = 10
-        # Performs consecutive calls to tail to extract the end of the file
-        # from a previous start point. It is important to notice that the
-        # Debian Installer does not provide concise error messages so that
-        # is not possible to look for error in the installation process.
-        while time() <= timeout_installation:
-            _, out = shell.run(cmd_read_line.format(line_offset))
-
-            out = out.rstrip('\n')
-            if not out:
-                sleep(frequency_check)
-                continue
-
-            line_offset += len(out.split('\n'))
-            self._logger.info(out)
-
-            if out.find(termination_string) != -1:
-                success = True
-                break
-
-        return success
-    # _read_logfile()
-
     @staticmethod
     def _wait_install_logfile(shell, logfile_path):
         """
@@ -264,21 +222,28 @@ class SmDebianInstaller(SmBase):
 
     def wait_install(self):
         """
-        Waits for the installation. This method periodically checks the
-        /tmp/anaconda.log file in the system and looks for a string that
-        indicates that the process has finished. There is a timeout of 10
-        minutes.
+        Waits for the installation. This method follows the
+        /var/log/syslog file in the system and looks for a string that
+        indicates that the process has finished. There is a timeout of 1
+        hour.
         """
         ssh_client, shell = self._get_ssh_conn()
 
         logfile_path = '/var/log/syslog'
 
         self._wait_install_logfile(shell, logfile_path)
-        success = self._read_logfile(shell, logfile_path)
+        # It is important to notice that the Debian Installer does not
+        # provide concise error messages so that is not possible to look for
+        # errors in the installation process.
+        result = self._follow_log(
+            shell, logfile_path,
+            [re.escape("Running /usr/lib/finish-install.d/20final-message")],
+            timeout=MAX_WAIT_INSTALL)
 
         shell.close()
         ssh_client.logoff()
 
+        success = result is not None
         if not success:
             raise TimeoutError('Installation Timeout: The installation'
                                ' process is taking too long')
@@ -27,10 +27,11 @@ from tessia.server.state_machines.autoinstall.model import \
 from tessia.server.config import Config
 from tessia.server.state_machines.autoinstall.sm_base import SmBase
 from tessia.server.state_machines.autoinstall.sm_base import TEMPLATES_DIR
+from tessia.server.state_machines.autoinstall.template_cache import \
+    TEMPLATE_CACHE
 from time import monotonic, sleep
 from urllib.parse import urlparse
 
-import jinja2
 import json
 import logging
 import os
@@ -372,7 +373,7 @@ class SmSubiquityInstaller(SmBase):
             "Using subiquity installer cmdline template for "
             "OS %s of type '%s'", self._os.name, self._os.type)
 
-        template_obj = jinja2.Template(template_content)
+        template_obj = TEMPLATE_CACHE.get(template_filename, template_content)
         return template_obj.render(config=self._info).strip()
 
     @staticmethod
@@ -534,11 +535,7 @@ class SmSubiquityInstaller(SmBase):
         """
         self._logger.info("generating autofile")
         self._remove_autofile()
-        template = jinja2.Template(self._template.content)
-        self._logger.info(
-            "autotemplate will be used: '%s'", self._template.name)
-
-        autofile_content = template.render(config=self._info)
+        autofile_content = self._render_autofile()
 
         # Subiquity requires a directory to be present, we pass that
         # as the autofile location. In the directory a file named
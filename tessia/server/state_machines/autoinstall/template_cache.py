@@ -0,0 +1,159 @@
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Cache of compiled templates used for autofile and cmdline rendering
+"""
+
+#
+# IMPORTS
+#
+from tessia.server.config import Config
+from threading import Lock
+
+import hashlib
+import jinja2
+import logging
+import os
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+
+#
+# CODE
+#
+
+
+class _ContentLoader(jinja2.BaseLoader):
+    """
+    Loader serving template sources registered by the content hash. Sources
+    never change for a given key, so loaded templates are always up to date.
+    """
+
+    def __init__(self):
+        """
+        Constructor, creates the sources map
+        """
+        self._sources = {}
+        self._lock = Lock()
+    # __init__()
+
+    def get_source(self, environment, template):
+        """
+        See jinja2.BaseLoader for docstring.
+        """
+        try:
+            source = self._sources[template]
+        except KeyError:
+            raise jinja2.TemplateNotFound(template) from None
+        return source, None, lambda: True
+    # get_source()
+
+    def register(self, name, content):
+        """
+        Register a template source
+
+        Args:
+            name (str): template name
+            content (str): template content
+
+        Returns:
+            str: key to load the template with
+        """
+        digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        key = '{}@{}'.format(name, digest[:32])
+        with self._lock:
+            self._sources.setdefault(key, content)
+        return key
+    # register()
+
+# _ContentLoader
+
+
+class _TemplateCache:
+    """
+    Shared jinja2 environment which compiles each template content only once
+    per process. When a cache directory is configured the compiled bytecode
+    is stored on disk as well, so that the job processes spawned by the
+    scheduler can skip the compilation of templates rendered by previous
+    jobs.
+    """
+
+    def __init__(self):
+        """
+        Constructor, environment is only created on first usage
+        """
+        self._env = None
+        self._loader = _ContentLoader()
+        self._lock = Lock()
+        self._logger = logging.getLogger(__name__)
+    # __init__()
+
+    def _get_env(self):
+        """
+        Create the jinja2 environment based on the server configuration
+
+        Returns:
+            jinja2.Environment: shared environment
+        """
+        with self._lock:
+            if self._env is not None:
+                return self._env
+
+            bytecode_cache = None
+            try:
+                cache_dir = Config.get_config().get(
+                    'auto_install')['template_cache_dir']
+            except (TypeError, KeyError):
+                cache_dir = None
+            if cache_dir:
+                try:
+                    os.makedirs(cache_dir, exist_ok=True)
+                # cache is an optimization, rendering works without it
+                except OSError as exc:
+                    self._logger.warning(
+                        'Template cache directory %s not available: %s',
+                        cache_dir, str(exc))
+                else:
+                    bytecode_cache = jinja2.FileSystemBytecodeCache(
+                        cache_dir)
+
+            self._env = jinja2.Environment(
+                loader=self._loader, bytecode_cache=bytecode_cache)
+            return self._env
+    # _get_env()
+
+    def get(self, name, content):
+        """
+        Return the compiled template for the given content
+
+        Args:
+            name (str): template name, used in error messages
+            content (str): template content
+
+        Returns:
+            jinja2.Template: compiled template
+
+        Raises:
+            jinja2.TemplateSyntaxError: if template content is invalid
+        """
+        env = self._get_env()
+        return env.get_template(self._loader.register(name, content))
+    # get()
+
+# _TemplateCache
+
+
+TEMPLATE_CACHE = _TemplateCache()
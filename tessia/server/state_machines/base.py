@@ -105,6 +105,16 @@ class BaseMachine(metaclass=abc.ABCMeta):
         raise NotImplementedError()
     # parse()
 
+    @classmethod
+    def prepare(cls):
+        """
+        Method called once when the scheduler starts to prepare resources
+        shared by all executions of the machine (i.e. container images), so
+        that the first job does not have to wait for them. It runs in a
+        background thread and may take long.
+        """
+    # prepare()
+
     @classmethod
     def prefilter(cls, params):
         """
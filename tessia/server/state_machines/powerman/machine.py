@@ -19,10 +19,13 @@ Machine to perform power management of systems
 #
 # IMPORTS
 #
+from concurrent.futures import (
+    FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait)
 from copy import deepcopy
 from datetime import datetime
 from itertools import chain
 from jsonschema import validate
+from threading import Lock
 from time import sleep, monotonic
 
 from tessia.baselib.common.s3270.terminal import Terminal
@@ -45,6 +48,8 @@ import yaml
 # CONSTANTS AND DEFINITIONS
 #
 LOAD_TIMEOUT = 600
+# max number of systems handled at the same time
+MAX_WORKERS = 8
 POWERON = 'poweron'
 POWERON_EXC = 'poweron-exclusive'
 POWEROFF = 'poweroff'
@@ -149,8 +154,52 @@ class PowerManagerMachine(BaseMachine):
         # avoid double work
         self._powered_off = {}
         self._powered_on = {}
+
+        # serializes access to the db objects when systems are handled
+        # concurrently, as the db session is not thread safe
+        self._db_lock = Lock()
+
+        # results of hypervisor checks, so that hypervisors shared by
+        # several systems are checked only once
+        self._hyp_checks = {}
+        self._hyp_locks = {}
     # __init__()
 
+    def _check_hypervisor(self, hyp_prof, guest_prof):
+        """
+        Verify that a hypervisor is up and whether it matches its profile.
+        The result is memoized until the hypervisor is powered on/off by
+        this job.
+
+        Args:
+            hyp_prof (SystemProfile): profile of hypervisor to check
+            guest_prof (SystemProfile): profile of the next system in the
+                chain, used for login on z/VM hypervisors
+
+        Returns:
+            bool: True if hypervisor matches the profile, False otherwise
+
+        Raises:
+            Exception: if hypervisor is not up
+        """
+        key = (hyp_prof.system_rel.name, hyp_prof.name)
+        # make sure the same hypervisor is not checked by two actions at the
+        # same time
+        with self._db_lock:
+            hyp_lock = self._hyp_locks.setdefault(key, Lock())
+        with hyp_lock:
+            if key in self._hyp_checks:
+                self._logger.info('Hypervisor %s was already checked',
+                                  key[0])
+                return self._hyp_checks[key]
+
+            self._logger.info('Checking if hypervisor %s is up', key[0])
+            self._is_system_up(hyp_prof, guest_prof)
+            self._logger.info('Hypervisor %s is up', key[0])
+            self._hyp_checks[key] = self._state_match(hyp_prof)
+            return self._hyp_checks[key]
+    # _check_hypervisor()
+
     @staticmethod
     def _check_profile(profile_obj):
         """
@@ -205,6 +254,162 @@ class PowerManagerMachine(BaseMachine):
         MANAGER.session.commit()
     # _commit_modified_time()
 
+    def _exec_action(self, system):
+        """
+        Perform the power action (poweron/poweroff) of one system.
+
+        Args:
+            system (dict): system entry from the request with the loaded
+                           db objects
+
+        Raises:
+            RuntimeError: if hypervisor is not up or does not match profile
+        """
+        profile_obj = system['profile_obj']
+        system_obj = profile_obj.system_rel
+        # the immediate hypervisor is at the end of the list
+        hyp_profile_obj = system['hyp_chain_objs'][-1]
+
+        # report the hierarchy so that the user understands what's going on
+        self._logger.info('Current action is %s system %s',
+                          system['action'], system_obj.name)
+        topology = [
+            '{} ({})'.format(obj.system_rel.name, obj.system_rel.type)
+            for obj in system['hyp_chain_objs']
+        ] + ['{} ({})'.format(system_obj.name, system_obj.type)]
+        self._logger.info('System topology is: %s', ' -> '.join(topology))
+
+        # poweroff requested
+        if system['action'] == POWEROFF:
+            if system_obj.name in self._powered_off:
+                self._logger.info('System %s was already powered off, '
+                                  'skipping', system_obj.name)
+            else:
+                self._poweroff(hyp_profile_obj, profile_obj)
+            return
+
+        # we need to check the complete chain to be sure that the
+        # hypervisors are up and that they match expected profiles
+        # cpc is not checked
+        start_pos = 0
+        if system['hyp_chain_objs'][0].system_rel.type.lower() == 'cpc':
+            start_pos = 1
+        for i in range(start_pos, len(system['hyp_chain_objs'])):
+            hyp_profile = system['hyp_chain_objs'][i]
+            # retrieve also the guest profile in order to have login
+            # credentials for eventual z/VM hypervisors
+            try:
+                guest_profile = system['hyp_chain_objs'][i+1]
+            # last entry: guest is the target system
+            except IndexError:
+                guest_profile = profile_obj
+
+            # hypervisor not up: not possible to activate system
+            try:
+                hyp_match = self._check_hypervisor(hyp_profile, guest_profile)
+            except Exception as exc:
+                raise RuntimeError(
+                    f'Cannot poweron system {system_obj.name}, '
+                    f'hypervisor {hyp_profile.system_rel.name} is not up'
+                ) from exc
+            # hypervisor is up but profile doesn't match: fatal error,
+            # cannot continue
+            if not hyp_match and self._params.get('verify'):
+                raise RuntimeError(
+                    'Cannot poweron system {} because hypervisor {} does '
+                    'not match expected profile {}'.format(
+                        system_obj.name, hyp_profile.system_rel.name,
+                        hyp_profile.name)
+                )
+
+        # exclusive operation: siblings must be powered off
+        if system['action'] == POWERON_EXC:
+            self._logger.info(
+                'Exclusive poweron requested for system %s, powering '
+                'off all sibling systems: %s', profile_obj.system_rel.name,
+                ', '.join([obj.system_rel.name
+                           for obj in system['sibling_objs']])
+            )
+
+            # TODO: replace usage of credentials by ssh private key
+            for sibling_prof in system['sibling_objs']:
+                sibling_system = sibling_prof.system_rel
+                if sibling_prof.system_rel.name in self._powered_off:
+                    self._logger.info(
+                        'System %s was already powered off, skipping',
+                        sibling_system.name)
+                    continue
+                self._poweroff(hyp_profile_obj, system['sibling_objs'])
+
+        self._logger.info('Checking if target system %s is already up',
+                          system_obj.name)
+        # system is already up: additional verifications are needed
+        try:
+            system_is_up = self._is_system_up(profile_obj)
+        except Exception as exc:
+            system_is_up = False
+            self._logger.info('System %s is not up', system_obj.name)
+            self._logger.debug('is_system_up check raised %s', exc)
+
+        if system_is_up:
+            self._logger.info('System is already up')
+            # force enabled: we need to poweroff the system first
+            if system.get('force'):
+                self._logger.info(
+                    'Force flag was specified therefore restart is needed')
+                self._poweroff(hyp_profile_obj, profile_obj)
+            # overrides enabled: we need to poweroff the system in order to
+            # boot with the new values
+            elif system.get('profile_override'):
+                self._logger.info('Override parameters were specified '
+                                  'therefore restart is needed')
+                self._poweroff(hyp_profile_obj, profile_obj)
+            elif not self._state_match(profile_obj):
+                self._logger.info('Current state does not match profile '
+                                  'therefore restart is needed')
+                self._poweroff(hyp_profile_obj, profile_obj)
+            # system already up and match profile: nothing to do
+            else:
+                self._logger.info(
+                    "System %s is already running as expected, no poweron "
+                    "needed", profile_obj.system_rel.name)
+                return
+
+        # proceed with the poweron action itself
+        self._poweron(hyp_profile_obj, profile_obj,
+                      system.get('profile_override'))
+    # _exec_action()
+
+    def _forget_checks(self, system_name):
+        """
+        Discard the memoized checks of a system whose power state changed.
+
+        Args:
+            system_name (str): name of the system
+        """
+        for key in list(self._hyp_checks):
+            if key[0] == system_name:
+                self._hyp_checks.pop(key, None)
+    # _forget_checks()
+
+    @staticmethod
+    def _get_footprint(system):
+        """
+        Return the names of the systems that an action relies on and the
+        names of the systems it powers on/off.
+
+        Args:
+            system (dict): system entry from the request
+
+        Returns:
+            tuple: (set of used system names, set of changed system names)
+        """
+        used = {obj.system_rel.name for obj in system['hyp_chain_objs']}
+        changed = {system['profile_obj'].system_rel.name}
+        changed.update(obj.system_rel.name for obj in system['sibling_objs'])
+        return used, changed
+    # _get_footprint()
+
     @staticmethod
     def _get_profile(system_name, profile_name=None):
         """
@@ -740,6 +945,23 @@ class PowerManagerMachine(BaseMachine):
         return params
     # _load_data()
 
+    @staticmethod
+    def _load_relations(profile_obj):
+        """
+        Load the related db objects used by the power actions, so that the
+        actions can run concurrently without lazy loads on the db session.
+
+        Args:
+            profile_obj (SystemProfile): profile db object
+        """
+        # accessing the relationships is enough to load them
+        list(profile_obj.storage_volumes_rel)
+        list(profile_obj.system_ifaces_rel)
+        # pylint: disable=pointless-statement
+        profile_obj.operating_system_rel
+        profile_obj.system_rel.hypervisor_rel
+    # _load_relations()
+
     def _poweroff(self, hyp_prof, guests):
         """
         Perform the actual poweroff operation on a list of systems.
@@ -767,6 +989,7 @@ class PowerManagerMachine(BaseMachine):
                 self._logger.info('Powering off system %s', system_name)
                 self._poweroff_zvm(hyp_prof, guest_prof)
                 self._powered_off[system_name] = guest_prof
+                self._forget_checks(system_name)
                 self._logger.info(
                     'System %s successfully powered off', system_name)
             return
@@ -794,6 +1017,7 @@ class PowerManagerMachine(BaseMachine):
             self._logger.info('Powering off system %s', system_name)
             baselib_hyp.stop(system_name, {})
             self._powered_off[system_name] = guest_prof
+            self._forget_checks(system_name)
             self._logger.info(
                 'System %s successfully powered off', system_name)
 
@@ -866,165 +1090,114 @@ class PowerManagerMachine(BaseMachine):
             )
 
         self._powered_on[guest_prof.system_rel.name] = guest_prof
+        self._forget_checks(system_name)
         self._logger.info('System %s successfully powered on', system_name)
     # _poweron()
 
     def _stage_exec(self):
         """
         Perform the power action (poweron/poweroff) for each system specified.
-        """
-        for system in self._params['systems']:
-            profile_obj = system['profile_obj']
-            system_obj = profile_obj.system_rel
-            # the immediate hypervisor is at the end of the list
-            hyp_profile_obj = system['hyp_chain_objs'][-1]
-
-            # report the hierarchy so that the user understands what's going on
-            self._logger.info('Current action is %s system %s',
-                              system['action'], system_obj.name)
-            topology = [
-                '{} ({})'.format(obj.system_rel.name, obj.system_rel.type)
-                for obj in system['hyp_chain_objs']
-            ] + ['{} ({})'.format(system_obj.name, system_obj.type)]
-            self._logger.info('System topology is: %s', ' -> '.join(topology))
-
-            # poweroff requested
-            if system['action'] == POWEROFF:
-                if system_obj.name in self._powered_off:
-                    self._logger.info('System %s was already powered off, '
-                                      'skipping', system_obj.name)
-                else:
-                    self._poweroff(hyp_profile_obj, profile_obj)
-                # proceed to next system
-                continue
-
-            # we need to check the complete chain to be sure that the
-            # hypervisors are up and that they match expected profiles
-            # cpc is not checked
-            start_pos = 0
-            if system['hyp_chain_objs'][0].system_rel.type.lower() == 'cpc':
-                start_pos = 1
-            for i in range(start_pos, len(system['hyp_chain_objs'])):
-                hyp_profile = system['hyp_chain_objs'][i]
-                # retrieve also the guest profile in order to have login
-                # credentials for eventual z/VM hypervisors
-                try:
-                    guest_profile = system['hyp_chain_objs'][i+1]
-                # last entry: guest is the target system
-                except IndexError:
-                    guest_profile = profile_obj
-
-                self._logger.info('Checking if hypervisor %s is up',
-                                  hyp_profile.system_rel.name)
-                # hypervisor not up: not possible to activate system
-                try:
-                    self._is_system_up(hyp_profile, guest_profile)
-                except Exception as exc:
-                    raise RuntimeError(
-                        f'Cannot poweron system {system_obj.name}, '
-                        f'hypervisor {hyp_profile.system_rel.name} is not up'
-                    ) from exc
-                self._logger.info(
-                    'Hypervisor %s is up', hyp_profile.system_rel.name)
-                # hypervisor is up but profile doesn't match: fatal error,
-                # cannot continue
-                if (not self._state_match(hyp_profile) and
-                        self._params.get('verify')):
-                    raise RuntimeError(
-                        'Cannot poweron system {} because hypervisor {} does '
-                        'not match expected profile {}'.format(
-                            system_obj.name, hyp_profile.system_rel.name,
-                            hyp_profile.name)
-                    )
-
-            # exclusive operation: siblings must be powered off
-            if system['action'] == POWERON_EXC:
-                self._logger.info(
-                    'Exclusive poweron requested for system %s, powering '
-                    'off all sibling systems: %s', profile_obj.system_rel.name,
-                    ', '.join([obj.system_rel.name
-                               for obj in system['sibling_objs']])
-                )
 
-                # TODO: replace usage of credentials by ssh private key
-                for sibling_prof in system['sibling_objs']:
-                    sibling_system = sibling_prof.system_rel
-                    if sibling_prof.system_rel.name in self._powered_off:
-                        self._logger.info(
-                            'System %s was already powered off, skipping',
-                            sibling_system.name)
+        Actions run concurrently unless one of them powers on/off a system
+        used or changed by another one, in which case they run in request
+        order.
+        """
+        systems = self._params['systems']
+        # load everything the actions need from the db beforehand
+        for system in systems:
+            for profile_obj in chain(
+                    [system['profile_obj']], system['hyp_chain_objs'],
+                    system['sibling_objs']):
+                self._load_relations(profile_obj)
+
+        # build the dependency graph, an action depends on the previous
+        # actions it conflicts with
+        footprints = [self._get_footprint(system) for system in systems]
+        depends_on = []
+        for index, (used, changed) in enumerate(footprints):
+            depends_on.append({
+                prev_index for prev_index in range(index)
+                if changed & (footprints[prev_index][0] |
+                              footprints[prev_index][1])
+                or footprints[prev_index][1] & used
+            })
+
+        pending = list(range(len(systems)))
+        running = {}
+        done = set()
+        error = None
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            while running or (pending and error is None):
+                # after a failure no more actions are started
+                if error is None:
+                    for index in [index for index in pending
+                                  if depends_on[index] <= done]:
+                        pending.remove(index)
+                        running[executor.submit(
+                            self._exec_action, systems[index])] = index
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    index = running.pop(future)
+                    try:
+                        future.result()
+                    except Exception as exc:
+                        if error is None:
+                            error = exc
                         continue
-                    self._poweroff(hyp_profile_obj, system['sibling_objs'])
-
-            self._logger.info('Checking if target system %s is already up',
-                              system_obj.name)
-            # system is already up: additional verifications are needed
-            try:
-                system_is_up = self._is_system_up(profile_obj)
-            except Exception as exc:
-                system_is_up = False
-                self._logger.info('System %s is not up', system_obj.name)
-                self._logger.debug('is_system_up check raised %s', exc)
-
-            if system_is_up:
-                self._logger.info('System is already up')
-                # force enabled: we need to poweroff the system first
-                if system.get('force'):
-                    self._logger.info(
-                        'Force flag was specified therefore restart is needed')
-                    self._poweroff(hyp_profile_obj, profile_obj)
-                # overrides enabled: we need to poweroff the system in order to
-                # boot with the new values
-                elif system.get('profile_override'):
-                    self._logger.info('Override parameters were specified '
-                                      'therefore restart is needed')
-                    self._poweroff(hyp_profile_obj, profile_obj)
-                elif not self._state_match(profile_obj):
-                    self._logger.info('Current state does not match profile '
-                                      'therefore restart is needed')
-                    self._poweroff(hyp_profile_obj, profile_obj)
-                # system already up and match profile: nothing to do
-                else:
-                    self._logger.info(
-                        "System %s is already running as expected, no poweron "
-                        "needed", profile_obj.system_rel.name)
-                    continue
-
-            # proceed with the poweron action itself
-            self._poweron(hyp_profile_obj, profile_obj,
-                          system.get('profile_override'))
+                    done.add(index)
 
+        if error is not None:
+            raise error
     # _stage_exec()
 
     def _stage_verify(self):
         """
         Verify for all powered on systems whether the running system's
         parameters correspond to the chosen activation profile.
+
+        Systems are waited for and verified concurrently so that the stage
+        takes about as long as the slowest system.
+
+        Raises:
+            TimeoutError: in case a system does not come up in time
+            RuntimeError: if verify flag is on and a system does not match its
+                          profile
         """
-        for system_name, profile_obj in self._powered_on.items():
-            # make sure system is already up
-            self._logger.info('Waiting for system %s to come up (%s seconds)',
-                              system_name, LOAD_TIMEOUT)
-            timeout_secs = monotonic() + LOAD_TIMEOUT
-            while True:
+        if not self._powered_on:
+            return
+
+        failed = []
+        with ThreadPoolExecutor(
+                max_workers=min(MAX_WORKERS, len(self._powered_on))
+        ) as executor:
+            futures = {
+                executor.submit(self._wait_and_verify, system_name,
+                                profile_obj): system_name
+                for system_name, profile_obj in self._powered_on.items()
+            }
+            for future in as_completed(futures):
+                system_name = futures[future]
                 try:
-                    self._is_system_up(profile_obj)
-                    break
-                except Exception as exc:
-                    if monotonic() >= timeout_secs:
-                        raise TimeoutError(
-                            'Could not establish a connection to system '
-                            f'{system_name} after {LOAD_TIMEOUT} seconds') \
-                            from exc
-                    sleep(5)
-
-            # do a state match always to log incinsitencies,
-            # raise only if requested
-            if (not self._state_match(profile_obj) and
-                    self._params.get('verify')):
-                raise RuntimeError(
-                    'Failed to poweron system {} with expected configuration'
-                    .format(system_name))
+                    state_match = future.result()
+                except TimeoutError:
+                    # no point in starting the verification of the remaining
+                    # systems
+                    for pending in futures:
+                        pending.cancel()
+                    raise
+                if state_match:
+                    self._logger.info(
+                        'System %s matches expected configuration',
+                        system_name)
+                else:
+                    failed.append(system_name)
+
+        # state match always logs inconsistencies, raise only if requested
+        if failed and self._params.get('verify'):
+            raise RuntimeError(
+                'Failed to poweron system {} with expected configuration'
+                .format(', '.join(sorted(failed))))
     # _stage_verify()
 
     def _state_match(self, system_prof):
@@ -1064,8 +1237,10 @@ class PowerManagerMachine(BaseMachine):
                 'warnings because verify flag is off')
 
         try:
-            checker = post_install.PostInstallChecker(
-                system_prof, permissive=True)
+            # the checker reads the profile's related db objects
+            with self._db_lock:
+                checker = post_install.PostInstallChecker(
+                    system_prof, permissive=True)
             # checked may still throw on unexpected errors
             mismatches = checker.verify()
         except Exception as exc:
@@ -1076,6 +1251,40 @@ class PowerManagerMachine(BaseMachine):
         return not mismatches
     # _state_match()
 
+    def _wait_and_verify(self, system_name, profile_obj):
+        """
+        Wait for a powered on system to come up and verify whether its
+        current state matches the profile.
+
+        Args:
+            system_name (str): name of the system
+            profile_obj (SystemProfile): profile used to power on the system
+
+        Returns:
+            bool: True if system matches the profile, False otherwise
+
+        Raises:
+            TimeoutError: in case system does not come up in time
+        """
+        # make sure system is already up
+        self._logger.info('Waiting for system %s to come up (%s seconds)',
+                          system_name, LOAD_TIMEOUT)
+        timeout_secs = monotonic() + LOAD_TIMEOUT
+        while True:
+            try:
+                self._is_system_up(profile_obj)
+                break
+            except Exception as exc:
+                if monotonic() >= timeout_secs:
+                    raise TimeoutError(
+                        'Could not establish a connection to system '
+                        f'{system_name} after {LOAD_TIMEOUT} seconds') \
+                        from exc
+                sleep(5)
+
+        return self._state_match(profile_obj)
+    # _wait_and_verify()
+
     def cleanup(self):
         """
         Clean up in case of cancelation.
@@ -0,0 +1,175 @@
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit test for api.instances module
+"""
+
+#
+# IMPORTS
+#
+from flask import Flask
+from flask_potion import Api, fields, ModelResource
+from flask_potion.contrib.memory.manager import MemoryManager
+from flask_potion.routes import Route
+from tessia.server.api.exceptions import BaseHttpError
+from tessia.server.api.instances import ProjectedInstances
+from unittest import TestCase
+
+import json
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+
+#
+# CODE
+#
+
+
+class Fruit(ModelResource):
+    """
+    Resource listing with the projected schema
+    """
+    class Meta:
+        """
+        Potion's meta section
+        """
+        name = 'fruit'
+        id_converter = 'int'
+        id_field_class = fields.Integer
+
+    class Schema:
+        """
+        Potion's schema section
+        """
+        name = fields.String()
+        color = fields.String()
+        weight = fields.Integer(attribute='grams')
+
+    @Route.GET('', rel="instances")
+    def instances(self, **kwargs):
+        """
+        Store the parsed parameters and list the items
+
+        Args:
+            kwargs (dict): parsed parameters
+
+        Returns:
+            Pagination: items of the page
+        """
+        Fruit.parsed_fields = kwargs.pop('fields')
+        return self.manager.paginated_instances(**kwargs)
+    instances.request_schema = instances.response_schema = (
+        ProjectedInstances())
+# Fruit
+
+
+class TestProjectedInstances(TestCase):
+    """
+    Validates the projection of fields in listings
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Create the app and one item, a resource can be registered only once
+        """
+        app = Flask(__name__)
+        # same response as generated by the tessia app
+        app.register_error_handler(
+            BaseHttpError, lambda exc: exc.get_response())
+        api = Api(app, default_manager=MemoryManager)
+        api.add_resource(Fruit)
+        cls._client = app.test_client()
+
+        resp = cls._client.post(
+            '/fruit', data=json.dumps(
+                {'name': 'apple', 'color': 'red', 'weight': 150}),
+            content_type='application/json')
+        assert resp.status_code == 200, resp.data
+    # setUpClass()
+
+    def setUp(self):
+        """
+        Clear the parameters stored by previous tests
+        """
+        Fruit.parsed_fields = None
+    # setUp()
+
+    def _list(self, fields_param):
+        """
+        Helper to list the items with the fields parameter
+
+        Args:
+            fields_param (str): value of the parameter
+
+        Returns:
+            flask.Response: response object
+        """
+        return self._client.get('/fruit', query_string={
+            'fields': fields_param})
+    # _list()
+
+    def test_projection(self):
+        """
+        Test that only the requested fields are returned
+        """
+        resp = self._list(json.dumps(['weight', 'name']))
+        self.assertEqual(resp.status_code, 200, resp.data)
+        # uri always present and the order is the same as in the schema
+        self.assertEqual(
+            json.loads(resp.data),
+            [{'$uri': '/fruit/1', 'name': 'apple', 'weight': 150}])
+        # manager receives the model attributes
+        self.assertEqual(Fruit.parsed_fields, ('name', 'grams'))
+    # test_projection()
+
+    def test_no_projection(self):
+        """
+        Test that all fields are returned when parameter is not specified
+        """
+        resp = self._client.get('/fruit')
+        self.assertEqual(resp.status_code, 200, resp.data)
+        self.assertEqual(
+            json.loads(resp.data),
+            [{'$uri': '/fruit/1', 'color': 'red', 'name': 'apple',
+              'weight': 150}])
+        self.assertIsNone(Fruit.parsed_fields)
+    # test_no_projection()
+
+    def test_invalid(self):
+        """
+        Test the error conditions of the parameter
+        """
+        for value in ('not json', '"name"', '[1]', '["name", "size"]'):
+            resp = self._list(value)
+            self.assertEqual(resp.status_code, 400, value)
+
+        resp = self._list('["name", "size"]')
+        self.assertIn('size', json.loads(resp.data)['message'])
+    # test_invalid()
+
+    def test_schema(self):
+        """
+        Test that the parameter is advertised in the schema
+        """
+        resp = self._client.get('/fruit/schema')
+        links = json.loads(resp.data)['links']
+        instances = [link for link in links if link['rel'] == 'instances'][0]
+        self.assertEqual(
+            instances['schema']['properties']['fields']['items']['enum'],
+            ['color', 'name', 'weight'])
+    # test_schema()
+# TestProjectedInstances
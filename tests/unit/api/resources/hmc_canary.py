@@ -0,0 +1,189 @@
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit test for hmc canary resource module
+"""
+
+#
+# IMPORTS
+#
+from datetime import datetime
+from tests.unit.api.resources.secure_resource import TestSecureResource
+from tessia.server.api.resources.hmc_canary import HMCCanaryResource
+from tessia.server.db import models
+from tessia.server.lib.canary.canary import MEDIATOR_REVISION_KEY
+from tessia.server.lib.canary.canary import MEDIATOR_STATUS_KEY
+from tessia.server.lib.mediator import MEDIATOR
+from unittest import mock
+
+import json
+import os
+import time
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+LOGIN = 'user_user@domain.com:a'
+
+#
+# CODE
+#
+
+
+class TestHmcCanary(TestSecureResource):
+    """
+    Validates the HMC canary status route
+    """
+    # entry point for resource in api
+    RESOURCE_URL = '/hmc-canary'
+    # model associated with this resource
+    RESOURCE_MODEL = models.HmcCanary
+    # api object associated with the resource
+    RESOURCE_API = HMCCanaryResource
+
+    @classmethod
+    def _entry_gen(cls):
+        """
+        Generator for producing new entries for database insertion.
+        """
+        index = 0
+        while True:
+            data = {
+                'name': 'hmc{}.domain.com'.format(index),
+                'status': 'OK',
+                'cpc_status': {'CPC{}'.format(index): 'operating'},
+            }
+            index += 1
+            yield data
+    # _entry_gen()
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Called once before any test in this test class run.
+        """
+        url = os.environ.get('TESSIA_MEDIATOR_URI')
+        if not url:
+            raise RuntimeError('env variable TESSIA_MEDIATOR_URI not set')
+
+        # switch to test database
+        MEDIATOR._mediator_uri = url.replace('/0', '/1')
+
+        super(TestHmcCanary, cls).setUpClass()
+    # setUpClass(cls):
+
+    def setUp(self):
+        """
+        Create the HMC entries and clear the published status.
+        """
+        self._entries = []
+        for _ in range(2):
+            entry = self.RESOURCE_MODEL(
+                last_update=datetime.utcnow(), **next(self._get_next_entry))
+            self.db.session.add(entry)
+            self._entries.append(entry.name)
+        self.db.session.commit()
+        MEDIATOR.set(MEDIATOR_STATUS_KEY, None)
+        MEDIATOR.set(MEDIATOR_REVISION_KEY, None)
+    # setUp()
+
+    def tearDown(self):
+        """
+        Remove the HMC entries and the published status.
+        """
+        self.RESOURCE_MODEL.query.filter(
+            self.RESOURCE_MODEL.name.in_(self._entries)).delete(
+                synchronize_session=False)
+        self.db.session.commit()
+        MEDIATOR.set(MEDIATOR_STATUS_KEY, None)
+        MEDIATOR.set(MEDIATOR_REVISION_KEY, None)
+    # tearDown()
+
+    def _get_status(self, params=''):
+        """
+        Request the status route and return the parsed response.
+
+        Args:
+            params (str): url query parameters
+
+        Returns:
+            dict: response content
+        """
+        resp = self._do_request('get', LOGIN, 'status?{}'.format(params))
+        self.assertEqual(resp.status_code, 200, resp.data)
+        return json.loads(resp.data)
+    # _get_status()
+
+    def test_status_from_db(self):
+        """
+        Test that the status is read from the database when the canary
+        service has not published it.
+        """
+        status = self._get_status()
+        self.assertEqual(status['revision'], 0)
+        self.assertEqual(
+            [hmc['name'] for hmc in status['hmcs']
+             if hmc['name'] in self._entries],
+            self._entries)
+    # test_status_from_db()
+
+    def test_status_from_mediator(self):
+        """
+        Test that the status published by the canary service is returned.
+        """
+        snapshot = {'revision': 1234, 'hmcs': [
+            {'name': 'hmc.domain.com', 'status': 'OK'}]}
+        MEDIATOR.set(MEDIATOR_STATUS_KEY, json.dumps(snapshot))
+        MEDIATOR.set(MEDIATOR_REVISION_KEY, '1234')
+
+        self.assertEqual(self._get_status(), snapshot)
+        # a different revision returns immediately
+        start = time.monotonic()
+        self.assertEqual(
+            self._get_status('revision=1&timeout=10'), snapshot)
+        self.assertLess(time.monotonic() - start, 5)
+    # test_status_from_mediator()
+
+    def test_status_wait_no_revision(self):
+        """
+        Test that waiting on the revision of the database fallback blocks
+        until the timeout instead of returning immediately.
+        """
+        start = time.monotonic()
+        status = self._get_status('revision=0&timeout=1')
+        self.assertGreaterEqual(time.monotonic() - start, 1)
+        self.assertEqual(status['revision'], 0)
+    # test_status_wait_no_revision()
+
+    def test_status_mediator_failure(self):
+        """
+        Test that the status is read from the database when the mediator
+        is not available, and that waiting requests are delayed.
+        """
+        with mock.patch.object(MEDIATOR, 'get', autospec=True) as mock_get, \
+                mock.patch('tessia.server.api.resources.hmc_canary.time',
+                           autospec=True) as mock_time:
+            mock_get.side_effect = ConnectionError('mediator down')
+            status = self._get_status()
+            mock_time.sleep.assert_not_called()
+            self.assertEqual(status['revision'], 0)
+
+            status = self._get_status('revision=0&timeout=30')
+            mock_time.sleep.assert_called_once_with(5)
+            self.assertEqual(status['revision'], 0)
+            self.assertIn(self._entries[0],
+                          [hmc['name'] for hmc in status['hmcs']])
+    # test_status_mediator_failure()
+# TestHmcCanary
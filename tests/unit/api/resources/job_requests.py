@@ -25,8 +25,11 @@ from tessia.server.api.resources.job_requests import JobRequestResource
 from tessia.server.db import models
 from tessia.server.lib.mediator import MEDIATOR
 
+import json
 import os
 import secrets
+import time
+import urllib.parse
 import yaml
 
 #
@@ -155,4 +158,40 @@ class TestJobRequest(TestSecureResource):
         resp = self._do_request('create', '{}:a'.format(login), data)
         self.assertEqual(400, resp.status_code, resp.data)
     # test_malformed_request()
+
+    def test_wait(self):
+        """
+        Test the long-poll waiting for a request state
+        """
+        login = 'user_privileged@domain.com'
+        resp = self._do_request(
+            'create', '{}:a'.format(login), next(self._get_next_entry))
+        self.assertEqual(200, resp.status_code, resp.data)
+        request_id = int(resp.get_data(as_text=True))
+
+        def wait_url(until, timeout):
+            """Helper to build the path of the wait endpoint"""
+            return '{}/wait?until={}&timeout={}'.format(
+                request_id, urllib.parse.quote(json.dumps(until)), timeout)
+        # wait_url()
+
+        # state already reached: answer immediately
+        resp = self._do_request(
+            'get', '{}:a'.format(login), wait_url(['PENDING'], 10))
+        self.assertEqual(200, resp.status_code, resp.data)
+        self.assertEqual(json.loads(resp.data)['state'], 'PENDING')
+
+        # no scheduler running: state does not change until the timeout
+        start = time.monotonic()
+        resp = self._do_request(
+            'get', '{}:a'.format(login), wait_url(['COMPLETED', 'FAILED'], 1))
+        self.assertEqual(200, resp.status_code, resp.data)
+        self.assertEqual(json.loads(resp.data)['state'], 'PENDING')
+        self.assertGreaterEqual(time.monotonic() - start, 1)
+
+        # invalid state
+        resp = self._do_request(
+            'get', '{}:a'.format(login), wait_url(['RUNNING'], 1))
+        self.assertEqual(400, resp.status_code, resp.data)
+    # test_wait()
 # TestJobRequest
@@ -0,0 +1,292 @@
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit test for jobs resource module
+"""
+
+#
+# IMPORTS
+#
+from base64 import b64encode
+from datetime import datetime
+from tempfile import TemporaryDirectory
+from tests.unit.api.resources.secure_resource import TestSecureResource
+from tessia.server.api.resources.jobs import JobResource
+from tessia.server.db import models
+from tessia.server.lib.output_cache import OUTPUT_CACHE
+from unittest import mock
+
+import gzip
+import json
+import os
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+LOGIN = 'user_user@domain.com:a'
+
+OUTPUT = ''.join('line {}\n'.format(index) for index in range(100))
+
+#
+# CODE
+#
+
+
+class TestJobs(TestSecureResource):
+    """
+    Validates the conditional and range requests on the jobs output
+    """
+    # entry point for resource in api
+    RESOURCE_URL = '/jobs'
+    # model associated with this resource
+    RESOURCE_MODEL = models.SchedulerJob
+    # api object associated with the resource
+    RESOURCE_API = JobResource
+
+    @classmethod
+    def _entry_gen(cls):
+        """
+        Generator for producing new entries for database insertion.
+        """
+        index = 0
+        while True:
+            data = {
+                'requester': 'user_user@domain.com',
+                'job_type': 'echo',
+                'state': models.SchedulerJob.STATE_COMPLETED,
+                'parameters': 'echo job {}'.format(index),
+                'description': 'job {}'.format(index),
+                'submit_date': datetime.utcnow(),
+            }
+            index += 1
+            yield data
+    # _entry_gen()
+
+    def setUp(self):
+        """
+        Create a finished and a running job with their output files.
+        """
+        temp_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(temp_dir.cleanup)
+        self._jobs_dir = os.path.join(temp_dir.name, 'jobs')
+
+        patcher = mock.patch(
+            'tessia.server.api.resources.jobs.CONF', autospec=True)
+        mock_conf = patcher.start()
+        self.addCleanup(patcher.stop)
+        mock_conf.get_config.return_value = {
+            'scheduler': {'jobs_dir': self._jobs_dir}}
+
+        # serve the compressed content from a cache in the temp directory
+        cache_dir = os.path.join(temp_dir.name, 'cache')
+        os.makedirs(cache_dir)
+        for attr, value in (('_cache_dir', cache_dir),
+                            ('_max_size', 1024 * 1024)):
+            patcher = mock.patch.object(OUTPUT_CACHE, attr, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self._jobs = []
+        for finished in (True, False):
+            entry = self.RESOURCE_MODEL(**next(self._get_next_entry))
+            if finished:
+                entry.end_date = datetime.utcnow()
+            else:
+                entry.state = models.SchedulerJob.STATE_RUNNING
+            self.db.session.add(entry)
+            self.db.session.commit()
+            self._jobs.append(entry.id)
+
+            job_dir = '{}/{}'.format(self._jobs_dir, entry.id)
+            os.makedirs(job_dir)
+            with open('{}/output'.format(job_dir), 'w') as file_fd:
+                file_fd.write(OUTPUT)
+            # the result file marks the job as over
+            if finished:
+                with open('{}/.{}'.format(job_dir, entry.id), 'w') as file_fd:
+                    file_fd.write('0\n{}\n'.format(
+                        entry.end_date.strftime('%Y-%m-%d %H:%M:%S:%f')))
+    # setUp()
+
+    def tearDown(self):
+        """
+        Remove the job entries.
+        """
+        self.RESOURCE_MODEL.query.filter(
+            self.RESOURCE_MODEL.id.in_(self._jobs)).delete(
+                synchronize_session=False)
+        self.db.session.commit()
+    # tearDown()
+
+    def _get(self, path, headers=None):
+        """
+        Request a route of the jobs resource.
+
+        Args:
+            path (str): path after the resource url
+            headers (dict): additional request headers
+
+        Returns:
+            Response: flask response object
+        """
+        req_headers = {'Authorization': 'basic {}'.format(
+            b64encode(bytes(LOGIN, 'ascii')).decode('ascii'))}
+        req_headers.update(headers or {})
+        return self.app.get('{}/{}'.format(self.RESOURCE_URL, path),
+                            headers=req_headers)
+    # _get()
+
+    def test_output_finished(self):
+        """
+        Test that the output of a finished job has an etag, is not sent
+        again to a client which has it and can be requested in ranges,
+        without reading the job from the database.
+        """
+        with mock.patch.object(JobResource.manager, 'read',
+                               wraps=JobResource.manager.read) as mock_read:
+            resp = self._get('{}/output?offset=10&qty=5'.format(
+                self._jobs[0]))
+            self.assertEqual(resp.status_code, 200, resp.data)
+            etag = resp.headers['ETag'].strip('"')
+            self.assertEqual(resp.headers['Content-Encoding'], 'gzip')
+            content = resp.data
+            self.assertEqual(
+                json.loads(gzip.decompress(content)),
+                ''.join(OUTPUT.splitlines(True)[10:15]))
+
+            # client already has the content
+            resp = self._get(
+                '{}/output?offset=10&qty=5'.format(self._jobs[0]),
+                {'If-None-Match': '"{}"'.format(etag)})
+            self.assertEqual(resp.status_code, 304)
+            self.assertEqual(resp.headers['ETag'].strip('"'), etag)
+            self.assertEqual(resp.data, b'')
+
+            # other slice of the output: different content
+            resp = self._get(
+                '{}/output?offset=0&qty=5'.format(self._jobs[0]),
+                {'If-None-Match': '"{}"'.format(etag)})
+            self.assertEqual(resp.status_code, 200)
+            self.assertNotEqual(resp.headers['ETag'].strip('"'), etag)
+
+            # resume an interrupted transfer
+            resp = self._get(
+                '{}/output?offset=10&qty=5'.format(self._jobs[0]),
+                {'Range': 'bytes=10-'})
+            self.assertEqual(resp.status_code, 206)
+            self.assertEqual(
+                resp.headers['Content-Range'],
+                'bytes 10-{}/{}'.format(len(content) - 1, len(content)))
+            self.assertEqual(resp.data, content[10:])
+
+            mock_read.assert_not_called()
+    # test_output_finished()
+
+    def test_output_running(self):
+        """
+        Test that the output of a running job is always sent and has no etag.
+        """
+        resp = self._get('{}/output'.format(self._jobs[1]),
+                         {'If-None-Match': '*'})
+        self.assertEqual(resp.status_code, 200, resp.data)
+        self.assertNotIn('ETag', resp.headers)
+        self.assertEqual(json.loads(gzip.decompress(resp.data)), OUTPUT)
+    # test_output_running()
+
+    def test_output_not_created(self):
+        """
+        Test that an empty output is returned for a job without output file
+        and that a wrong job id is reported.
+        """
+        os.remove('{}/{}/output'.format(self._jobs_dir, self._jobs[0]))
+        resp = self._get('{}/output'.format(self._jobs[0]))
+        self.assertEqual(resp.status_code, 200, resp.data)
+        self.assertNotIn('ETag', resp.headers)
+        self.assertEqual(json.loads(gzip.decompress(resp.data)), '')
+
+        resp = self._get('{}/output'.format(max(self._jobs) + 1000))
+        self.assertEqual(resp.status_code, 404, resp.data)
+    # test_output_not_created()
+
+    def test_download_finished(self):
+        """
+        Test the conditional and range requests on the download of the output
+        of a finished job.
+        """
+        resp = self._get('{}/download?encoding=raw'.format(self._jobs[0]))
+        self.assertEqual(resp.status_code, 200, resp.data)
+        etag = resp.headers['ETag'].strip('"')
+        self.assertEqual(resp.data.decode('utf-8'), OUTPUT)
+
+        resp = self._get('{}/download?encoding=raw'.format(self._jobs[0]),
+                         {'If-None-Match': '"{}"'.format(etag)})
+        self.assertEqual(resp.status_code, 304)
+
+        resp = self._get('{}/download?encoding=raw'.format(self._jobs[0]),
+                         {'Range': 'bytes=0-9'})
+        self.assertEqual(resp.status_code, 206)
+        self.assertEqual(resp.headers['Content-Range'],
+                         'bytes 0-9/{}'.format(len(OUTPUT)))
+        self.assertEqual(resp.data.decode('utf-8'), OUTPUT[:10])
+
+        # gzip content is served from the cache and can be resumed as well
+        resp = self._get('{}/download'.format(self._jobs[0]))
+        self.assertEqual(resp.status_code, 200, resp.data)
+        content = resp.data
+        self.assertEqual(gzip.decompress(content).decode('utf-8'), OUTPUT)
+        resp = self._get('{}/download'.format(self._jobs[0]),
+                         {'Range': 'bytes=5-'})
+        self.assertEqual(resp.status_code, 206)
+        self.assertEqual(resp.data, content[5:])
+    # test_download_finished()
+
+    def test_download_cache_disabled(self):
+        """
+        Test that without output cache the compressed output of a finished
+        job is streamed in full, ranges are ignored.
+        """
+        with mock.patch.object(OUTPUT_CACHE, '_cache_dir', ''):
+            resp = self._get('{}/download'.format(self._jobs[0]))
+            self.assertEqual(resp.status_code, 200, resp.data)
+            etag = resp.headers['ETag'].strip('"')
+            self.assertEqual(
+                gzip.decompress(resp.data).decode('utf-8'), OUTPUT)
+
+            resp = self._get('{}/download'.format(self._jobs[0]),
+                             {'If-None-Match': '"{}"'.format(etag)})
+            self.assertEqual(resp.status_code, 304)
+
+            resp = self._get('{}/download'.format(self._jobs[0]),
+                             {'Range': 'bytes=5-'})
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(
+                gzip.decompress(resp.data).decode('utf-8'), OUTPUT)
+
+            resp = self._get('{}/output'.format(self._jobs[0]))
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(json.loads(gzip.decompress(resp.data)), OUTPUT)
+    # test_download_cache_disabled()
+
+    def test_download_running(self):
+        """
+        Test that the download of a running job has no etag.
+        """
+        resp = self._get('{}/download?encoding=raw'.format(self._jobs[1]),
+                         {'If-None-Match': '*'})
+        self.assertEqual(resp.status_code, 200, resp.data)
+        self.assertNotIn('ETag', resp.headers)
+        self.assertEqual(resp.data.decode('utf-8'), OUTPUT)
+    # test_download_running()
+# TestJobs
@@ -26,6 +26,7 @@ from tessia.server.api.resources.system_profiles import MARKER_STRIPPED_SECRET
 from tessia.server.api.resources.system_profiles import SystemProfileResource
 from tessia.server.db import models
 from tests.unit.api.resources.secure_resource import TestSecureResource
+from tests.unit.db.query_budget import QueryBudgetMixin
 
 import json
 import time
@@ -37,7 +38,7 @@ import time
 #
 # CODE
 #
-class TestSystemProfile(TestSecureResource):
+class TestSystemProfile(QueryBudgetMixin, TestSecureResource):
     """
     Validates the SystemProfile resource
     """
@@ -1488,6 +1489,18 @@ class TestSystemProfile(TestSecureResource):
 
     # test_list_and_read()
 
+    def test_read_query_budget(self):
+        """
+        Verify the number of queries issued to read a profile
+        """
+        entries, _ = self._create_many_entries('user_user@domain.com', 1)
+
+        with self.assert_query_budget('api.system_profiles.read'):
+            resp = self._do_request(
+                'get', 'user_user@domain.com:a', entries[0]['id'])
+        self.assertEqual(resp.status_code, 200, resp.data)
+    # test_read_query_budget()
+
     def test_list_and_read_hidden_credentials(self):
         """
         Make sure users without role in a project can't see systems'
@@ -23,6 +23,7 @@ from tessia.server.api.resources.systems import SystemResource
 from tessia.server.api.resources.systems import MSG_BAD_COMBO
 from tessia.server.db import models
 from tests.unit.api.resources.secure_resource import TestSecureResource
+from tests.unit.db.query_budget import QueryBudgetMixin
 
 import json
 
@@ -33,7 +34,7 @@ import json
 #
 # CODE
 #
-class TestSystems(TestSecureResource):
+class TestSystems(QueryBudgetMixin, TestSecureResource):
     """
     Validates the Systems resource
     """
@@ -297,6 +298,19 @@ class TestSystems(TestSecureResource):
         self._test_list_and_read('user_hw_admin@domain.com', logins)
     # test_list_and_read()
 
+    def test_list_query_budget(self):
+        """
+        Verify that listing systems does not issue queries per entry
+        """
+        self._create_many_entries('user_hw_admin@domain.com', 20)
+
+        with self.assert_query_budget('api.systems.list'):
+            resp = self._do_request('list', 'user_user@domain.com:a', None)
+        self.assertEqual(resp.status_code, 200, resp.data)
+        self.assertGreaterEqual(
+            len(json.loads(resp.get_data(as_text=True))), 20)
+    # test_list_query_budget()
+
     def test_list_and_read_restricted_no_role(self):
         """
         List entries with a restricted user without role in any project
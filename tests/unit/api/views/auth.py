@@ -26,7 +26,7 @@ from tessia.server.db import models
 from tests.unit.config import EnvConfig
 from tests.unit.db.models import DbUnit
 from unittest import TestCase
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import json
 
@@ -329,6 +329,16 @@ class TestAuth(TestCase):
 
             # validate a 401 unauthorized
             self.assertEqual(resp.status_code, 401)
+
+        # schemes sent by clients are not used as metric labels
+        mock_global = Mock()
+        with patch.object(auth, 'flask_global', mock_global):
+            resp = self.app.get(
+                '/users',
+                headers={'Authorization': 'something_wrong with_cred'}
+            )
+        self.assertEqual(resp.status_code, 401)
+        self.assertEqual(mock_global.auth_duration[0], 'unsupported')
     # test_scheme_wrong()
 
     def test_case_sens_login_success(self):
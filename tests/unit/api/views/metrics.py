@@ -0,0 +1,146 @@
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit test for api.views.metrics module
+"""
+
+#
+# IMPORTS
+#
+from flask import Flask
+from flask import g as flask_global
+from sqlalchemy import create_engine
+from tessia.server.api.views import metrics
+from unittest import TestCase
+from unittest.mock import patch
+
+import json
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+
+#
+# CODE
+#
+
+
+class TestMetrics(TestCase):
+    """
+    Validates the collection and export of api metrics
+    """
+
+    def setUp(self):
+        """
+        Create an app with metrics enabled and a fresh registry
+        """
+        patcher = patch.object(metrics, 'MEDIATOR', autospec=True)
+        self._mock_mediator = patcher.start()
+        self.addCleanup(patcher.stop)
+        # mediator returns what was stored
+        stored = {}
+        self._mock_mediator.set_fields.side_effect = (
+            lambda key, values, expire: stored.update(values))
+        self._mock_mediator.get.side_effect = lambda key: dict(stored)
+
+        definitions = metrics.METRICS.snapshot()
+        patcher = patch.object(metrics, 'METRICS', metrics.Registry())
+        registry = patcher.start()
+        self.addCleanup(patcher.stop)
+        for name, metric in definitions.items():
+            if metric['type'] == 'counter':
+                registry.counter(name, metric['help'])
+            else:
+                registry.histogram(name, metric['help'], metric['buckets'])
+
+        engine = create_engine('sqlite://')
+        app = Flask(__name__)
+        metrics.init_app(app)
+
+        @app.route('/items/<int:item_id>')
+        def read(item_id):  # pylint: disable=unused-variable
+            """Simulate a view authenticating and querying the db"""
+            flask_global.auth_duration = ('x-key', 0.002)
+            engine.execute('select 1')
+            engine.execute('select 2')
+            return json.dumps({'id': item_id})
+
+        self._client = app.test_client()
+    # setUp()
+
+    def test_disabled_by_default(self):
+        """
+        Test that metrics must be explicitly enabled
+        """
+        with patch.object(metrics, 'CONF', autospec=True) as mock_conf:
+            mock_conf.get_config.return_value = {}
+            self.assertFalse(metrics.is_enabled())
+            mock_conf.get_config.return_value = {'metrics': {'enabled': True}}
+            self.assertTrue(metrics.is_enabled())
+    # test_disabled_by_default()
+
+    def test_export(self):
+        """
+        Test that requests are accounted and exported
+        """
+        for item_id in (1, 2):
+            resp = self._client.get('/items/{}'.format(item_id))
+            self.assertEqual(resp.status_code, 200)
+        self._client.get('/missing')
+
+        resp = self._client.get('/metrics')
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.content_type.startswith('text/plain'))
+        lines = resp.get_data(as_text=True).splitlines()
+        labels = 'method="GET",route="/items/<int:item_id>"'
+        for expected in (
+                'tessia_api_requests_total{%s,status="200"} 2' % labels,
+                'tessia_api_requests_total{method="GET",route="<unmatched>",'
+                'status="404"} 1',
+                'tessia_api_request_duration_seconds_count{%s} 2' % labels,
+                'tessia_api_db_statements_bucket{%s,le="1"} 0' % labels,
+                'tessia_api_db_statements_bucket{%s,le="2"} 2' % labels,
+                'tessia_api_db_statements_sum{%s} 4' % labels,
+                'tessia_api_db_duration_seconds_count{%s} 2' % labels,
+                'tessia_api_response_size_bytes_sum{%s} 18' % labels,
+                'tessia_api_auth_duration_seconds_count{scheme="x-key"} 2'):
+            self.assertIn(expected, lines)
+
+        # the values of other workers are added
+        self._mock_mediator.get.side_effect = lambda key: {
+            'this': json.dumps(metrics.METRICS.snapshot()),
+            'other': json.dumps(metrics.METRICS.snapshot())}
+        lines = self._client.get('/metrics').get_data(
+            as_text=True).splitlines()
+        self.assertIn(
+            'tessia_api_requests_total{%s,status="200"} 4' % labels, lines)
+    # test_export()
+
+    def test_mediator_failure(self):
+        """
+        Test that values of the current process are exported when the
+        mediator is not available
+        """
+        self._mock_mediator.set_fields.side_effect = RuntimeError('down')
+        with self.assertLogs(metrics.__name__, 'WARNING'):
+            self._client.get('/items/1')
+            resp = self._client.get('/metrics')
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn(
+            'tessia_api_requests_total{method="GET",'
+            'route="/items/<int:item_id>",status="200"} 1',
+            resp.get_data(as_text=True).splitlines())
+    # test_mediator_failure()
+# TestMetrics
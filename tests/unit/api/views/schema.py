@@ -0,0 +1,107 @@
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit test for api.views.schema module
+"""
+
+#
+# IMPORTS
+#
+from flask import Flask
+from flask_potion import Api, Resource
+from tessia.server.api.views import schema
+from unittest import TestCase
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+
+#
+# CODE
+#
+
+
+class TestSchema(TestCase):
+    """
+    Validates the etag handling of the schema endpoints
+    """
+
+    @staticmethod
+    def _create_client(resource_title):
+        """
+        Create an app with one resource
+
+        Args:
+            resource_title (str): title of the resource
+
+        Returns:
+            flask.testing.FlaskClient: test client of the app
+        """
+        class Ping(Resource):
+            """
+            Minimal resource to populate the api schema
+            """
+            class Meta:
+                """
+                Potion's meta section
+                """
+                name = 'ping'
+                title = resource_title
+
+        app = Flask(__name__)
+        app.after_request(schema.add_schema_etag)
+        api = Api(app)
+        api.add_resource(Ping)
+        return app.test_client()
+    # _create_client()
+
+    def setUp(self):
+        """
+        Create the app used by the tests
+        """
+        self._client = self._create_client('Ping')
+    # setUp()
+
+    def test_not_modified(self):
+        """
+        Test that schemas are not sent again when the client has them
+        """
+        for url in ('/schema', '/ping/schema'):
+            resp = self._client.get(url)
+            self.assertEqual(resp.status_code, 200)
+            etag = resp.headers['ETag']
+
+            resp = self._client.get(url, headers={'If-None-Match': etag})
+            self.assertEqual(resp.status_code, 304)
+            self.assertEqual(resp.get_data(), b'')
+
+            resp = self._client.get(url, headers={'If-None-Match': '"other"'})
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(resp.headers['ETag'], etag)
+    # test_not_modified()
+
+    def test_root_covers_resources(self):
+        """
+        Test that the root etag changes when a resource schema changes
+        """
+        root_etag = self._client.get('/schema').headers['ETag']
+
+        # the root document is the same, only the resource schema differs
+        client = self._create_client('Pong')
+        self.assertEqual(client.get('/schema').get_data(),
+                         self._client.get('/schema').get_data())
+        self.assertNotEqual(client.get('/schema').headers['ETag'], root_etag)
+    # test_root_covers_resources()
+# TestSchema
@@ -0,0 +1,210 @@
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Helpers to count the sql statements issued by a block of code and to assert
+them against the budgets committed in query_budgets.json
+"""
+
+#
+# IMPORTS
+#
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event
+from tessia.server.db import connection
+from unittest import TestCase
+from unittest.mock import patch
+
+import json
+import os
+import tempfile
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+BUDGETS_FILE = '{}/query_budgets.json'.format(
+    os.path.dirname(os.path.abspath(__file__)))
+
+# when set, the statement count of each budget check is appended to the file
+# named by this variable, in json lines format
+REPORT_ENV = 'TESSIA_QUERY_REPORT'
+
+#
+# CODE
+#
+
+
+class QueryCounter:
+    """
+    Context manager which records the sql statements executed on an engine,
+    including the ones issued by other threads
+    """
+
+    def __init__(self, engine=None):
+        """
+        Constructor
+
+        Args:
+            engine (Engine): engine to watch, defaults to the one of the
+                             connection manager
+        """
+        self._engine = engine
+        self.statements = []
+    # __init__()
+
+    def __enter__(self):
+        """
+        Start recording
+
+        Returns:
+            QueryCounter: self
+        """
+        if self._engine is None:
+            self._engine = connection.MANAGER.engine
+        event.listen(self._engine, 'before_cursor_execute', self._record)
+        return self
+    # __enter__()
+
+    def __exit__(self, *_args):
+        """
+        Stop recording
+        """
+        event.remove(self._engine, 'before_cursor_execute', self._record)
+    # __exit__()
+
+    # pylint: disable=too-many-arguments
+    def _record(self, _conn, _cursor, statement, _parameters, _context,
+                _executemany):
+        """
+        Listener of the engine's before_cursor_execute event
+        """
+        self.statements.append(statement)
+    # _record()
+
+    @property
+    def count(self):
+        """
+        Number of statements recorded
+        """
+        return len(self.statements)
+    # count
+# QueryCounter
+
+
+class QueryBudgetMixin:
+    """
+    Mixin for test cases with blocks that must not exceed a query budget
+    """
+
+    @contextmanager
+    def assert_query_budget(self, name, engine=None):
+        """
+        Fail the test if the block executes more statements than allowed by
+        the budget. The budgets are kept in query_budgets.json so that an
+        increase is visible in the review of the change which caused it.
+
+        Args:
+            name (str): budget name in the budgets file
+            engine (Engine): engine to watch, defaults to the one of the
+                             connection manager
+
+        Yields:
+            QueryCounter: counter of the block
+        """
+        with open(BUDGETS_FILE, 'r') as file_obj:
+            budget = json.load(file_obj)[name]
+
+        with QueryCounter(engine) as counter:
+            yield counter
+
+        report_file = os.environ.get(REPORT_ENV)
+        if report_file:
+            with open(report_file, 'a') as file_obj:
+                file_obj.write(json.dumps({
+                    'budget': name,
+                    'test': self.id(),
+                    'count': counter.count,
+                    'limit': budget,
+                }) + '\n')
+
+        if counter.count > budget:
+            self.fail(
+                'Query budget {} exceeded: {} statements executed, {} '
+                'allowed. Statements:\n{}'.format(
+                    name, counter.count, budget,
+                    '\n'.join(counter.statements)))
+    # assert_query_budget()
+# QueryBudgetMixin
+
+
+class TestQueryBudget(QueryBudgetMixin, TestCase):
+    """
+    Unit test for the query counting helpers
+    """
+
+    def setUp(self):
+        """
+        Use an in-memory database so that no server is needed
+        """
+        self._engine = create_engine('sqlite://')
+        self.addCleanup(self._engine.dispose)
+    # setUp()
+
+    def test_count(self):
+        """
+        Test that statements are recorded only inside the block
+        """
+        self._engine.execute('SELECT 1')
+        with QueryCounter(self._engine) as counter:
+            self._engine.execute('SELECT 2')
+            self._engine.execute('SELECT 3')
+        self._engine.execute('SELECT 4')
+
+        self.assertEqual(counter.count, 2)
+        self.assertEqual(counter.statements, ['SELECT 2', 'SELECT 3'])
+    # test_count()
+
+    def test_budget(self):
+        """
+        Test that exceeding a budget fails the test with the statements
+        """
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        budgets_file = os.path.join(temp_dir.name, 'budgets.json')
+        report_file = os.path.join(temp_dir.name, 'report.json')
+        with open(budgets_file, 'w') as file_obj:
+            json.dump({'two': 2}, file_obj)
+        patcher = patch('{}.BUDGETS_FILE'.format(__name__), budgets_file)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.dict(os.environ, {REPORT_ENV: report_file})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        with self.assert_query_budget('two', self._engine):
+            self._engine.execute('SELECT 1')
+            self._engine.execute('SELECT 2')
+
+        with self.assertRaisesRegex(
+                AssertionError, 'Query budget two exceeded: 3 statements '
+                'executed, 2 allowed. Statements:\nSELECT 1\n'):
+            with self.assert_query_budget('two', self._engine):
+                for _ in range(3):
+                    self._engine.execute('SELECT 1')
+
+        with open(report_file, 'r') as file_obj:
+            self.assertEqual(
+                [json.loads(line)['count'] for line in file_obj], [2, 3])
+    # test_budget()
+# TestQueryBudget
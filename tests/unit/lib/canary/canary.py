@@ -0,0 +1,288 @@
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit test for the canary module
+"""
+
+#
+# IMPORTS
+#
+from datetime import datetime
+from tessia.server.db.models import HmcCanary
+from tessia.server.lib.canary import canary
+from tests.unit.db.models import DbUnit
+from tests.unit.db.query_budget import QueryCounter
+from unittest import TestCase
+from unittest.mock import MagicMock, Mock, patch
+from urllib.parse import urlsplit
+
+import requests
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+# cpc name, hmc hostname, profiles as (name, default, credentials)
+CPCS = [
+    ('cpc10', 'hmc1.domain.com', [
+        ('default', True, {'admin-user': 'user1', 'admin-password': 'pwd1'}),
+        ('other', False, {'admin-user': 'other', 'admin-password': 'other'}),
+    ]),
+    # second cpc managed by the same hmc
+    ('cpc11', 'hmc1.domain.com', [
+        ('default', True, {'admin-user': 'user2', 'admin-password': 'pwd2'}),
+    ]),
+    # no password in default profile
+    ('cpc12', 'hmc2.domain.com', [
+        ('default', True, {'admin-user': 'user3'}),
+        ('other', False, {'admin-user': 'user3', 'admin-password': 'pwd3'}),
+    ]),
+    ('cpc13', 'hmc3.domain.com', [
+        ('default', True, {'admin-user': 'user4', 'admin-password': 'pwd4'}),
+    ]),
+]
+
+#
+# CODE
+#
+
+
+class TestCanary(TestCase):
+    """
+    Unit test for the Canary class
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Called once to create the db content for this test.
+        """
+        DbUnit.create_db()
+        entries = {'System': [], 'SystemProfile': []}
+        for name, hostname, profiles in CPCS:
+            entries['System'].append({
+                'name': name,
+                'hostname': hostname,
+                'hypervisor': None,
+                'model': 'ZEC12_H43',
+                'type': 'CPC',
+                'state': 'AVAILABLE',
+                'owner': 'admin',
+                'modifier': 'admin',
+                'project': 'Admins',
+                'desc': None,
+            })
+            for prof_name, default, credentials in profiles:
+                entries['SystemProfile'].append({
+                    'name': prof_name,
+                    'system': name,
+                    'default': default,
+                    'cpu': 2,
+                    'memory': 4096,
+                    'credentials': credentials,
+                })
+        # lpars are not checked even if they have credentials
+        entries['System'].append({
+            'name': 'cpc13lp1',
+            'hostname': 'cpc13lp1.domain.com',
+            'hypervisor': 'cpc13',
+            'model': 'ZEC12_H43',
+            'type': 'LPAR',
+            'state': 'AVAILABLE',
+            'owner': 'admin',
+            'modifier': 'admin',
+            'project': 'Admins',
+            'desc': None,
+        })
+        entries['SystemProfile'].append({
+            'name': 'default',
+            'system': 'cpc13lp1',
+            'default': True,
+            'cpu': 2,
+            'memory': 4096,
+            'credentials': {
+                'admin-user': 'root', 'admin-password': 'passwd'},
+        })
+        DbUnit.create_entry(entries)
+        cls.db = DbUnit
+    # setUpClass()
+
+    def setUp(self):
+        """
+        Start each test with an empty status table and mocked HMC sessions.
+        """
+        HmcCanary.query.delete()
+        self.db.session.commit()
+
+        # hostnames of the HMCs whose requests time out
+        self._timeouts = set()
+        patcher = patch.object(canary.requests, 'Session', autospec=True)
+        self._mock_session_cls = patcher.start()
+        self.addCleanup(patcher.stop)
+        self._mock_session_cls.side_effect = self._new_session
+        self._sessions = []
+
+        self._canary = canary.Canary()
+    # setUp()
+
+    def _new_session(self):
+        """
+        Create a fake session to an HMC which answers all requests, except
+        for the HMCs listed in self._timeouts.
+
+        Returns:
+            MagicMock: session mock
+        """
+        def _post(url, **_kwargs):
+            """Open the HMC api session"""
+            hostname = urlsplit(url).hostname
+            if hostname in self._timeouts:
+                raise requests.exceptions.ConnectTimeout(
+                    'timed out connecting to {}'.format(hostname))
+            return Mock(status_code=200,
+                        json=Mock(return_value={'api-session': hostname}))
+
+        def _get(url, **_kwargs):
+            """List the CPCs of the HMC"""
+            hostname = urlsplit(url).hostname
+            return Mock(status_code=200, json=Mock(return_value={
+                'cpcs': [{'name': hostname.split('.')[0].upper(),
+                          'status': 'operating'}]}))
+
+        session = MagicMock()
+        session.__enter__.return_value = session
+        session.post.side_effect = _post
+        session.get.side_effect = _get
+        session.delete.return_value = Mock(status_code=204)
+        self._sessions.append(session)
+        return session
+    # _new_session()
+
+    def test_check_hmc_timeout(self):
+        """
+        Test that an HMC timing out does not prevent the others from being
+        checked.
+        """
+        self._canary.request_timeout = 3
+        self._canary.hmc_to_check = [
+            {'hostname': 'hmc{}.domain.com'.format(index),
+             'user': 'user', 'password': 'pwd'}
+            for index in range(4)]
+        self._timeouts.add('hmc2.domain.com')
+
+        self._canary.check()
+
+        statuses = {hmc['hostname']: (hmc['status'], hmc['cpc'])
+                    for hmc in self._canary.hmc_to_check}
+        self.assertEqual(statuses.pop('hmc2.domain.com'),
+                         ('NOT AVAILABLE', []))
+        for hostname, status in statuses.items():
+            self.assertEqual(status, ('AVAILABLE', [{
+                'name': hostname.split('.')[0].upper(),
+                'status': 'operating'}]))
+        # each session was closed and all requests used the timeout
+        self.assertEqual(len(self._sessions), 4)
+        for session in self._sessions:
+            session.__exit__.assert_called_once()
+            for call in (session.post.call_args_list +
+                         session.get.call_args_list +
+                         session.delete.call_args_list):
+                self.assertEqual(call[1]['timeout'], 3)
+    # test_check_hmc_timeout()
+
+    def test_get_hmc_list(self):
+        """
+        Test that the HMCs are retrieved with the credentials of the default
+        profiles of the CPCs in a single query.
+        """
+        with QueryCounter() as counter:
+            self._canary.get_hmc_list()
+
+        self.assertEqual(counter.count, 1)
+        hmcs = {hmc['hostname']: (hmc['user'], hmc['password'])
+                for hmc in self._canary.hmc_to_check}
+        self.assertEqual(len(self._canary.hmc_to_check), len(hmcs))
+        self.assertEqual(hmcs['hmc3.domain.com'], ('user4', 'pwd4'))
+        # credentials of one of the cpcs, always from the default profile
+        self.assertIn(hmcs.pop('hmc1.domain.com'),
+                      [('user1', 'pwd1'), ('user2', 'pwd2')])
+        self.assertEqual(list(hmcs), ['hmc3.domain.com'])
+    # test_get_hmc_list()
+
+    def test_update_db_removes_unchecked(self):
+        """
+        Test that the entries are updated in place and the HMCs which are
+        not checked anymore are removed.
+        """
+        first_date = datetime(2026, 1, 1)
+        self._canary.hmc_to_check = [
+            {'hostname': 'hmc1.domain.com', 'status': 'AVAILABLE',
+             'cpc': [{'name': 'CPC10', 'status': 'operating'}]},
+            {'hostname': 'hmc2.domain.com', 'status': 'NOT AVAILABLE',
+             'cpc': []},
+        ]
+        self._canary.update_db(first_date)
+        self.assertEqual(
+            sorted(entry.name for entry in HmcCanary.query.all()),
+            ['hmc1.domain.com', 'hmc2.domain.com'])
+
+        # hmc2 is not checked anymore, hmc1 changed its status
+        second_date = datetime(2026, 1, 2)
+        self._canary.hmc_to_check = [
+            {'hostname': 'hmc1.domain.com', 'status': 'NOT AVAILABLE',
+             'cpc': []},
+        ]
+        self._canary.update_db(second_date)
+        self.db.session.expire_all()
+        entries = HmcCanary.query.all()
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0].name, 'hmc1.domain.com')
+        self.assertEqual(entries[0].status, 'NOT AVAILABLE')
+        self.assertEqual(entries[0].cpc_status, [])
+        self.assertEqual(entries[0].last_update, second_date)
+
+        # no HMC left to check
+        self._canary.hmc_to_check = []
+        self._canary.update_db(second_date)
+        self.assertEqual(HmcCanary.query.count(), 0)
+    # test_update_db_removes_unchecked()
+
+    def test_configuration_int_options(self):
+        """
+        Test that the numeric options are converted and validated.
+        """
+        config = {'check_on': True, 'waiting_time': 60,
+                  'max_workers': '4', 'request_timeout': '20'}
+        with patch.object(canary, 'CONF', autospec=True) as mock_conf:
+            mock_conf.get_config.return_value = {'canary': config}
+            self._canary.configuration()
+            self.assertEqual(self._canary.max_workers, 4)
+            self.assertEqual(self._canary.request_timeout, 20)
+
+            # defaults
+            del config['max_workers']
+            del config['request_timeout']
+            self._canary.configuration()
+            self.assertEqual(self._canary.max_workers,
+                             canary.DEFAULT_MAX_WORKERS)
+            self.assertEqual(self._canary.request_timeout,
+                             canary.DEFAULT_REQUEST_TIMEOUT)
+
+            for wrong_value in ('ten', None, 0, -5, True, [10]):
+                config['request_timeout'] = wrong_value
+                with self.assertRaisesRegex(
+                        RuntimeError, "'request_timeout' must be"):
+                    self._canary.configuration()
+    # test_configuration_int_options()
+# TestCanary
@@ -0,0 +1,163 @@
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit test for docker_image module
+"""
+
+#
+# IMPORTS
+#
+from tempfile import TemporaryDirectory
+from tessia.server.lib import docker_image
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+import docker
+import json
+import os
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+IMAGE_NAME = 'tessia_test_docker'
+
+BUILD_OUTPUT = ['Step 1/1 : FROM ubuntu:18.04',
+                'Successfully built ddc72650454e',
+                'Successfully tagged tessia_test_docker:latest']
+
+#
+# CODE
+#
+
+
+class TestDockerImage(TestCase):
+    """
+    Unit test for the DockerImage class
+    """
+
+    def setUp(self):
+        """
+        Create a build context and a jobs directory
+        """
+        self._temp_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self._temp_dir.cleanup)
+        self._context_dir = os.path.join(self._temp_dir.name, 'context')
+        os.mkdir(self._context_dir)
+        self._dockerfile = os.path.join(self._context_dir, 'Dockerfile')
+        with open(self._dockerfile, 'w') as file_fd:
+            file_fd.write('FROM ubuntu:18.04\n')
+        self._jobs_dir = os.path.join(self._temp_dir.name, 'jobs')
+        os.mkdir(self._jobs_dir)
+
+        patcher = patch.object(docker_image, 'CONF', autospec=True)
+        self._mock_conf = patcher.start()
+        self.addCleanup(patcher.stop)
+        self._mock_conf.get_config.return_value = {
+            'scheduler': {'jobs_dir': self._jobs_dir}}
+
+        self._mock_client = MagicMock()
+        self._mock_client.images.get.side_effect = docker.errors.ImageNotFound(
+            'image not found')
+        self._mock_client.api.build.return_value = [
+            json.dumps({'stream': line}).encode('utf-8')
+            for line in BUILD_OUTPUT]
+        self._mock_client.images.list.return_value = []
+
+        self._image = docker_image.DockerImage(
+            self._mock_client, IMAGE_NAME, self._context_dir)
+    # setUp()
+
+    def test_build(self):
+        """
+        Test that the image is built with the instance label and the lock
+        file is created in the jobs directory
+        """
+        self._image.build()
+
+        self._mock_client.api.build.assert_called_once_with(
+            path=self._context_dir, tag=self._image.tag, nocache=True,
+            forcerm=True,
+            labels={docker_image.INSTANCE_LABEL: self._jobs_dir})
+        self.assertTrue(os.path.exists(os.path.join(
+            self._jobs_dir, '.{}.lock'.format(IMAGE_NAME))))
+    # test_build()
+
+    def test_build_existing(self):
+        """
+        Test that an existing image is not built again
+        """
+        self._mock_client.images.get.side_effect = None
+        self._image.build()
+
+        self._mock_client.api.build.assert_not_called()
+        self._mock_client.images.list.assert_not_called()
+    # test_build_existing()
+
+    def test_build_no_jobs_dir(self):
+        """
+        Test that the build fails when no jobs directory is configured
+        """
+        self._mock_conf.get_config.return_value = {}
+        with self.assertRaisesRegex(RuntimeError, 'No scheduler job'):
+            self._image.build()
+        self._mock_client.api.build.assert_not_called()
+    # test_build_no_jobs_dir()
+
+    def test_context_hash(self):
+        """
+        Test that the tag changes only when the build context changes
+        """
+        self.assertRegex(
+            self._image.tag, r'^{}:[0-9a-f]{{16}}$'.format(IMAGE_NAME))
+        self.assertEqual(
+            docker_image.DockerImage(
+                self._mock_client, IMAGE_NAME, self._context_dir).tag,
+            self._image.tag)
+
+        with open(self._dockerfile, 'a') as file_fd:
+            file_fd.write('RUN true\n')
+        self.assertNotEqual(
+            docker_image.DockerImage(
+                self._mock_client, IMAGE_NAME, self._context_dir).tag,
+            self._image.tag)
+    # test_context_hash()
+
+    def test_remove_outdated(self):
+        """
+        Test that only the outdated images of the instance are removed
+        """
+        current = MagicMock(id='current', tags=[self._image.tag])
+        outdated = MagicMock(id='outdated', tags=['{}:old'.format(IMAGE_NAME)])
+        in_use = MagicMock(id='in_use', tags=['{}:older'.format(IMAGE_NAME)])
+        self._mock_client.images.list.return_value = [
+            current, outdated, in_use]
+
+        def _remove(image_id):
+            """Fail to remove image used by a container"""
+            if image_id == 'in_use':
+                raise docker.errors.APIError('image in use')
+        self._mock_client.images.remove.side_effect = _remove
+
+        self._image.build()
+
+        self._mock_client.images.list.assert_called_once_with(
+            name=IMAGE_NAME, filters={'label': '{}={}'.format(
+                docker_image.INSTANCE_LABEL, self._jobs_dir)})
+        self.assertEqual(
+            [call[0][0] for call in
+             self._mock_client.images.remove.call_args_list],
+            ['outdated', 'in_use'])
+    # test_remove_outdated()
+# TestDockerImage
@@ -71,6 +71,33 @@ class TestMediator(TestCase):
             self._mediator._decode({b'dict': b'object', b'decodes': b'well'}))
     # test_decode()
 
+    def test_set_get_many(self):
+        """
+        Test storing and retrieving several values at once
+        """
+        values = {
+            "a string": "string_value",
+            "a dict": {"this": "is", "a": "dictionary"},
+            "a list": ["store", "lists", "this", "simple", "way"],
+        }
+        self._mediator.set_many(values, expire=60)
+        keys = list(values.keys()) + ["a missing key"]
+        self.assertEqual(list(values.values()) + [None],
+                         self._mediator.get_many(keys))
+        self.assertEqual([], self._mediator.get_many([]))
+
+        # keys can be removed in the same operation as others are updated
+        self._mediator.set_many({"a string": None, "a list": ["updated"]})
+        self.assertEqual(
+            [None, values["a dict"], ["updated"]],
+            self._mediator.get_many(["a string", "a dict", "a list"]))
+
+        # unsupported types are reported
+        self._mediator._conn.sadd("a set", "member")
+        with self.assertRaisesRegex(ValueError, "unsupported value type"):
+            self._mediator.get_many(["a string", "a set"])
+    # test_set_get_many()
+
     def test_set_get(self):
         """
         Test decode binary strings and objects
@@ -100,6 +127,40 @@ class TestMediator(TestCase):
         self.assertEqual(dict_value, self._mediator.get("a dict"))
     # test_set_get()
 
+    def test_set_fields(self):
+        """
+        Test updating some fields of a hash
+        """
+        self._mediator.set_fields("a hash", {"first": "1"})
+        self._mediator.set_fields("a hash", {"second": "2"}, expire=60)
+        self._mediator.set_fields("a hash", {})
+        self.assertEqual({"first": "1", "second": "2"},
+                         self._mediator.get("a hash"))
+        self.assertGreater(self._mediator._conn.ttl("a hash"), 0)
+    # test_set_fields()
+
+    def test_wait_change(self):
+        """
+        Test waiting for a value to change
+        """
+        self._mediator.set("a revision", "1")
+
+        # value is different from the known one: returns immediately
+        self.assertEqual(
+            "1", self._mediator.wait_change("a revision", "0", timeout=10))
+
+        # value does not change: returns after timeout
+        self.assertEqual(
+            "1", self._mediator.wait_change(
+                "a revision", "1", timeout=0.3, interval=0.1))
+
+        # value expires while waiting
+        self._mediator.set("a revision", "2", expire=1)
+        self.assertEqual(
+            None, self._mediator.wait_change(
+                "a revision", "2", timeout=10, interval=0.1))
+    # test_wait_change()
+
     def test_expire(self):
         """
         Test expiring values
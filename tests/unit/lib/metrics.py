@@ -0,0 +1,161 @@
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit test for metrics module
+"""
+
+#
+# IMPORTS
+#
+from tessia.server.lib import metrics
+from tessia.server.lib.metrics import Registry
+from unittest import TestCase
+from unittest.mock import patch
+
+import json
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+
+#
+# CODE
+#
+
+
+class TestRegistry(TestCase):
+    """
+    Unit test for the Registry class
+    """
+
+    def setUp(self):
+        """
+        Create a registry with one metric of each type
+        """
+        self._registry = Registry()
+        self._registry.counter('requests_total', 'Requests')
+        self._registry.histogram('duration_seconds', 'Duration', (0.1, 1))
+    # setUp()
+
+    def test_define_twice(self):
+        """
+        Test that metric names are unique
+        """
+        with self.assertRaisesRegex(ValueError, 'already defined'):
+            self._registry.counter('requests_total', 'Requests')
+    # test_define_twice()
+
+    def test_merge(self):
+        """
+        Test that snapshots of several processes are summed
+        """
+        self._registry.inc('requests_total', {'route': '/a'})
+        self._registry.observe('duration_seconds', 0.5)
+        other = Registry()
+        other.counter('requests_total', 'Requests')
+        other.histogram('duration_seconds', 'Duration', (0.1, 1))
+        other.inc('requests_total', {'route': '/a'}, 2)
+        other.inc('requests_total', {'route': '/b'})
+        other.observe('duration_seconds', 5)
+
+        # snapshots go through json between processes
+        merged = Registry.merge([
+            json.loads(json.dumps(self._registry.snapshot())),
+            json.loads(json.dumps(other.snapshot()))])
+        self.assertEqual(
+            sorted(merged['requests_total']['values']),
+            [[[['route', '/a']], 3], [[['route', '/b']], 1]])
+        self.assertEqual(merged['duration_seconds']['values'],
+                         [[[], [0, 1, 1, 5.5]]])
+    # test_merge()
+
+    def test_render(self):
+        """
+        Test the text exposition format
+        """
+        self._registry.inc('requests_total', {'route': '/a', 'method': 'GET'})
+        self._registry.inc('requests_total', {'route': 'say "hi"'})
+        for value in (0.05, 0.5, 0.5, 3):
+            self._registry.observe('duration_seconds', value, {'route': '/a'})
+
+        self.assertEqual(
+            Registry.render(self._registry.snapshot()),
+            '# HELP duration_seconds Duration\n'
+            '# TYPE duration_seconds histogram\n'
+            'duration_seconds_bucket{route="/a",le="0.1"} 1\n'
+            'duration_seconds_bucket{route="/a",le="1"} 3\n'
+            'duration_seconds_bucket{route="/a",le="+Inf"} 4\n'
+            'duration_seconds_sum{route="/a"} 4.05\n'
+            'duration_seconds_count{route="/a"} 4\n'
+            '# HELP requests_total Requests\n'
+            '# TYPE requests_total counter\n'
+            'requests_total{method="GET",route="/a"} 1\n'
+            'requests_total{route="say \\"hi\\""} 1\n')
+    # test_render()
+
+    def test_gauge(self):
+        """
+        Test setting and clearing gauges
+        """
+        self._registry.gauge('queue_depth', 'Queue depth')
+        self._registry.set('queue_depth', 3, {'resource': 'a'})
+        self._registry.set('queue_depth', 1, {'resource': 'a'})
+        self._registry.set('queue_depth', 2, {'resource': 'b'})
+        merged = Registry.merge(
+            [self._registry.snapshot(), self._registry.snapshot()])
+        self.assertIn(
+            'queue_depth{resource="a"} 2\nqueue_depth{resource="b"} 4\n',
+            Registry.render(merged))
+
+        self._registry.clear('queue_depth')
+        self.assertEqual(
+            self._registry.snapshot()['queue_depth']['values'], [])
+    # test_gauge()
+
+    def test_summary(self):
+        """
+        Test quantiles of summaries over the window of recent observations
+        """
+        self._registry.summary('wait_seconds', 'Wait')
+        with patch.object(metrics, 'SUMMARY_WINDOW', 100):
+            # the first observations fall out of the window
+            for value in [1000] * 50 + list(range(1, 101)):
+                self._registry.observe('wait_seconds', value, {'type': 'x'})
+
+        self.assertIn(
+            'wait_seconds{type="x",quantile="0.5"} 50\n'
+            'wait_seconds{type="x",quantile="0.9"} 90\n'
+            'wait_seconds{type="x",quantile="0.99"} 99\n'
+            'wait_seconds_sum{type="x"} 55050\n'
+            'wait_seconds_count{type="x"} 150\n',
+            Registry.render(self._registry.snapshot()))
+    # test_summary()
+
+    def test_time(self):
+        """
+        Test measuring the duration of a block, also when it fails
+        """
+        with patch.object(metrics.time, 'perf_counter', autospec=True,
+                          side_effect=[10, 10.5, 20, 22]):
+            with self._registry.time('duration_seconds'):
+                pass
+            with self.assertRaises(RuntimeError):
+                with self._registry.time('duration_seconds'):
+                    raise RuntimeError()
+        self.assertEqual(
+            self._registry.snapshot()['duration_seconds']['values'],
+            [[[], [0, 1, 1, 2.5]]])
+    # test_time()
+# TestRegistry
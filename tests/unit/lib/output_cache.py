@@ -0,0 +1,179 @@
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit test for output_cache module
+"""
+
+#
+# IMPORTS
+#
+from io import BytesIO
+from tempfile import TemporaryDirectory
+from tessia.server.lib import output_cache
+from unittest import TestCase
+from unittest.mock import patch
+
+import os
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+
+#
+# CODE
+#
+
+
+class TestOutputCache(TestCase):
+    """
+    Unit test for the _OutputCache class
+    """
+
+    def setUp(self):
+        """
+        Create a cache pointing to a temporary directory
+        """
+        self._temp_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self._temp_dir.cleanup)
+        self._cache_dir = os.path.join(self._temp_dir.name, 'cache')
+
+        patcher = patch.object(output_cache, 'CONF', autospec=True)
+        self._mock_conf = patcher.start()
+        self.addCleanup(patcher.stop)
+        self._mock_conf.get_config.return_value = {
+            'scheduler': {
+                'output_cache': {'dir': self._cache_dir, 'max_size': 1}
+            }
+        }
+
+        self._cache = output_cache._OutputCache()
+    # setUp()
+
+    def _write_source(self, name, content):
+        """
+        Create a source file in the temporary directory
+        """
+        path = os.path.join(self._temp_dir.name, name)
+        with open(path, 'wb') as file_obj:
+            file_obj.write(content)
+        return path
+    # _write_source()
+
+    def test_compute_etag(self):
+        """
+        Test that etag changes with the files and parameters
+        """
+        path = self._write_source('output', b'line\n')
+        etag = self._cache.compute_etag([path], 0, -1)
+
+        # same file and parameters give same etag
+        self.assertEqual(etag, self._cache.compute_etag([path], 0, -1))
+        # different parameters give a different etag
+        self.assertNotEqual(etag, self._cache.compute_etag([path], 1, -1))
+
+        # content change gives a different etag
+        with open(path, 'ab') as file_obj:
+            file_obj.write(b'another line\n')
+        self.assertNotEqual(etag, self._cache.compute_etag([path], 0, -1))
+
+        # missing file is reported
+        with self.assertRaises(FileNotFoundError):
+            self._cache.compute_etag([path + '.missing'])
+    # test_compute_etag()
+
+    def test_disabled(self):
+        """
+        Test that content is streamed from the producer on every call when
+        no cache directory is configured
+        """
+        self._mock_conf.get_config.return_value = {'scheduler': {}}
+        streams = []
+
+        def _producer():
+            streams.append(BytesIO(b'content'))
+            return streams[-1]
+
+        for _ in range(2):
+            file_obj, size = self._cache.open('key', _producer)
+            self.assertIs(file_obj, streams[-1])
+            self.assertEqual(file_obj.read(), b'content')
+            self.assertIsNone(size)
+        self.assertEqual(len(streams), 2)
+        self.assertFalse(os.path.exists(self._cache_dir))
+    # test_disabled()
+
+    def test_eviction(self):
+        """
+        Test that least recently used entries are evicted above the size cap
+        """
+        chunk = b'x' * (400 * 1024)
+        for key in ('first', 'second'):
+            file_obj, _ = self._cache.open(key, lambda: BytesIO(chunk))
+            file_obj.close()
+        # make sure first entry is the least recently used one
+        os.utime(os.path.join(self._cache_dir, 'first'), (0, 0))
+        os.utime(os.path.join(self._cache_dir, 'second'), (1, 1))
+
+        # third entry exceeds the cap of 1 MiB
+        file_obj, size = self._cache.open('third', lambda: BytesIO(chunk))
+        self.assertEqual(file_obj.read(), chunk)
+        self.assertEqual(size, len(chunk))
+        file_obj.close()
+
+        self.assertEqual(
+            sorted(os.listdir(self._cache_dir)), ['second', 'third'])
+    # test_eviction()
+
+    def test_hit_and_miss(self):
+        """
+        Test that content is produced only once and then served from disk
+        """
+        calls = []
+
+        def _producer():
+            calls.append(BytesIO(b'compressed content'))
+            return calls[-1]
+
+        # miss: content is produced and stored
+        file_obj, size = self._cache.open('etag.gz', _producer)
+        self.assertEqual(file_obj.read(), b'compressed content')
+        self.assertEqual(size, 18)
+        file_obj.close()
+        # producer stream is closed once stored
+        self.assertTrue(calls[0].closed)
+
+        # hit: content comes from disk
+        file_obj, size = self._cache.open('etag.gz', _producer)
+        self.assertEqual(file_obj.read(), b'compressed content')
+        self.assertEqual(size, 18)
+        file_obj.close()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(os.listdir(self._cache_dir), ['etag.gz'])
+    # test_hit_and_miss()
+
+    def test_producer_error(self):
+        """
+        Test that a failed production does not leave entries behind
+        """
+        def _producer():
+            raise RuntimeError('failed')
+
+        with self.assertRaises(RuntimeError):
+            self._cache.open('etag.gz', _producer)
+        self.assertEqual(os.listdir(self._cache_dir), [])
+    # test_producer_error()
+
+# TestOutputCache
@@ -16,6 +16,7 @@
 Unit test for the post_install verification module.
 """
 
+from base64 import b64decode
 from contextlib import contextmanager
 from copy import deepcopy
 from tessia.server.db.models import System, SystemProfile, OperatingSystem
@@ -26,11 +27,20 @@ from unittest.mock import patch, Mock
 
 import json
 import os
+import re
+import shlex
 import subprocess
 
 #
 # CONSTANTS AND DEFINITIONS
 #
+DASD_DEVPATH_1 = '/dev/disk/by-path/ccw-0.0.3956'
+DASD_DEVPATH_2 = '/dev/disk/by-path/ccw-0.0.3957'
+FCP_DEVPATH_1 = (
+    '/dev/disk/by-id/dm-uuid-mpath-11002076305aac1a0000000000002200')
+FCP_DEVPATH_2 = (
+    '/dev/disk/by-id/dm-uuid-mpath-11002076305aac1a0000000000002202')
+NVME_DEVPATH = '/dev/disk/by-id/nvme-eui.111nvme111'
 
 #
 # CODE
@@ -68,6 +78,18 @@ class TestPostInstallChecker(TestCase):
         self._mock_check_output = patcher.start()
         self.addCleanup(patcher.stop)
 
+        # mock for the ssh session where the facts script is executed
+        patcher = patch.object(post_install, 'SshClient', autospec=True)
+        self._mock_ssh_client = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self._mock_shell = self._mock_ssh_client.open_shell.return_value
+        self._mock_shell.run.side_effect = self._run_script
+        # commands sent to the shell and content of the script file
+        self._shell_cmds = []
+        self._script_file = None
+        # command outputs returned by the script, by command name
+        self._cmd_outputs = {}
+
         # patch logger
         patcher = patch.object(post_install, 'logging')
         mock_logging = patcher.start()
@@ -115,6 +137,31 @@ class TestPostInstallChecker(TestCase):
         self.db.session.commit()
     # _mock_db_obj()
 
+    def _run_script(self, cmd, **_):
+        """
+        Simulate the transfer and execution of the facts script on the target
+        system by returning the output defined for each command it contains.
+        Commands without a defined output fail as if they did not exist.
+        """
+        self._shell_cmds.append(cmd)
+        if cmd.startswith('_facts='):
+            self._script_file = ''
+            return 0, ''
+        if cmd.startswith('printf '):
+            self._script_file += shlex.split(cmd)[2]
+            return 0, ''
+
+        script = b64decode(self._script_file).decode('utf-8')
+        output = ''
+        for line in re.findall('^_section .*$', script, re.MULTILINE):
+            name = shlex.split(line)[1]
+            ret, cmd_output = self._cmd_outputs.get(
+                name, (127, 'sh: 1: {}: not found\n'.format(name)))
+            output += '{0} begin {1}\n{2}\n{0} end {3}\n'.format(
+                post_install.SCRIPT_MARKER, name, cmd_output, ret)
+        return 0, output
+    # _run_script()
+
     def _set_mocks_lpar_fcp(self, prof_obj):
         """
         Prepare mocks to return content of a lpar with fcp disks installation.
@@ -128,55 +175,17 @@ class TestPostInstallChecker(TestCase):
             facts = facts_fd.read()
 
         parted_1 = (
-            """cpc3lp52.domain.com | SUCCESS => {
-    "changed": false,
-    "disk": {
-        "dev": "/dev/dm-0",
-        "logical_block": 512,
-        "model": "Linux device-mapper (multipath)",
-        "physical_block": 512,
-        "size": 10737418240.0,
-        "table": "msdos",
-        "unit": "b"
-    },
-    "partitions": [
-        {
-            "begin": 1048576.0,
-            "end": 9437183999.0,
-            "flags": [],
-            "fstype": "ext4",
-            "num": 1,
-            "size": 9436135424.0,
-            "unit": "b"
-        },
-        {
-            "begin": 9438231552.0,
-            "end": 10737418239.0,
-            "flags": [],
-            "fstype": "",
-            "num": 2,
-            "size": 1299186688.0,
-            "unit": "b"
-        },
-        {
-            "begin": 9438232576.0,
-            "end": 10737418239.0,
-            "flags": [],
-            "fstype": "linux-swap(v1)",
-            "num": 5,
-            "size": 1299185664.0,
-            "unit": "b"
-        }
-    ],
-    "script": "unit 'B' print"
-}
+            """BYT;
+/dev/dm-0:10737418240B:dm:512:512:msdos:Linux device-mapper (multipath):;
+1:1048576B:9437183999B:9436135424B:ext4::;
+2:9438231552B:10737418239B:1299186688B:::;
+5:9438232576B:10737418239B:1299185664B:linux-swap(v1)::;
 """
         )
 
         # pylint: disable=trailing-whitespace
         lsblk_1 = (
-            """cpc3lp52.domain.com | SUCCESS | rc=0 >>
- 
+            """ 
 ext4 /
  
 swap [SWAP]
@@ -185,45 +194,22 @@ swap [SWAP]
         # pylint: enable=trailing-whitespace
 
         parted_2 = (
-            """cpc3lp52.domain.com | SUCCESS => {
-    "changed": false,
-    "disk": {
-        "dev": "/dev/dm-4",
-        "logical_block": 512,
-        "model": "Linux device-mapper (multipath)",
-        "physical_block": 512,
-        "size": 10737418240.0,
-        "table": "msdos",
-        "unit": "b"
-    },
-    "partitions": [
-        {
-            "begin": 1048576.0,
-            "end": 5243928575.0,
-            "flags": [],
-            "fstype": "btrfs",
-            "num": 1,
-            "size": 5242880000.0,
-            "unit": "b"
-        }
-    ],
-    "script": "unit 'B' print"
-}
+            """BYT;
+/dev/dm-4:10737418240B:dm:512:512:msdos:Linux device-mapper (multipath):;
+1:1048576B:5243928575B:5242880000B:btrfs::;
 """
         )
 
         # pylint: disable=trailing-whitespace
         lsblk_2 = (
-            """cpc3lp52.domain.com | SUCCESS | rc=0 >>
- 
+            """ 
 btrfs /home
 """
         )
         # pylint: enable=trailing-whitespace
 
         lszfcp = (
-            """cpc3lp52.domain.com | SUCCESS | rc=0 >>
-0.0.1800/0x100207630513c1ae/0x1022400000000000 0:0:21:1073758242
+            """0.0.1800/0x100207630513c1ae/0x1022400000000000 0:0:21:1073758242
 0.0.1800/0x100207630513c1ae/0x1022400200000000 0:0:21:1073889314
 0.0.1800/0x100207630508c1ae/0x1022400000000000 0:0:22:1073758242
 0.0.1800/0x100207630508c1ae/0x1022400200000000 0:0:22:1073889314
@@ -243,8 +229,7 @@ btrfs /home
         )
 
         os_release = (
-            """cpc3lp52.domain.com | SUCCESS | rc=0 >>
-NAME=xxxx
+            """NAME=xxxx
 VERSION=xxxx
 PRETTY_NAME="{}"
 ID=xxxxx
@@ -252,8 +237,7 @@ ID=xxxxx
         )
 
         lscpu_output = (
-            """cpc3lp52.domain.com | SUCCESS | rc=0 >>
-Architecture:          s390x
+            """Architecture:          s390x
 CPU op-mode(s):        32-bit, 64-bit
 Byte Order:            Big Endian
 CPU(s):                24
@@ -268,8 +252,7 @@ NUMA node0 CPU(s):     0-255
 
         # new format (lsmem's C port)
         lsmem_output = (
-            """cpc3lp52.domain.com | SUCCESS | rc=0 >>
-RANGE                                        SIZE  STATE REMOVABLE BLOCK
+            """RANGE                                        SIZE  STATE REMOVABLE BLOCK
 0x0000000000000000-0x000000006fffffff  2147483648 online       yes   0-7
 0x0000000070000000-0x000000007fffffff   268435456 online        no     8
 0x0000000080000000-0x00000000bfffffff  1073741824 online       yes  9-12
@@ -283,12 +266,10 @@ Total offline memory:            0
 
         # systemd dns config
         realp_output = (
-            """cpc3lp52.domain.com | SUCCESS | rc=0 >>
-/run/systemd/resolve/stub-resolv.conf
+            """/run/systemd/resolve/stub-resolv.conf
 """)
         resolv_output = (
-            """cpc3lp52.domain.com | SUCCESS | rc=0 >>
-# This file is managed by man:systemd-resolved(8). Do not edit.
+            """# This file is managed by man:systemd-resolved(8). Do not edit.
 #
 
 nameserver 192.168.200.241
@@ -296,20 +277,30 @@ search domain.com
 """)
 
         lsdasd = (
-            """cpc3lp52.domain.com | SUCCESS | rc=0 >>
-Bus-ID     Status      Name      Device  Type  BlkSz  Size      Blocks
+            """Bus-ID     Status      Name      Device  Type  BlkSz  Size      Blocks
 ==============================================================================
 """)
 
         kernel_cmdline = (
-            """cpc3lp52.domain.com | SUCCESS | rc=0 >>
-crashkernel=196M root=UUID=f0057090-da7c-470f-bc34-93c29aebafe1
+            """crashkernel=196M root=UUID=f0057090-da7c-470f-bc34-93c29aebafe1
 """)
 
-        self._mock_check_output.side_effect = [
-            facts, parted_1, lsblk_1, parted_2, lsblk_2, lszfcp, os_release,
-            lscpu_output, lsmem_output, realp_output, resolv_output, lsdasd,
-            kernel_cmdline]
+        self._mock_check_output.side_effect = None
+        self._mock_check_output.return_value = facts
+        self._cmd_outputs = {
+            'parted:' + FCP_DEVPATH_1: (0, parted_1),
+            'lsblk:' + FCP_DEVPATH_1: (0, lsblk_1),
+            'parted:' + FCP_DEVPATH_2: (0, parted_2),
+            'lsblk:' + FCP_DEVPATH_2: (0, lsblk_2),
+            'lszfcp': (0, lszfcp),
+            'os_release': (0, os_release),
+            'lscpu': (0, lscpu_output),
+            'lsmem_bytes': (0, lsmem_output),
+            'resolv_path': (0, realp_output),
+            'resolv_conf': (0, resolv_output),
+            'lsdasd': (0, lsdasd),
+            'cmdline': (0, kernel_cmdline),
+        }
     # _set_mocks_lpar_fcp()
 
     def _set_mocks_lpar_dasd(self, prof_obj):
@@ -325,88 +316,40 @@ crashkernel=196M root=UUID=f0057090-da7c-470f-bc34-93c29aebafe1
             facts = facts_fd.read()
 
         parted_1 = (
-            """cpc3lp52.domain.com | SUCCESS => {
-    "changed": false,
-    "disk": {
-        "dev": "/dev/dasda",
-        "logical_block": 512,
-        "model": "IBM S390 DASD drive",
-        "physical_block": 4096,
-        "size": 7385333760.0,
-        "table": "dasd",
-        "unit": "b"
-    },
-    "partitions": [
-        {
-            "begin": 98304.0,
-            "end": 7340163071.0,
-            "flags": [],
-            "fstype": "ext4",
-            "num": 1,
-            "size": 7340064768.0,
-            "unit": "b"
-        }
-    ],
-    "script": "unit 'B' print"
-}
+            """BYT;
+/dev/dasda:7385333760B:dasd:512:4096:dasd:IBM S390 DASD drive:;
+1:98304B:7340163071B:7340064768B:ext4::;
 """
         )
 
         # pylint: disable=trailing-whitespace
         lsblk_1 = (
-            """cpc3lp52.domain.com | SUCCESS | rc=0 >>
- 
+            """ 
 ext4 /
 """
         )  # pylint: enable=trailing-whitespace
 
         parted_2 = (
-            """cpc3lp52.domain.com | SUCCESS => {
-    "changed": false,
-    "disk": {
-        "dev": "/dev/dasdb",
-        "logical_block": 512,
-        "model": "IBM S390 DASD drive",
-        "physical_block": 4096,
-        "size": 7385333760.0,
-        "table": "dasd",
-        "unit": "b"
-    },
-    "partitions": [
-        {
-            "begin": 98304.0,
-            "end": 7340163071.0,
-            "flags": [],
-            "fstype": "linux-swap(v1)",
-            "num": 1,
-            "size": 7340064768.0,
-            "unit": "b"
-        }
-    ],
-    "script": "unit 'B' print"
-}
+            """BYT;
+/dev/dasdb:7385333760B:dasd:512:4096:dasd:IBM S390 DASD drive:;
+1:98304B:7340163071B:7340064768B:linux-swap(v1)::;
 """
         )
 
         # pylint: disable=trailing-whitespace
         lsblk_2 = (
-            """cpc3lp52.domain.com | SUCCESS | rc=0 >>
- 
+            """ 
 swap [SWAP]
 """
         )  # pylint: enable=trailing-whitespace
 
-        lszfcp = subprocess.CalledProcessError(returncode=1, cmd='lszfcp -D')
-        lszfcp_output = (
-            """cpc3lp52.domain.com | FAILED | rc=1 >>
-Error: No fcp devices found.
+        lszfcp = (
+            """Error: No fcp devices found.
 """
         )
-        lszfcp.output = lszfcp_output
 
         os_release = (
-            """cpc3lp52.domain.com | SUCCESS | rc=0 >>
-NAME=xxxx
+            """NAME=xxxx
 VERSION=xxxx
 PRETTY_NAME="{}"
 ID=xxxxx
@@ -414,8 +357,7 @@ ID=xxxxx
         )
 
         lscpu_output = (
-            """cpc3lp52.domain.com | SUCCESS | rc=0 >>
-Architecture:          s390x
+            """Architecture:          s390x
 CPU op-mode(s):        32-bit, 64-bit
 Byte Order:            Big Endian
 CPU(s):                10
@@ -429,8 +371,7 @@ NUMA node0 CPU(s):     0-255
 
         # old format (lsmem's perl script)
         lsmem_output = (
-            """cpc3lp52.domain.com | SUCCESS | rc=0 >>
-Address Range                          Size (MB)  State    Removable  Device
+            """Address Range                          Size (MB)  State    Removable  Device
 ===============================================================================
 0x0000000000000000-0x00000000fffffffe       4096  online   no         0-4095
 
@@ -443,13 +384,11 @@ Total offline memory: 0 MB
 
         # systemd dns config
         realp_output = (
-            """cpc3lp52.domain.com | SUCCESS | rc=0 >>
-/etc/resolv.conf
+            """/etc/resolv.conf
 """)
 
         lsdasd = (
-            """cpc3lp52.domain.com | SUCCESS | rc=0 >>
-Bus-ID     Status      Name      Device  Type  BlkSz  Size      Blocks
+            """Bus-ID     Status      Name      Device  Type  BlkSz  Size      Blocks
 ==============================================================================
 0.0.3999   alias                         ECKD
 0.0.399a   alias                         ECKD
@@ -458,17 +397,29 @@ Bus-ID     Status      Name      Device  Type  BlkSz  Size      Blocks
 """)
 
         kernel_cmdline = (
-            """cpc3lp52.domain.com | SUCCESS | rc=0 >>
-BOOT_IMAGE=0 LANG=en_US.UTF-8 cio_ignore=all,!condev crashkernel=auto """\
-"""rd.dasd=0.0.3957 rd.znet=qeth,0.0.f500,0.0.f501,0.0.f502,layer2=1,"""\
-"""portno=0,portname=OSAPORT root=/dev/disk/by-path/ccw-0.0.3956-part1 """\
-"""nosmt=true selinux=0
+            """BOOT_IMAGE=0 LANG=en_US.UTF-8 cio_ignore=all,!condev """\
+"""crashkernel=auto rd.dasd=0.0.3957 rd.znet=qeth,0.0.f500,0.0.f501,"""\
+"""0.0.f502,layer2=1,portno=0,portname=OSAPORT """\
+"""root=/dev/disk/by-path/ccw-0.0.3956-part1 nosmt=true selinux=0
 """)
 
-        self._mock_check_output.side_effect = [
-            facts, parted_1, lsblk_1, parted_2, lsblk_2, lszfcp, os_release,
-            lscpu_output, RuntimeError(), lsmem_output, realp_output, lsdasd,
-            kernel_cmdline]
+        self._mock_check_output.side_effect = None
+        self._mock_check_output.return_value = facts
+        self._cmd_outputs = {
+            'parted:' + DASD_DEVPATH_1: (0, parted_1),
+            'lsblk:' + DASD_DEVPATH_1: (0, lsblk_1),
+            'parted:' + DASD_DEVPATH_2: (0, parted_2),
+            'lsblk:' + DASD_DEVPATH_2: (0, lsblk_2),
+            'lszfcp': (1, lszfcp),
+            'os_release': (0, os_release),
+            'lscpu': (0, lscpu_output),
+            # lsmem version without support to bytes
+            'lsmem_bytes': (1, "lsmem: invalid option -- 'b'\n"),
+            'lsmem': (0, lsmem_output),
+            'resolv_path': (0, realp_output),
+            'lsdasd': (0, lsdasd),
+            'cmdline': (0, kernel_cmdline),
+        }
     # _set_mocks_lpar_dasd()
 
     def _set_mocks_lpar_nvme(self, prof_obj):
@@ -484,66 +435,27 @@ BOOT_IMAGE=0 LANG=en_US.UTF-8 cio_ignore=all,!condev crashkernel=auto """\
             facts = facts_fd.read()
 
         parted = (
-            """cpc3lp52.domain.com | SUCCESS => {
-    "changed": false,
-    "disk": {
-        "dev": "/dev/nvme0n1",
-        "logical_block": 512,
-        "model": "INTEL SSDPE2KX010T8",
-        "physical_block": 512,
-        "size": 1000204886016.0,
-        "table": "msdos",
-        "unit": "b"
-    },
-    "partitions": [
-        {
-            "begin": 1048576.0,
-            "end": 107374182399.0,
-            "flags": [],
-            "fstype": "ext4",
-            "name": "",
-            "num": 1,
-            "size": 107374182400.0,
-            "unit": "b"
-        },
-                {
-            "begin": 107375230976.0,
-            "end": 214749413375.0,
-            "flags": [
-                "swap"
-            ],
-            "fstype": "linux-swap(v1)",
-            "name": "",
-            "num": 2,
-            "size": 107374182400.0,
-            "unit": "b"
-        }
-    ],
-    "script": "unit 'B' print"
-}
+            """BYT;
+/dev/nvme0n1:1000204886016B:nvme:512:512:msdos:INTEL SSDPE2KX010T8:;
+1:1048576B:107374182399B:107374182400B:ext4::;
+2:107375230976B:214749413375B:107374182400B:linux-swap(v1)::swap;
 """
         )
 
-        # pylint: disable=trailing-whitespace
         lsblk = (
-            """cpc3lp52.domain.com | SUCCESS | rc=0 >>
-
+            """
 ext4 /
 swap [SWAP]
 """
-        )  # pylint: enable=trailing-whitespace
+        )
 
-        lszfcp = subprocess.CalledProcessError(returncode=1, cmd='lszfcp -D')
-        lszfcp_output = (
-            """cpc3lp52.domain.com | FAILED | rc=1 >>
-Error: No fcp devices found.
+        lszfcp = (
+            """Error: No fcp devices found.
 """
         )
-        lszfcp.output = lszfcp_output
 
         os_release = (
-            """cpc3lp52.domain.com | SUCCESS | rc=0 >>
-NAME=xxxx
+            """NAME=xxxx
 VERSION=xxxx
 PRETTY_NAME="{}"
 ID=xxxxx
@@ -551,8 +463,7 @@ ID=xxxxx
         )
 
         lscpu_output = (
-            """cpc3lp52.domain.com | SUCCESS | rc=0 >>
-Architecture:          s390x
+            """Architecture:          s390x
 CPU op-mode(s):        32-bit, 64-bit
 Byte Order:            Big Endian
 CPU(s):                10
@@ -566,8 +477,7 @@ NUMA node0 CPU(s):     0-255
 
         # old format (lsmem's perl script)
         lsmem_output = (
-            """cpc3lp52.domain.com | SUCCESS | rc=0 >>
-Address Range                          Size (MB)  State    Removable  Device
+            """Address Range                          Size (MB)  State    Removable  Device
 ===============================================================================
 0x0000000000000000-0x00000000fffffffe       4096  online   no         0-4095
 
@@ -580,27 +490,35 @@ Total offline memory: 0 MB
 
         # systemd dns config
         realp_output = (
-            """cpc3lp52.domain.com | SUCCESS | rc=0 >>
-/etc/resolv.conf
+            """/etc/resolv.conf
 """)
 
         lsdasd = (
-            """cpc3lp52.domain.com | SUCCESS | rc=0 >>
-Bus-ID     Status      Name      Device  Type  BlkSz  Size      Blocks
+            """Bus-ID     Status      Name      Device  Type  BlkSz  Size      Blocks
 ==============================================================================
 """)
 
         kernel_cmdline = (
-            """cpc3lp52.domain.com | SUCCESS | rc=0 >>
-root=UUID=70d8d7c0-a573-4209-a355-a0968a230958 crashkernel=1G-4G:192M """\
-"""cio_ignore=all,!condev rd.znet=qeth,0.0.f500,0.0.f501,0.0.f502,layer2=1"""\
-"""portno=0
+            """root=UUID=70d8d7c0-a573-4209-a355-a0968a230958 """\
+"""crashkernel=1G-4G:192M cio_ignore=all,!condev """\
+"""rd.znet=qeth,0.0.f500,0.0.f501,0.0.f502,layer2=1portno=0
 """)
 
-        self._mock_check_output.side_effect = [
-            facts, parted, lsblk, lszfcp, os_release,
-            lscpu_output, RuntimeError(), lsmem_output, realp_output, lsdasd,
-            kernel_cmdline]
+        self._mock_check_output.side_effect = None
+        self._mock_check_output.return_value = facts
+        self._cmd_outputs = {
+            'parted:' + NVME_DEVPATH: (0, parted),
+            'lsblk:' + NVME_DEVPATH: (0, lsblk),
+            'lszfcp': (1, lszfcp),
+            'os_release': (0, os_release),
+            'lscpu': (0, lscpu_output),
+            # lsmem version without support to bytes
+            'lsmem_bytes': (1, "lsmem: invalid option -- 'b'\n"),
+            'lsmem': (0, lsmem_output),
+            'resolv_path': (0, realp_output),
+            'lsdasd': (0, lsdasd),
+            'cmdline': (0, kernel_cmdline),
+        }
     # _set_mocks_lpar_nvme()
 
     def test_lpar_nvme(self):
@@ -670,31 +588,51 @@ some_output
 
         # prepare valid output and turn them invalid
         self._set_mocks_lpar_dasd(profile_entry)
-        orig_outputs = list(self._mock_check_output.side_effect)
+        orig_facts = self._mock_check_output.return_value
 
         # simulate invalid facts content
-        test_outputs = orig_outputs[:]
-        test_outputs[0] = test_outputs[0].replace(
+        self._mock_check_output.return_value = orig_facts.replace(
             'ansible_facts', 'ansible_wrong_facts')
-        self._mock_check_output.side_effect = test_outputs
         with self.assertRaisesRegex(
                 SystemError, 'Could not parse output from ansible facts: '):
             checker.verify()
+        self._mock_check_output.return_value = orig_facts
+
+        # simulate ssh connection failure
+        self._mock_ssh_client.login.side_effect = PermissionError(
+            'Authentication failed')
+        with self.assertRaisesRegex(
+                ConnectionError, 'Connection failed: Authentication failed'):
+            checker.verify()
+        self._mock_ssh_client.login.side_effect = None
+
+        # simulate script output in an unknown format (i.e. interrupted)
+        def _run_interrupted(cmd, **kwargs):
+            """Transfer the script but fail its execution"""
+            if cmd.startswith('base64 '):
+                return 1, 'Connection closed'
+            return self._run_script(cmd, **kwargs)
+        self._mock_shell.run.side_effect = _run_interrupted
+        with self.assertRaisesRegex(
+                SystemError, 'Could not parse command output: '):
+            checker.verify()
+        self._mock_shell.run.side_effect = self._run_script
+        # session is always closed
+        self._mock_ssh_client.logoff.assert_called_with()
 
         # simulate invalid lsmem output
-        test_outputs = orig_outputs[:]
-        test_outputs[9] = test_outputs[9].replace(
+        _, lsmem_output = self._cmd_outputs['lsmem']
+        self._cmd_outputs['lsmem'] = (0, lsmem_output.replace(
             'Total online memory : 4096 MB',
-            'Total online memory:       unknown')
-        self._mock_check_output.side_effect = test_outputs
+            'Total online memory:       unknown'))
         with self.assertRaisesRegex(
                 RuntimeError, 'Failed to parse lsmem output'):
             checker.verify()
 
         # simulate invalid parted content
-        test_outputs = orig_outputs[:]
-        test_outputs[1] += '}'
-        self._mock_check_output.side_effect = test_outputs
+        self._set_mocks_lpar_dasd(profile_entry)
+        self._cmd_outputs['parted:' + DASD_DEVPATH_1] = (
+            0, 'BYT;\n/dev/dasda:invalid;\n')
         with self.assertRaisesRegex(
                 SystemError, 'Could not parse parted output of disk'):
             checker.verify()
@@ -732,15 +670,7 @@ some_output
         profile_entry = self._get_profile('cpc3lp52', 'dasd1')
         self._set_mocks_lpar_dasd(profile_entry)
         # set mock to simulate lscpu not found
-        check_outputs = list(self._mock_check_output.side_effect)
-        check_outputs[7] = subprocess.CalledProcessError(
-            returncode=2, cmd='lscpu')
-        check_outputs[7].output = (
-            """cpc3lp52.domain.com | FAILED | rc=3 >>
-[Errno 2] No such file or directory
-"""
-        )
-        self._mock_check_output.side_effect = check_outputs
+        self._cmd_outputs.pop('lscpu')
 
         checker = post_install.PostInstallChecker(profile_entry)
         checker.verify()
@@ -758,6 +688,51 @@ some_output
         checker.verify()
     # test_lpar_fcp()
 
+    def test_many_volumes(self):
+        """
+        Test that the facts script for a system with many volumes is sent
+        in lines short enough for the terminal of the interactive shell.
+        """
+        profile_entry = self._get_profile('cpc3lp52', 'fcp1')
+        checker = post_install.PostInstallChecker(profile_entry)
+
+        commands = []
+        for index in range(200):
+            devpath = '{}{:04x}'.format(FCP_DEVPATH_1[:-4], index)
+            commands.append((
+                'parted:' + devpath,
+                'parted -s -m {} unit B print'.format(devpath)))
+            commands.append((
+                'lsblk:' + devpath,
+                'lsblk --raw --noheadings --output FSTYPE,MOUNTPOINT {}'
+                .format(devpath)))
+            self._cmd_outputs['parted:' + devpath] = (0, 'BYT;')
+        results = checker._exec_script(commands)
+
+        self.assertEqual(len(results), len(commands))
+        self.assertEqual(results['parted:' + FCP_DEVPATH_1[:-4] + '00c7'],
+                         (0, 'BYT;'))
+        self.assertEqual(results['lsblk:' + FCP_DEVPATH_1[:-4] + '0000'][0],
+                         127)
+        self.assertGreater(len(self._shell_cmds), 10)
+        for cmd in self._shell_cmds:
+            self.assertLess(len(cmd), 4096)
+    # test_many_volumes()
+
+    def test_script_transfer_fail(self):
+        """
+        Test that a failure while transferring the facts script is reported.
+        """
+        profile_entry = self._get_profile('cpc3lp52', 'fcp1')
+        checker = post_install.PostInstallChecker(profile_entry)
+        self._mock_shell.run.side_effect = [
+            (0, ''), (1, 'No space left on device')]
+
+        with self.assertRaisesRegex(SystemError, 'No space left'):
+            checker._exec_script(post_install.FACT_COMMANDS)
+        self._mock_ssh_client.logoff.assert_called_once_with()
+    # test_script_transfer_fail()
+
     def test_misconfiguration_cpu(self):
         """
         Exercise misconfiguration of cpu values.
@@ -830,17 +805,8 @@ some_output
         self._set_mocks_lpar_fcp(fcp_prof_entry)
         checker = post_install.PostInstallChecker(fcp_prof_entry)
         # mock the failure to call lsmem
-        exc = subprocess.CalledProcessError(returncode=1, cmd='')
-        exc.output = (
-            """cpc3lp52.domain.com | FAILED | rc=2 >>
-[Errno 2] No such file or directory
-"""
-        )
-        # add the failure to the list of outputs
-        test_outputs = self._mock_check_output.side_effect[:]
-        test_outputs[8] = RuntimeError()
-        test_outputs.insert(9, exc)
-        self._mock_check_output.side_effect = test_outputs
+        self._cmd_outputs.pop('lsmem_bytes')
+        self._cmd_outputs.pop('lsmem', None)
         # expected error message
         error_msg = self._mismatch_msg.format(
             'minimum MiB memory', 3968, -1)
@@ -850,7 +816,7 @@ some_output
             checker.verify()
         # now test permissive - only logging occurs
         self._set_mocks_lpar_fcp(fcp_prof_entry)
-        self._mock_check_output.side_effect = test_outputs
+        self._cmd_outputs.pop('lsmem_bytes')
         self._mock_logger.reset_mock()
         checker = post_install.PostInstallChecker(
             fcp_prof_entry, permissive=True)
@@ -867,18 +833,16 @@ some_output
 
         # os mismatch (different pretty name)
         self._set_mocks_lpar_fcp(fcp_prof_entry)
-        check_outputs = list(self._mock_check_output.side_effect)
         wrong_os = 'SUSE Linux 12.2'
-        check_outputs[6] = (
-            """cpc3lp52.domain.com | SUCCESS | rc=0 >>
-NAME=xxxx
+        os_release = (
+            """NAME=xxxx
 VERSION=xxxx
 PRETTY_NAME="{}"
 ID=xxxxx
 """.format(wrong_os)
         )
 
-        self._mock_check_output.side_effect = check_outputs
+        self._cmd_outputs['os_release'] = (0, os_release)
         error_msg = self._mismatch_msg.format(
             'OS name', fcp_prof_entry.operating_system_rel.pretty_name,
             wrong_os)
@@ -889,7 +853,7 @@ ID=xxxxx
 
         # permissive - only logging occurs
         self._set_mocks_lpar_fcp(fcp_prof_entry)
-        self._mock_check_output.side_effect = check_outputs
+        self._cmd_outputs['os_release'] = (0, os_release)
         self._mock_logger.reset_mock()
         checker = post_install.PostInstallChecker(
             fcp_prof_entry, permissive=True)
@@ -906,11 +870,10 @@ ID=xxxxx
 
         # network - gateway mismatch
         self._set_mocks_lpar_fcp(fcp_prof_entry)
-        check_outputs = list(self._mock_check_output.side_effect)
         # simulate missing gateway
-        check_outputs[0] = check_outputs[0].replace(
+        facts = self._mock_check_output.return_value.replace(
             'gateway', 'hide_gateway')
-        self._mock_check_output.side_effect = check_outputs
+        self._mock_check_output.return_value = facts
         error_msg = self._mismatch_msg.format(
             'gateway', '192.168.160.1', '<not found>')
         checker = post_install.PostInstallChecker(fcp_prof_entry)
@@ -920,7 +883,7 @@ ID=xxxxx
 
         # permissive - only logging occurs
         self._set_mocks_lpar_fcp(fcp_prof_entry)
-        self._mock_check_output.side_effect = check_outputs
+        self._mock_check_output.return_value = facts
         self._mock_logger.reset_mock()
         checker = post_install.PostInstallChecker(
             fcp_prof_entry, permissive=True)
@@ -937,11 +900,10 @@ ID=xxxxx
 
         # simulate invalid gateway
         self._set_mocks_lpar_fcp(fcp_prof_entry)
-        check_outputs = list(self._mock_check_output.side_effect)
-        check_outputs[0] = check_outputs[0].replace(
+        facts = self._mock_check_output.return_value.replace(
             '"gateway": "192.168.160.1"',
             '"gateway": "192.152.160.1"')
-        self._mock_check_output.side_effect = check_outputs
+        self._mock_check_output.return_value = facts
         error_msg = self._mismatch_msg.format(
             'gateway', '192.168.160.1', '192.152.160.1')
         checker = post_install.PostInstallChecker(fcp_prof_entry)
@@ -951,7 +913,7 @@ ID=xxxxx
 
         # permissive - only logging occurs
         self._set_mocks_lpar_fcp(fcp_prof_entry)
-        self._mock_check_output.side_effect = check_outputs
+        self._mock_check_output.return_value = facts
         self._mock_logger.reset_mock()
         checker = post_install.PostInstallChecker(
             fcp_prof_entry, permissive=True)
@@ -987,10 +949,7 @@ ID=xxxxx
 
         # no resolv.conf available
         self._set_mocks_lpar_fcp(fcp_prof_entry)
-        test_outputs = list(self._mock_check_output.side_effect)
-        test_outputs[9] = RuntimeError(
-            'Command failed, output: cpc3lp52.domain.com | FAILED!')
-        self._mock_check_output.side_effect = test_outputs
+        self._cmd_outputs['resolv_path'] = (1, 'Permission denied')
         error_msg = self._mismatch_msg.format(
             'iface enccw0.0.f nameservers', '192.168.200.241',
             '<not found>')
@@ -1001,10 +960,7 @@ ID=xxxxx
 
         # permissive - only logging occurs
         self._set_mocks_lpar_fcp(fcp_prof_entry)
-        test_outputs = list(self._mock_check_output.side_effect)
-        test_outputs[9] = RuntimeError(
-            'Command failed, output: cpc3lp52.domain.com | FAILED!')
-        self._mock_check_output.side_effect = test_outputs
+        self._cmd_outputs['resolv_path'] = (1, 'Permission denied')
         checker = post_install.PostInstallChecker(
             fcp_prof_entry, permissive=True)
         checker.verify(areas=['network'])
@@ -1012,10 +968,7 @@ ID=xxxxx
 
         # failed to read resolv.conf froms systemd
         self._set_mocks_lpar_fcp(fcp_prof_entry)
-        test_outputs = list(self._mock_check_output.side_effect)
-        test_outputs[10] = RuntimeError(
-            'Command failed, output: cpc3lp52.domain.com | FAILED!')
-        self._mock_check_output.side_effect = test_outputs
+        self._cmd_outputs['resolv_conf'] = (1, 'Permission denied')
         error_msg = self._mismatch_msg.format(
             'iface enccw0.0.f nameservers', '192.168.200.241',
             '<not found>')
@@ -1026,10 +979,7 @@ ID=xxxxx
 
         # permissive - only logging occurs
         self._set_mocks_lpar_fcp(fcp_prof_entry)
-        test_outputs = list(self._mock_check_output.side_effect)
-        test_outputs[10] = RuntimeError(
-            'Command failed, output: cpc3lp52.domain.com | FAILED!')
-        self._mock_check_output.side_effect = test_outputs
+        self._cmd_outputs['resolv_conf'] = (1, 'Permission denied')
         checker = post_install.PostInstallChecker(
             fcp_prof_entry, permissive=True)
         checker.verify(areas=['network'])
@@ -1066,12 +1016,8 @@ ID=xxxxx
 
         # simulate disk not available
         self._set_mocks_lpar_fcp(fcp_prof_entry)
-        test_outputs = list(self._mock_check_output.side_effect)
-        test_outputs[1] = RuntimeError(
-            'Command failed, output: cpc3lp52.domain.com | FAILED!')
-        # lsblk won't get called for this disk so remove the mock entry
-        test_outputs.pop(2)
-        self._mock_check_output.side_effect = test_outputs
+        self._cmd_outputs['parted:' + FCP_DEVPATH_1] = (
+            1, 'Error: Could not stat device')
         error_msg = self._mismatch_msg.format(
             'volume 1022400000000000',
             'disk /dev/disk/by-id/dm-uuid-mpath-'
@@ -1082,8 +1028,9 @@ ID=xxxxx
             checker.verify(areas=['storage'])
 
         # permissive - only logging occurs
-        self._set_mocks_lpar_dasd(dasd_prof_entry)
-        self._mock_check_output.side_effect = test_outputs
+        self._set_mocks_lpar_fcp(fcp_prof_entry)
+        self._cmd_outputs['parted:' + FCP_DEVPATH_1] = (
+            1, 'Error: Could not stat device')
         self._mock_logger.reset_mock()
         checker = post_install.PostInstallChecker(
             fcp_prof_entry, permissive=True)
@@ -1135,13 +1082,11 @@ ID=xxxxx
 
         # simulate hpav alias not found
         self._set_mocks_lpar_dasd(dasd_prof_entry)
-        test_outputs = list(self._mock_check_output.side_effect)
-        test_outputs[11] = (
-            """cpc3lp52.domain.com | SUCCESS | rc=0 >>
-Bus-ID     Status      Name      Device  Type  BlkSz  Size      Blocks
+        lsdasd = (
+            """Bus-ID     Status      Name      Device  Type  BlkSz  Size      Blocks
 ==============================================================================
 """)
-        self._mock_check_output.side_effect = test_outputs
+        self._cmd_outputs['lsdasd'] = (0, lsdasd)
         error_msg = self._mismatch_msg.format(
             'dasd alias', '0.0.3999', '<not found>')
         error_msg_2 = self._mismatch_msg.format(
@@ -1152,7 +1097,7 @@ Bus-ID     Status      Name      Device  Type  BlkSz  Size      Blocks
 
         # permissive - only logging occurs
         self._set_mocks_lpar_dasd(dasd_prof_entry)
-        self._mock_check_output.side_effect = test_outputs
+        self._cmd_outputs['lsdasd'] = (0, lsdasd)
         self._mock_logger.reset_mock()
         checker = post_install.PostInstallChecker(
             dasd_prof_entry, permissive=True)
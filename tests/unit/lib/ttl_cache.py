@@ -0,0 +1,99 @@
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit test for ttl_cache module
+"""
+
+#
+# IMPORTS
+#
+from tessia.server.lib import ttl_cache
+from unittest import TestCase
+from unittest.mock import patch
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+
+#
+# CODE
+#
+
+
+class TestTtlCache(TestCase):
+    """
+    Unit test for the TtlCache class
+    """
+
+    def setUp(self):
+        """
+        Create a cache with a controlled clock
+        """
+        patcher = patch.object(ttl_cache, 'time', autospec=True)
+        self._mock_time = patcher.start()
+        self.addCleanup(patcher.stop)
+        self._mock_time.monotonic.return_value = 1000
+
+        self._cache = ttl_cache.TtlCache(ttl=10, error_ttl=2)
+    # setUp()
+
+    def test_error(self):
+        """
+        Test that errors are cached with their own time to live
+        """
+        calls = []
+
+        def _producer():
+            calls.append(1)
+            raise ValueError('not accessible')
+
+        for _ in range(2):
+            with self.assertRaisesRegex(ValueError, 'not accessible'):
+                self._cache.get('url', _producer)
+        self.assertEqual(len(calls), 1)
+
+        # error expired: producer is called again
+        self._mock_time.monotonic.return_value = 1002
+        with self.assertRaises(ValueError):
+            self._cache.get('url', _producer)
+        self.assertEqual(len(calls), 2)
+    # test_error()
+
+    def test_hit_and_expiry(self):
+        """
+        Test that results are reused until they expire
+        """
+        calls = []
+
+        def _producer():
+            calls.append(1)
+            return len(calls)
+
+        self.assertEqual(self._cache.get('url', _producer), 1)
+        self._mock_time.monotonic.return_value = 1009
+        self.assertEqual(self._cache.get('url', _producer), 1)
+        # other keys have their own entries
+        self.assertEqual(self._cache.get('other_url', _producer), 2)
+
+        # entry expired: producer is called again
+        self._mock_time.monotonic.return_value = 1010
+        self.assertEqual(self._cache.get('url', _producer), 3)
+
+        # clear removes all entries
+        self._cache.clear()
+        self.assertEqual(self._cache.get('url', _producer), 4)
+    # test_hit_and_expiry()
+
+# TestTtlCache
@@ -31,13 +31,16 @@ from tessia.server.scheduler import wrapper
 from tessia.server.scheduler.spawner import (PROCESS_DEAD, PROCESS_RUNNING,
                                              PROCESS_UNKNOWN, SpawnerError)
 from tests.unit.db.models import DbUnit
+from tests.unit.db.query_budget import QueryBudgetMixin
 from tests.unit.scheduler.spawner import MockProcess
 from unittest import TestCase
 from unittest.mock import MagicMock
 from unittest.mock import patch
 from unittest.mock import sentinel
 
+import json
 import os
+import threading
 
 #
 # CONSTANTS AND DEFINITIONS
@@ -49,7 +52,7 @@ import os
 # pylint: disable=too-many-public-methods
 
 
-class TestLooper(TestCase):
+class TestLooper(QueryBudgetMixin, TestCase):
     """
     Unit test for the looper module
     """
@@ -87,6 +90,11 @@ class TestLooper(TestCase):
         mock_conf._mediator_uri = os.environ.get(
             'TESSIA_MEDIATOR_URI').replace('/0', '/1')
 
+        # revisions published on commits
+        patcher = patch.object(looper.notify, 'MEDIATOR', autospec=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
         # resources manager
         patcher = patch.object(
             looper.resources_manager, 'ResourcesManager', autospec=True)
@@ -107,6 +115,11 @@ class TestLooper(TestCase):
         self._mock_signal.SIGKILL = sentinel.SIGKILL
         self.addCleanup(patcher.stop)
 
+        # stats file and profiler
+        patcher = patch.object(looper.stats, 'StatsWriter', autospec=True)
+        self._mock_stats_writer = patcher.start()
+        self.addCleanup(patcher.stop)
+
         # multiprocessing module
         patcher = patch.object(looper, 'multiprocessing', autospec=True)
         self._mock_mp = patcher.start()
@@ -354,7 +367,8 @@ class TestLooper(TestCase):
 
     # _patch_alive_process()
 
-    def _patch_dead_process(self, ret_code, end_time, cleanup_code=None):
+    def _patch_dead_process(self, ret_code, end_time, cleanup_code=None,
+                            metrics=None):
         """
         Patch with mocks to simulate the case where job's process died because
         /proc/$pid/comm does not exist.
@@ -363,6 +377,7 @@ class TestLooper(TestCase):
             ret_code (int): return code to include in results file
             end_time (str): end date to include in results file
             cleanup_code (int): cleanup code to include in results file
+            metrics (dict): content of the metrics file, None for no file
         """
         # contents of result file
 
@@ -375,6 +390,10 @@ class TestLooper(TestCase):
 
         self._mock_open_log.return_value.__enter__.return_value.readlines. \
             return_value = readlines_return
+        # result and metrics files are read with the same mock, the metrics
+        # one with read()
+        self._mock_open_log.return_value.__enter__.return_value.read. \
+            return_value = json.dumps(metrics) if metrics else ''
 
         self._mock_spawner.return_value.validate.return_value = PROCESS_DEAD
 
@@ -573,6 +592,24 @@ class TestLooper(TestCase):
 
         job = self._session.query(SchedulerJob).get(job.id)
         self.assertEqual(job.state, job.STATE_COMPLETED)
+        self.assertIsNone(job.metrics)
+
+        # job completed and reported its resource usage
+        metrics = {
+            'cpu_seconds': 1.5, 'max_rss_bytes': 1024, 'read_bytes': 0,
+            'write_bytes': 512, 'output_bytes': 100,
+            'stages': [{'name': 'init', 'seconds': 2}],
+        }
+        job = self._make_alive_job()
+        self._patch_dead_process(0, datetime.utcnow(), metrics=metrics)
+        self._looper.loop()
+
+        job = self._session.query(SchedulerJob).get(job.id)
+        self.assertEqual(job.state, job.STATE_COMPLETED)
+        self.assertEqual(job.metrics, metrics)
+        self._mock_open_log.assert_any_call(
+            '/tmp/looper-unit-test/jobs/{}/{}'.format(
+                job.id, wrapper.METRICS_FILE), 'r')
 
         # process died by seeing cwd is wrong and result has invalid exit code
         job = self._make_alive_job()
@@ -668,6 +705,75 @@ class TestLooper(TestCase):
         self._mock_wrapper.return_value.assert_not_called()
     # test_start_job_cant_start()
 
+    def test_start_jobs_batch_vars(self):
+        """
+        Verify that extra variables of all startable jobs are retrieved from
+        the mediator at once and that jobs created before the request id was
+        stored get it resolved.
+        """
+        # resources manager is mocked so the jobs can use the same system
+        requests = [
+            self._make_request(
+                self._make_resources(['lpar0'], []),
+                self._requester, commit=True)
+            for _ in range(3)]
+
+        # force the jobs not to be started yet
+        self._mock_resources_man.can_start.return_value = False
+        self._looper.loop()
+
+        # simulate a job created by an older version of the scheduler
+        jobs = [SchedulerJob.query.filter_by(id=request.job_id).one()
+                for request in requests]
+        for request, job in zip(requests, jobs):
+            self.assertEqual(job.request_id, request.id)
+        jobs[0].request_id = None
+        self._session.commit()
+
+        # start all jobs in one loop
+        # mediator is mocked in setUp
+        mock_mediator = looper.MEDIATOR
+        mock_mediator.get_many.reset_mock()
+        mock_mediator.get_many.return_value = [None, None, None]
+        self._mock_resources_man.can_start.return_value = True
+        self._patch_alive_process()
+        self._looper.loop()
+
+        # validate that the mediator was accessed once for all jobs
+        mock_mediator.get_many.assert_called_once_with(
+            ['job_requests:{}:vars'.format(request.id)
+             for request in requests])
+        for request, job in zip(requests, jobs):
+            self.assertEqual(job.state, job.STATE_RUNNING, job.result)
+            self.assertEqual(job.request_id, request.id)
+    # test_start_jobs_batch_vars()
+
+    def test_loop_query_budget(self):
+        """
+        Verify the number of queries issued by the loop iterations which
+        turn 10 requests into jobs and start them.
+        """
+        requests = [
+            self._make_request(
+                self._make_resources(['lpar0'], []),
+                self._requester, commit=True)
+            for _ in range(10)]
+
+        self._mock_resources_man.can_start.return_value = False
+        with self.assert_query_budget('scheduler.submit'):
+            self._looper.loop()
+
+        looper.MEDIATOR.get_many.return_value = [None] * len(requests)
+        self._mock_resources_man.can_start.return_value = True
+        self._patch_alive_process()
+        with self.assert_query_budget('scheduler.start'):
+            self._looper.loop()
+
+        for request in requests:
+            job = SchedulerJob.query.filter_by(id=request.job_id).one()
+            self.assertEqual(job.state, job.STATE_RUNNING, job.result)
+    # test_loop_query_budget()
+
     def test_start_job_process_start_fail(self):
         """
         Verify if job correctly goes to failed state when there are failures
@@ -1004,6 +1110,108 @@ class TestLooper(TestCase):
         self.assertEqual(request.state, SchedulerRequest.STATE_FAILED)
         self.assertRegex(request.result.lower(), 'parser not found')
 
+    def test_submit_slow_parse(self):
+        """
+        Submit a job whose parser does not finish within a loop iteration and
+        verify that the request stays pending until the parser is done.
+        """
+        parse_done = threading.Event()
+        echo_parse = looper.MACHINES.classes['echo'].parse
+
+        def slow_parse(content):
+            """Wait for the test to release the parser"""
+            parse_done.wait(10)
+            return echo_parse(content)
+
+        patcher = patch.object(
+            looper.MACHINES.classes['echo'], 'parse', side_effect=slow_parse)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        request = self._make_request(
+            self._make_resources(['lpar0'], []),
+            self._requester,
+            commit=True)
+
+        # parser still running: nothing happens
+        self._looper.loop()
+        self.assertEqual(request.state, SchedulerRequest.STATE_PENDING)
+        self.assertEqual(SchedulerJob.query.count(), 0)
+
+        # parser finishes: job is created
+        parse_done.set()
+        self._looper.loop()
+        self.assertEqual(request.state, SchedulerRequest.STATE_COMPLETED)
+        self.assertEqual(SchedulerJob.query.count(), 1)
+    # test_submit_slow_parse()
+
+    def test_submit_order(self):
+        """
+        Submit a job with a slow parser followed by a job with a fast one and
+        verify that the jobs are created in submit order.
+        """
+        parse_done = threading.Event()
+        echo_parse = looper.MACHINES.classes['echo'].parse
+
+        def slow_parse(content):
+            """Wait for the test to release the parser of lpar0"""
+            if 'lpar0' in content:
+                parse_done.wait(10)
+            return echo_parse(content)
+
+        patcher = patch.object(
+            looper.MACHINES.classes['echo'], 'parse', side_effect=slow_parse)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        slow_request = self._make_request(
+            self._make_resources(['lpar0'], []),
+            self._requester,
+            commit=True)
+        fast_request = self._make_request(
+            self._make_resources([], ['cpc0']),
+            self._requester,
+            commit=True)
+
+        # first parser still running: the second request waits for it
+        self._looper.loop()
+        self.assertEqual(slow_request.state, SchedulerRequest.STATE_PENDING)
+        self.assertEqual(fast_request.state, SchedulerRequest.STATE_PENDING)
+        self.assertEqual(SchedulerJob.query.count(), 0)
+
+        parse_done.set()
+        self._looper.loop()
+        self.assertEqual(slow_request.state, SchedulerRequest.STATE_COMPLETED)
+        self.assertEqual(fast_request.state, SchedulerRequest.STATE_COMPLETED,
+                         fast_request.result)
+        self.assertLess(slow_request.job_id, fast_request.job_id)
+        self.assertEqual(
+            [call[0][0].id for call in
+             self._mock_resources_man.enqueue.call_args_list],
+            [slow_request.job_id, fast_request.job_id])
+    # test_submit_order()
+
+    def test_loop_stop_parsers(self):
+        """
+        Verify that the parser threads are shut down when the loop stops.
+        """
+        self._make_request(
+            self._make_resources(['lpar0'], []),
+            self._requester,
+            commit=True)
+        with patch.object(self._looper, '_finish_jobs', autospec=True,
+                          side_effect=RuntimeError('loop error')):
+            with self.assertRaises(RuntimeError):
+                self._looper.loop()
+        with self.assertRaisesRegex(RuntimeError, 'shutdown'):
+            self._looper._parse_pool.submit(print)
+
+        self._looper.loop()
+        self.assertEqual(self._looper._parsing, {})
+        with self.assertRaisesRegex(RuntimeError, 'shutdown'):
+            self._looper._parse_pool.submit(print)
+    # test_loop_stop_parsers()
+
     def test_submit_no_permission(self):
         """
         Submit a job with a user without permission to update a system
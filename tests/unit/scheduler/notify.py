@@ -0,0 +1,155 @@
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+notify.py unit test
+"""
+from sqlalchemy import create_engine, Column, Integer, String
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import sessionmaker
+from tessia.server.scheduler import notify
+from unittest import TestCase
+from unittest.mock import patch
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+BASE = declarative_base()
+
+#
+# CODE
+#
+
+
+class Item(BASE):
+    """Minimal model with a state"""
+    __tablename__ = 'items'
+
+    id = Column(Integer, primary_key=True)
+    state = Column(String)
+# Item
+
+
+class TestNotify(TestCase):
+    """
+    Unit test for the notify module
+    """
+
+    def setUp(self):
+        """
+        Create a session on an in-memory database and mock the mediator
+        """
+        engine = create_engine('sqlite://')
+        BASE.metadata.create_all(engine)
+        self._session = sessionmaker(bind=engine)()
+
+        patcher = patch.object(notify, 'MEDIATOR', autospec=True)
+        self._mock_mediator = patcher.start()
+        self.addCleanup(patcher.stop)
+    # setUp()
+
+    def test_publish_changes(self):
+        """
+        Test that a revision is published only for commits with changes
+        """
+        notify.publish_changes(self._session)
+
+        self._session.commit()
+        self._mock_mediator.set.assert_not_called()
+
+        self._session.add(Item(state='A'))
+        self._session.commit()
+        self._mock_mediator.set.assert_called_once()
+        self.assertEqual(self._mock_mediator.set.call_args[0][0],
+                         notify.MEDIATOR_REVISION_KEY)
+
+        # changes rolled back are not published
+        self._session.add(Item(state='B'))
+        self._session.flush()
+        self._session.rollback()
+        self._session.commit()
+        self.assertEqual(self._mock_mediator.set.call_count, 1)
+
+        # failure to publish does not affect the commit
+        self._mock_mediator.set.side_effect = RuntimeError('unavailable')
+        self._session.add(Item(state='C'))
+        with self.assertLogs(notify.__name__, 'WARNING'):
+            self._session.commit()
+        self.assertEqual(self._session.query(Item).count(), 2)
+    # test_publish_changes()
+
+    def test_wait_state(self):
+        """
+        Test that the state is read again when the revision changes
+        """
+        item = Item(state='PENDING')
+        self._session.add(item)
+        self._session.commit()
+        self._mock_mediator.get.return_value = '1'
+
+        def change_state(*_args, **_kwargs):
+            """Simulate the scheduler changing the item"""
+            self._session.query(Item).update({'state': 'COMPLETED'})
+            self._session.commit()
+            return '2'
+        self._mock_mediator.wait_change.side_effect = change_state
+
+        ret = notify.wait_state(self._session, item, ['COMPLETED'], 10)
+        self.assertIs(ret, item)
+        self.assertEqual(item.state, 'COMPLETED')
+        self._mock_mediator.wait_change.assert_called_once()
+        self.assertEqual(
+            self._mock_mediator.wait_change.call_args[0][:2],
+            (notify.MEDIATOR_REVISION_KEY, '1'))
+    # test_wait_state()
+
+    def test_wait_state_timeout(self):
+        """
+        Test that the current state is returned when the timeout is reached
+        and that the database is polled if the mediator is not available
+        """
+        item = Item(state='PENDING')
+        self._session.add(item)
+        self._session.commit()
+        self._mock_mediator.get.side_effect = RuntimeError('unavailable')
+
+        with self.assertLogs(notify.__name__, 'WARNING'):
+            ret = notify.wait_state(self._session, item, ['COMPLETED'], 0.1)
+        self.assertEqual(ret.state, 'PENDING')
+        self._mock_mediator.wait_change.assert_not_called()
+    # test_wait_state_timeout()
+
+    def test_wait_state_mediator_failure(self):
+        """
+        Test that a mediator failure while waiting falls back to polling the
+        database
+        """
+        item = Item(state='PENDING')
+        self._session.add(item)
+        self._session.commit()
+        self._mock_mediator.get.return_value = '1'
+        self._mock_mediator.wait_change.side_effect = RuntimeError(
+            'connection lost')
+
+        def poll(*_args, **_kwargs):
+            """Simulate the scheduler changing the item meanwhile"""
+            self._session.query(Item).update({'state': 'COMPLETED'})
+            self._session.commit()
+        with patch.object(notify.time, 'sleep', side_effect=poll) \
+                as mock_sleep, self.assertLogs(notify.__name__, 'WARNING'):
+            ret = notify.wait_state(self._session, item, ['COMPLETED'], 10)
+        self.assertEqual(ret.state, 'COMPLETED')
+        mock_sleep.assert_called_once_with(notify.FALLBACK_POLL_INTERVAL)
+    # test_wait_state_mediator_failure()
+# TestNotify
@@ -467,6 +467,21 @@ class TestResourceManager(TestCase):
         for queue in self._res_man._wait_queues.values():
             self.assertEqual(len(queue), 0)
 
+    def test_queue_depths(self):
+        """
+        Test reporting the number of jobs waiting for each resource.
+        """
+        self.assertEqual(self._res_man.queue_depths(), {})
+
+        job_a = self._make_job(['A'], ['B'])
+        self._res_man.enqueue(job_a)
+        self._res_man.enqueue(self._make_job(['A'], []))
+        self.assertEqual(self._res_man.queue_depths(), {'A': 2, 'B': 1})
+
+        # empty queues are not reported
+        self._res_man.wait_pop(job_a)
+        self.assertEqual(self._res_man.queue_depths(), {'A': 1})
+
     def test_set_active_not_running(self):
         """
         Test setting a job with an invalid state as active.
@@ -0,0 +1,199 @@
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit test for the scheduler simulator module
+"""
+
+#
+# IMPORTS
+#
+from tessia.server.scheduler import resources_manager
+from tessia.server.scheduler import simulator
+from unittest import TestCase
+
+import io
+import json
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+
+#
+# CODE
+#
+
+
+def _entry(submit, duration, exclusive=None, shared=None, **kwargs):
+    """
+    Create a trace entry
+    """
+    entry = {
+        'submit': submit,
+        'duration': duration,
+        'resources': {
+            'exclusive': exclusive or [],
+            'shared': shared or [],
+        },
+    }
+    entry.update(kwargs)
+    return entry
+# _entry()
+
+
+class TestSimulator(TestCase):
+    """
+    Unit test for the Simulator class
+    """
+
+    def test_queue(self):
+        """
+        Test that jobs wait for the resources used by other jobs
+        """
+        report = simulator.Simulator([
+            _entry(0, 100, exclusive=['system.a']),
+            _entry(1, 100, exclusive=['system.a']),
+            _entry(1, 50, shared=['system.b']),
+            _entry(2, 50, shared=['system.b']),
+        ]).run()
+
+        self.assertEqual(report['started'], 4)
+        self.assertEqual(report['never_started'], 0)
+        # the second job starts in the first iteration after the end of
+        # the first one
+        self.assertEqual(report['wait_seconds']['max'], 99)
+        self.assertEqual(report['wait_seconds']['p50'], 0)
+        self.assertEqual(report['span_seconds'], 200)
+        self.assertEqual(report['utilization'],
+                         {'system.a': 1.0, 'system.b': 0.255})
+    # test_queue()
+
+    def test_rejections(self):
+        """
+        Test the requests which do not turn into jobs
+        """
+        report = simulator.Simulator([
+            _entry(0, 100, exclusive=['system.a'], start=1000, timeout=100),
+            _entry(1, 100, exclusive=['system.a'], start=1050, timeout=100),
+            _entry(2, 100, exclusive=['system.a'], start=5000),
+            _entry(3, 100, exclusive=['system.a'], shared=['system.a']),
+            _entry(4, 100, exclusive=['system.b']),
+        ]).run()
+
+        self.assertEqual(report['rejected'], {
+            simulator.REJECT_CONFLICT: 1,
+            simulator.REJECT_INVALID: 1,
+            simulator.REJECT_NO_TIMEOUT: 1,
+        })
+        self.assertEqual(report['conflict_rejection_rate'], 0.2)
+        self.assertEqual(report['started'], 2)
+    # test_rejections()
+
+    def test_grace_seconds(self):
+        """
+        Test changing the grace time added to the timeouts
+        """
+        trace = [
+            _entry(0, 100, exclusive=['system.a'], start=1000, timeout=100),
+            _entry(1, 100, exclusive=['system.a'], start=1200, timeout=100),
+        ]
+        report = simulator.Simulator(trace).run()
+        self.assertEqual(report['rejected'][simulator.REJECT_CONFLICT], 1)
+
+        report = simulator.Simulator(trace, grace_seconds=0).run()
+        self.assertEqual(report['rejected'][simulator.REJECT_CONFLICT], 0)
+        self.assertEqual(report['wait_seconds']['max'], 1199)
+
+        # the manager is not affected after the simulation
+        self.assertEqual(resources_manager.GRACE_SECONDS, 300)
+        self.assertIs(resources_manager.datetime, simulator.datetime)
+    # test_grace_seconds()
+
+    def test_priorities(self):
+        """
+        Test replacing the priorities of the job types
+        """
+        trace = [
+            _entry(0, 100, exclusive=['system.a']),
+            _entry(1, 100, exclusive=['system.a'], job_type='echo',
+                   priority=9),
+            _entry(2, 100, exclusive=['system.a'], job_type='ansible',
+                   priority=0),
+        ]
+        report = simulator.Simulator(trace).run()
+        self.assertEqual(report['wait_seconds_by_priority'][9]['max'], 199)
+        self.assertEqual(report['wait_seconds_by_priority'][0]['max'], 98)
+
+        report = simulator.Simulator(
+            trace, priorities={'echo': 0, 'ansible': 9}).run()
+        self.assertEqual(report['wait_seconds_by_priority'][0]['max'], 99)
+        self.assertEqual(report['wait_seconds_by_priority'][9]['max'], 198)
+    # test_priorities()
+
+    def test_timeout(self):
+        """
+        Test that jobs end when they reach their timeout
+        """
+        report = simulator.Simulator([
+            _entry(0, 500, exclusive=['system.a'], timeout=100),
+            _entry(0, 500, exclusive=['system.b']),
+        ]).run()
+        self.assertEqual(report['timed_out'], 1)
+        self.assertEqual(report['span_seconds'], 500)
+        self.assertEqual(report['utilization'],
+                         {'system.a': 0.2, 'system.b': 1.0})
+    # test_timeout()
+
+    def test_synthetic(self):
+        """
+        Test that synthetic traces and their simulations are deterministic
+        """
+        trace = simulator.synthetic_trace(200, 10, seed=3)
+        self.assertEqual(trace, simulator.synthetic_trace(200, 10, seed=3))
+        self.assertNotEqual(trace, simulator.synthetic_trace(200, 10, seed=4))
+
+        report = simulator.Simulator(trace).run()
+        self.assertEqual(report, simulator.Simulator(trace).run())
+        self.assertEqual(report['requests'], 200)
+        self.assertEqual(
+            report['started'] + sum(report['rejected'].values()), 200)
+    # test_synthetic()
+# TestSimulator
+
+
+class TestLoadTrace(TestCase):
+    """
+    Unit test for the load_trace function
+    """
+
+    def test_load(self):
+        """
+        Test reading a trace in json lines format
+        """
+        trace = [_entry(0, 10, exclusive=['system.a']),
+                 _entry(5, 10, shared=['system.a'], start=None)]
+        content = '\n'.join(json.dumps(entry) for entry in trace) + '\n\n'
+        self.assertEqual(simulator.load_trace(io.StringIO(content)), trace)
+    # test_load()
+
+    def test_invalid(self):
+        """
+        Test that invalid entries are reported with their line
+        """
+        content = '{}\n{}\n'.format(
+            json.dumps(_entry(0, 10)), json.dumps({'submit': 1}))
+        with self.assertRaisesRegex(ValueError, 'line 2'):
+            simulator.load_trace(io.StringIO(content))
+    # test_invalid()
+# TestLoadTrace
@@ -188,7 +188,7 @@ class TestForkSpawner(TestCase):
         pid = self._fork_spawner.spawn(job_args=job_args)
 
         self.assertEqual(pid, 100000)
-        self._mock_wrapper.assert_called_with('', '', '', 0)
+        self._mock_wrapper.assert_called_with('', '', '', 0, False)
 
         # test failure
         self._mock_mp.side_effect = multiprocessing.ProcessError
@@ -401,7 +401,8 @@ class TestContainerSpawner(TestCase):
             job_args['job_dir'],
             job_args['job_type'],
             job_args['job_parameters'],
-            job_args['timeout'])
+            job_args['timeout'],
+            False)
 
     # test_spawn()
 
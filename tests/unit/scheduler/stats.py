@@ -0,0 +1,108 @@
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit test for the scheduler stats module
+"""
+
+#
+# IMPORTS
+#
+from tessia.server.scheduler import stats
+from unittest import TestCase
+from unittest.mock import patch
+
+import os
+import pstats
+import tempfile
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+
+#
+# CODE
+#
+
+
+class TestStatsWriter(TestCase):
+    """
+    Unit test for the StatsWriter class
+    """
+
+    def setUp(self):
+        """
+        Create a writer on a temporary jobs directory
+        """
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self._jobs_dir = temp_dir.name
+        self._writer = stats.StatsWriter(self._jobs_dir)
+        self.addCleanup(stats.STATS.clear, 'tessia_scheduler_jobs')
+    # setUp()
+
+    def test_profile(self):
+        """
+        Test toggling the profiler by signal
+        """
+        # nothing happens without the signal
+        self.assertIsNone(self._writer.toggle_profile())
+
+        self._writer.request_profile_toggle()
+        self.assertIsNone(self._writer.toggle_profile())
+        sorted(range(1000))
+        self._writer.request_profile_toggle()
+        path = self._writer.toggle_profile()
+
+        self.assertEqual(os.path.dirname(path), self._jobs_dir)
+        self.assertIn('sorted', ''.join(
+            str(func) for func in pstats.Stats(path).stats))
+    # test_profile()
+
+    def test_write(self):
+        """
+        Test writing the stats file at most once per interval
+        """
+        path = os.path.join(self._jobs_dir, stats.STATS_FILE)
+        with patch.object(stats.time, 'monotonic', autospec=True,
+                          side_effect=[100, 105, 111]):
+            stats.STATS.set('tessia_scheduler_jobs', 3, {'state': 'waiting'})
+            self._writer.write()
+            with open(path) as file_obj:
+                self.assertIn('tessia_scheduler_jobs{state="waiting"} 3\n',
+                              file_obj.read())
+
+            # too early for another write
+            stats.STATS.set('tessia_scheduler_jobs', 1, {'state': 'waiting'})
+            self._writer.write()
+            with open(path) as file_obj:
+                self.assertIn('tessia_scheduler_jobs{state="waiting"} 3\n',
+                              file_obj.read())
+
+            self._writer.write()
+            with open(path) as file_obj:
+                self.assertIn('tessia_scheduler_jobs{state="waiting"} 1\n',
+                              file_obj.read())
+        self.assertEqual(os.listdir(self._jobs_dir), [stats.STATS_FILE])
+    # test_write()
+
+    def test_write_error(self):
+        """
+        Test that failing to write the file does not stop the scheduler
+        """
+        writer = stats.StatsWriter(os.path.join(self._jobs_dir, 'missing'))
+        with self.assertLogs(stats.__name__, 'WARNING'):
+            writer.write(force=True)
+    # test_write_error()
+# TestStatsWriter
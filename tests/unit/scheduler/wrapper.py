@@ -20,12 +20,16 @@ Unit test for the scheduler's looper module
 # IMPORTS
 #
 
+from datetime import datetime
 from tessia.server.scheduler import wrapper
 from tessia.server.state_machines import base
 from unittest import TestCase
 from unittest import mock
 from unittest.mock import patch
 
+import os
+import resource
+import tempfile
 import unittest
 
 
@@ -313,5 +317,136 @@ class TestWrapper(TestCase):
         self._run_interrupted_start(timeout=True,
                                     cleanup_timeout=True)
 
+
+class TestMetrics(TestCase):
+    """
+    Unit test for the collection of job metrics
+    """
+
+    def setUp(self):
+        """
+        Create a job directory with an output file and fixed resource usage
+        """
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self._run_dir = temp_dir.name
+        with open('{}/output'.format(self._run_dir), 'w') as output_file:
+            output_file.write(
+                '2026-01-01 10:00:00 | INFO | new state: init_target\n'
+                '2026-01-01 10:00:05 | INFO | some output\n'
+                '2026-01-01 10:00:10 | INFO | autoinstall.py(10) | '
+                'new stage: boot_installer\n'
+                'new state: not a log message\n'
+                '2026-01-01 10:01:10 | INFO | new state: check_installation\n')
+
+        def getrusage(who):
+            """Return different usages for the process and its children"""
+            if who == resource.RUSAGE_SELF:
+                return mock.Mock(ru_utime=1.5, ru_stime=0.5, ru_maxrss=2048,
+                                 ru_inblock=8, ru_oublock=16)
+            return mock.Mock(ru_utime=3.0, ru_stime=1.0, ru_maxrss=4096,
+                             ru_inblock=2, ru_oublock=0)
+        patcher = patch.object(wrapper.resource, 'getrusage',
+                               side_effect=getrusage)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        cgroup_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cgroup_dir.cleanup)
+        self._cgroup_dir = cgroup_dir.name
+        patcher = patch.object(wrapper, 'CGROUP_DIR', self._cgroup_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    # setUp()
+
+    def _write_cgroup_files(self, files):
+        """
+        Create files in the fake cgroup mount point
+        """
+        for path, content in files.items():
+            path = '{}/{}'.format(self._cgroup_dir, path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as stat_file:
+                stat_file.write(content)
+    # _write_cgroup_files()
+
+    def test_collect(self):
+        """
+        Test the usage of the process and the stages from the output
+        """
+        metrics = wrapper.collect_metrics(self._run_dir)
+
+        self.assertEqual(metrics['cpu_seconds'], 6.0)
+        self.assertEqual(metrics['max_rss_bytes'], 4096 * 1024)
+        self.assertEqual(metrics['read_bytes'], 10 * 512)
+        self.assertEqual(metrics['write_bytes'], 16 * 512)
+        self.assertEqual(
+            metrics['output_bytes'],
+            os.path.getsize('{}/output'.format(self._run_dir)))
+        self.assertEqual([stage['name'] for stage in metrics['stages']],
+                         ['init_target', 'boot_installer',
+                          'check_installation'])
+        self.assertNotIn('cgroup', metrics)
+
+        stages = wrapper._read_stages('{}/output'.format(self._run_dir),
+                                      datetime(2026, 1, 1, 10, 2))
+        self.assertEqual(stages, [
+            {'name': 'init_target', 'seconds': 10},
+            {'name': 'boot_installer', 'seconds': 60},
+            {'name': 'check_installation', 'seconds': 50},
+        ])
+    # test_collect()
+
+    def test_collect_no_output(self):
+        """
+        Test a job which did not create its output file
+        """
+        os.remove('{}/output'.format(self._run_dir))
+        metrics = wrapper.collect_metrics(self._run_dir)
+        self.assertEqual(metrics['output_bytes'], 0)
+        self.assertEqual(metrics['stages'], [])
+    # test_collect_no_output()
+
+    def test_cgroup_v2(self):
+        """
+        Test the statistics of a cgroup v2 hierarchy
+        """
+        self._write_cgroup_files({
+            'cgroup.controllers': 'cpu io memory\n',
+            'cpu.stat': 'usage_usec 2500000\nuser_usec 2000000\n',
+            'memory.peak': '1048576\n',
+            'io.stat': '8:0 rbytes=100 wbytes=200 rios=1 wios=2\n'
+                       '8:16 rbytes=1 wbytes=2 rios=1 wios=1\n',
+        })
+        metrics = wrapper.collect_metrics(self._run_dir, cgroup_stats=True)
+        self.assertEqual(metrics['cgroup'], {
+            'cpu_seconds': 2.5,
+            'max_memory_bytes': 1048576,
+            'read_bytes': 101,
+            'write_bytes': 202,
+        })
+    # test_cgroup_v2()
+
+    def test_cgroup_v1(self):
+        """
+        Test the statistics of cgroup v1 controllers, missing files are
+        left out
+        """
+        self._write_cgroup_files({
+            'cpuacct/cpuacct.usage': '3000000000\n',
+            'blkio/blkio.throttle.io_service_bytes':
+                '8:0 Read 100\n8:0 Write 200\n8:0 Sync 300\n'
+                '8:16 Read 1\nTotal 301\n',
+        })
+        metrics = wrapper.collect_metrics(self._run_dir, cgroup_stats=True)
+        self.assertEqual(metrics['cgroup'], {
+            'cpu_seconds': 3.0,
+            'read_bytes': 101,
+            'write_bytes': 200,
+        })
+    # test_cgroup_v1()
+# TestMetrics
+
+
 if __name__ == '__main__':
     unittest.main()
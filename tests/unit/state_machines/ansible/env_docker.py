@@ -19,6 +19,7 @@ Unit test for env docker
 #
 # IMPORTS
 #
+from tessia.server.lib import docker_image
 from tessia.server.state_machines.ansible import env_docker
 from unittest import mock
 from unittest.mock import MagicMock
@@ -30,6 +31,7 @@ from unittest import TestCase
 import docker
 import json
 import tarfile
+import tempfile
 
 #
 # CONSTANTS AND DEFINITIONS
@@ -141,10 +143,22 @@ class TestEnvDocker(TestCase):
         patcher.start()
         self.addCleanup(patcher.stop)
 
-        # Mock logging module
+        # Mock logging module, also used by the image build helper
         patcher = mock.patch.object(env_docker, 'logging')
         mock_logging = patcher.start()
         self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(docker_image, 'logging', mock_logging)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # build lock is created in the jobs directory
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        patcher = mock.patch.object(docker_image, 'CONF', autospec=True)
+        mock_conf = patcher.start()
+        self.addCleanup(patcher.stop)
+        mock_conf.get_config.return_value = {
+            'scheduler': {'jobs_dir': temp_dir.name}}
 
         # Mock the return_value of the getLogger method
         mock_logging.getLogger.return_value = MagicMock(
@@ -192,6 +206,12 @@ class TestEnvDocker(TestCase):
         self._mock_open.return_value = self._mock_open_fd
         self._mock_open_fd.__enter__.return_value = self._mock_open_fd
 
+        # repository cache is disabled by default
+        patcher = mock.patch.object(env_docker, 'REPO_CACHE', autospec=True)
+        self._mock_repo_cache = patcher.start()
+        self.addCleanup(patcher.stop)
+        self._mock_repo_cache.get_archive.return_value = None
+
 
 class TestEnvDockerSuccessful(TestEnvDocker):
     """
@@ -213,6 +233,23 @@ class TestEnvDockerSuccessful(TestEnvDocker):
         self._mock_logger.debug.assert_any_call(success_msg_1)
         self._mock_logger.debug.assert_any_call(success_msg_2)
 
+    def test_docker_build_existing(self):
+        """
+        Test that the image is tagged with the hash of the build context and
+        not built again when it exists
+        """
+        self.docker_client_mock.images.get.side_effect = None
+        env = env_docker.EnvDocker()
+        env.build()
+
+        image_name = self.docker_client_mock.images.get.call_args[0][0]
+        self.assertRegex(image_name, r'^tessia_ansible_docker:[0-9a-f]{16}$')
+        self.docker_client_mock.api.build.assert_not_called()
+
+        # same context gives same tag
+        self.assertEqual(env_docker.EnvDocker()._image_name, image_name)
+    # test_docker_build_existing()
+
     def test_run(self):
         """
         Test the successful run of an ansible playbook in the docker env
@@ -285,6 +322,29 @@ class TestEnvDockerSuccessful(TestEnvDocker):
         # Check stop container call
         self.assertEqual(len(self.docker_containers_mock.stop.mock_calls), 1)
 
+    def test_run_from_cache(self):
+        """
+        Test that the repository is copied from the cache when available
+        """
+        self._mock_repo_cache.get_archive.return_value = '/cache/repo.tar'
+        env = env_docker.EnvDocker()
+
+        ret = env.run(REPO_URL, REPO_DIR, PLAYBOOK_NAME)
+        self.assertEqual(ret, 0)
+        self._mock_repo_cache.get_archive.assert_called_with(
+            REPO_URL, 'ansible', default_branches=('main', 'master'))
+        self._mock_open.assert_any_call('/cache/repo.tar', 'rb')
+
+        # repository and config files are transferred, downloader not used
+        self.docker_containers_mock.put_archive.assert_any_call(
+            '/home/ansible/playbook', self._mock_open_fd)
+        self.assertEqual(
+            len(self.docker_containers_mock.put_archive.mock_calls), 2)
+        self.assertEqual(
+            len(self.docker_client_mock.api.exec_create.mock_calls), 1)
+        args, _ = self.docker_client_mock.api.exec_create.call_args
+        self.assertListEqual(args[1], ["ansible-playbook", PLAYBOOK_NAME])
+
 
 class TestEnvDockerUnsuccessful(TestEnvDocker):
     """
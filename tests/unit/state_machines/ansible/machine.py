@@ -130,6 +130,9 @@ class TestAnsibleMachine(TestCase):
         }
         self._mock_reqs_mod_get_resp.iter_content.return_value = [
             bytes('line{}'.format(index), 'ascii') for index in range(0, 5)]
+
+        # results of previous verifications must not affect the test
+        machine.SOURCE_CHECKS.clear()
     # setUp()
 
     def test_valid_urls(self):
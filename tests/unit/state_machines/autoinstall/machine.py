@@ -0,0 +1,164 @@
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit test for the autoinstall machine module
+"""
+
+#
+# IMPORTS
+#
+from tessia.server.state_machines.autoinstall import machine
+from tests.unit.db.models import DbUnit
+from tests.unit.db.query_budget import QueryBudgetMixin, QueryCounter
+from unittest import TestCase
+
+import json
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+# hypervisor chain of two levels with a profile for each system
+SYSTEMS = [
+    ('cpc3', None, 'CPC'),
+    ('cpc3lp52', 'cpc3', 'LPAR'),
+    ('kvm054', 'cpc3lp52', 'KVM'),
+]
+
+# system whose profiles are not default
+NO_DEFAULT_SYSTEM = 'kvm055'
+
+OS_NAME = 'rhel7.2'
+
+#
+# CODE
+#
+
+
+class TestAutoInstallMachine(QueryBudgetMixin, TestCase):
+    """
+    Unit test for the AutoInstallMachine class
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Called once to create the db content for this test.
+        """
+        DbUnit.create_db()
+        entries = {'System': [], 'SystemProfile': []}
+        for name, hypervisor, sys_type in (
+                SYSTEMS + [(NO_DEFAULT_SYSTEM, 'cpc3lp52', 'KVM')]):
+            entries['System'].append({
+                'name': name,
+                'hostname': '{}.domain.com'.format(name),
+                'hypervisor': hypervisor,
+                'model': 'ZEC12_H43',
+                'type': sys_type,
+                'state': 'AVAILABLE',
+                'owner': 'admin',
+                'modifier': 'admin',
+                'project': 'Admins',
+                'desc': None,
+            })
+            for index in range(3):
+                entries['SystemProfile'].append({
+                    'name': 'profile{}'.format(index),
+                    'system': name,
+                    'default': index == 0 and name != NO_DEFAULT_SYSTEM,
+                    'cpu': 2,
+                    'memory': 4096,
+                    'credentials': {
+                        'admin-user': 'root', 'admin-password': 'passwd'},
+                })
+        DbUnit.create_entry(entries)
+        cls.db = DbUnit
+    # setUpClass()
+
+    def _parse(self, system):
+        """
+        Parse an installation request from a clean session, so that no
+        entry is served from the identity map of a previous request.
+
+        Args:
+            system (str): system name
+
+        Returns:
+            tuple: parse result, QueryCounter of the call
+        """
+        self.db.session.expunge_all()
+        with QueryCounter() as counter:
+            result = machine.AutoInstallMachine.parse(
+                json.dumps({'system': system, 'os': OS_NAME}))
+        return result, counter
+    # _parse()
+
+    def test_parse(self):
+        """
+        Test that the system is exclusive and its hypervisors are shared
+        """
+        result, _ = self._parse('kvm054')
+
+        self.assertEqual(result['resources'], {
+            'exclusive': ['kvm054'], 'shared': ['cpc3lp52', 'cpc3']})
+        self.assertEqual(result['description'],
+                         machine.MACHINE_DESCRIPTION.format('kvm054', OS_NAME))
+    # test_parse()
+
+    def test_parse_query_count(self):
+        """
+        Test that parsing issues a constant number of statements regardless
+        of the depth of the hypervisor chain, and that profiles are only
+        checked for existence instead of being loaded.
+        """
+        counts = {}
+        for name, _, _ in SYSTEMS:
+            _, counter = self._parse(name)
+            counts[name] = counter.count
+            profile_statements = [statement for statement in counter.statements
+                                  if 'system_profiles' in statement]
+            self.assertEqual(len(profile_statements), 1, profile_statements)
+            self.assertNotIn('system_profiles.credentials',
+                             profile_statements[0])
+            self.assertFalse(
+                [statement for statement in counter.statements
+                 if 'storage_volumes' in statement or
+                 'system_ifaces' in statement],
+                'profile relationships loaded for {}'.format(name))
+        self.assertEqual(len(set(counts.values())), 1, counts)
+
+        self.db.session.expunge_all()
+        with self.assert_query_budget('autoinstall.parse'):
+            machine.AutoInstallMachine.parse(
+                json.dumps({'system': 'kvm054', 'os': OS_NAME}))
+    # test_parse_query_count()
+
+    def test_parse_invalid_system(self):
+        """
+        Test that a request for an unknown system is rejected
+        """
+        with self.assertRaisesRegex(ValueError, 'System unknown not found'):
+            self._parse('unknown')
+    # test_parse_invalid_system()
+
+    def test_parse_no_default_profile(self):
+        """
+        Test that a request for a system without default profile is rejected
+        """
+        with self.assertRaisesRegex(
+                ValueError, 'Default profile for system {} not available'
+                .format(NO_DEFAULT_SYSTEM)):
+            self._parse(NO_DEFAULT_SYSTEM)
+    # test_parse_no_default_profile()
+# TestAutoInstallMachine
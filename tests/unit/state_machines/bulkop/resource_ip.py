@@ -24,6 +24,7 @@ from tessia.server.db import models
 from tessia.server.state_machines import base
 from tessia.server.state_machines.bulkop import resource_ip
 from tests.unit.db.models import DbUnit
+from tests.unit.db.query_budget import QueryBudgetMixin
 from unittest import TestCase
 from unittest.mock import patch
 from unittest.mock import Mock
@@ -41,7 +42,7 @@ IP_HEADERS = [field.lower() for field in resource_ip.FIELDS_CSV]
 #
 
 
-class TestResourceIpAddress(TestCase):
+class TestResourceIpAddress(QueryBudgetMixin, TestCase):
     """
     Unit test for the resource_svol module of the bulkop state machine.
     """
@@ -291,6 +292,32 @@ class TestResourceIpAddress(TestCase):
                           error_msg=msg)
     # test_add_many_roles()
 
+    def test_import_query_budget(self):
+        """
+        Verify the number of queries issued to import 100 ip addresses
+        """
+        user_obj = models.User.query.filter_by(
+            login='user_admin@domain.com').one()
+        res_obj = resource_ip.ResourceHandlerIpAddress(user_obj)
+        entries = []
+        for index in range(1, 101):
+            entries.append({
+                'subnet': self._subnet_name,
+                'address': '192.168.162.{}'.format(index),
+                # some addresses are also assigned to a system
+                'system': 'cpc3lp52' if index % 10 == 0 else '',
+                'owner': 'admin',
+                'project': 'bulkop project',
+                'desc': 'Imported address {}'.format(index),
+            })
+
+        with self.assert_query_budget('bulkop.ip_import_100'):
+            for entry in entries:
+                res_obj.render_item(entry)
+
+        self._check_add('user_admin@domain.com', entries[-1])
+    # test_import_query_budget()
+
     def test_invalid_values(self):
         """
         Test general invalid values
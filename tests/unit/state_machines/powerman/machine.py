@@ -1172,6 +1172,46 @@ class TestPowerManagerMachine(TestCase):
         self._mock_hyp_cls_kvm.assert_not_called()
     # test_poweron_hypervisor_not_up(self):
 
+    def test_poweron_hypervisor_checked_once(self):
+        """
+        Validate that a hypervisor shared by several actions is checked only
+        once per job
+        """
+        # collect necessary db objects
+        test_system = 'kvm054'
+        system_obj = System.query.filter_by(name=test_system).one()
+        prof_obj = self._get_profile(system_obj.name)
+        hyp_prof_obj = self._get_profile(system_obj.hypervisor_rel.name)
+
+        request = str({
+            'systems': [
+                {
+                    'action': 'poweron',
+                    'name': system_obj.name,
+                },
+                {
+                    'action': 'poweron',
+                    'name': system_obj.name,
+                },
+            ]
+        })
+        machine_obj = machine.PowerManagerMachine(request)
+        machine_obj.start()
+
+        # hypervisor checked once, system checked by each action
+        self._assert_system_up_action(hyp_prof_obj, 0)
+        self._assert_system_up_action(prof_obj, 1)
+        self._assert_system_up_action(prof_obj, 2)
+        self.assertEqual(self._mock_guest_obj.login.call_count, 3)
+        self.assertEqual(self._mock_post_cls.call_args_list, [
+            call(hyp_prof_obj, permissive=True),
+            call(prof_obj, permissive=True),
+            call(prof_obj, permissive=True),
+        ])
+        # system already up: no call to power on system
+        self._mock_hyp_cls_kvm.assert_not_called()
+    # test_poweron_hypervisor_checked_once()
+
     def test_poweron_hypervisor_no_profile(self):
         """
         Test the case where the system's profile has no hypervisor profile
@@ -1284,6 +1324,46 @@ class TestPowerManagerMachine(TestCase):
         self._mock_post_obj.verify.assert_called_with()
     # test_poweron_verify_fails()
 
+    def test_poweron_multiple_verify(self):
+        """
+        Poweron several systems and verify them concurrently, where one of
+        them does not match its profile
+        """
+        systems = ('cpc3lp52', 'zvm033')
+        prof_objs = [self._get_profile(name) for name in systems]
+        # simulate systems to be down before poweron and up afterwards
+        self._mock_guest_obj.login.side_effect = [
+            ConnectionError('offline'), ConnectionError('offline'),
+            None, None]
+
+        # only second system has a mismatch
+        def create_checker(prof_obj, permissive):
+            """Return a checker mock with results according to system"""
+            checker = Mock(spec=['verify'])
+            checker.verify.return_value = []
+            if prof_obj.system_rel.name == 'zvm033':
+                checker.verify.return_value = ['memory mismatch']
+            return checker
+        self._mock_post_cls.side_effect = create_checker
+
+        request = str({
+            'systems': [
+                {'action': 'poweron', 'name': name} for name in systems
+            ],
+            'verify': True,
+        })
+        error_msg = (
+            'Failed to poweron system zvm033 with expected configuration')
+        machine_obj = machine.PowerManagerMachine(request)
+        with self.assertRaisesRegex(RuntimeError, error_msg):
+            machine_obj.start()
+
+        # both systems were verified
+        self.assertEqual(self._mock_guest_obj.login.call_count, 4)
+        for prof_obj in prof_objs:
+            self._mock_post_cls.assert_any_call(prof_obj, permissive=True)
+    # test_poweron_multiple_verify()
+
     def test_poweron_zvm_dasd(self):
         """
         Try a poweron operation of a zvm guest with dasd disk.
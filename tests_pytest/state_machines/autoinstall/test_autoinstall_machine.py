@@ -0,0 +1,117 @@
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test the autoinstall machine entry points
+"""
+
+# pylint: disable=redefined-outer-name  # use of fixtures
+
+#
+# IMPORTS
+#
+from tessia.server.config import Config
+from tessia.server.state_machines.autoinstall import machine
+from tessia.server.state_machines.autoinstall.model import \
+    AutoinstallMachineModel
+
+import json
+import pytest
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+REQUEST = {'system': 'lp10', 'os': 'rhel8', 'profile': 'default'}
+
+#
+# CODE
+#
+
+
+@pytest.fixture(autouse=True)
+def mock_config(monkeypatch, tmp_path):
+    """
+    Set default configuration
+    """
+
+    def get_config():
+        """
+        Configuration for use in tests
+        """
+        return {
+            'auto_install': {
+                'url': 'http://server_1:5000',
+                'dir': str(tmp_path),
+            }
+        }
+
+    monkeypatch.setattr(Config, 'get_config', get_config)
+
+
+@pytest.fixture
+def mock_db(monkeypatch, lpar_scsi_system, os_rhel8_tuple, creds):
+    """
+    Replace the database queries of the machine by a model built from
+    fixtures
+
+    Returns:
+        dict: parameters used to build the model and the fixtures used
+    """
+    lpar_scsi_system.hypervisor.credentials = {
+        'user': 'admin', 'password': 'secret'}
+    state = {'params': [], 'os_tuple': list(os_rhel8_tuple)}
+
+    def parse(params):
+        """Validate request without resource lookup"""
+        return {'params': json.loads(params)}
+
+    def model_from_params(params, _dbctrl):
+        """Build model from fixtures"""
+        state['params'].append(params)
+        return AutoinstallMachineModel(*state['os_tuple'], lpar_scsi_system,
+                                       creds)
+
+    monkeypatch.setattr(machine.MANAGER, 'connect', lambda: None)
+    monkeypatch.setattr(machine, 'DbController', lambda manager: None)
+    monkeypatch.setattr(machine.AutoInstallMachine, 'parse', parse)
+    monkeypatch.setattr(machine.AutoInstallMachine, '_model_from_params',
+                        model_from_params)
+    yield state
+
+
+def test_preflight_renders_templates(mock_db, tmp_path):
+    """
+    Test that preflight renders the autofile and cmdline of a request
+    without creating the autofile
+    """
+    result = machine.AutoInstallMachine.preflight(json.dumps(REQUEST))
+
+    assert mock_db['params'] == [REQUEST]
+    # kickstart rendered for the profile
+    assert 'lp10.local' in result['autofile']
+    assert 'rootpw' in result['autofile']
+    # cmdline points to the autofile of the profile
+    assert 'inst.ks=http://server_1:5000/lp10-default' in result['cmdline']
+    assert not list(tmp_path.iterdir())
+
+
+def test_preflight_invalid_template(mock_db):
+    """
+    Test that errors in a template are reported by preflight
+    """
+    mock_db['os_tuple'][2] = AutoinstallMachineModel.Template(
+        'broken', '{% if system.hostname %}unclosed')
+
+    with pytest.raises(Exception, match='if'):
+        machine.AutoInstallMachine.preflight(json.dumps(REQUEST))
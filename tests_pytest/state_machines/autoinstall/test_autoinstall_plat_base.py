@@ -0,0 +1,78 @@
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test hypervisor operations running in background
+"""
+
+#
+# IMPORTS
+#
+from threading import Event
+from tessia.server.state_machines.autoinstall.plat_base import HypThread
+
+import pytest
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+
+
+#
+# CODE
+#
+
+
+def test_hyp_thread_notifies():
+    """
+    Operation signals the event and keeps running
+    """
+    notification = Event()
+    done = Event()
+
+    def _operation(event):
+        event.set()
+        done.wait(5.)
+
+    thread = HypThread('test-thread', _operation, notification)
+    thread.start()
+    assert thread.wait_event(notification, 'failed', interval=0.1)
+    done.set()
+    thread.join()
+# test_hyp_thread_notifies()
+
+
+def test_hyp_thread_ends_without_notification():
+    """
+    Operation ends without signaling the event
+    """
+    thread = HypThread('test-thread', lambda event: None, Event())
+    thread.start()
+    assert not thread.wait_event(Event(), 'failed', interval=0.1)
+# test_hyp_thread_ends_without_notification()
+
+
+def test_hyp_thread_exception():
+    """
+    Exception in the operation is propagated to the caller
+    """
+    def _operation(_event):
+        raise ConnectionError('HMC not reachable')
+
+    thread = HypThread('test-thread', _operation, Event())
+    thread.start()
+    with pytest.raises(RuntimeError, match='Failed to start') as exc_info:
+        thread.wait_event(Event(), 'Failed to start', interval=0.1)
+    assert isinstance(exc_info.value.__cause__, ConnectionError)
+# test_hyp_thread_exception()
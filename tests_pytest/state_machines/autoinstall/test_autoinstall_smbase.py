@@ -21,6 +21,7 @@ A smallest implementation on SmBase is used to test common features
 # pylint: disable=invalid-name  # we have really long test names
 # pylint: disable=redefined-outer-name  # use of fixtures
 # pylint: disable=unused-argument  # use of fixtures for their side effects
+# pylint: disable=protected-access  # log following is internal to SmBase
 
 #
 # IMPORTS
@@ -487,3 +488,140 @@ def test_template_kvm_scsi(kvm_scsi_system, default_os_tuple, creds, tmpdir):
     assert autofile['gw_iface']['type'] == 'MACVTAP'
     assert autofile['gw_iface']['osname'] == 'eth0'
     assert autofile['ifaces'][0]['is_gateway']
+
+
+def test_render_templates_without_target(lpar_dasd_system, default_os_tuple,
+                                         creds, tmpdir):
+    """
+    Test that templates are rendered without a platform or autofile
+    """
+    model = AutoinstallMachineModel(*default_os_tuple,
+                                    lpar_dasd_system, creds)
+
+    with tmpdir.as_cwd():
+        smbase = NullMachine(model, None)
+        autofile_path = (Path.cwd() / 'lp10-default')
+
+    result = smbase.render_templates()
+    autofile = yaml.safe_load(result['autofile'])
+
+    assert autofile['system']['hostname'] == 'lp10.local'
+    assert result['cmdline'] == 'command-line template'
+    assert not autofile_path.exists()
+
+
+class FollowShell:
+    """
+    Shell stub whose channel returns the given chunks of output, one per
+    read, to follow a log file
+    """
+
+    def __init__(self, chunks, error=None):
+        """
+        Initialize shell with the output to return
+
+        Args:
+            chunks (list): output returned by each read
+            error (Exception): raised by the reads after the last chunk
+        """
+        self.written = []
+        self._chunks = list(chunks)
+        self._error = error
+
+    def _write(self, data_content: str):
+        """
+        Record the data written to the channel
+        """
+        self.written.append(data_content)
+
+    def _read(self):
+        """
+        Return the next chunk of output
+        """
+        if self._chunks:
+            return self._chunks.pop(0)
+        if self._error:
+            raise self._error
+        return ''
+
+
+@pytest.fixture
+def follow_machine(lpar_dasd_system, default_os_tuple, creds, tmpdir,
+                   monkeypatch):
+    """
+    A machine to follow logs with, using a fake clock advanced by sleep
+    """
+    clock = [0.0]
+
+    def fake_sleep(seconds):
+        """Advance the clock instead of sleeping"""
+        clock[0] += seconds
+
+    monkeypatch.setattr(sm_base, 'monotonic', lambda: clock[0])
+    monkeypatch.setattr(sm_base, 'sleep', fake_sleep)
+
+    model = AutoinstallMachineModel(*default_os_tuple,
+                                    lpar_dasd_system, creds)
+    with tmpdir.as_cwd():
+        yield NullMachine(model, None)
+
+
+def test_follow_log_line_split_across_reads(follow_machine):
+    """
+    Test that lines are only matched once they are complete
+    """
+    shell = FollowShell(['Installation st', 'arted\r\nInstallation com',
+                         '', 'plete\r\n'])
+
+    succeeded, match = follow_machine._follow_log(
+        shell, '/var/log/my install.log', [r'^Installation complete$'],
+        [r'^Installation com$'])
+
+    assert succeeded
+    assert match.group(0) == 'Installation complete'
+    assert shell.written == [
+        "tail -n +1 -F '/var/log/my install.log'\n", '\x03']
+
+
+def test_follow_log_failure_pattern(follow_machine):
+    """
+    Test that a failure pattern ends the follow in failure
+    """
+    shell = FollowShell(['step 1\n', 'ERROR: disk dasda not found\n'
+                         'Installation complete\n'])
+
+    succeeded, match = follow_machine._follow_log(
+        shell, '/tmp/install.log', ['Installation complete'],
+        [r'ERROR: disk (\w+) not found'])
+
+    assert not succeeded
+    assert match.group(1) == 'dasda'
+    assert shell.written[-1] == '\x03'
+
+
+def test_follow_log_timeout(follow_machine):
+    """
+    Test that following stops when no pattern is found before the timeout
+    """
+    shell = FollowShell(['Installation started\n'])
+
+    result = follow_machine._follow_log(
+        shell, '/tmp/install.log', ['Installation complete'], timeout=10)
+
+    assert result is None
+    assert sm_base.monotonic() > 10
+    assert shell.written[-1] == '\x03'
+
+
+def test_follow_log_interrupted_on_error(follow_machine):
+    """
+    Test that the follower is interrupted when reading fails
+    """
+    shell = FollowShell(['Installation started\n'],
+                        error=ConnectionError('channel closed'))
+
+    with pytest.raises(ConnectionError, match='channel closed'):
+        follow_machine._follow_log(
+            shell, '/tmp/install.log', ['Installation complete'])
+    assert shell.written[-1] == '\x03'
+    assert len(shell.written) == 2
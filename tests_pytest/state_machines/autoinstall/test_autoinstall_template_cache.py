@@ -0,0 +1,91 @@
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test compiled template cache
+"""
+
+# pylint: disable=redefined-outer-name  # use of fixtures
+
+#
+# IMPORTS
+#
+from tessia.server.config import Config
+from tessia.server.state_machines.autoinstall import template_cache
+
+import jinja2
+import pytest
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+
+
+#
+# CODE
+#
+
+
+@pytest.fixture
+def cache_dir(monkeypatch, tmp_path):
+    """
+    Configure a bytecode cache directory
+    """
+    path = tmp_path / 'cache'
+
+    def get_config():
+        """
+        Configuration for use in tests
+        """
+        return {'auto_install': {'template_cache_dir': str(path)}}
+
+    monkeypatch.setattr(Config, 'get_config', get_config)
+    yield path
+
+
+def test_same_content_compiled_once(cache_dir):
+    """
+    Test that templates are compiled once per content
+    """
+    cache = template_cache._TemplateCache()
+
+    template = cache.get('autofile', 'hostname={{ config.hostname }}')
+    assert template.render(config={'hostname': 'lp10'}) == 'hostname=lp10'
+    assert cache.get('autofile', 'hostname={{ config.hostname }}') is template
+
+    # changed content under the same name is compiled again
+    changed = cache.get('autofile', 'host={{ config.hostname }}')
+    assert changed is not template
+    assert changed.render(config={'hostname': 'lp10'}) == 'host=lp10'
+
+    # bytecode is stored for other processes
+    assert len(list(cache_dir.iterdir())) == 2
+
+
+def test_bytecode_shared_between_caches(cache_dir, monkeypatch):
+    """
+    Test that a new process reuses bytecode stored on disk
+    """
+    template_cache._TemplateCache().get('cmdline', 'ip={{ config.ip }}')
+
+    def compile_source(*args, **kwargs):
+        """
+        Compilation should not happen
+        """
+        raise AssertionError('template compiled again')
+
+    monkeypatch.setattr(jinja2.Environment, 'compile', compile_source)
+    template = template_cache._TemplateCache().get(
+        'cmdline', 'ip={{ config.ip }}')
+    assert template.render(config={'ip': '10.0.0.1'}) == 'ip=10.0.0.1'
@@ -55,6 +55,8 @@ class SshShell:
                     (retcode, string)
         """
         self._responses = responses if responses else {}
+        # output waiting to be read from the shell channel
+        self._pending = ''
 
     def close(self):
         """
@@ -82,14 +84,19 @@ class SshShell:
     def _write(self, data_content: str):
         """
         Write to a file
-        Always succeeds.
+        Always succeeds, matching responses become available for reading.
         """
+        for query, response in self._responses.items():
+            if query in data_content and isinstance(response, str):
+                self._pending += response + '\n'
 
     def _read(self):
         """
         Read to a file
-        Always succeeds.
+        Always succeeds, returns output of previous writes.
         """
+        data, self._pending = self._pending, ''
+        return data
 
 
 class SshClient:
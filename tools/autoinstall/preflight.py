@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Render the autofile and the installer kernel cmdline of an installation
+request without executing it, to validate templates against a system
+profile. Uses the database configured for the server and does not change it
+nor touch the target system.
+"""
+
+#
+# IMPORTS
+#
+from tessia.server.state_machines.autoinstall.machine import \
+    AutoInstallMachine
+
+import argparse
+import json
+import sys
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+
+#
+# CODE
+#
+
+
+def main():
+    """
+    Entry point for calling the function from command line.
+
+    Returns:
+        int: exit code, 1 if the templates could not be rendered
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--system', required=True, help='target system')
+    parser.add_argument('--os', required=True, help='operating system')
+    parser.add_argument(
+        '--profile', help='system activation profile, default if omitted')
+    parser.add_argument(
+        '--template', help='autofile template, default of the os if omitted')
+    parser.add_argument(
+        '--cmdline-only', action='store_true',
+        help='only print the installer kernel cmdline, the autofile contains '
+             'credentials')
+    args = parser.parse_args()
+
+    params = {'system': args.system, 'os': args.os}
+    if args.profile:
+        params['profile'] = args.profile
+    if args.template:
+        params['template'] = args.template
+
+    try:
+        result = AutoInstallMachine.preflight(json.dumps(params))
+    except Exception as exc:  # pylint: disable=broad-except
+        print('error: {}'.format(exc), file=sys.stderr)
+        return 1
+
+    if not args.cmdline_only:
+        print(result['autofile'])
+    print(result['cmdline'])
+    return 0
+# main()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
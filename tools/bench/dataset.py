@@ -0,0 +1,150 @@
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Creation of the benchmark databases, one per scale factor, populated with the
+data from tools/db/gen_random_data.py
+"""
+
+#
+# IMPORTS
+#
+from sqlalchemy import create_engine
+from sqlalchemy.engine.url import make_url
+
+import importlib.util
+import json
+import os
+import random
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+MY_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# database name used when the url does not contain one, the scale factor is
+# appended to it
+DEFAULT_DB = 'tessia_bench'
+
+# generator of the dataset
+GEN_DATA_PATH = os.path.join(MY_DIR, '..', 'db', 'gen_random_data.py')
+
+#
+# CODE
+#
+
+
+def _load_generator():
+    """
+    Import the data generator module, which is a script outside of any
+    package
+
+    Returns:
+        module: gen_random_data module
+    """
+    spec = importlib.util.spec_from_file_location(
+        'gen_random_data', GEN_DATA_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+# _load_generator()
+
+
+def generate(scale, seed):
+    """
+    Generate the dataset of a scale factor, the same seed always produces
+    the same data
+
+    Args:
+        scale (int): scale factor
+        seed (int): seed of the random generator
+
+    Returns:
+        dict: entries in the format expected by the db feeder
+    """
+    random.seed(seed)
+    return json.loads(_load_generator().create_data(scale))
+# generate()
+
+
+def prepare_db(base_url, scale, recreate=False):
+    """
+    Create the database of a scale factor in postgres if it does not exist
+
+    Args:
+        base_url (str): postgres url, its database name is used as prefix
+        scale (int): scale factor
+        recreate (bool): drop the database first if it exists
+
+    Returns:
+        str: url of the database of the scale factor
+
+    Raises:
+        RuntimeError: if url is not a postgres one
+    """
+    url_obj = make_url(base_url)
+    if not url_obj.drivername.startswith('postgresql'):
+        raise RuntimeError('Only postgresql is supported as benchmark '
+                           'database ({} was set)'.format(url_obj.drivername))
+    db_name = '{}_{}x'.format(url_obj.database or DEFAULT_DB, scale)
+
+    url_obj.database = 'postgres'
+    engine = create_engine(url_obj, isolation_level='AUTOCOMMIT')
+    if recreate:
+        engine.execute('DROP DATABASE IF EXISTS {}'.format(db_name)).close()
+    result = engine.execute(
+        "SELECT 1 FROM pg_database WHERE datname='{}'".format(db_name))
+    db_exist = result.scalar()
+    result.close()
+    if not db_exist:
+        engine.execute(
+            "CREATE DATABASE {} ENCODING 'UTF8' LC_COLLATE 'en_US.utf8' "
+            "LC_CTYPE 'en_US.utf8' TEMPLATE template0".format(db_name)).close()
+    engine.dispose()
+
+    url_obj.database = db_name
+    return str(url_obj)
+# prepare_db()
+
+
+def load(scale, seed):
+    """
+    Create the tables and feed the dataset unless the database was already
+    populated by a previous run. The configuration must already point to the
+    database of the scale factor.
+
+    Args:
+        scale (int): scale factor
+        seed (int): seed of the random generator
+
+    Returns:
+        bool: True if the data was loaded, False if it was already there
+    """
+    # imported here as the configuration has to be set beforehand
+    # pylint: disable=import-outside-toplevel
+    from tessia.server.db import types
+    from tessia.server.db.connection import MANAGER
+    from tessia.server.db.feeder import db_insert
+    from tessia.server.db.models import BASE, User
+
+    BASE.metadata.create_all(MANAGER.engine)
+    if MANAGER.session.query(User.id).first() is not None:
+        MANAGER.session.rollback()
+        return False
+    MANAGER.session.rollback()
+
+    types.create_all()
+    db_insert(generate(scale, seed))
+    return True
+# load()
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Run the benchmark scenarios at the given scale factors and output the
+results in json format, optionally comparing them with a baseline
+"""
+
+#
+# IMPORTS
+#
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from fnmatch import fnmatch
+from tempfile import NamedTemporaryFile
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import dataset
+import scenarios
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+MY_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# version of the results format
+RESULTS_VERSION = 1
+
+# differences in the median smaller than this (in seconds) are not
+# considered regressions, as they are within the measurement noise
+MIN_REGRESSION_DELTA = 0.001
+
+# configuration used by the tessia modules during the benchmark
+BENCH_CONFIG = {
+    'auth': {
+        'login_method': 'free',
+        'realm': 'bench realm',
+    },
+    'log': {
+        'version': 1,
+        'loggers': {
+            'tessia.server': {
+                'level': 'ERROR'
+            }
+        },
+        'handlers': {},
+    },
+}
+
+#
+# CODE
+#
+
+
+def _git_commit():
+    """
+    Return the commit of the repository being measured
+
+    Returns:
+        str: commit id or None if not available
+    """
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=MY_DIR, check=True,
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            universal_newlines=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+# _git_commit()
+
+
+def _error_entry(name, scale, exc):
+    """
+    Create the result of a failed case and report it
+
+    Args:
+        name (str): scenario or case name
+        scale (int): scale factor
+        exc (Exception): error raised
+
+    Returns:
+        dict: result entry
+    """
+    error = '{}: {}'.format(type(exc).__name__, exc)
+    print('{} {}x: {}'.format(name, scale, error), file=sys.stderr)
+    return {'scenario': name, 'scale': scale, 'error': error}
+# _error_entry()
+
+
+def _time_case(func, repeat):
+    """
+    Time the executions of a benchmark case
+
+    Args:
+        func (callable): case to execute
+        repeat (int): number of timed executions
+
+    Returns:
+        list: duration of each execution in seconds
+    """
+    # first execution warms up caches and is not considered
+    func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+# _time_case()
+
+
+def _configure(options, scale):
+    """
+    Point the tessia configuration to the database of the scale factor and
+    load the dataset on it
+
+    Args:
+        options (dict): command line options
+        scale (int): scale factor
+
+    Returns:
+        float: seconds taken to load the dataset, None if already loaded
+    """
+    # imported here so that the config file is set before it is read
+    # pylint: disable=import-outside-toplevel
+    import yaml
+
+    config = dict(BENCH_CONFIG, db={'url': dataset.prepare_db(
+        options['db_url'], scale, options['recreate'])})
+    # pylint: disable=consider-using-with
+    config_file = NamedTemporaryFile(mode='w', suffix='.yaml', delete=False)
+    with config_file:
+        yaml.dump(config, config_file)
+    os.environ['TESSIA_CFG'] = config_file.name
+
+    start = time.perf_counter()
+    if dataset.load(scale, options['seed']):
+        return time.perf_counter() - start
+    return None
+# _configure()
+
+
+def run_scale(options, scale):
+    """
+    Run the selected scenarios at a scale factor. Called in a new process
+    for each scale factor so that the db connections of the tessia modules
+    are created for its database.
+
+    Args:
+        options (dict): command line options
+        scale (int): scale factor
+
+    Returns:
+        list: results of each case
+    """
+    results = []
+    use_db = bool(options['db_url'])
+    if use_db:
+        load_time = _configure(options, scale)
+        if load_time is not None:
+            print('loaded dataset {}x in {:.1f}s'.format(scale, load_time),
+                  file=sys.stderr)
+
+    for name, needs_db, generator in scenarios.SCENARIOS:
+        if not any(fnmatch(name, pattern) for pattern in options['only']):
+            continue
+        if needs_db and not use_db:
+            results.append({'scenario': name, 'scale': scale,
+                            'skipped': 'no database url provided'})
+            continue
+
+        cases = generator(scale)
+        while True:
+            try:
+                case_name, ops, func = next(cases)
+            except StopIteration:
+                break
+            # the generator cannot continue after failing in its setup
+            except Exception as exc:  # pylint: disable=broad-except
+                results.append(_error_entry(name, scale, exc))
+                break
+
+            case_name = '{}.{}'.format(name, case_name)
+            try:
+                samples = _time_case(func, options['repeat'])
+            except Exception as exc:  # pylint: disable=broad-except
+                results.append(_error_entry(case_name, scale, exc))
+                continue
+
+            median = statistics.median(samples)
+            results.append({
+                'scenario': case_name,
+                'scale': scale,
+                'repeat': len(samples),
+                'min': min(samples),
+                'median': median,
+                'max': max(samples),
+                'ops': ops,
+                'ops_per_second': ops / median if median else None,
+            })
+            print('{} {}x: median {:.6f}s'.format(
+                case_name, scale, median), file=sys.stderr)
+    return results
+# run_scale()
+
+
+def compare(results, baseline, tolerance):
+    """
+    Find the cases whose median got slower than in the baseline
+
+    Args:
+        results (list): current results
+        baseline (dict): results document of a previous run
+        tolerance (float): accepted slowdown as a fraction of the baseline
+
+    Returns:
+        list: descriptions of the regressions found
+    """
+    previous = {
+        (entry['scenario'], entry['scale']): entry['median']
+        for entry in baseline['results'] if 'median' in entry}
+    regressions = []
+    for entry in results:
+        base_median = previous.get((entry['scenario'], entry['scale']))
+        if base_median is None or 'median' not in entry:
+            continue
+        limit = max(base_median * (1 + tolerance),
+                    base_median + MIN_REGRESSION_DELTA)
+        if entry['median'] > limit:
+            regressions.append(
+                '{} {}x: median {:.6f}s, baseline {:.6f}s (+{:.0%})'.format(
+                    entry['scenario'], entry['scale'], entry['median'],
+                    base_median, entry['median'] / base_median - 1))
+    return regressions
+# compare()
+
+
+def main():
+    """
+    Entry point, parse the command line and run the scale factors
+
+    Returns:
+        int: 0 on success, 1 if regressions were found, 2 if cases failed
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--db-url', default=os.environ.get('TESSIA_BENCH_DB_URI'),
+        help='postgres url, a database is created for each scale factor '
+             'with the url database name as prefix (default from env '
+             'variable TESSIA_BENCH_DB_URI). Without it only the scenarios '
+             'which do not need a database are run.')
+    parser.add_argument(
+        '--scales', type=int, nargs='+', default=[1],
+        help='scale factors of the dataset (default: 1)')
+    parser.add_argument(
+        '--only', nargs='+', default=['*'],
+        help='run only the scenarios matching these patterns')
+    parser.add_argument(
+        '--repeat', type=int, default=5,
+        help='timed executions of each case (default: 5)')
+    parser.add_argument(
+        '--seed', type=int, default=0,
+        help='seed of the dataset generator (default: 0)')
+    parser.add_argument(
+        '--recreate', action='store_true',
+        help='drop and load again the databases of the scale factors')
+    parser.add_argument(
+        '--output', help='write the results to this file instead of stdout')
+    parser.add_argument(
+        '--baseline', help='results file of a previous run to compare with')
+    parser.add_argument(
+        '--tolerance', type=float, default=0.2,
+        help='slowdown accepted in comparison to the baseline, as a fraction '
+             '(default: 0.2)')
+    args = parser.parse_args()
+    options = vars(args)
+
+    results = []
+    for scale in args.scales:
+        # a new process for each scale so that nothing is shared between them
+        with ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=multiprocessing.get_context('spawn')) as executor:
+            results.extend(executor.submit(run_scale, options, scale).result())
+
+    document = {
+        'version': RESULTS_VERSION,
+        'date': datetime.utcnow().isoformat(),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'results': results,
+    }
+    output = json.dumps(document, indent=4)
+    if args.output:
+        with open(args.output, 'w') as file_obj:
+            file_obj.write(output + '\n')
+    else:
+        print(output)
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, 'r') as file_obj:
+            regressions = compare(results, json.load(file_obj),
+                                  args.tolerance)
+        for regression in regressions:
+            print('regression: {}'.format(regression), file=sys.stderr)
+        if regressions:
+            exit_code = 1
+    if any('error' in entry for entry in results):
+        exit_code = 2
+    return exit_code
+# main()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,330 @@
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark scenarios. Each scenario is a generator registered with the
+scenario decorator which receives the scale factor and yields the cases to
+be timed as tuples (name, operations per call, callable).
+"""
+
+#
+# IMPORTS
+#
+from base64 import b64encode
+from datetime import datetime, timedelta
+
+import io
+import json
+import random
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+# registered scenarios as tuples (name, needs database, generator)
+SCENARIOS = []
+
+# users of the generated dataset by type of access
+USERS = {
+    'admin': 'user_x_0@domain.com',
+    'restricted': 'user_x_1@domain.com',
+    # no role in any project: only sees what is not restricted
+    'sandbox': 'user_x_6@domain.com',
+}
+
+# entries requested per page in list operations
+PAGE_SIZE = 100
+
+#
+# CODE
+#
+
+
+def scenario(name, needs_db=False):
+    """
+    Register a scenario
+
+    Args:
+        name (str): scenario name, used as prefix of its cases
+        needs_db (bool): whether the scenario requires the database
+
+    Returns:
+        function: decorator
+    """
+    def _register(func):
+        """Add the generator to the list"""
+        SCENARIOS.append((name, needs_db, func))
+        return func
+    return _register
+# scenario()
+
+
+def _api_get(client, url, login):
+    """
+    Perform a GET request on the api
+
+    Args:
+        client (FlaskClient): test client of the api app
+        url (str): request url
+        login (str): user authenticated by the request
+
+    Returns:
+        any: decoded json response
+
+    Raises:
+        RuntimeError: if the request failed
+    """
+    auth = b64encode('{}:pass'.format(login).encode('ascii')).decode('ascii')
+    resp = client.get(url, headers={'Authorization': 'basic ' + auth})
+    if resp.status_code != 200:
+        raise RuntimeError('GET {} failed with status {}: {}'.format(
+            url, resp.status_code, resp.get_data(as_text=True)[:200]))
+    return json.loads(resp.get_data(as_text=True))
+# _api_get()
+
+
+@scenario('api', needs_db=True)
+def api_scenario(_scale):
+    """
+    List and read each resource type with each type of user
+
+    Args:
+        _scale (int): scale factor, reflected by the database
+
+    Yields:
+        tuple: benchmark cases
+    """
+    # imported here as the configuration has to be set beforehand
+    # pylint: disable=import-outside-toplevel
+    from tessia.server.api.app import API
+    from tessia.server.api.resources import RESOURCES
+
+    API.app.config['TESTING'] = True
+    API.app.app_context().push()
+    client = API.app.test_client()
+
+    for resource in RESOURCES:
+        url = '/{}'.format(resource.meta.name)
+        list_url = '{}?per_page={}'.format(url, PAGE_SIZE)
+        entries = _api_get(client, list_url, USERS['admin'])
+        for user_type, login in USERS.items():
+            yield ('list.{}.{}'.format(resource.meta.name, user_type), 1,
+                   lambda url=list_url, login=login: _api_get(
+                       client, url, login))
+
+        if not entries:
+            continue
+        read_url = entries[0]['$uri']
+        for user_type, login in USERS.items():
+            yield ('read.{}.{}'.format(resource.meta.name, user_type), 1,
+                   lambda url=read_url, login=login: _api_get(
+                       client, url, login))
+# api_scenario()
+
+
+@scenario('bulkop', needs_db=True)
+def bulkop_scenario(scale):
+    """
+    Import a csv file of ip addresses with the bulk operator machine, in dry
+    run mode so that each run processes the same input
+
+    Args:
+        scale (int): scale factor, multiplies the number of rows
+
+    Yields:
+        tuple: benchmark cases
+    """
+    # imported here as the configuration has to be set beforehand
+    # pylint: disable=import-outside-toplevel
+    from tessia.server.state_machines.bulkop import machine
+
+    rows = ['subnet,address,system,owner,project,desc']
+    # the shared subnet of the first cpc is a /16, addresses from its upper
+    # half are not used by the dataset
+    row_count = 100 * scale
+    for index in range(row_count):
+        rows.append('cpc0 shared,10.1.{}.{},,{},Department x,bench'.format(
+            128 + index // 250, index % 250 + 1, USERS['admin']))
+    params = json.dumps({
+        'commit': False,
+        'content': '\n'.join(rows),
+        'requester': USERS['admin'],
+        'resource_type': 'ip',
+    })
+
+    def _import():
+        """Run the machine with a new parser of the content"""
+        machine.BulkOperatorMachine(params).start()
+    yield ('ip_import', row_count, _import)
+# bulkop_scenario()
+
+
+@scenario('resources_manager')
+def resources_manager_scenario(scale):
+    """
+    Enqueue a synthetic mix of jobs and verify which ones can start
+
+    Args:
+        scale (int): scale factor, multiplies the number of jobs and
+                     resources
+
+    Yields:
+        tuple: benchmark cases
+    """
+    # pylint: disable=import-outside-toplevel
+    from tessia.server.db.models import SchedulerJob
+    from tessia.server.scheduler import resources_manager
+
+    rand = random.Random(scale)
+    now = datetime.utcnow()
+    resources = ['system.guest{}'.format(index)
+                 for index in range(20 * scale)]
+    hypervisors = ['system.lpar{}'.format(index) for index in range(scale)]
+    jobs = []
+    for job_id in range(200 * scale):
+        start_date = None
+        # some jobs are scheduled for later
+        if rand.random() < 0.1:
+            start_date = now + timedelta(minutes=rand.randint(10, 600))
+        jobs.append(SchedulerJob(
+            id=job_id + 1,
+            requester_id=1,
+            priority=rand.randint(0, 9),
+            time_slot=SchedulerJob.SLOT_DEFAULT,
+            submit_date=now - timedelta(seconds=job_id),
+            start_date=start_date,
+            state=SchedulerJob.STATE_WAITING,
+            job_type='echo',
+            resources={
+                resources_manager.MODE_EXCLUSIVE: rand.sample(
+                    resources, rand.randint(1, 3)),
+                resources_manager.MODE_SHARED: rand.sample(
+                    hypervisors, rand.randint(0, min(2, len(hypervisors)))),
+            },
+            description='bench job',
+            parameters='',
+            timeout=rand.choice((0, 600, 3600)),
+        ))
+
+    manager = resources_manager.ResourcesManager()
+
+    def _enqueue():
+        """Enqueue all jobs in an empty manager"""
+        manager.reset()
+        for job in jobs:
+            manager.enqueue(job)
+
+    def _can_start():
+        """Verify each job of the queues"""
+        for job in jobs:
+            manager.can_start(job)
+
+    yield ('enqueue', len(jobs), _enqueue)
+    _enqueue()
+    yield ('can_start', len(jobs), _can_start)
+# resources_manager_scenario()
+
+
+@scenario('scheduler_sim')
+def scheduler_sim_scenario(scale):
+    """
+    Simulate the scheduler on a synthetic trace
+
+    Args:
+        scale (int): scale factor, multiplies the number of jobs and
+                     resources
+
+    Yields:
+        tuple: benchmark cases
+    """
+    # pylint: disable=import-outside-toplevel
+    from tessia.server.scheduler import simulator
+
+    trace = simulator.synthetic_trace(500 * scale, 20 * scale, seed=scale,
+                                      interval=60 / scale)
+
+    yield ('replay', len(trace),
+           lambda: simulator.Simulator(trace).run())
+# scheduler_sim_scenario()
+
+
+@scenario('json_stream')
+def json_stream_scenario(scale):
+    """
+    Parse a stream of job arguments as read by the job executor
+
+    Args:
+        scale (int): scale factor, multiplies the number of objects
+
+    Yields:
+        tuple: benchmark cases
+    """
+    # pylint: disable=import-outside-toplevel
+    from tessia.server.lib.json_stream import JsonStream
+
+    rand = random.Random(scale)
+    objects = []
+    for index in range(100 * scale):
+        objects.append(json.dumps({
+            'job_dir': '/var/tessia/jobs/{}'.format(index),
+            'job_type': 'ansible',
+            'job_parameters': json.dumps({
+                'source': 'https://example.com/repo.git',
+                'playbook': 'site.yml',
+                'vars': {'value{}'.format(item): rand.random()
+                         for item in range(10)},
+            }),
+            'timeout': rand.randint(0, 86400),
+        }))
+    content = '\n'.join(objects)
+
+    def _parse():
+        """Consume all objects of the stream"""
+        for _ in JsonStream(io.StringIO(content)):
+            pass
+    yield ('parse', len(content), _parse)
+# json_stream_scenario()
+
+
+@scenario('gzip_stream')
+def gzip_stream_scenario(scale):
+    """
+    Compress job output as served by the api
+
+    Args:
+        scale (int): scale factor, multiplies the size of the output
+
+    Yields:
+        tuple: benchmark cases
+    """
+    # pylint: disable=import-outside-toplevel
+    from tessia.server.lib.compression import CHUNK_SIZE, GzipStreamWrapper
+
+    rand = random.Random(scale)
+    lines = []
+    size = 0
+    while size < scale * 1024 * 1024:
+        line = '{} | INFO | task {} changed host {}: {}\n'.format(
+            datetime(2026, 1, 1) + timedelta(seconds=len(lines)),
+            rand.randint(1, 200), rand.randint(1, 50), rand.random())
+        lines.append(line)
+        size += len(line)
+    content = ''.join(lines).encode('utf-8')
+
+    def _compress():
+        """Read the whole compressed stream"""
+        stream = GzipStreamWrapper(io.BytesIO(content))
+        while stream.read(CHUNK_SIZE):
+            pass
+    yield ('compress', len(content), _compress)
+# gzip_stream_scenario()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# Copyright 2026 IBM Corp.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Simulate the scheduler on a recorded or synthetic trace of job submissions
+and output wait times, utilization per resource and rejection rates in json
+format
+"""
+
+#
+# IMPORTS
+#
+from datetime import datetime, timedelta
+
+import argparse
+import json
+import sys
+import time
+
+#
+# CONSTANTS AND DEFINITIONS
+#
+
+#
+# CODE
+#
+
+
+def record(args):
+    """
+    Write the trace of the jobs submitted in the last days, read from the
+    database of the tessia configuration
+
+    Args:
+        args (argparse.Namespace): command line options
+
+    Returns:
+        int: exit code
+    """
+    # pylint: disable=import-outside-toplevel
+    from tessia.server.scheduler import simulator
+
+    until = datetime.utcnow()
+    trace = simulator.record_trace(until - timedelta(days=args.days), until)
+    with open(args.output, 'w') as file_obj:
+        for entry in trace:
+            file_obj.write(json.dumps(entry) + '\n')
+    print('{} requests recorded'.format(len(trace)), file=sys.stderr)
+    return 0
+# record()
+
+
+def run(args):
+    """
+    Simulate the trace and output the report
+
+    Args:
+        args (argparse.Namespace): command line options
+
+    Returns:
+        int: exit code
+    """
+    # pylint: disable=import-outside-toplevel
+    from tessia.server.scheduler import simulator
+
+    if args.trace:
+        with open(args.trace, 'r') as file_obj:
+            trace = simulator.load_trace(file_obj)
+    else:
+        trace = simulator.synthetic_trace(
+            args.jobs, args.resources, args.seed, args.interval)
+
+    priorities = {}
+    for pair in args.priority:
+        job_type, _, priority = pair.partition('=')
+        priorities[job_type] = int(priority)
+
+    start = time.perf_counter()
+    report = simulator.Simulator(
+        trace, grace_seconds=args.grace_seconds, priorities=priorities,
+        loop_interval=args.loop_interval).run()
+    report['simulation_seconds'] = time.perf_counter() - start
+
+    output = json.dumps(report, indent=4)
+    if args.output:
+        with open(args.output, 'w') as file_obj:
+            file_obj.write(output + '\n')
+    else:
+        print(output)
+    return 0
+# run()
+
+
+def main():
+    """
+    Entry point, parse the command line and execute the subcommand
+
+    Returns:
+        int: exit code
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.required = True
+
+    record_parser = subparsers.add_parser(
+        'record', help='create a trace from the jobs in the database')
+    record_parser.add_argument(
+        '--days', type=int, default=30,
+        help='record the jobs submitted in these last days (default: 30)')
+    record_parser.add_argument(
+        '--output', required=True, help='trace file to write')
+    record_parser.set_defaults(func=record)
+
+    run_parser = subparsers.add_parser('run', help='simulate a trace')
+    run_parser.add_argument(
+        '--trace', help='trace file to replay, a synthetic trace is used '
+                        'if not specified')
+    run_parser.add_argument(
+        '--jobs', type=int, default=1000,
+        help='requests of the synthetic trace (default: 1000)')
+    run_parser.add_argument(
+        '--resources', type=int, default=50,
+        help='systems used by the synthetic trace (default: 50)')
+    run_parser.add_argument(
+        '--interval', type=int, default=60,
+        help='mean seconds between the submissions of the synthetic trace '
+             '(default: 60)')
+    run_parser.add_argument(
+        '--seed', type=int, default=0,
+        help='seed of the synthetic trace (default: 0)')
+    run_parser.add_argument(
+        '--grace-seconds', type=int,
+        help='grace time added to the job timeouts when checking for '
+             'conflicts (default: same as the scheduler)')
+    run_parser.add_argument(
+        '--priority', nargs='+', default=[], metavar='JOB_TYPE=PRIORITY',
+        help='replace the priority of the jobs of a type')
+    run_parser.add_argument(
+        '--loop-interval', type=float, default=0.5,
+        help='seconds between the iterations of the scheduler loop '
+             '(default: 0.5)')
+    run_parser.add_argument(
+        '--output', help='write the report to this file instead of stdout')
+    run_parser.set_defaults(func=run)
+
+    args = parser.parse_args()
+    return args.func(args)
+# main()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
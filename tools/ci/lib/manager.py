@@ -34,6 +34,8 @@ import tempfile
 #
 MY_DIR = os.path.dirname(os.path.abspath(__file__))
 REPO_DIR = os.path.abspath('{}/../../..'.format(MY_DIR))
+# maximum import time in ms of the client, which is often called in shell loops
+CLI_IMPORT_TIME_LIMIT = 1000
 
 #
 # CODE
@@ -175,6 +177,15 @@ class Manager():
             raise RuntimeError(
                 'failed to clear coverage data')
 
+        # check that the client startup did not get slower
+        ret_code, _ = self._session.run(
+            "docker exec --user admin {} /home/admin/cli/tests/runner "
+            "importtime --max-ms={}".format(client_id, CLI_IMPORT_TIME_LIMIT),
+            stdout=True)
+        if ret_code != 0:
+            raise RuntimeError(
+                'client import time exceeds the limit')
+
         test_list = []
         # field tests section (uses real resources)
         if self._field_tests:
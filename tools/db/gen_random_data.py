@@ -21,6 +21,7 @@ purposes.
 #
 # IMPORTS
 #
+import argparse
 import json
 import random
 
@@ -31,9 +32,10 @@ import random
 #
 # CODE
 #
-def create_permissions():
+def create_permissions(scale=1):
     """
     Some information on the data generated:
+    - each project has 10 users per scale factor;
     - user_{project}_0@domain.com is always admin;
     - user_{project}_1@domain.com is always restricted;
     - user_{project}_2@domain.com has always 'hardware admin' role;
@@ -69,8 +71,8 @@ def create_permissions():
     roles = []
     for project in projects:
         project_id = project['name'].split()[-1]
-        # create 10 users per project
-        for i in range(0, 10):
+        # create 10 users per project for each scale factor
+        for i in range(0, 10 * scale):
             suffix = '{}_{}'.format(project_id, i)
             login = 'user_{}@domain.com'.format(suffix)
             name = 'Name of user {}'.format(suffix)
@@ -243,17 +245,17 @@ def create_network(data):
     net_ifaces = []
     profile_ifaces_associations = []
     roce = True
+    # index profiles by system, a linear search would make large datasets
+    # take too long
+    profile_by_system = {
+        profile['system']: profile for profile in data['SystemProfile']}
     for system in data['System']:
         if system['type'] == 'cpc':
             continue
 
         # get the corresponding activation profile to which the created
         # interfaces will be added to
-        profile = None
-        for find_profile in data['SystemProfile']:
-            if find_profile['system'] == system['name']:
-                profile = find_profile
-                break
+        profile = profile_by_system.get(system['name'])
         # sanity check
         if profile is None:
             raise RuntimeError('Activation profile for system {} not '
@@ -521,17 +523,15 @@ def create_storage(data):
     storage_pools = []
     logical_volumes = []
     prof_logical_volumes_assoc = []
+    profile_by_system = {
+        profile['system']: profile for profile in data['SystemProfile']}
     for system in data['System']:
         if system['type'] == 'cpc':
             continue
 
         # get the corresponding activation profile to which the created
         # volumes will be added to
-        profile = None
-        for find_profile in data['SystemProfile']:
-            if find_profile['system'] == system['name']:
-                profile = find_profile
-                break
+        profile = profile_by_system.get(system['name'])
         # sanity check
         if profile is None:
             raise RuntimeError('Activation profile for system {} not '
@@ -936,13 +936,14 @@ def create_systems(data):
     return result
 # create_systems()
 
-def create_data():
+def create_data(scale=1):
     """
     Entry point for data generation, calls all other auxility methods and
     returns a data in json format (dictionary).
 
     Args:
-        None
+        scale (int): multiplies the number of users and consequently of
+                     systems and their resources
 
     Returns:
         str: containing a dictionary in json format
@@ -951,7 +952,7 @@ def create_data():
         None
     """
     data = {}
-    data.update(create_permissions())
+    data.update(create_permissions(scale))
     data.update(create_systems(data))
     data.update(create_network(data))
     data.update(create_storage(data))
@@ -963,7 +964,12 @@ def main():
     """
     Entry point for calling the function from command line.
     """
-    print(create_data())
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--scale', type=int, default=1,
+        help='multiply the amount of data generated by this factor')
+    args = parser.parse_args()
+    print(create_data(args.scale))
 # main()
 
 if __name__ == '__main__':